@@ -0,0 +1,14 @@
+'''Performance benchmarks for |esec|.
+
+.. include:: epydoc_include.txt
+
+Each module in this package may be run as a script from the directory
+containing ``run.py``. For example::
+
+    python -m benchmarks.real_landscapes
+
+``benchmarks.suite`` runs a fixed set of cases and can save its
+results and compare them against an earlier run to detect regressions.
+
+Benchmarks report timings only; correctness is checked by the tests.
+'''
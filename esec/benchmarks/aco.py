@@ -0,0 +1,129 @@
+'''Compares the pheromone maps and tour construction of the ACO plugin
+on the Berlin52 and U2319 problems.
+
+Pheromone updates are timed for `plugins.ACO.pheromone.PheromoneMap`
+and `plugins.ACO.pheromone.PheromoneMatrix`. Tours are built by
+calculating the attractiveness of every remaining link at each step (as
+`plugins.ACO.tsp.TourSpecies` did before `plugins.ACO.tsp.TourBuilder`
+was added), by `TourBuilder` considering every unvisited node, and by
+`TourBuilder` with candidate lists. The link-by-link construction is
+only timed for problems no larger than ``--wheel-limit`` nodes.
+
+The current implementation is also timed by the ``aco`` cases in
+`benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.aco [--ants=20] [--updates=10] [--tours=5]
+                             [--candidates=15] [--wheel-limit=500]
+'''
+
+import optparse
+import random
+import sys
+from esec.context import _context
+from esec.landscape.sequence import TSP
+from esec.species.sequence import SequenceIndividual, SequenceSpecies
+from plugins.ACO.pheromone import PheromoneMap, PheromoneMatrix
+from plugins.ACO.tsp import TourSpecies, TourBuilder
+from benchmarks.suite import measure
+
+PROBLEMS = (
+    ('Berlin52', TSP.berlin52_map),
+    ('U2319', 'cfgs/TSP/U2319.csv'),
+)
+'''The problems to run, as ``(name, cost_map)`` pairs.'''
+
+def _wheel_tour(cost_map, size, pheromone_map, start):
+    '''Returns a tour built by calculating and sorting the attractiveness
+    of every remaining link at each step.'''
+    frand = _context.rand.random
+    options = set(xrange(size))
+    options.discard(start)
+    genes = [ start ]
+    while options:
+        prob_list = TourSpecies._init_fitness_wheel(genes[-1], options, cost_map, 2.0,    #pylint: disable=W0212
+                                                    pheromone_map, 2.0)
+        selection = frand() * sum(i[1] for i in prob_list)
+        next_city = prob_list[0][0]
+        for city_index, prob in prob_list:
+            if selection < prob:
+                next_city = city_index
+                break
+            selection -= prob
+        genes.append(next_city)
+        options.discard(next_city)
+    return genes
+
+def _update(pheromone_map, ants, updates):
+    '''Updates `pheromone_map` with `ants` the specified number of
+    times.'''
+    for _ in xrange(updates):
+        pheromone_map.update_fitness(source=ants, persistence=0.9, strength=1, minimisation=True)
+
+def run(ants, updates, tours, candidates, wheel_limit, out=sys.stdout):
+    '''Runs the benchmark for each problem and writes a table to `out`.
+    '''
+    _context.notify = lambda *p, **kw: None
+    out.write('%-9s %-22s %12s %14s\n' % ('problem', 'case', 'time (s)', 'mean length'))
+    for name, cost_map in PROBLEMS:
+        landscape = TSP(cost_map=cost_map)
+        cost_map = landscape.cost_map
+        size = cost_map.size
+        
+        rand = random.Random(1)
+        species = SequenceSpecies({ }, None)
+        group = [ ]
+        for _ in xrange(ants):
+            genes = range(size)
+            rand.shuffle(genes)
+            indiv = SequenceIndividual(genes, parent=species)
+            indiv.fitness = landscape.eval(indiv)
+            group.append(indiv)
+        
+        map_time = measure(lambda: _update(PheromoneMap(), group, updates), 3)
+        matrix_time = measure(lambda: _update(PheromoneMatrix(size=size), group, updates), 3)
+        out.write('%-9s %-22s %12.5f %14s\n' % (name, 'update (map)', map_time, '-'))
+        out.write('%-9s %-22s %12.5f %14s\n' % (name, 'update (matrix)', matrix_time, '-'))
+        
+        pheromone_map = PheromoneMap()
+        pheromone_matrix = PheromoneMatrix(size=size)
+        for each in (pheromone_map, pheromone_matrix):
+            _update(each, group, 1)
+        
+        cases = [ ]
+        if size <= wheel_limit:
+            cases.append(('tours (wheel)', lambda i: _wheel_tour(cost_map, size, pheromone_map, i)))
+        full = TourBuilder(cost_map, 2.0, pheromone_matrix, 2.0)
+        cases.append(('tours (builder)', lambda i: full.tour(i)))
+        nearest = TourBuilder(cost_map, 2.0, pheromone_matrix, 2.0, candidates)
+        cases.append(('tours (%d candidates)' % candidates, lambda i: nearest.tour(i)))
+        
+        for case, build in cases:
+            # Attractiveness is calculated before timing begins
+            build(0)
+            results = [ ]
+            elapsed = measure(lambda: results.append([build(i) for i in xrange(tours)]), 1)
+            length = sum(cost_map.tour_length(t) for t in results[0]) / len(results[0])
+            out.write('%-9s %-22s %12.5f %14.1f\n' % (name, case, elapsed, length))
+            out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--ants', type='int', default=20,
+                      help='number of tours used to update pheromone')
+    parser.add_option('--updates', type='int', default=10,
+                      help='number of pheromone updates to time')
+    parser.add_option('--tours', type='int', default=5,
+                      help='number of tours to build')
+    parser.add_option('--candidates', type='int', default=15,
+                      help='number of candidate nodes for each step')
+    parser.add_option('--wheel-limit', type='int', default=500,
+                      help='largest problem to build tours for link by link')
+    (options, _) = parser.parse_args()
+    
+    run(options.ants, options.updates, options.tours, options.candidates, options.wheel_limit)
+
+if __name__ == '__main__':
+    main()
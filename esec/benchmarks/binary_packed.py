@@ -0,0 +1,84 @@
+'''Compares the operators of `esec.species.binary.BinarySpecies` against
+the bit-packed equivalents in
+`esec.species.binary_packed.PackedBinarySpecies`, including `OneMax`
+evaluation of each representation. Both representations are also
+timed by the ``species.binary``, ``species.packed`` and
+``landscape.OneMax`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.binary_packed [--sizes=100,1000] [--lengths=100,1000,10000]
+                                       [--rates=0.001,0.01]
+'''
+
+import optparse
+import random
+import sys
+from itertools import islice
+from timeit import default_timer as clock
+from esec.context import _context
+from esec.landscape.binary import OneMax
+from esec.species.binary import BinarySpecies
+from esec.species.binary_packed import PackedBinarySpecies
+
+def _time(func, repeat=3):
+    '''Returns the shortest time taken to call `func`. The random number
+    generator is reset before each call.'''
+    best = None
+    for _ in xrange(repeat):
+        _context.rand = random.Random(12345)
+        start = clock()
+        func()
+        elapsed = clock() - start
+        if best is None or elapsed < best: best = elapsed
+    return best
+
+def run(sizes, lengths, rates, out=sys.stdout):
+    '''Runs the benchmark for each population size, genome length and
+    mutation rate and writes a table to `out`.
+    '''
+    _context.notify = lambda *p, **kw: None
+    out.write('%7s %7s %-28s %12s %12s %9s\n' %
+              ('size', 'length', 'operation', 'list (s)', 'packed (s)', 'speedup'))
+    for length in lengths:
+        onemax = OneMax(parameters=length)
+        species = (BinarySpecies({ }, onemax), PackedBinarySpecies({ }, onemax))
+        for size in sizes:
+            pops = []
+            for spec in species:
+                _context.rand = random.Random(12345)
+                pops.append(list(islice(spec.init_random(length=length), size)))
+            
+            operations = [
+                ('init_random', lambda spec, pop: list(islice(spec.init_random(length=length), size))),
+                ('crossover_uniform', lambda spec, pop: list(spec.crossover_uniform(pop, two_children=True))),
+                ('crossover_two', lambda spec, pop: list(spec.crossover_two(pop, two_children=True))),
+                ('OneMax', lambda spec, pop: [onemax._eval(i) for i in pop]),   #pylint: disable=W0212
+            ]
+            for rate in rates:
+                operations.append(('mutate_bitflip(%g)' % rate,
+                                   lambda spec, pop, rate=rate: list(spec.mutate_bitflip(pop, per_gene_rate=rate))))
+            
+            for name, func in operations:
+                times = [_time(lambda: func(spec, pop)) for spec, pop in zip(species, pops)]
+                out.write('%7d %7d %-28s %12.5f %12.5f %8.1fx\n' %
+                          (size, length, name, times[0], times[1], times[0] / max(times[1], 1e-9)))
+            out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='100,1000',
+                      help='comma-separated population sizes')
+    parser.add_option('--lengths', default='100,1000,10000',
+                      help='comma-separated genome lengths')
+    parser.add_option('--rates', default='0.001,0.01',
+                      help='comma-separated per-gene mutation rates')
+    (options, _) = parser.parse_args()
+    
+    run([int(s) for s in options.sizes.split(',')],
+        [int(l) for l in options.lengths.split(',')],
+        [float(r) for r in options.rates.split(',')])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+'''Compares evaluating `esec.landscape.binary.CNF_SAT` by scanning every
+clause (as it was implemented before `esec.landscape.binary.ClauseIndex`
+was added) against counting the true literals of every clause with
+`ClauseIndex.counts` (as ``eval`` does for new genomes) and against
+`CNF_SAT.rescore` for offspring that differ from their parent in a few
+bits. Both are also timed by the ``landscape.CNF_SAT`` cases in
+`benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.cnf_sat [--variables=100,1000] [--ratio=4.3]
+                                 [--count=500] [--flips=1,2,8]
+'''
+
+import optparse
+import random
+import sys
+from timeit import default_timer as clock
+from esec.landscape.binary import CNF_SAT
+from esec.species.binary import BinaryIndividual, BinarySpecies
+
+def _scan_eval(landscape, indiv):
+    '''Evaluates `indiv` as `CNF_SAT._eval` did by scanning every
+    clause.'''
+    satisfied = 0
+    c_list = landscape.c_list
+    for j in xrange(landscape.n_clauses):
+        for k in xrange(landscape.c_len):
+            if (((c_list[j][k] > 0) and indiv[c_list[j][k] - 1]) or
+                ((c_list[j][k] < 0) and (not indiv[-c_list[j][k] - 1]))):
+                satisfied += 1
+                break
+    return (float(satisfied) / landscape.n_clauses)
+
+def run(variables, ratio, count, flips, out=sys.stdout):
+    '''Runs the benchmark for each number of variables and writes a table
+    to `out`.
+    '''
+    rand = random.Random(12345)
+    species = BinarySpecies({ }, rand)
+    out.write('%6s %7s %6s %12s %12s %12s %9s\n' %
+              ('N', 'L', 'flips', 'scan (s)', 'counts (s)', 'rescore (s)', 'speedup'))
+    for n in variables:
+        clauses = int(n * ratio)
+        landscape = CNF_SAT({ 'N': n, 'L': clauses, 'K': 3, 'random_seed': 1, 'state_cache_size': 2 * count })
+        parents = [BinaryIndividual([rand.randrange(2) for _ in xrange(n)], species) for _ in xrange(count)]
+        for parent in parents:
+            landscape.eval(parent)
+        
+        for flip in flips:
+            children = [ ]
+            for parent in parents:
+                genes = list(parent.genome)
+                changed = rand.sample(xrange(n), flip)
+                for i in changed:
+                    genes[i] = 1 - genes[i]
+                children.append((BinaryIndividual(genes, species), parent, changed))
+            
+            start = clock()
+            expected = [_scan_eval(landscape, child) for child, _, _ in children]
+            scan_time = clock() - start
+            
+            start = clock()
+            for child, _, _ in children:
+                landscape._index.counts(child.genome)     #pylint: disable=W0212
+            counts_time = clock() - start
+            
+            start = clock()
+            actual = [landscape.rescore(child, parent, changed) for child, parent, changed in children]
+            rescore_time = clock() - start
+            assert expected == actual, "Results do not match"
+            
+            out.write('%6d %7d %6d %12.4f %12.4f %12.4f %8.1fx\n' %
+                      (n, clauses, flip, scan_time, counts_time, rescore_time,
+                       scan_time / max(rescore_time, 1e-9)))
+            out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--variables', default='100,1000',
+                      help='comma-separated numbers of variables')
+    parser.add_option('--ratio', type='float', default=4.3,
+                      help='number of clauses per variable')
+    parser.add_option('--count', type='int', default=500,
+                      help='number of offspring to evaluate')
+    parser.add_option('--flips', default='1,2,8',
+                      help='comma-separated numbers of bits that differ from the parent')
+    (options, _) = parser.parse_args()
+    
+    run([int(n) for n in options.variables.split(',')], options.ratio, options.count,
+        [int(f) for f in options.flips.split(',')])
+
+if __name__ == '__main__':
+    main()
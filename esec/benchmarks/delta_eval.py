@@ -0,0 +1,84 @@
+'''Compares evaluating mutated offspring in full against calculating
+their fitness from their parent's fitness and the changed genes (see
+``_eval_delta`` in `esec.landscape`). Both are also timed by the
+``delta`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.delta_eval [--lengths=100,1000,10000]
+                                    [--count=500] [--genes=1,8]
+'''
+
+import optparse
+import random
+import sys
+from itertools import islice
+from timeit import default_timer as clock
+from esec.context import _context
+from esec.landscape.binary import OneMax, SUS
+from esec.landscape.real import Rastrigin, Schwefel
+from esec.species.binary import BinarySpecies
+from esec.species.real import RealSpecies
+
+LANDSCAPES = (
+    ('OneMax', lambda n: OneMax(parameters=n), BinarySpecies, 'mutate_bitflip', { }),
+    ('SUS', lambda n: SUS(parameters=n, random_seed=1), BinarySpecies, 'mutate_bitflip', { }),
+    ('Rastrigin', lambda n: Rastrigin(parameters=n), RealSpecies, 'mutate_gaussian',
+     { 'lowest': -5.12, 'highest': 5.12 }),
+    ('Schwefel', lambda n: Schwefel(parameters=n), RealSpecies, 'mutate_gaussian',
+     { 'lowest': -512.0, 'highest': 511.0 }),
+)
+'''The landscapes to measure, as ``(name, factory, species, mutation,
+init_random arguments)`` tuples.'''
+
+def run(lengths, count, genes, out=sys.stdout):
+    '''Runs the benchmark for each landscape, genome length and number of
+    mutated genes and writes a table to `out`.
+    '''
+    _context.rand = random.Random(12345)
+    _context.notify = lambda *p, **kw: None
+    out.write('%-10s %6s %6s %12s %12s %9s\n' %
+              ('landscape', 'length', 'genes', 'full (s)', 'delta (s)', 'speedup'))
+    for name, factory, species_type, mutation, init_args in LANDSCAPES:
+        for length in lengths:
+            landscape = factory(length)
+            species = species_type({ }, landscape)
+            parents = list(islice(species.init_random(length=length, **init_args), count))
+            for parent in parents:
+                _ = parent.fitness
+            
+            for gene_count in genes:
+                children = list(getattr(species, mutation)(parents, genes=gene_count))
+                copies = [type(child)(child.genome, child) for child in children]
+                
+                start = clock()
+                expected = [landscape.eval(child) for child in copies]
+                full_time = clock() - start
+                
+                start = clock()
+                actual = [landscape.eval(child) for child in children]
+                delta_time = clock() - start
+                assert all(abs(f1.values[0] - f2.values[0]) <= 1e-9 * max(1.0, abs(f2.values[0]))
+                           for f1, f2 in zip(actual, expected)), "Results do not match"
+                
+                out.write('%-10s %6d %6d %12.4f %12.4f %8.1fx\n' %
+                          (name, length, gene_count, full_time, delta_time,
+                           full_time / max(delta_time, 1e-9)))
+                out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--lengths', default='100,1000,10000',
+                      help='comma-separated numbers of genes in each individual')
+    parser.add_option('--count', type='int', default=500,
+                      help='number of offspring to evaluate')
+    parser.add_option('--genes', default='1,8',
+                      help='comma-separated numbers of genes to mutate')
+    (options, _) = parser.parse_args()
+    
+    run([int(n) for n in options.lengths.split(',')], options.count,
+        [int(g) for g in options.genes.split(',')])
+
+if __name__ == '__main__':
+    main()
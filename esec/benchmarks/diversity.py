@@ -0,0 +1,99 @@
+'''Compares measuring diversity by comparing every pair of individuals
+against `esec.monitors.diversity`, with and without sampling.
+
+Pairwise comparisons are only timed for populations no larger than
+``--pairwise-limit``. `esec.monitors.diversity` is also timed by the
+``diversity`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.diversity [--sizes=100,1000,10000] [--length=100]
+                                   [--sample=500] [--pairwise-limit=300]
+'''
+
+import optparse
+import random
+import sys
+from itertools import islice, izip
+from esec.context import _context
+from esec.monitors import diversity
+from esec.species.binary import BinarySpecies
+from esec.species.binary_packed import PackedBinarySpecies
+from esec.species.real import RealSpecies
+from esec.species.sequence import SequenceSpecies
+from benchmarks.suite import measure
+
+def _pairwise_binary(genomes):
+    '''Returns the mean Hamming distance between every pair of genomes.'''
+    total = 0
+    for i, a in enumerate(genomes):
+        for b in genomes[i + 1:]:
+            total += sum(1 for x, y in izip(a, b) if x != y)
+    return total / (len(genomes) * (len(genomes) - 1) / 2.0)
+
+def _pairwise_real(genomes):
+    '''Returns the root-mean-square distance between every pair of
+    genomes.'''
+    total = 0.0
+    for i, a in enumerate(genomes):
+        for b in genomes[i + 1:]:
+            total += sum((x - y) ** 2 for x, y in izip(a, b))
+    return (total / (len(genomes) * (len(genomes) - 1) / 2.0)) ** 0.5
+
+def _pairwise_sequence(genomes):
+    '''Returns the mean number of edges that are not shared by every pair
+    of genomes.'''
+    edges = [set((x, y) if x < y else (y, x) for x, y in izip(g, g[1:])) for g in genomes]
+    total = 0
+    for i, a in enumerate(edges):
+        for b in edges[i + 1:]:
+            total += len(a - b)
+    return total / (len(genomes) * (len(genomes) - 1) / 2.0)
+
+def run(sizes, length, sample, pairwise_limit, out=sys.stdout):
+    '''Runs the benchmark for each species and population size and
+    writes a table to `out`.
+    '''
+    _context.rand = random.Random(12345)
+    _context.notify = lambda *p, **kw: None
+    species = [
+        ('binary', lambda: BinarySpecies({ }, None).init_random(length=length), _pairwise_binary),
+        ('packed', lambda: PackedBinarySpecies({ }, None).init_random(length=length), _pairwise_binary),
+        ('real', lambda: RealSpecies({ }, None).init_random(length=length, lowest=-5.0, highest=5.0),
+         _pairwise_real),
+        ('sequence', lambda: SequenceSpecies({ }, None).init_random(length=length), _pairwise_sequence),
+    ]
+    
+    out.write('%-9s %7s %12s %12s %12s %9s\n' %
+              ('species', 'size', 'pairwise (s)', 'exact (s)', 'sampled (s)', 'speedup'))
+    for name, make_gen, pairwise in species:
+        for size in sizes:
+            group = list(islice(make_gen(), size))
+            genomes = [i.genome for i in group]
+            exact = measure(lambda: diversity.measure(group), 3)
+            sampled = measure(lambda: diversity.measure(group, sample, random.Random(1)), 3)
+            if size <= pairwise_limit:
+                naive = measure(lambda: pairwise(genomes), 1)
+                out.write('%-9s %7d %12.5f %12.5f %12.5f %8.1fx\n' %
+                          (name, size, naive, exact, sampled, naive / max(exact, 1e-9)))
+            else:
+                out.write('%-9s %7d %12s %12.5f %12.5f %9s\n' % (name, size, '-', exact, sampled, '-'))
+            out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='100,1000,10000',
+                      help='comma-separated population sizes')
+    parser.add_option('--length', type='int', default=100,
+                      help='number of genes in each individual')
+    parser.add_option('--sample', type='int', default=500,
+                      help='number of individuals to sample')
+    parser.add_option('--pairwise-limit', type='int', default=300,
+                      help='largest population to compare pairwise')
+    (options, _) = parser.parse_args()
+    
+    run([int(s) for s in options.sizes.split(',')], options.length, options.sample, options.pairwise_limit)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+'''Compares evaluating `esec.landscape.binary.ECC` by splitting the
+genome and comparing every ordered pair of codewords for both the
+legality check and the fitness sum (as it was implemented before
+`esec.landscape.binary.CodeDistances` was added) against the shared
+distance matrix. The current evaluator is also timed by the
+``landscape.ECC`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.ecc [--codes=12x24,16x32,20x40] [--distance=1]
+                             [--count=200]
+'''
+
+import optparse
+import random
+import sys
+from timeit import default_timer as clock
+from esec.context import _context
+from esec.landscape.binary import ECC
+from esec.species.binary import BinaryIndividual, BinarySpecies
+
+def _old_legal(landscape, indiv):
+    '''Checks `indiv` as `ECC.legal` did by comparing every ordered pair
+    of codewords.'''
+    dist = landscape._HammDist          #pylint: disable=W0212
+    code = landscape._splitgenome(indiv)  #pylint: disable=W0212
+    for i in code:
+        for j in code:
+            if i is j:
+                continue
+            if dist(i, j) < landscape.d:
+                return False
+    return True
+
+def _old_eval(landscape, indiv):
+    '''Evaluates `indiv` as `ECC._eval` did.'''
+    if _old_legal(landscape, indiv):
+        code = landscape._splitgenome(indiv)  #pylint: disable=W0212
+        total = 0
+        dist = landscape._HammDist      #pylint: disable=W0212
+        for i in code:
+            for j in code:
+                if i is not j:
+                    total += dist(i, j)**-2
+        return 1.0 / total
+    else:
+        return 0.0001
+
+def run(codes, distance, count, out=sys.stdout):
+    '''Runs the benchmark for each code size and writes a table to
+    `out`.
+    '''
+    rand = random.Random(12345)
+    _context.notify = lambda *p, **kw: None
+    out.write('%4s %4s %4s %7s %12s %12s %9s\n' %
+              ('n', 'M', 'd', 'legal', 'old (s)', 'new (s)', 'speedup'))
+    for n, M in codes:
+        landscape = ECC({ 'n': n, 'M': M, 'd': distance })
+        species = BinarySpecies({ }, landscape)
+        genomes = [[rand.randrange(2) for _ in xrange(landscape.size.exact)] for _ in xrange(count)]
+        
+        group = [BinaryIndividual(genes, species) for genes in genomes]
+        start = clock()
+        expected = [_old_eval(landscape, indiv) for indiv in group]
+        old_time = clock() - start
+        
+        group = [BinaryIndividual(genes, species) for genes in genomes]
+        start = clock()
+        actual = [landscape.eval(indiv).values[0] for indiv in group]
+        new_time = clock() - start
+        assert expected == actual, "Results do not match"
+        
+        out.write('%4d %4d %4d %7d %12.4f %12.4f %8.1fx\n' %
+                  (n, M, distance, sum(1 for f in actual if f != 0.0001), old_time, new_time,
+                   old_time / max(new_time, 1e-9)))
+        out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--codes', default='12x24,16x32,20x40',
+                      help='comma-separated codeword lengths and counts as NxM')
+    parser.add_option('--distance', type='int', default=1,
+                      help='minimum distance between legal codewords')
+    parser.add_option('--count', type='int', default=200,
+                      help='number of individuals to evaluate')
+    (options, _) = parser.parse_args()
+    
+    run([tuple(int(i) for i in code.split('x')) for code in options.codes.split(',')],
+        options.distance, options.count)
+
+if __name__ == '__main__':
+    main()
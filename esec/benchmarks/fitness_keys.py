@@ -0,0 +1,90 @@
+'''Compares ordering individuals by `esec.fitness.Fitness` objects against
+ordering them by the precomputed ``Fitness.key``, and times the
+selectors that use the key.
+
+Usage::
+
+    python -m benchmarks.fitness_keys [--sizes=100,1000,10000]
+'''
+
+import optparse
+import random
+import sys
+from itertools import islice
+from timeit import default_timer as clock
+from esec.context import _context
+from esec.fitness import FitnessMaximise, FitnessMinimise
+from esec.generators import _key_fitness
+from esec.generators import selectors
+from esec.species.real import RealSpecies
+
+def _key_object(i):
+    '''Orders individuals by comparing their `Fitness` objects.'''
+    return i.fitness
+
+def make_group(fitness_type, size, rand):
+    '''Returns `size` individuals with random fitness values of type
+    `fitness_type`.'''
+    species = RealSpecies({ }, None)
+    group = list(islice(species.init_random(length=2), size))
+    for indiv in group:
+        indiv.fitness = fitness_type(rand.random())
+    return group
+
+def _time(func, repeat=5):
+    '''Returns the shortest time taken to call `func`.'''
+    best = None
+    for _ in xrange(repeat):
+        start = clock()
+        func()
+        elapsed = clock() - start
+        if best is None or elapsed < best: best = elapsed
+    return best
+
+def run(sizes, out=sys.stdout):
+    '''Runs the benchmark for each population size and writes a table
+    to `out`.
+    '''
+    _context.rand = rand = random.Random(12345)
+    _context.notify = lambda *p, **kw: None
+    out.write('%-16s %7s %-34s %12s %12s %9s\n' %
+              ('fitness', 'size', 'operation', 'object (s)', 'key (s)', 'speedup'))
+    for fitness_type in (FitnessMaximise, FitnessMinimise):
+        for size in sizes:
+            group = make_group(fitness_type, size, rand)
+            comparisons = [
+                ('sorted', lambda key: sorted(group, key=key)),
+                ('max', lambda key: max(group, key=key)),
+                ('tournament(k=2) x size', lambda key: [max((rand.choice(group), rand.choice(group)), key=key)
+                                                         for _ in xrange(size)]),
+            ]
+            for name, func in comparisons:
+                object_time = _time(lambda: func(_key_object))
+                key_time = _time(lambda: func(_key_fitness))
+                out.write('%-16s %7d %-34s %12.5f %12.5f %8.1fx\n' %
+                          (fitness_type.__name__, size, name, object_time, key_time,
+                           object_time / max(key_time, 1e-9)))
+            
+            for name, func in [
+                    ('Best', lambda: list(selectors.Best(group))),
+                    ('Worst', lambda: list(selectors.Worst(group))),
+                    ('Tournament', lambda: list(islice(selectors.Tournament(group), size))),
+                    ('Tournament(without_replacement)',
+                     lambda: list(selectors.Tournament(group, without_replacement=True))),
+                    ('RankProportional', lambda: list(islice(selectors.RankProportional(group), size))),
+                ]:
+                out.write('%-16s %7d %-34s %12s %12.5f\n' %
+                          (fitness_type.__name__, size, name, '-', _time(func)))
+            out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='100,1000,10000',
+                      help='comma-separated population sizes')
+    (options, _) = parser.parse_args()
+    
+    run([int(s) for s in options.sizes.split(',')])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+'''Compares the memory use and creation rate of `esec.individual.Individual`
+against an equivalent class that uses an instance dictionary, copies
+every genome and merges statistics into a new dictionary at every birth.
+
+Memory is measured as the total size of the distinct objects owned by a
+population: the individuals, their instance dictionaries, genomes,
+statistics and fitness values. The time taken by a full garbage
+collection with the population alive is also reported.
+
+Usage::
+
+    python -m benchmarks.individuals [--sizes=10000,100000] [--length=30]
+'''
+
+import gc
+import optparse
+import random
+import sys
+from timeit import default_timer as clock
+from esec.context import _context
+from esec.fitness import EmptyFitness
+from esec.species.real import RealIndividual, RealSpecies
+
+class DictIndividual(RealIndividual):
+    '''A `RealIndividual` that reproduces the storage behaviour of
+    individuals without ``__slots__``.
+    '''
+    def __init__(self, genes, parent, lower_bounds=None, upper_bounds=None, strategy=None, statistic=None):
+        super(DictIndividual, self).__init__(list(genes), parent, lower_bounds, upper_bounds, strategy)
+        self._fitness = EmptyFitness()
+        merged = statistic or { }
+        for key, value in parent.statistic.iteritems():
+            if key in merged:
+                merged[key] += value
+            else:
+                merged[key] = value
+        self._statistic = merged
+
+def footprint(population):
+    '''Returns the total size in bytes of the distinct objects owned by
+    `population`.
+    '''
+    seen = set()
+    total = 0
+    for indiv in population:
+        parts = [indiv, indiv.genome, indiv.statistic, indiv._fitness]    #pylint: disable=W0212
+        try:
+            parts.append(object.__getattribute__(indiv, '__dict__'))
+        except AttributeError:
+            pass
+        for obj in parts:
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                total += sys.getsizeof(obj)
+    return total
+
+def breed(cls, parents, size, rand):
+    '''Returns `size` new individuals of type `cls`, each derived from a
+    random member of `parents`. One in ten is given a statistic.
+    '''
+    choice = rand.choice
+    frand = rand.random
+    result = []
+    for _ in xrange(size):
+        parent = choice(parents)
+        statistic = { 'mutated': 1 } if frand() < 0.1 else None
+        result.append(cls(list(parent.genome), parent, statistic=statistic))
+    return result
+
+def run(sizes, length, out=sys.stdout):
+    '''Runs the benchmark for each population size and writes a table
+    to `out`.
+    '''
+    _context.notify = lambda *p, **kw: None
+    species = RealSpecies({ }, None)
+    out.write('%-16s %8s %12s %12s %12s %12s\n' %
+              ('class', 'size', 'create (s)', 'births/s', 'bytes/indiv', 'gc (s)'))
+    for size in sizes:
+        for cls in (DictIndividual, RealIndividual):
+            _context.rand = rand = random.Random(12345)
+            parents = [cls([rand.random() for _ in xrange(length)], species,
+                           lower_bounds=[0.0] * length, upper_bounds=[1.0] * length)
+                       for _ in xrange(100)]
+            
+            gc.collect()
+            start = clock()
+            population = breed(cls, parents, size, rand)
+            create_time = clock() - start
+            
+            start = clock()
+            gc.collect()
+            gc_time = clock() - start
+            
+            out.write('%-16s %8d %12.4f %12.0f %12.1f %12.4f\n' %
+                      (cls.__name__, size, create_time, size / max(create_time, 1e-9),
+                       footprint(population) / float(size), gc_time))
+            out.flush()
+            del population
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='10000,100000',
+                      help='comma-separated population sizes')
+    parser.add_option('--length', type='int', default=30,
+                      help='number of genes in each individual')
+    (options, _) = parser.parse_args()
+    
+    run([int(s) for s in options.sizes.split(',')], options.length)
+
+if __name__ == '__main__':
+    main()
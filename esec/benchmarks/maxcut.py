@@ -0,0 +1,88 @@
+'''Compares evaluating `esec.landscape.binary.MAXCUT` using a full
+weight matrix (as it was implemented before edges were stored in
+arrays) against the current implementation, and times
+`MAXCUT.find_best`. The current evaluator is also timed by the
+``landscape.MAXCUT`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.maxcut [--sizes=20,100,300] [--probs=0.9,0.1,0.01]
+                                [--count=200] [--node-limit=100000]
+'''
+
+import optparse
+import random
+import sys
+from itertools import izip
+from timeit import default_timer as clock
+from esec.landscape.binary import MAXCUT
+from esec.species.binary import BinaryIndividual, BinarySpecies
+
+def _matrix(landscape):
+    '''Returns the full weight matrix of `landscape`.'''
+    n = landscape.size.exact
+    W = [[0] * n for _ in xrange(n)]
+    for i, j, w in izip(landscape._edges_from, landscape._edges_to, landscape._weights):   #pylint: disable=W0212
+        W[i][j] = W[j][i] = w
+    return W
+
+def _matrix_eval(W, indiv):
+    '''Evaluates `indiv` as `MAXCUT._eval` did using a full matrix.'''
+    N = len(W)
+    total = 0
+    for i in xrange(N-1):
+        for j in xrange(i + 1, N):
+            if indiv[i] != indiv[j]:
+                total += W[i][j]
+    return total
+
+def run(sizes, probs, count, node_limit, out=sys.stdout):
+    '''Runs the benchmark for each graph size and edge probability and
+    writes a table to `out`.
+    '''
+    rand = random.Random(12345)
+    species = BinarySpecies({ }, rand)
+    out.write('%6s %6s %7s %12s %12s %9s %12s %12s %8s\n' %
+              ('N', 'P', 'edges', 'matrix (s)', 'edges (s)', 'speedup', 'best (s)', 'best', 'optimal'))
+    for n in sizes:
+        group = [BinaryIndividual([rand.randrange(2) for _ in xrange(n)], species) for _ in xrange(count)]
+        for prob in probs:
+            landscape = MAXCUT(parameters=n, P=prob, random_seed=1)
+            W = _matrix(landscape)
+            
+            start = clock()
+            expected = [_matrix_eval(W, indiv) for indiv in group]
+            matrix_time = clock() - start
+            
+            start = clock()
+            actual = [landscape.eval(indiv).values[0] for indiv in group]
+            edge_time = clock() - start
+            assert expected == actual, "Results do not match"
+            
+            start = clock()
+            best, _, optimal = landscape.find_best(node_limit)
+            best_time = clock() - start
+            
+            out.write('%6d %6.3f %7d %12.4f %12.4f %8.1fx %12.4f %12.3f %8s\n' %
+                      (n, prob, len(landscape._weights), matrix_time, edge_time,   #pylint: disable=W0212
+                       matrix_time / max(edge_time, 1e-9), best_time, best, optimal))
+            out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='20,100,300',
+                      help='comma-separated numbers of vertices')
+    parser.add_option('--probs', default='0.9,0.1,0.01',
+                      help='comma-separated edge probabilities')
+    parser.add_option('--count', type='int', default=200,
+                      help='number of individuals to evaluate')
+    parser.add_option('--node-limit', type='int', default=100000,
+                      help='maximum number of branch-and-bound nodes')
+    (options, _) = parser.parse_args()
+    
+    run([int(s) for s in options.sizes.split(',')], [float(p) for p in options.probs.split(',')],
+        options.count, options.node_limit)
+
+if __name__ == '__main__':
+    main()
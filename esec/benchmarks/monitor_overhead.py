@@ -0,0 +1,107 @@
+'''Measures the time spent by `esec.monitors.ConsoleMonitor` collecting
+group statistics as a percentage of the total time of each generation.
+
+Each predefined system is run with several report strings. The
+``all`` column forces every statistic to be calculated, as was done
+before statistics were only calculated when they were displayed. The
+statistics for a single group are also timed by the ``monitor`` cases
+in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.monitor_overhead [--sizes=100,1000]
+                                          [--length=64] [--iterations=10]
+'''
+
+import optparse
+import sys
+from timeit import default_timer as clock
+from esec import Experiment
+from esec.landscape.binary import OneMax
+from esec.landscape.real import Sphere
+from esec.monitors.consolemonitor import ConsoleMonitor, NullStream
+from esec.monitors.groupstatistics import GroupStatistics
+import dialects
+
+SYSTEMS = (('GA', OneMax), ('SSGA', OneMax), ('ES', Sphere))
+'''The predefined systems and landscapes to run.'''
+
+REPORTS = (
+    ('brief', 'brief'),
+    ('default', 'brief+global'),
+    ('unique+counters', 'brief+global+local+local_unique+mutated'),
+)
+'''The report strings to measure, as ``(name, report)`` pairs.'''
+
+FORMATS = {
+    'mutated': [ ' mutation  ', '%10d ', 'stats.local_mutated', 0 ],
+}
+'''Extra report columns, providing a default for individual statistics
+that may not be present.'''
+
+def _run(name, landscape, size, length, iterations, report, all_statistics):
+    '''Runs one experiment and returns the total time and the time spent
+    in ``on_yield``.'''
+    system = dict(dialects.default['system'])
+    system.update(dialects.configs[name]['system'])
+    system['size'] = size
+    monitor = ConsoleMonitor({ 'out': NullStream(), 'error_out': sys.stderr, 'report': report,
+                               'formats': FORMATS, 'limits': { 'iterations': iterations } })
+    if all_statistics:
+        monitor.statistics = GroupStatistics()
+    
+    elapsed = [0.0]
+    on_yield = monitor.on_yield
+    def _timed_on_yield(sender, group_name, group):
+        '''Calls the original ``on_yield`` and accumulates its time.
+        Individuals are evaluated first so that evaluation is not
+        included.'''
+        for indiv in group:
+            _ = indiv.fitness
+        start = clock()
+        on_yield(sender, group_name, group)
+        elapsed[0] += clock() - start
+    monitor.on_yield = _timed_on_yield
+    
+    experiment = Experiment({
+        'random_seed': 12345,
+        'monitor': monitor,
+        'landscape': landscape(parameters=length),
+        'system': system,
+    })
+    start = clock()
+    experiment.run()
+    return clock() - start, elapsed[0]
+
+def run(sizes, length, iterations, out=sys.stdout):
+    '''Runs the benchmark for each system, population size and report
+    string and writes a table to `out`.
+    '''
+    out.write('%-6s %7s %-16s %10s %10s %9s %10s %9s\n' %
+              ('system', 'size', 'report', 'total (s)', 'yield (s)', 'overhead',
+               'all (s)', 'overhead'))
+    for name, landscape in SYSTEMS:
+        for size in sizes:
+            for report_name, report in REPORTS:
+                total, monitor = _run(name, landscape, size, length, iterations, report, False)
+                all_total, all_monitor = _run(name, landscape, size, length, iterations, report, True)
+                out.write('%-6s %7d %-16s %10.4f %10.4f %8.1f%% %10.4f %8.1f%%\n' %
+                          (name, size, report_name, total, monitor, 100.0 * monitor / total,
+                           all_monitor, 100.0 * all_monitor / all_total))
+                out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='100,1000',
+                      help='comma-separated population sizes')
+    parser.add_option('--length', type='int', default=64,
+                      help='number of genes in each individual')
+    parser.add_option('--iterations', type='int', default=10,
+                      help='number of generations to run')
+    (options, _) = parser.parse_args()
+    
+    run([int(s) for s in options.sizes.split(',')], options.length, options.iterations)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+'''Compares evaluation of the `esec.landscape.binary.NK` landscape using
+nested lists (as it was implemented before
+`esec.landscape.binary.EpistasisTable` was added) against the
+``eval`` and ``eval_batch`` methods, and reports the memory used by
+each representation of the table.
+
+The nested-list table is only built for values of K no greater than
+``--list-limit``. ``eval`` and ``eval_batch`` are also timed by the
+``landscape.NK`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.nk_landscape [--n=100] [--ks=2,4,8,12,16]
+                                      [--size=1000] [--list-limit=12]
+'''
+
+import optparse
+import random
+import sys
+from timeit import default_timer as clock
+from esec.landscape.binary import NK
+from esec.species.binary import BinaryIndividual, BinarySpecies
+
+def _nested_lists(landscape):
+    '''Returns the table of `landscape` as a list of lists and its
+    approximate size in bytes.'''
+    table = landscape._F     #pylint: disable=W0212
+    columns = 2 ** (landscape.K + 1)
+    rows = [table[i * columns:(i + 1) * columns].tolist() for i in xrange(landscape.size.exact)]
+    # Each float object uses sys.getsizeof(0.0) bytes plus a pointer
+    size = sum(sys.getsizeof(row) + len(row) * sys.getsizeof(0.0) for row in rows) + sys.getsizeof(rows)
+    return rows, size
+
+def _nested_eval(landscape, rows, indiv):
+    '''Evaluates `indiv` as `NK._eval` did using nested lists.'''
+    E = landscape._E     #pylint: disable=W0212
+    k = landscape.K
+    total = 0.0
+    for gene in xrange(landscape.size.exact):
+        fit_index = indiv[gene]
+        for i in xrange(k):
+            multiplier = 2**(i + 1)
+            epi_index = E[gene][i]
+            fit_index += multiplier * indiv[epi_index]
+        total += rows[gene][fit_index]
+    return total / landscape.size.exact
+
+def run(n, ks, size, list_limit, out=sys.stdout):
+    '''Runs the benchmark for each value of K and writes a table to
+    `out`.
+    '''
+    rand = random.Random(12345)
+    species = BinarySpecies({ }, rand)
+    group = [BinaryIndividual([rand.randrange(2) for _ in xrange(n)], species) for _ in xrange(size)]
+    
+    out.write('%4s %10s %12s %12s %12s %12s %12s %9s\n' %
+              ('K', 'build (s)', 'array (MB)', 'lists (MB)', 'lists (s)', 'eval (s)', 'batch (s)', 'speedup'))
+    for k in ks:
+        start = clock()
+        landscape = NK(parameters=n, K=k, random_seed=1)
+        build_time = clock() - start
+        table = landscape._F     #pylint: disable=W0212
+        array_size = len(table) * table.itemsize / 1048576.0
+        
+        start = clock()
+        scalar = [landscape.eval(indiv) for indiv in group]
+        scalar_time = clock() - start
+        
+        start = clock()
+        batch = landscape.eval_batch(group)
+        batch_time = clock() - start
+        assert scalar == batch, "Batch results do not match"
+        
+        if k <= list_limit:
+            rows, list_size = _nested_lists(landscape)
+            start = clock()
+            for indiv in group:
+                _nested_eval(landscape, rows, indiv)
+            list_time = clock() - start
+            del rows
+            out.write('%4d %10.3f %12.2f %12.2f %12.4f %12.4f %12.4f %8.1fx\n' %
+                      (k, build_time, array_size, list_size / 1048576.0, list_time, scalar_time, batch_time,
+                       list_time / max(batch_time, 1e-9)))
+        else:
+            out.write('%4d %10.3f %12.2f %12s %12s %12.4f %12.4f %9s\n' %
+                      (k, build_time, array_size, '-', '-', scalar_time, batch_time, '-'))
+        out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--n', type='int', default=100,
+                      help='number of genes')
+    parser.add_option('--ks', default='2,4,8,12,16',
+                      help='comma-separated numbers of epistatic links')
+    parser.add_option('--size', type='int', default=1000,
+                      help='number of individuals to evaluate')
+    parser.add_option('--list-limit', type='int', default=12,
+                      help='largest K to build nested lists for')
+    (options, _) = parser.parse_args()
+    
+    run(options.n, [int(k) for k in options.ks.split(',')], options.size, options.list_limit)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+'''Compares the scalar (``eval``) and vectorised (``eval_batch``)
+evaluation of the real-valued landscapes in `esec.landscape.real`.
+
+The vectorised path requires NumPy. Without it, ``eval_batch`` falls
+back on ``eval`` and both columns report similar times.
+
+Usage::
+
+    python -m benchmarks.real_landscapes [--sizes=100,1000,10000]
+                                         [--dims=30,100,1000]
+                                         [--landscapes=Sphere,...]
+'''
+
+import optparse
+import random
+import sys
+from timeit import default_timer as clock
+import esec.landscape.real as real
+from esec.species.real import RealIndividual, RealSpecies
+
+LANDSCAPES = ('Sphere', 'Rastrigin', 'Griewangk', 'Ackley', 'Schwefel', 'Michalewicz', 'FMS')
+'''The landscapes that are benchmarked by default.'''
+
+def make_group(landscape, size, dims, rand):
+    '''Returns `size` random individuals with `dims` genes, within the
+    bounds of `landscape`.
+    '''
+    species = RealSpecies({ }, rand)
+    lower = landscape.lower_bounds[0]
+    upper = landscape.upper_bounds[0]
+    return [RealIndividual([rand.uniform(lower, upper) for _ in xrange(dims)],
+                           lower_bounds=landscape.lower_bounds, upper_bounds=landscape.upper_bounds,
+                           parent=species)
+            for _ in xrange(size)]
+
+def run(sizes, dims, names, out=sys.stdout):
+    '''Runs the benchmark for every combination of landscape, population
+    size and dimensionality and writes a table to `out`.
+    '''
+    rand = random.Random(12345)
+    out.write('%-12s %7s %6s %12s %12s %9s %10s\n' %
+              ('landscape', 'size', 'dims', 'eval (s)', 'batch (s)', 'speedup', 'max error'))
+    for name in names:
+        cls = getattr(real, name)
+        for dim in dims:
+            # FMS is only defined for six parameters
+            if cls.strict.get('size.exact') not in (None, '*'):
+                if dim != dims[0]: continue
+                dim = cls.strict['size.exact']
+            landscape = cls(parameters=dim, random_seed=1)
+            for size in sizes:
+                group = make_group(landscape, size, dim, rand)
+                
+                start = clock()
+                scalar = [landscape.eval(indiv) for indiv in group]
+                scalar_time = clock() - start
+                
+                start = clock()
+                batch = landscape.eval_batch(group)
+                batch_time = clock() - start
+                
+                error = max(abs(f1.values[0] - f2.values[0]) for f1, f2 in zip(scalar, batch))
+                out.write('%-12s %7d %6d %12.4f %12.4f %8.1fx %10.2e\n' %
+                          (name, size, dim, scalar_time, batch_time,
+                           scalar_time / max(batch_time, 1e-9), error))
+                out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='100,1000,10000',
+                      help='comma-separated population sizes')
+    parser.add_option('--dims', default='30,100,1000',
+                      help='comma-separated numbers of dimensions')
+    parser.add_option('--landscapes', default=','.join(LANDSCAPES),
+                      help='comma-separated landscape names')
+    (options, _) = parser.parse_args()
+    
+    if real.numpy is None:
+        print 'NumPy is not available; eval_batch will use the scalar evaluator.'
+    
+    run([int(s) for s in options.sizes.split(',')],
+        [int(d) for d in options.dims.split(',')],
+        options.landscapes.split(','))
+
+if __name__ == '__main__':
+    main()
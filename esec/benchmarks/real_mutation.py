@@ -0,0 +1,75 @@
+'''Compares the per-gene and bulk (``bulk=True``) forms of the mutation
+operators provided by `esec.species.real.RealSpecies`.
+
+Bulk mutation requires NumPy. Without it, ``bulk=True`` uses the
+per-gene operators and both columns report similar times. Both forms
+are also timed by the ``species.real`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.real_mutation [--sizes=100,1000]
+                                       [--dims=1000,10000]
+                                       [--rates=0.01,0.1,1.0]
+'''
+
+import optparse
+import random
+import sys
+from itertools import islice
+from timeit import default_timer as clock
+from esec.context import _context
+import esec.species.real as real
+
+OPERATORS = ('mutate_random', 'mutate_delta', 'mutate_gaussian')
+'''The operators that are benchmarked.'''
+
+def run(sizes, dims, rates, out=sys.stdout):
+    '''Runs the benchmark for every combination of operator, population
+    size, dimensionality and per-gene rate and writes a table to `out`.
+    '''
+    _context.notify = lambda *p, **kw: None
+    species = real.RealSpecies({ }, None)
+    out.write('%-16s %7s %6s %6s %12s %12s %9s\n' %
+              ('operator', 'size', 'dims', 'rate', 'per-gene (s)', 'bulk (s)', 'speedup'))
+    for dim in dims:
+        for size in sizes:
+            _context.rand = random.Random(12345)
+            group = list(islice(species.init_random(length=dim, lowest=-5.0, highest=5.0), size))
+            for name in OPERATORS:
+                operator = getattr(species, name)
+                for rate in rates:
+                    _context.rand = random.Random(12345)
+                    start = clock()
+                    list(operator(iter(group), per_gene_rate=rate))
+                    scalar_time = clock() - start
+                    
+                    _context.rand = random.Random(12345)
+                    start = clock()
+                    list(operator(iter(group), per_gene_rate=rate, bulk=True))
+                    bulk_time = clock() - start
+                    
+                    out.write('%-16s %7d %6d %6.2f %12.4f %12.4f %8.1fx\n' %
+                              (name, size, dim, rate, scalar_time, bulk_time,
+                               scalar_time / max(bulk_time, 1e-9)))
+                    out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='100,1000',
+                      help='comma-separated population sizes')
+    parser.add_option('--dims', default='1000,10000',
+                      help='comma-separated numbers of dimensions')
+    parser.add_option('--rates', default='0.01,0.1,1.0',
+                      help='comma-separated per-gene mutation rates')
+    (options, _) = parser.parse_args()
+    
+    if real.numpy is None:
+        print 'NumPy is not available; bulk mutation will use the per-gene operators.'
+    
+    run([int(s) for s in options.sizes.split(',')],
+        [int(d) for d in options.dims.split(',')],
+        [float(r) for r in options.rates.split(',')])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+'''Compares selecting mutation sites by testing every gene against
+`esec.utils.sample_sites`, and times the species operators that use
+it at low per-gene rates. `sample_sites` and the operators are also
+timed by the ``sampling`` cases in `benchmarks.suite`.
+
+Usage::
+
+    python -m benchmarks.site_sampling [--lengths=100,1000,10000]
+                                       [--rates=0.001,0.01,0.1]
+                                       [--size=100]
+'''
+
+import optparse
+import random
+import sys
+from itertools import islice
+from timeit import default_timer as clock
+from esec.context import _context
+from esec.species.binary import BinarySpecies
+from esec.species.integer import IntegerSpecies
+from esec.species.real import RealSpecies
+from esec.utils import sample_sites
+
+def test_every_site(length, rate):
+    '''Returns the sites selected by testing each one in turn.'''
+    frand = _context.rand.random
+    return [i for i in xrange(length) if frand() < rate]
+
+def _time(func, repeat=3):
+    '''Returns the shortest time taken to call `func`. The random number
+    generator is reset before each call.'''
+    best = None
+    for _ in xrange(repeat):
+        _context.rand = random.Random(12345)
+        start = clock()
+        func()
+        elapsed = clock() - start
+        if best is None or elapsed < best: best = elapsed
+    return best
+
+def run(lengths, rates, size, out=sys.stdout):
+    '''Runs the benchmark for each genome length and per-gene rate and
+    writes a table to `out`.
+    '''
+    _context.rand = random.Random(12345)
+    _context.notify = lambda *p, **kw: None
+    binary = BinarySpecies({ }, None)
+    integer = IntegerSpecies({ }, None)
+    real = RealSpecies({ }, None)
+    
+    out.write('%7s %7s %-28s %12s %12s %9s\n' %
+              ('length', 'rate', 'operation', 'every (s)', 'sampled (s)', 'speedup'))
+    for length in lengths:
+        bits = list(islice(binary.init_random(length=length), size))
+        ints = list(islice(integer.init_random(length=length, lowest=0, highest=100), size))
+        reals = list(islice(real.init_random(length=length, lowest=-5.0, highest=5.0), size))
+        for rate in rates:
+            every = _time(lambda: [test_every_site(length, rate) for _ in xrange(size)])
+            sampled = _time(lambda: [sample_sites(length, rate) for _ in xrange(size)])
+            out.write('%7d %7g %-28s %12.5f %12.5f %8.1fx\n' %
+                      (length, rate, 'select sites x size', every, sampled, every / max(sampled, 1e-9)))
+            
+            for name, func in [
+                    ('binary.mutate_bitflip', lambda: list(binary.mutate_bitflip(bits, per_gene_rate=rate))),
+                    ('integer.mutate_random', lambda: list(integer.mutate_random(ints, per_gene_rate=rate))),
+                    ('real.mutate_gaussian', lambda: list(real.mutate_gaussian(reals, per_gene_rate=rate))),
+                    ('binary.crossover_uniform', lambda: list(binary.crossover_uniform(bits, per_gene_rate=rate))),
+                ]:
+                out.write('%7d %7g %-28s %12s %12.5f\n' % (length, rate, name, '-', _time(func)))
+            out.flush()
+
+def main():
+    '''The main entry point for the benchmark.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--lengths', default='100,1000,10000',
+                      help='comma-separated genome lengths')
+    parser.add_option('--rates', default='0.001,0.01,0.1',
+                      help='comma-separated per-gene rates')
+    parser.add_option('--size', type='int', default=100,
+                      help='number of individuals in each population')
+    (options, _) = parser.parse_args()
+    
+    run([int(l) for l in options.lengths.split(',')],
+        [float(r) for r in options.rates.split(',')],
+        options.size)
+
+if __name__ == '__main__':
+    main()
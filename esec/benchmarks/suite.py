@@ -0,0 +1,595 @@
+'''A reproducible benchmark suite covering species operators, selectors,
+landscape evaluation, monitor statistics, diversity measures, the ACO
+plugin, ESDL compilation and complete experiments using the predefined
+systems in ``dialects.py``.
+
+Every case is seeded with the same value before it is timed and the
+best time from several repeats is reported. Results may be written to a
+JSON file with ``--out`` and compared against a previously saved file
+with ``--baseline``. A case is reported as a regression if it is slower
+than the baseline by more than ``--threshold`` (a fraction of the
+baseline time), in which case the exit code is non-zero.
+
+Cases for operators whose cost depends mainly on the genome length
+are also run with the genome lengths given by ``--long-lengths`` and
+the smallest population size. Diversity measures are also run with the
+population sizes given by ``--large-sizes`` and the smallest genome
+length.
+
+Usage::
+
+    python -m benchmarks.suite [--sizes=100,1000] [--lengths=32,256]
+                               [--long-lengths=1000,10000]
+                               [--large-sizes=10000]
+                               [--filter=species.*,selector.*]
+                               [--repeat=5] [--iterations=20]
+                               [--out=results.json]
+                               [--baseline=baseline.json]
+                               [--threshold=0.2]
+'''
+
+import fnmatch
+import json
+import optparse
+import platform
+import random
+import sys
+from itertools import islice
+from timeit import default_timer as clock
+
+from esdlc import compileESDL
+from esdlc.emitters.esec import emit
+from esec import Experiment
+from esec.context import _context
+from esec.generators import selectors
+from esec.landscape.binary import OneMax, SUS, NK, MAXCUT, CNF_SAT, ECC
+from esec.landscape.real import Sphere, Rastrigin, Schwefel
+from esec.landscape.sequence import TSP
+from esec.monitors import diversity
+from esec.monitors.consolemonitor import ConsoleMonitor, NullStream
+from esec.monitors.groupstatistics import GroupStatistics
+from esec.species.binary import BinaryIndividual, BinarySpecies
+from esec.species.binary_packed import PackedBinarySpecies
+from esec.species.integer import IntegerSpecies
+from esec.species.real import RealSpecies
+from esec.species.sequence import SequenceIndividual, SequenceSpecies
+from esec.utils import sample_sites
+from plugins.ACO.pheromone import PheromoneMap, PheromoneMatrix
+from plugins.ACO.tsp import TourBuilder
+import dialects
+
+SEED = 12345
+'''The seed applied to the system-wide random number generator before
+each case is run.'''
+
+SYSTEMS = (('GA', OneMax), ('SSGA', OneMax), ('ES', Sphere))
+'''The predefined systems and landscapes used for the ``compile`` and
+``experiment`` cases.'''
+
+def _ignore_notify(*p, **kw): #pylint: disable=W0613
+    '''Drops all notifications sent while a case is running.'''
+    pass
+
+def _reset():
+    '''Restores the system-wide random number generator and notification
+    function to a known state.
+    '''
+    _context.rand = random.Random(SEED)
+    _context.notify = _ignore_notify
+
+def _population(species, size, length, **kw):
+    '''Returns a list of `size` random individuals with `length` genes
+    created by `species`.
+    '''
+    _reset()
+    return list(islice(species.init_random(length=length, **kw), size))
+
+def _evaluated(group):
+    '''Evaluates every individual in `group` and returns it.'''
+    for indiv in group:
+        _ = indiv.fitness
+    return group
+
+#=======================================================================
+
+def species_cases(sizes, lengths):
+    '''Yields cases for the crossover and mutation operators.'''
+    for length in lengths:
+        onemax = OneMax(parameters=length)
+        sphere = Sphere(parameters=length)
+        binary = BinarySpecies({ }, onemax)
+        real = RealSpecies({ }, sphere)
+        for size in sizes:
+            bits = _population(binary, size, length)
+            reals = _population(real, size, length, lowest=-5.12, highest=5.12)
+            params = '/size=%d/length=%d' % (size, length)
+            
+            yield ('species.crossover_one' + params,
+                   lambda bits=bits: list(binary.crossover_one(bits, per_pair_rate=1.0)))
+            yield ('species.crossover_two' + params,
+                   lambda bits=bits: list(binary.crossover_two(bits, per_pair_rate=1.0)))
+            yield ('species.crossover_uniform' + params,
+                   lambda bits=bits: list(binary.crossover_uniform(bits, per_pair_rate=1.0)))
+            yield ('species.mutate_gaussian' + params,
+                   lambda reals=reals: list(real.mutate_gaussian(reals, step_size=0.5, per_gene_rate=0.1)))
+            yield ('species.mutate_bitflip' + params,
+                   lambda bits=bits: list(binary.mutate_bitflip(bits, per_gene_rate=0.1)))
+
+def selector_cases(sizes, lengths):
+    '''Yields cases for the selectors, each making as many selections
+    as there are individuals in the group.'''
+    length = lengths[0]
+    onemax = OneMax(parameters=length)
+    binary = BinarySpecies({ }, onemax)
+    for size in sizes:
+        group = _evaluated(_population(binary, size, length))
+        params = '/size=%d' % size
+        
+        yield ('selector.Tournament' + params,
+               lambda group=group, size=size: list(islice(selectors.Tournament(group, k=2), size)))
+        yield ('selector.FitnessProportionalSUS' + params,
+               lambda group=group, size=size: list(islice(selectors.FitnessProportionalSUS(group, mu=size), size)))
+        yield ('selector.Best' + params,
+               lambda group=group: list(selectors.Best(group)))
+        yield ('selector.Best(take=2)' + params,
+               lambda group=group: list(islice(selectors.Best(group), 2)))
+
+def landscape_cases(sizes, lengths):
+    '''Yields cases for the scalar evaluators of a selection of
+    landscapes.'''
+    for length in lengths:
+        onemax = OneMax(parameters=length)
+        sphere = Sphere(parameters=length)
+        rastrigin = Rastrigin(parameters=length)
+        binary = BinarySpecies({ }, onemax)
+        real = RealSpecies({ }, sphere)
+        for size in sizes:
+            bits = _population(binary, size, length)
+            reals = _population(real, size, length, lowest=-5.12, highest=5.12)
+            params = '/size=%d/length=%d' % (size, length)
+            
+            yield ('landscape.OneMax' + params,
+                   lambda bits=bits, lscape=onemax: [lscape.eval(i) for i in bits])
+            yield ('landscape.Sphere' + params,
+                   lambda reals=reals, lscape=sphere: [lscape.eval(i) for i in reals])
+            yield ('landscape.Rastrigin' + params,
+                   lambda reals=reals, lscape=rastrigin: [lscape.eval(i) for i in reals])
+
+MONITOR_REPORTS = (
+    ('brief', 'brief'),
+    ('default', 'brief+global'),
+    ('unique', 'brief+global+local+local_unique'),
+)
+'''The report strings used for the ``monitor`` cases, as ``(name,
+report)`` pairs.'''
+
+def monitor_cases(sizes, lengths):
+    '''Yields cases for the statistics collected by `ConsoleMonitor` for
+    one group with several report strings, and with every statistic
+    calculated.'''
+    length = lengths[0]
+    binary = BinarySpecies({ }, OneMax(parameters=length))
+    for size in sizes:
+        group = _evaluated(_population(binary, size, length))
+        params = '/size=%d' % size
+        
+        for name, report in MONITOR_REPORTS:
+            monitor = ConsoleMonitor({ 'out': NullStream(), 'error_out': sys.stderr, 'report': report })
+            
+            def _update(statistics=monitor.statistics, group=group):
+                '''Collects the statistics of a group that has not been
+                seen before.'''
+                statistics.reset()
+                statistics.update({ }, 'population', group)
+            
+            yield ('monitor.statistics(%s)%s' % (name, params), _update)
+        
+        yield ('monitor.statistics(all)' + params,
+               lambda group=group: GroupStatistics().update({ }, 'population', group))
+
+def diversity_cases(sizes, lengths):
+    '''Yields cases for measuring the diversity of each species, exactly
+    and from a sample of 500 individuals.'''
+    species = [
+        ('binary', BinarySpecies({ }, None), { }),
+        ('packed', PackedBinarySpecies({ }, None), { }),
+        ('real', RealSpecies({ }, None), { 'lowest': -5.0, 'highest': 5.0 }),
+        ('sequence', SequenceSpecies({ }, None), { }),
+    ]
+    for length in lengths:
+        for name, spec, init_args in species:
+            for size in sizes:
+                group = _population(spec, size, length, **init_args)
+                params = '/size=%d/length=%d' % (size, length)
+                
+                yield ('diversity.' + name + params,
+                       lambda group=group: diversity.measure(group))
+                yield ('diversity.%s(sample=500)%s' % (name, params),
+                       lambda group=group: diversity.measure(group, 500, random.Random(1)))
+
+ACO_PROBLEMS = (
+    ('Berlin52', TSP.berlin52_map),
+    ('U2319', 'cfgs/TSP/U2319.csv'),
+)
+'''The problems used for the ``aco`` cases, as ``(name, cost_map)``
+pairs.'''
+
+def aco_cases(sizes, lengths):   #pylint: disable=W0613
+    '''Yields cases for updating the pheromone maps of the ACO plugin
+    with 20 ants and for building five tours with
+    `plugins.ACO.tsp.TourBuilder`, with and without candidate lists.'''
+    for problem, cost_map in ACO_PROBLEMS:
+        landscape = TSP(cost_map=cost_map)
+        cost_map = landscape.cost_map
+        nodes = cost_map.size
+        rand = random.Random(1)
+        species = SequenceSpecies({ }, None)
+        ants = [ ]
+        for _ in xrange(20):
+            genes = range(nodes)
+            rand.shuffle(genes)
+            indiv = SequenceIndividual(genes, parent=species)
+            indiv.fitness = landscape.eval(indiv)
+            ants.append(indiv)
+        
+        def _update(pheromone_map, ants=ants):
+            '''Updates `pheromone_map` with every ant ten times.'''
+            for _ in xrange(10):
+                pheromone_map.update_fitness(source=ants, persistence=0.9, strength=1, minimisation=True)
+        
+        yield ('aco.%s.update(map)' % problem, lambda update=_update: update(PheromoneMap()))
+        yield ('aco.%s.update(matrix)' % problem,
+               lambda update=_update, nodes=nodes: update(PheromoneMatrix(size=nodes)))
+        
+        pheromone_matrix = PheromoneMatrix(size=nodes)
+        pheromone_matrix.update_fitness(source=ants, persistence=0.9, strength=1, minimisation=True)
+        for name, candidates in (('all', None), ('candidates=15', 15)):
+            builder = TourBuilder(cost_map, 2.0, pheromone_matrix, 2.0, candidates)
+            # Attractiveness is calculated before timing begins
+            builder.tour(0)
+            yield ('aco.%s.tour(%s)' % (problem, name),
+                   lambda builder=builder: [builder.tour(i) for i in xrange(5)])
+
+def nk_cases(sizes, lengths):
+    '''Yields cases for the scalar and batch evaluators of the NK
+    landscape.'''
+    binary = BinarySpecies({ }, None)
+    for length in lengths:
+        for k in (2, 8, 12):
+            landscape = NK(parameters=length, K=k, random_seed=1)
+            for size in sizes:
+                bits = _population(binary, size, length)
+                params = '(K=%d)/size=%d/length=%d' % (k, size, length)
+                
+                yield ('landscape.NK' + params,
+                       lambda bits=bits, lscape=landscape: [lscape.eval(i) for i in bits])
+                yield ('landscape.NK.eval_batch' + params,
+                       lambda bits=bits, lscape=landscape: lscape.eval_batch(bits))
+
+def maxcut_cases(sizes, lengths):
+    '''Yields cases for evaluating the MAXCUT landscape on sparse graphs
+    and for searching for the best cut of each graph.'''
+    binary = BinarySpecies({ }, None)
+    for length in lengths:
+        for prob in (0.01, 0.1):
+            landscape = MAXCUT(parameters=length, P=prob, random_seed=1)
+            graph = '(P=%g)' % prob
+            for size in sizes:
+                bits = _population(binary, size, length)
+                params = '%s/size=%d/length=%d' % (graph, size, length)
+                yield ('landscape.MAXCUT' + params,
+                       lambda bits=bits, lscape=landscape: [lscape.eval(i) for i in bits])
+            
+            def _find_best(landscape=landscape):
+                '''Searches for the best cut without using a previous
+                result.'''
+                landscape._best = None      #pylint: disable=W0212
+                return landscape.find_best(10000)
+            
+            yield ('landscape.MAXCUT.find_best%s/length=%d' % (graph, length), _find_best)
+
+def cnf_sat_cases(sizes, lengths):
+    '''Yields cases for evaluating new genomes with the CNF_SAT
+    landscape and for rescoring offspring that differ from their parent
+    in a few bits.'''
+    binary = BinarySpecies({ }, None)
+    for length in lengths:
+        rand = random.Random(SEED)
+        clauses = int(length * 4.3)
+        # Remembered states are not used when evaluating new genomes
+        landscape = CNF_SAT({ 'N': length, 'L': clauses, 'K': 3, 'random_seed': 1, 'state_cache_size': 0 })
+        rescorer = CNF_SAT({ 'N': length, 'L': clauses, 'K': 3, 'random_seed': 1,
+                             'state_cache_size': 2 * max(sizes) })
+        for size in sizes:
+            bits = _population(binary, size, length)
+            params = '/size=%d/length=%d' % (size, length)
+            yield ('landscape.CNF_SAT' + params,
+                   lambda bits=bits, lscape=landscape: [lscape.eval(i) for i in bits])
+            
+            for parent in bits:
+                rescorer.eval(parent)
+            for flips in (1, 8):
+                children = [ ]
+                for parent in bits:
+                    genes = list(parent.genome)
+                    changed = rand.sample(xrange(length), flips)
+                    for i in changed:
+                        genes[i] = 1 - genes[i]
+                    children.append((BinaryIndividual(genes, parent), parent, changed))
+                yield ('landscape.CNF_SAT.rescore(flips=%d)%s' % (flips, params),
+                       lambda children=children, lscape=rescorer:
+                           [lscape.rescore(c, p, changed) for c, p, changed in children])
+
+def ecc_cases(sizes, lengths):   #pylint: disable=W0613
+    '''Yields cases for evaluating the ECC landscape with codes of
+    several sizes. The genome length is determined by the code.'''
+    for n, M in ((12, 24), (16, 32), (20, 40)):
+        landscape = ECC({ 'n': n, 'M': M, 'd': 1 })
+        binary = BinarySpecies({ }, landscape)
+        for size in sizes:
+            bits = _population(binary, size, landscape.size.exact)
+            yield ('landscape.ECC(n=%d,M=%d)/size=%d' % (n, M, size),
+                   lambda bits=bits, lscape=landscape: [lscape.eval(i) for i in bits])
+
+DELTA_LANDSCAPES = (
+    ('OneMax', lambda n: OneMax(parameters=n), BinarySpecies, 'mutate_bitflip', { }),
+    ('SUS', lambda n: SUS(parameters=n, random_seed=1), BinarySpecies, 'mutate_bitflip', { }),
+    ('Rastrigin', lambda n: Rastrigin(parameters=n), RealSpecies, 'mutate_gaussian',
+     { 'lowest': -5.12, 'highest': 5.12 }),
+    ('Schwefel', lambda n: Schwefel(parameters=n), RealSpecies, 'mutate_gaussian',
+     { 'lowest': -512.0, 'highest': 511.0 }),
+)
+'''The landscapes used for the ``delta`` cases, as ``(name, factory,
+species, mutation, init_random arguments)`` tuples.'''
+
+def delta_cases(sizes, lengths):
+    '''Yields cases evaluating offspring that differ from their parent in
+    one gene, both in full and from their parent's fitness (see
+    ``_eval_delta`` in `esec.landscape`).'''
+    for name, factory, species_type, mutation, init_args in DELTA_LANDSCAPES:
+        for length in lengths:
+            landscape = factory(length)
+            species = species_type({ }, landscape)
+            for size in sizes:
+                parents = _evaluated(_population(species, size, length, **init_args))
+                children = list(getattr(species, mutation)(parents, genes=1))
+                # Copies do not record their changes, so are evaluated in full
+                copies = [type(child)(child.genome, child) for child in children]
+                params = '/size=%d/length=%d' % (size, length)
+                
+                yield ('delta.%s(full)%s' % (name, params),
+                       lambda copies=copies, lscape=landscape: [lscape.eval(i) for i in copies])
+                yield ('delta.%s%s' % (name, params),
+                       lambda children=children, lscape=landscape: [lscape.eval(i) for i in children])
+
+def _make_experiment(name, landscape, size, length, iterations):
+    '''Returns an `Experiment` for the predefined system `name` using a
+    new instance of `landscape`.'''
+    system = dict(dialects.default['system'])
+    system.update(dialects.configs[name]['system'])
+    system['size'] = size
+    return Experiment({
+        'random_seed': SEED,
+        'monitor': ConsoleMonitor({ 'out': NullStream(), 'error_out': sys.stderr,
+                                    'limits': { 'iterations': iterations } }),
+        'landscape': landscape(parameters=length),
+        'system': system,
+    })
+
+def compile_cases(sizes, lengths):   #pylint: disable=W0613
+    '''Yields cases for compiling and emitting the predefined
+    systems.'''
+    for name, landscape in SYSTEMS:
+        context = _make_experiment(name, landscape, 10, lengths[0], 1).system._context    #pylint: disable=W0212
+        definition = dialects.configs[name]['system']['definition']
+        
+        def _compile(definition=definition, context=context):
+            '''Compiles and emits one system.'''
+            model, _ = compileESDL(definition, context)
+            return emit(model, out=None)
+        
+        yield ('compile.' + name, _compile)
+
+def experiment_cases(sizes, lengths, iterations):
+    '''Yields cases for complete runs of the predefined systems.'''
+    for name, landscape in SYSTEMS:
+        for length in lengths:
+            for size in sizes:
+                params = '/size=%d/length=%d' % (size, length)
+                yield ('experiment.' + name + params,
+                       lambda name=name, landscape=landscape, size=size, length=length:
+                           _make_experiment(name, landscape, size, length, iterations).run())
+
+def real_mutation_cases(sizes, lengths):
+    '''Yields cases for the per-gene and bulk (``bulk=True``) forms of
+    the real-valued mutation operators.'''
+    real = RealSpecies({ }, None)
+    for length in lengths:
+        for size in sizes:
+            reals = _population(real, size, length, lowest=-5.0, highest=5.0)
+            params = '/size=%d/length=%d' % (size, length)
+            
+            for name in ('mutate_random', 'mutate_delta', 'mutate_gaussian'):
+                operator = getattr(real, name)
+                yield ('species.real.' + name + params,
+                       lambda reals=reals, operator=operator: list(operator(reals, per_gene_rate=0.1)))
+                yield ('species.real.' + name + '(bulk)' + params,
+                       lambda reals=reals, operator=operator: list(operator(reals, per_gene_rate=0.1, bulk=True)))
+
+def packed_cases(sizes, lengths):
+    '''Yields cases comparing the operators of `BinarySpecies` against
+    the bit-packed equivalents in `PackedBinarySpecies`, including
+    `OneMax` evaluation of each representation.'''
+    for length in lengths:
+        onemax = OneMax(parameters=length)
+        for name, species in (('binary', BinarySpecies({ }, onemax)), ('packed', PackedBinarySpecies({ }, onemax))):
+            for size in sizes:
+                group = _population(species, size, length)
+                params = '/size=%d/length=%d' % (size, length)
+                
+                yield ('species.%s.init_random%s' % (name, params),
+                       lambda species=species, size=size, length=length:
+                           list(islice(species.init_random(length=length), size)))
+                yield ('species.%s.crossover_uniform%s' % (name, params),
+                       lambda species=species, group=group: list(species.crossover_uniform(group, two_children=True)))
+                yield ('species.%s.crossover_two%s' % (name, params),
+                       lambda species=species, group=group: list(species.crossover_two(group, two_children=True)))
+                for rate in (0.01, 0.001):
+                    yield ('species.%s.mutate_bitflip(rate=%g)%s' % (name, rate, params),
+                           lambda species=species, group=group, rate=rate:
+                               list(species.mutate_bitflip(group, per_gene_rate=rate)))
+                yield ('landscape.OneMax(%s)%s' % (name, params),
+                       lambda group=group, lscape=onemax: [lscape.eval(i) for i in group])
+
+def site_sampling_cases(sizes, lengths):
+    '''Yields cases for `esec.utils.sample_sites` and the species
+    operators that use it at low per-gene rates.'''
+    binary = BinarySpecies({ }, None)
+    integer = IntegerSpecies({ }, None)
+    real = RealSpecies({ }, None)
+    for length in lengths:
+        for size in sizes:
+            bits = _population(binary, size, length)
+            ints = _population(integer, size, length, lowest=0, highest=100)
+            reals = _population(real, size, length, lowest=-5.0, highest=5.0)
+            for rate in (0.1, 0.01, 0.001):
+                params = '(rate=%g)/size=%d/length=%d' % (rate, size, length)
+                
+                yield ('sampling.sample_sites' + params,
+                       lambda size=size, length=length, rate=rate: [sample_sites(length, rate) for _ in xrange(size)])
+                yield ('sampling.binary.mutate_bitflip' + params,
+                       lambda bits=bits, rate=rate: list(binary.mutate_bitflip(bits, per_gene_rate=rate)))
+                yield ('sampling.integer.mutate_random' + params,
+                       lambda ints=ints, rate=rate: list(integer.mutate_random(ints, per_gene_rate=rate)))
+                yield ('sampling.real.mutate_gaussian' + params,
+                       lambda reals=reals, rate=rate: list(real.mutate_gaussian(reals, per_gene_rate=rate)))
+                yield ('sampling.binary.crossover_uniform' + params,
+                       lambda bits=bits, rate=rate: list(binary.crossover_uniform(bits, per_gene_rate=rate)))
+
+#=======================================================================
+
+def measure(func, repeat):
+    '''Returns the shortest time taken to call `func` over `repeat`
+    attempts. The random number generator is reset before each call.
+    '''
+    best = None
+    for _ in xrange(repeat):
+        _reset()
+        start = clock()
+        func()
+        elapsed = clock() - start
+        if best is None or elapsed < best: best = elapsed
+    return best
+
+def run(cases, patterns, repeat, out=sys.stdout):
+    '''Times each case with a name matching one of `patterns` and
+    returns a dictionary mapping case names to times. A table of times
+    is written to `out`.
+    '''
+    results = { }
+    out.write('%-72s %12s\n' % ('case', 'time (s)'))
+    for name, func in cases:
+        if not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            continue
+        results[name] = measure(func, repeat)
+        out.write('%-72s %12.5f\n' % (name, results[name]))
+        out.flush()
+    return results
+
+def compare(results, baseline, threshold, out=sys.stdout):
+    '''Compares `results` against `baseline` and writes a table to
+    `out`. Only cases appearing in both are compared.
+    
+    :Returns:
+        A list of the names of cases that are slower than the baseline
+        by more than `threshold`.
+    '''
+    regressions = []
+    out.write('%-72s %12s %12s %9s\n' % ('case', 'baseline', 'current', 'change'))
+    for name in sorted(results):
+        if name not in baseline: continue
+        base, current = baseline[name], results[name]
+        change = (current - base) / max(base, 1e-9)
+        flag = ''
+        if change > threshold:
+            flag = ' REGRESSION'
+            regressions.append(name)
+        out.write('%-72s %12.5f %12.5f %+8.1f%%%s\n' % (name, base, current, change * 100.0, flag))
+    return regressions
+
+def main():
+    '''The main entry point for the benchmark suite.'''
+    parser = optparse.OptionParser()
+    parser.add_option('--sizes', default='100,1000',
+                      help='comma-separated population sizes')
+    parser.add_option('--lengths', default='32,256',
+                      help='comma-separated genome lengths')
+    parser.add_option('--long-lengths', default='1000,10000',
+                      help='comma-separated genome lengths for the long-genome cases')
+    parser.add_option('--large-sizes', default='10000',
+                      help='comma-separated population sizes for the large-population cases')
+    parser.add_option('--filter', default='*',
+                      help='comma-separated patterns of case names to run')
+    parser.add_option('--repeat', type='int', default=5,
+                      help='number of times to run each case')
+    parser.add_option('--iterations', type='int', default=20,
+                      help='number of iterations for each experiment case')
+    parser.add_option('--out', default=None,
+                      help='file to write the results to as JSON')
+    parser.add_option('--baseline', default=None,
+                      help='JSON results file to compare against')
+    parser.add_option('--threshold', type='float', default=0.2,
+                      help='fraction by which a case may be slower than the baseline')
+    (options, _) = parser.parse_args()
+    
+    sizes = [int(s) for s in options.sizes.split(',')]
+    lengths = [int(l) for l in options.lengths.split(',')]
+    long_lengths = [int(l) for l in options.long_lengths.split(',')]
+    large_sizes = [int(s) for s in options.large_sizes.split(',')]
+    
+    def _cases():
+        '''Yields every case in order.'''
+        for func in (species_cases, selector_cases, landscape_cases, nk_cases, maxcut_cases,
+                     cnf_sat_cases, ecc_cases, delta_cases, monitor_cases, diversity_cases,
+                     aco_cases):
+            for case in func(sizes, lengths):
+                yield case
+        # Large populations are only used with the smallest genome length
+        for func in (diversity_cases, ):
+            for case in func(large_sizes, lengths[:1]):
+                yield case
+        # Long genomes are only used with the smallest population size
+        for func in (real_mutation_cases, packed_cases, site_sampling_cases, delta_cases):
+            for case in func(sizes[:1], long_lengths):
+                yield case
+        for case in compile_cases(sizes, lengths):
+            yield case
+        for case in experiment_cases(sizes, lengths, options.iterations):
+            yield case
+    
+    results = run(_cases(), options.filter.split(','), options.repeat)
+    
+    if options.out:
+        with open(options.out, 'w') as dest:
+            json.dump({
+                'python': sys.version,
+                'platform': platform.platform(),
+                'seed': SEED,
+                'repeat': options.repeat,
+                'iterations': options.iterations,
+                'results': results,
+            }, dest, indent=2, sort_keys=True)
+    
+    if options.baseline:
+        with open(options.baseline, 'r') as src:
+            baseline = json.load(src)['results']
+        print
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print
+            print '%d case(s) slower than baseline by more than %.0f%%' % (len(regressions), options.threshold * 100.0)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -31,7 +31,7 @@ config = {
                                              strength=1, minimisation=True)
             END GENERATION
         ''',
-        'create_pheromone_map': plugins.ACO.pheromone.PheromoneMap,
+        'create_pheromone_map': plugins.ACO.pheromone.PheromoneMatrix,
         'size': 100,
     },
     'landscape': {
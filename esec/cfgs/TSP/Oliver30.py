@@ -40,7 +40,7 @@ config = {
                 pheromone_map.update(source=ants, persistence=(rho), strength=(Q), minimisation)
             END GENERATION
         ''',
-        'create_pheromone_map': plugins.ACO.pheromone.PheromoneMap,
+        'create_pheromone_map': plugins.ACO.pheromone.PheromoneMatrix,
     },
     'monitor': {
         'report': 'brief+local_header+local_min+local_ave+local_max+local_unique+|+time',
@@ -23,7 +23,8 @@ config = {
             
             BEGIN GENERATION
                 FROM build_tours(cost_map=cost_map, cost_power=2, \
-                                 pheromone_map=pheromone_map, pheromone_power=2) \
+                                 pheromone_map=pheromone_map, pheromone_power=2, \
+                                 candidates=15) \
                     SELECT (size) ants
                 YIELD ants
                 
@@ -31,7 +32,7 @@ config = {
                                              strength=1, minimisation=True)
             END GENERATION
         ''',
-        'create_pheromone_map': plugins.ACO.pheromone.PheromoneMap,
+        'create_pheromone_map': plugins.ACO.pheromone.PheromoneMatrix,
         'size': 10,
     },
     'landscape': {
@@ -2,7 +2,9 @@
 
 '''
 import itertools
+import os
 import sys
+from timeit import default_timer
 from warnings import warn
 
 ILLEGAL_VARIABLE_NAMES = frozenset((
@@ -13,19 +15,167 @@ ILLEGAL_VARIABLE_NAMES = frozenset((
 ))
 
 class Profiler(object):
-    '''Tracks statement execution time.'''
+    '''Tracks the wall-clock and CPU time spent executing blocks,
+    statements, generator pipeline stages and evaluations.
+    
+    Each timed section is identified by a kind (``'BLOCK'``,
+    ``'STMT'``, ``'STAGE'`` or ``'EVAL'``) and a name. Times are
+    aggregated across every execution of a section, and include both
+    the inclusive time and the "self" time, which excludes any time
+    spent in nested sections.
+    '''
+    
+    KINDS = ('BLOCK', 'STMT', 'STAGE', 'EVAL')
+    '''The kinds of section that are timed, in reporting order.'''
+    
     def __init__(self):
-        self.data = []
-
+        self.data = { }
+        '''A dictionary mapping ``(kind, name)`` to a list containing
+        the number of calls, the inclusive wall-clock and CPU times and
+        the self wall-clock and CPU times. All times are in seconds.
+        '''
+        self._stack = []
+    
     def _current_time(self):
-        return 0
-
-    def start(self, statement):
-        self.data.append(None)
-        self.data[-1] = (statement, 0, self._current_time())
+        '''Returns the current wall-clock and CPU times in seconds.'''
+        cpu = os.times()
+        return default_timer(), cpu[0] + cpu[1]
+    
+    def start(self, name, kind='STMT'):
+        '''Starts timing a section.'''
+        wall, cpu = self._current_time()
+        self._stack.append([kind, name, wall, cpu, 0.0, 0.0])
+    
+    def end(self, name, kind='STMT'):
+        '''Stops timing a section and records the elapsed time.
+        
+        Any sections started after the matching call to `start` that
+        have not ended (for example, because an exception was raised)
+        are discarded.
+        '''
+        wall, cpu = self._current_time()
+        stack = self._stack
+        i = len(stack) - 1
+        while i >= 0 and (stack[i][0] != kind or stack[i][1] != name):
+            i -= 1
+        if i < 0: return
+        
+        entry = stack[i]
+        del stack[i:]
+        wall -= entry[2]
+        cpu -= entry[3]
+        
+        record = self.data.get((kind, name))
+        if record is None:
+            record = self.data[kind, name] = [0, 0.0, 0.0, 0.0, 0.0]
+        record[0] += 1
+        record[1] += wall
+        record[2] += cpu
+        record[3] += wall - entry[4]
+        record[4] += cpu - entry[5]
+        
+        if stack:
+            stack[-1][4] += wall
+            stack[-1][5] += cpu
+    
+    def unwind(self):
+        '''Discards all sections that have been started but not ended.
+        '''
+        del self._stack[:]
+    
+    def clear(self):
+        '''Discards all recorded times.'''
+        self.data.clear()
+        self.unwind()
+    
+    def wrap(self, name, _source):
+        '''Returns the items in `_source`, timing the retrieval of each
+        item as a ``'STAGE'`` section.
+        '''
+        start, end = self.start, self.end
+        _iter = iter(_source)
+        while True:
+            start(name, 'STAGE')
+            try:
+                item = next(_iter)
+            finally:
+                end(name, 'STAGE')
+            yield item
+    
+    def evaluator(self, evaluator, name=None):
+        '''Returns an evaluator that times each call to ``eval`` on
+        `evaluator` as an ``'EVAL'`` section. If `evaluator` is
+        ``None``, returns ``None``.
+        '''
+        if evaluator is None or isinstance(evaluator, _ProfiledEvaluator):
+            return evaluator
+        return _ProfiledEvaluator(self, evaluator, name)
+    
+    def totals(self):
+        '''Returns a dictionary mapping each kind of section to a list
+        containing the total number of calls, inclusive wall-clock and
+        CPU times and self wall-clock and CPU times.
+        '''
+        result = dict((kind, [0, 0.0, 0.0, 0.0, 0.0]) for kind in self.KINDS)
+        for (kind, _), record in self.data.iteritems():
+            total = result.setdefault(kind, [0, 0.0, 0.0, 0.0, 0.0])
+            for i, value in enumerate(record):
+                total[i] += value
+        return result
+    
+    def report(self):
+        '''Returns a list of strings describing the recorded times.
+        Sections are ordered by kind and then by decreasing inclusive
+        wall-clock time.
+        '''
+        order = dict((kind, i) for i, kind in enumerate(self.KINDS))
+        def _key(item):
+            '''Returns the sort key for a record.'''
+            (kind, _), record = item
+            return order.get(kind, len(order)), -record[1]
+        
+        result = ['%-5s %8s %10s %10s %10s %10s  %s' %
+                  ('kind', 'calls', 'wall', 'cpu', 'self wall', 'self cpu', 'name')]
+        for (kind, name), record in sorted(self.data.iteritems(), key=_key):
+            result.append('%-5s %8d %10.4f %10.4f %10.4f %10.4f  %s' %
+                          ((kind,) + tuple(record) + (' '.join(str(name).split()),)))
+        return result
+
+class _ProfiledEvaluator(object):
+    '''Wraps an evaluator so that each call to ``eval`` is timed by a
+    `Profiler`. All other attributes are obtained from the wrapped
+    evaluator.
+    '''
+    def __init__(self, profiler, evaluator, name=None):
+        self._profiler = profiler
+        self._evaluator = evaluator
+        self._name = name or type(evaluator).__name__
+    
+    def eval(self, indiv):
+        '''Evaluates `indiv` using the wrapped evaluator.'''
+        profiler = self._profiler
+        profiler.start(self._name, 'EVAL')
+        try:
+            return self._evaluator.eval(indiv)
+        finally:
+            profiler.end(self._name, 'EVAL')
+    
+    def __getattr__(self, name):
+        if name.startswith('__'): raise AttributeError(name)
+        return getattr(self._evaluator, name)
+    
+    def __nonzero__(self):
+        return bool(self._evaluator)
+    
+    def __reduce__(self):
+        # Worker processes receive the unwrapped evaluator, since their
+        # times cannot be reported back to the profiler.
+        return _unwrap, (self._evaluator,)
 
-    def end(self, statement):
-        self.data.append((statement, 1, self._current_time()))
+def _unwrap(evaluator):
+    '''Returns `evaluator`. Used when unpickling a profiled evaluator.
+    '''
+    return evaluator
 
 def _alias(dest, source):
     '''Makes `dest` an alias for `source`. Both are strings.'''
@@ -85,6 +235,18 @@ def _evaluator(*_sources):
     assert len(_sources) == 1, "Only simple evaluators are currently supported"
     return eval_or_call(_sources[0])
 
+def _evaluate(_eval, _source):
+    '''Assigns `_eval` to every individual in `_source` and clears any
+    existing fitness values. Fitness values are recalculated when next
+    required.
+    
+    If `_eval` is ``None``, the default evaluator for each individual's
+    species is used.
+    '''
+    for indiv in _source:
+        indiv._eval = _eval     #pylint: disable=W0212
+        del indiv.fitness
+
 def _yield(source_name, source_group):  #pylint: disable=W0613
     '''A placeholder for the ``_yield`` method, which will be specified
     by esec.
@@ -99,6 +261,7 @@ DEFAULT_CONTEXT = {
     '_range': _range,
     '_part': _part,
     '_evaluator': _evaluator,
+    '_evaluate': _evaluate,
     '_yield': _yield,
 }
 
@@ -151,15 +314,11 @@ class _emitter(object): #pylint: disable=R0903
         self._wl("def _block_" + block_name.lower() + "():")
         self._indent += 1
         if self.profile:
-            self._wl("_profiler.start('BLOCK %s')" % block_name)
-            for stmt in statements:
-                self._wl("_profiler.start('%s')" % stmt)
-                self._emit(stmt)
-                self._wl("_profiler.end('%s')" % stmt)
-            self._wl("_profiler.end('BLOCK %s')" % block_name)
-        else:
-            for stmt in statements:
-                self._emit(stmt)
+            self._wl("_profiler.start(%r, 'BLOCK')" % block_name)
+        for stmt in statements:
+            self._emit(stmt)
+        if self.profile:
+            self._wl("_profiler.end(%r, 'BLOCK')" % block_name)
         self._indent -= 1
         self._wl()
 
@@ -169,6 +328,8 @@ class _emitter(object): #pylint: disable=R0903
         if self.optimise < 3:
             self._w('# ')
             self._wl(str(stmt))
+        if self.profile:
+            self._wl("_profiler.start(%r)" % str(stmt), preflush=True)
         if tag == 'repeatblock':
             self._emit_repeat(stmt)
         elif tag == 'function':
@@ -184,6 +345,8 @@ class _emitter(object): #pylint: disable=R0903
             self._emit_pragma(stmt)
         else:
             assert False, "Invalid statement: %s" % stmt
+        if self.profile:
+            self._wl("_profiler.end(%r)" % str(stmt), preflush=True)
         if self.optimise < 3: self._wl()
 
     def _emit_pragma(self, stmt):
@@ -211,19 +374,17 @@ class _emitter(object): #pylint: disable=R0903
                 self._w(', ')
                 self._emit_expression(evaluator)
             self._wl(')')
+            if self.profile:
+                self._wl('_eval = _profiler.evaluator(_eval)')
             eval_name = '_eval'
         else:
             eval_name = 'None'
-        self._w('for _indiv in _merge(')
+        self._w('_evaluate(' + eval_name + ', _merge(')
         self._emit_variable(stmt.sources[0].id)
         for group in itertools.islice(stmt.sources, 1, None):
             self._w(', ')
             self._emit_variable(group.id)
-        self._wl('):')
-        self._indent += 1
-        self._wl('_indiv._eval = ' + eval_name)
-        self._wl('del _indiv.fitness')
-        self._indent -= 1
+        self._wl('))')
 
     def _emit_variable(self, var, name_only=False, safe_access=False):
         '''Emits names for variables.'''
@@ -375,12 +536,17 @@ class _emitter(object): #pylint: disable=R0903
         while op_stack:
             op = op_stack.pop()
             self._w('_gen = ')
+            if self.profile:
+                self._w('_profiler.wrap(%r, ' % str(op.func))
             self._emit_expression(op.func.parameter_dict["_function"])
             self._w('(')
             for arg in (i for i in op.func.parameters if i.name != '_function'):
                 self._emit_param(arg)
                 self._w(', ')
-            self._wl('_source=_gen)')
+            self._w('_source=_gen)')
+            if self.profile:
+                self._w(')')
+            self._wl()
 
         for group in stmt.destinations:
             if group.id.tag == 'variable':
@@ -417,6 +583,9 @@ class _emitter(object): #pylint: disable=R0903
         closing = ')'
         op = stmt.source
         while op.tag not in set(('merge', 'join')):
+            if self.profile:
+                self._w('_profiler.wrap(%r, ' % str(op.func))
+                closing += ')'
             self._emit_expression(op.func.parameter_dict["_function"])
             self._w('(')
             for arg in (i for i in op.func.parameters if i.name != '_function'):
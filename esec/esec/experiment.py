@@ -2,9 +2,11 @@
 experiment.
 '''
 
+import os
 import random
 import sys
 import traceback
+import cPickle as pickle
 
 from esec.utils import cfg_read, cfg_validate, ConfigDict
 from esec.utils.exceptions import ESDLCompilerError, EvaluatorError, ExceptionGroup
@@ -25,6 +27,10 @@ class Experiment(object):
         'landscape': '*',
         'system': '*', # allow System to validate
         'selector?': '*', # System also validates this
+        'processes?': [int, None], # System also validates this
+        'profile?': bool, # System also validates this
+        'checkpoint?': [str, None],
+        'checkpoint_interval': int,
         'verbose': int,
     }
     '''The expected format of the configuration dictionary passed to
@@ -75,6 +81,27 @@ class Experiment(object):
         these names are reserved for use by the ESDL compiler and
         runtime.
       
+      processes : (int |ge| 0 [optional])
+        The number of worker processes used to evaluate individuals in
+        ``EVAL`` statements. If zero, one process is used for each CPU.
+        If omitted or ``None``, individuals are evaluated serially in
+        the current process. See `esec.parallel` for details.
+      
+      profile : (bool [optional])
+        ``True`` to record the wall-clock and CPU time spent in each
+        block, statement, generator pipeline stage and evaluator. The
+        results are available from ``system.profile_report()`` and as
+        the ``block_time``, ``stage_time`` and ``eval_time``
+        statistics.
+      
+      checkpoint : (str [optional])
+        The name of the file to save checkpoints to. If omitted or
+        ``None``, checkpoints are not saved automatically. See
+        `save_checkpoint` and `resume`.
+      
+      checkpoint_interval : (int |ge| 1 [defaults to 10])
+        The number of steps between each checkpoint.
+      
       verbose : (int |ge| 0 [defaults to zero])
         The verbosity level to use.
     
@@ -84,6 +111,7 @@ class Experiment(object):
     default = {
         'verbose': 0,
         'random_seed': None,
+        'checkpoint_interval': 10,
     }
     '''The default values to use for unspecified keys in `syntax`.
     '''
@@ -174,6 +202,8 @@ class Experiment(object):
 
             # -- System --
             self.system = System(cfg, self.lscape, self.monitor)
+            self.steps = 0
+            '''The number of steps executed since `begin` was called.'''
 
             # -- Pass compiled system and landscape to monitor --
             self.monitor.notify('Experiment', 'System', self.system)
@@ -203,8 +233,25 @@ class Experiment(object):
         
         self.close()
     
+    def resume(self, filename=None):
+        '''Resumes the experiment from a checkpoint and runs it to
+        completion. The experiment must have been created with the same
+        configuration as the experiment that saved the checkpoint.
+        
+        :Parameters:
+          filename : str [optional]
+            The checkpoint file to load. If omitted, the ``checkpoint``
+            configuration value is used.
+        '''
+        self.load_checkpoint(filename)
+        
+        while self.step(): pass
+        
+        self.close()
+    
     def begin(self):
         '''Start the experiment.'''
+        self.steps = 0
         self.system.begin()
     
     def step(self, always_step=False):
@@ -224,12 +271,91 @@ class Experiment(object):
         '''
         
         if self.monitor.should_terminate(self.system):  #pylint: disable=E1103
-            if always_step: self.system.step()
+            if always_step: self._step()
             return False
         else:
-            self.system.step()
+            self._step()
             return True
     
+    def _step(self):
+        '''Executes one step and saves a checkpoint if required.'''
+        self.system.step()
+        self.steps += 1
+        if self.cfg.checkpoint and self.steps % max(1, self.cfg.checkpoint_interval) == 0:
+            self.save_checkpoint()
+    
+    def _get_state(self):
+        '''Returns the state of the experiment between steps.'''
+        lscape_rand = getattr(self.lscape, 'rand', None)
+        monitor_state = getattr(self.monitor, 'get_state', None)
+        return {
+            'steps': self.steps,
+            'system': self.system.get_state(),
+            'landscape_rand': lscape_rand.getstate() if lscape_rand else None,
+            'monitor': monitor_state() if monitor_state else None,
+        }
+    
+    def save_checkpoint(self, filename=None):
+        '''Saves the current state of the experiment. This includes the
+        groups and variables held by the system, the next birthday
+        value, the state of the system and landscape random number
+        generators and the state of the monitor.
+        
+        Species and evaluators belonging to the system are saved by
+        reference and are not included in the checkpoint.
+        
+        :Parameters:
+          filename : str [optional]
+            The file to save the checkpoint to. If omitted, the
+            ``checkpoint`` configuration value is used. The checkpoint
+            is written to a temporary file first, so an existing
+            checkpoint is only replaced if saving succeeds.
+        '''
+        filename = filename or self.cfg.checkpoint
+        assert filename, "No checkpoint file specified"
+        
+        persistent = dict((id(obj), name) for name, obj in self.system.persistent_objects().iteritems())
+        temp_filename = filename + '.tmp'
+        with open(temp_filename, 'wb') as dest:
+            pickler = pickle.Pickler(dest, pickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = lambda obj: persistent.get(id(obj))
+            pickler.dump(self._get_state())
+        
+        try:
+            os.rename(temp_filename, filename)
+        except OSError:
+            # os.rename cannot replace existing files on Windows
+            os.remove(filename)
+            os.rename(temp_filename, filename)
+    
+    def load_checkpoint(self, filename=None):
+        '''Restores the state of the experiment from a checkpoint saved
+        by `save_checkpoint`. This replaces a call to `begin`.
+        
+        :Parameters:
+          filename : str [optional]
+            The checkpoint file to load. If omitted, the ``checkpoint``
+            configuration value is used.
+        '''
+        filename = filename or self.cfg.checkpoint
+        assert filename, "No checkpoint file specified"
+        
+        persistent = self.system.persistent_objects()
+        with open(filename, 'rb') as source:
+            unpickler = pickle.Unpickler(source)
+            unpickler.persistent_load = persistent.__getitem__
+            state = unpickler.load()
+        
+        self.monitor.on_run_start(self.system)
+        self.monitor.on_pre_reset(self.system)
+        
+        self.steps = state['steps']
+        self.system.set_state(state['system'])
+        if state['landscape_rand'] is not None:
+            self.lscape.rand.setstate(state['landscape_rand'])
+        if state['monitor'] is not None:
+            self.monitor.set_state(state['monitor'])
+    
     def close(self):
         '''Closes the experiment.'''
         self.system.close()
@@ -101,6 +101,17 @@ class Fitness(object):
             self.values = (self.check(0, self.types[0], self.defaults[0], values),)
         assert not isinstance(self.values, generator)
         assert len(self.values) == len(self.types), 'Invalid number of values'
+        
+        sign = _scalar_sign(type(self))
+        self.key = self.values[0] * sign if sign else self
+        '''A value that sorts in the same order as this fitness, where
+        larger values are more fit. For single-valued fitnesses using
+        the default comparisons this is a plain number; otherwise, it
+        is the `Fitness` instance itself.
+        
+        `EmptyFitness` instances are their own key and compare less than
+        any number or `Fitness` instance.
+        '''
     
     def __iter__(self):
         return iter(self.values)
@@ -316,12 +327,14 @@ class Fitness(object):
         if __debug__: self.validate(other)
         if not isinstance(other, EmptyFitness):
             self.values = tuple((value1 + value2 for value1, value2 in izip(self.values, other.values)))
+            if self.key is not self: self.key = self.values[0] * _scalar_sign(type(self))
         return self
     
     def __isub__(self, other):
         if __debug__: self.validate(other)
         if not isinstance(other, EmptyFitness):
             self.values = tuple((value1 - value2 for value1, value2 in izip(self.values, other.values)))
+            if self.key is not self: self.key = self.values[0] * _scalar_sign(type(self))
         return self
     
     def __mul__(self, other):
@@ -428,6 +441,36 @@ class FitnessMinimize(FitnessMinimise):
 
 #=======================================================================
 
+_scalar_signs = { }
+
+def _scalar_sign(cls):
+    '''Returns ``1`` or ``-1`` if instances of `cls` may be ordered by
+    multiplying their only value by the result, or ``None`` if they
+    must be compared as `Fitness` objects.
+    
+    A plain key is only used when `cls` has a single numeric part and
+    uses the comparison methods of either `Fitness` or
+    `FitnessMinimise`.
+    '''
+    try:
+        return _scalar_signs[cls]
+    except KeyError:
+        pass
+    
+    sign = None
+    if (len(cls.types) == 1 and cls.types[0] in (int, long, float) and
+        cls.__eq__ == Fitness.__eq__ and cls.__ne__ == Fitness.__ne__ and
+        cls.__lt__ == Fitness.__lt__ and cls.__ge__ == Fitness.__ge__ and
+        cls.__le__ == Fitness.__le__):
+        if cls.__gt__ == Fitness.__gt__:
+            sign = 1
+        elif cls.__gt__ == FitnessMinimise.__gt__:
+            sign = -1
+    _scalar_signs[cls] = sign
+    return sign
+
+#=======================================================================
+
 class EmptyFitness(object):
     '''Represents an unspecified multi-stage fitness value.
     
@@ -466,6 +509,12 @@ class EmptyFitness(object):
     def __bool__(self):
         return False
     
+    @property
+    def key(self):
+        '''Returns `self`, which compares less than any other key. See
+        `Fitness.key`.'''
+        return self
+    
     def __add__(self, other):
         if isinstance(other, EmptyFitness): return self
         else: return NotImplemented
@@ -10,9 +10,36 @@ All mutation operations belong to individual species.
 
 from esec.fitness import EmptyFitness
 
+_EMPTY_FITNESS = EmptyFitness()
+
 def _key_fitness(i):
-    '''Used with ``sorted`` to sort by fitness.'''
-    return i.fitness  if i else EmptyFitness()
+    '''Used with ``sorted`` to sort by fitness. The key is the
+    precomputed `esec.fitness.Fitness.key`, which is a plain number for
+    single-valued fitnesses.
+    '''
+    try:
+        return i.fitness.key
+    except AttributeError:
+        return _EMPTY_FITNESS
+
+def _fitness_keys(group, evaluate=True):
+    '''Returns a list containing the result of `_key_fitness` for each
+    individual in `group`.
+    
+    Keys are read directly from the cached fitness values, avoiding the
+    ``fitness`` property, unless some individuals have not yet been
+    evaluated. In that case, every individual is evaluated if `evaluate`
+    is ``True``; otherwise, ``None`` is returned.
+    '''
+    try:
+        keys = [i._fitness.key for i in group]     #pylint: disable=W0212
+    except AttributeError:
+        keys = None
+    else:
+        if not any(issubclass(t, EmptyFitness) for t in set(map(type, keys))):
+            return keys
+    return map(_key_fitness, group) if evaluate else None
+
 def _key_birthday(i):
     '''Used with ``sorted`` to sort by age.'''
     return i.birthday if i else 0
@@ -9,14 +9,47 @@ The global variable ``rand`` is made available through the context in
 which the selectors are executed.
 '''
 
-from itertools import cycle, repeat
+from bisect import bisect_left
+from heapq import nlargest, nsmallest
+from itertools import cycle, islice, repeat
 from math import isinf
 from warnings import warn
 from esec import esdl_func
 from esec.fitness import Fitness
-from esec.generators import _key_fitness, _key_birthday
+from esec.generators import _key_fitness, _key_birthday, _fitness_keys
 from esec.context import rand
 
+PARTIAL_SELECTION = 8
+'''The number of individuals that `_ordered` selects before sorting the
+entire group.'''
+
+def _ordered(group, keys, reverse=False):
+    '''Returns the individuals in `group` in the same order as
+    ``sorted(group, key=..., reverse=reverse)`` where `keys` contains
+    the key of each individual.
+    
+    The first `PARTIAL_SELECTION` individuals are found with a single
+    pass over the keys. The rest of the group is only sorted if more
+    individuals are taken. Individuals with equal keys remain in their
+    original order.
+    '''
+    size = len(group)
+    key = keys.__getitem__
+    
+    def _select():
+        '''Yields the individuals in order.'''
+        count = PARTIAL_SELECTION
+        if count < size:
+            select = nlargest if reverse else nsmallest
+            for i in select(count, xrange(size), key=key):
+                yield group[i]
+        else:
+            count = 0
+        for i in islice(sorted(xrange(size), key=key, reverse=reverse), count, None):
+            yield group[i]
+    
+    return _select()
+
 @esdl_func('select_all')
 def All(_source):
     '''Returns all individuals in an unspecified order.
@@ -77,7 +110,8 @@ def Best(_source, only=False):
     if only:
         return repeat(max(_source, key=_key_fitness))
     else:
-        return iter(sorted(_source, key=_key_fitness, reverse=True))
+        group = list(_source)
+        return _ordered(group, _fitness_keys(group), reverse=True)
 
 @esdl_func('best_only')
 def BestOnly(_source):
@@ -107,7 +141,8 @@ def Worst(_source, only=False):
     if only:
         return repeat(min(_source, key=_key_fitness))
     else:
-        return iter(sorted(_source, key=_key_fitness, reverse=False))
+        group = list(_source)
+        return _ordered(group, _fitness_keys(group), reverse=False)
 
 @esdl_func('worst_only')
 def WorstOnly(_source):
@@ -137,7 +172,8 @@ def Youngest(_source, only=False):
     if only:
         return repeat(max(_source, key=_key_birthday))
     else:
-        return iter(sorted(_source, key=_key_birthday, reverse=True))
+        group = list(_source)
+        return _ordered(group, map(_key_birthday, group), reverse=True)
 
 @esdl_func('youngest_only')
 def YoungestOnly(_source):
@@ -167,7 +203,8 @@ def Oldest(_source, only=False):
     if only:
         return repeat(min(_source, key=_key_birthday))
     else:
-        return iter(sorted(_source, key=_key_birthday, reverse=False))
+        group = list(_source)
+        return _ordered(group, map(_key_birthday, group), reverse=False)
 
 @esdl_func('oldest_only')
 def OldestOnly(_source):
@@ -224,30 +261,47 @@ def Tournament(_source, k=2,
     irand = rand.randrange
     frand = rand.random
     choice = rand.choice
+    
+    group = list(_source)
+    size = len(group)
+    # Competitors are identified by their index into group. Keys are
+    # read once if every individual has been evaluated; otherwise, they
+    # are only evaluated when they compete.
+    keys = _fitness_keys(group, evaluate=False)
+    key = keys.__getitem__ if keys is not None else (lambda i: _key_fitness(group[i]))
+    
     # WITH REPLACEMENT
     if with_replacement and not without_replacement:
-        group = list(_source)
-        size = len(group)
         while True:
-            pool = [group[irand(size)] for _ in xrange(k)]
-            winner = max(pool, key=_key_fitness)
+            pool = [irand(size) for _ in xrange(k)]
+            winner = max(pool, key=key)
             if greediness >= 1.0 or frand() < greediness:
-                yield winner
+                yield group[winner]
             else:
                 pool.remove(winner)
-                yield choice(pool)
+                yield group[choice(pool)]
     # WITHOUT REPLACEMENT
     else:
-        group = list(_source)
-        while group:
-            winner_index = 0
-            if len(group) >= k:
-                pool_index = [irand(len(group)) for _ in xrange(k)]
-                winner_index = max(pool_index, key=lambda i: group[i].fitness)
-                if not (greediness >= 1.0 or frand() < greediness):
-                    pool_index.remove(winner_index)
-                    winner_index = choice(pool_index)
-            yield group.pop(winner_index)
+        # The first `remaining` elements of `order` are the indices of
+        # the individuals still in contention. Winners are removed by
+        # moving the last of these into their place.
+        order = range(size)
+        remaining = size
+        position_key = lambda p: key(order[p])
+        while remaining >= k:
+            pool = [irand(remaining) for _ in xrange(k)]
+            winner = max(pool, key=position_key)
+            if not (greediness >= 1.0 or frand() < greediness):
+                pool.remove(winner)
+                winner = choice(pool)
+            remaining -= 1
+            index = order[winner]
+            order[winner] = order[remaining]
+            yield group[index]
+        # Fewer than k individuals remain, which are returned in their
+        # original order.
+        for index in sorted(order[:remaining]):
+            yield group[index]
 
 @esdl_func('binary_tournament')
 def BinaryTournament(_source,
@@ -323,7 +377,7 @@ def UniformShuffle(_source):
 def FitnessProportional(_source,
                         with_replacement=True, without_replacement=False,
                         sus=False, mu=None,
-                        offset=None):
+                        offset=None, method='bisect'):
     '''Returns a sequence of individuals selected in proportion to their
     fitness. The simplified fitness value
     (`esec.fitness.Fitness.simple`) is used for determining proportion.
@@ -367,6 +421,12 @@ def FitnessProportional(_source,
         iterable(`Individual`) is passed (for example, a group from
         within an ESDL system), the first individual is used. If
         omitted, the minimum fitness value in `_source` is used.
+      
+      method : str
+        The algorithm used to spin the wheel when `sus` is ``False``.
+        ``'bisect'`` (the default) takes O(log n) time for each
+        selection. ``'linear'`` takes O(n) time for each selection.
+        Both select from the same distribution.
     '''
     assert offset is not True, "offset has no value"
     assert mu is not True, "mu has no value"
@@ -375,7 +435,7 @@ def FitnessProportional(_source,
     else:
         return FitnessProportionalNormal(_source,
             with_replacement=(with_replacement and not without_replacement),
-            offset=offset)
+            offset=offset, method=method)
 
 def _GetMinimumFitness(fitness1, fitness2):
     '''Returns the minimum of two fitness values.
@@ -397,7 +457,150 @@ def _GetMinimumFitness(fitness1, fitness2):
     return fitness1 if fitness2 > fitness1 else fitness2
 
 
-def FitnessProportionalNormal(_source, with_replacement=True, offset=None):
+def _spin_linear(wheel, with_replacement, name):
+    '''Returns a sequence of items selected from `wheel` by scanning
+    it linearly. Each selection takes O(n) time.
+    
+    :Parameters:
+      wheel : list(tuple(float, object))
+        A list of ``(weight, item)`` pairs. All weights must be
+        non-negative.
+      
+      with_replacement : bool
+        ``False`` to remove items from contention once they have been
+        returned.
+      
+      name : str
+        The name of the selector, used in warning messages.
+    '''
+    irand = rand.randrange
+    frand = rand.random
+    
+    wheel = list(wheel)
+    size = len(wheel)
+    total = sum(i[0] for i in wheel)
+    
+    while wheel:
+        prob = frand() * total
+        
+        i = 0
+        if size > 1:
+            while i < size and prob > wheel[i][0]:
+                prob -= wheel[i][0]
+                i += 1
+            # Fall back on uniform selection if wheel fails
+            if i >= size:
+                warn('%s selection wheel failed.' % name)
+                i = irand(size)
+        
+        # WITH REPLACEMENT
+        if with_replacement:
+            yield wheel[i][1]
+        # WITHOUT REPLACEMENT
+        else:
+            winner = wheel.pop(i)
+            total -= winner[0]
+            yield winner[1]
+            size -= 1
+
+def _spin_bisect(wheel, with_replacement, name):
+    '''Returns a sequence of items selected from `wheel` by searching
+    cumulative weights. Each selection takes O(log n) time.
+    
+    The same item is returned as `_spin_linear` would return for the
+    same random number, except where rounding errors in the cumulative
+    weights differ.
+    
+    :Parameters:
+      wheel : list(tuple(float, object))
+        A list of ``(weight, item)`` pairs. All weights must be
+        non-negative.
+      
+      with_replacement : bool
+        ``False`` to remove items from contention once they have been
+        returned.
+      
+      name : str
+        The name of the selector, used in warning messages.
+    '''
+    frand = rand.random
+    
+    size = len(wheel)
+    
+    # WITH REPLACEMENT
+    if with_replacement:
+        cumulative = []
+        total = 0.0
+        for weight, _ in wheel:
+            total += weight
+            cumulative.append(total)
+        
+        while True:
+            i = bisect_left(cumulative, frand() * total)
+            # Fall back on uniform selection if wheel fails
+            if i >= size:
+                warn('%s selection wheel failed.' % name)
+                i = rand.randrange(size)
+            yield wheel[i][1]
+    
+    # WITHOUT REPLACEMENT
+    # Weights are stored in a binary indexed (Fenwick) tree, which
+    # allows both searching and removal in O(log n) time. Removed items
+    # are given a weight of zero.
+    tree = [0.0] + [i[0] for i in wheel]
+    for i in xrange(1, size + 1):
+        j = i + (i & -i)
+        if j <= size: tree[j] += tree[i]
+    total = sum(i[0] for i in wheel)
+    
+    top = 1
+    while top * 2 <= size: top *= 2
+    
+    removed = [False] * size
+    lowest = 0
+    for _ in xrange(size):
+        prob = frand() * total
+        
+        # Find the first item with a cumulative weight of at least prob
+        i = 0
+        step = top
+        while step:
+            j = i + step
+            if j <= size and tree[j] < prob:
+                i = j
+                prob -= tree[j]
+            step >>= 1
+        
+        # Removed items are only found when prob is zero or because of
+        # rounding errors, so use the nearest remaining item.
+        if i < lowest:
+            i = lowest
+        elif i >= size or removed[i]:
+            j = i
+            while j < size and removed[j]: j += 1
+            if j >= size:
+                j = min(i, size - 1)
+                while removed[j]: j -= 1
+            i = j
+        
+        weight = wheel[i][0]
+        total -= weight
+        removed[i] = True
+        j = i + 1
+        while j <= size:
+            tree[j] -= weight
+            j += j & -j
+        while lowest < size and removed[lowest]: lowest += 1
+        
+        yield wheel[i][1]
+
+_WHEELS = {
+    'linear': _spin_linear,
+    'bisect': _spin_bisect,
+}
+
+
+def FitnessProportionalNormal(_source, with_replacement=True, offset=None, method='bisect'):
     '''Returns a sequence of individuals selected in proportion to their
     fitness. The simplified fitness value
     (`esec.fitness.Fitness.simple`) is used for determining proportion.
@@ -419,11 +622,17 @@ def FitnessProportionalNormal(_source, with_replacement=True, offset=None):
         iterable(`Individual`) is passed (for example, a group from
         within an ESDL system), the first individual is used. If
         omitted, the minimum fitness value in `_source` is used.
+      
+      method : str
+        The algorithm used to spin the wheel. ``'bisect'`` (the
+        default) takes O(log n) time for each selection. ``'linear'``
+        takes O(n) time for each selection. Both select from the same
+        distribution.
     '''
+    assert method in _WHEELS, "unknown selection method: %s" % method
+    
     group = [indiv for indiv in _source if not isinf(indiv.fitness.simple)]
     group.sort(key=_key_fitness, reverse=True)
-    irand = rand.randrange
-    frand = rand.random
     
     if not group: raise StopIteration
     if len(group) == 1:
@@ -433,32 +642,11 @@ def FitnessProportionalNormal(_source, with_replacement=True, offset=None):
     # adjust all fitnesses to be positive
     min_fitness = _GetMinimumFitness(min(i.fitness.simple for i in group), offset)
     
-    size = len(group)
     wheel = [(i.fitness.simple - min_fitness, i) for i in group]
     assert all(i[0] >= 0.0 for i in wheel), "Fitness scaling failed"
-    total = sum(i[0] for i in wheel)
     
-    while wheel:
-        prob = frand() * total
-        
-        i = 0
-        while i < size and prob > wheel[i][0]:
-            prob -= wheel[i][0]
-            i += 1
-        # Fall back on uniform selection if wheel fails
-        if i >= size:
-            warn('Fitness proportional selection wheel failed.')
-            i = irand(size)
-        
-        # WITH REPLACEMENT
-        if with_replacement:
-            yield wheel[i][1]
-        # WITHOUT REPLACEMENT
-        else:
-            winner = wheel.pop(i)
-            total -= winner[0]
-            yield winner[1]
-            size -= 1
+    for indiv in _WHEELS[method](wheel, with_replacement, 'Fitness proportional'):
+        yield indiv
 
 @esdl_func('fitness_sus')
 def FitnessProportionalSUS(_source, mu=None, offset=None):
@@ -519,7 +707,8 @@ def RankProportional(_source,
                      with_replacement=True, without_replacement=False,
                      expectation=1.1, neta=None,
                      invert=False,
-                     sus=False, mu=None):
+                     sus=False, mu=None,
+                     method='bisect'):
     '''Returns a sequence of individuals selected in proportion to their
     rank.
     
@@ -572,6 +761,12 @@ def RankProportional(_source,
         provided, the total number of individuals in `_source` is used.
         
         If `sus` is ``False``, `mu` is ignored.
+      
+      method : str
+        The algorithm used to spin the wheel when `sus` is ``False``.
+        ``'bisect'`` (the default) takes O(log n) time for each
+        selection. ``'linear'`` takes O(n) time for each selection.
+        Both select from the same distribution.
     '''
     assert expectation is not True, "expectation has no value"
     assert neta is not True, "neta has no value"
@@ -581,9 +776,10 @@ def RankProportional(_source,
     else:
         return RankProportionalNormal(_source,
             with_replacement=(with_replacement and not without_replacement),
-            expectation=expectation, neta=neta, invert=invert)
+            expectation=expectation, neta=neta, invert=invert, method=method)
 
-def RankProportionalNormal(_source, with_replacement=True, expectation=1.1, neta=None, invert=False):
+def RankProportionalNormal(_source, with_replacement=True, expectation=1.1, neta=None, invert=False,
+                           method='bisect'):
     '''Returns a sequence of individuals selected in proportion to their
     rank.
     
@@ -614,11 +810,17 @@ def RankProportionalNormal(_source, with_replacement=True, expectation=1.1, neta
         ``False`` to give the highest probabilities to the most fit
         individuals; otherwise, ``True`` to give the highest
         probabilities to the least fit individuals.
+      
+      method : str
+        The algorithm used to spin the wheel. ``'bisect'`` (the
+        default) takes O(log n) time for each selection. ``'linear'``
+        takes O(n) time for each selection. Both select from the same
+        distribution.
     '''
+    assert method in _WHEELS, "unknown selection method: %s" % method
+    
     group = [indiv for indiv in _source if not isinf(indiv.fitness.simple)]
     group.sort(key=_key_fitness, reverse=not invert)
-    irand = rand.randrange
-    frand = rand.random
     
     if not group: raise StopIteration
     if len(group) == 1:
@@ -628,30 +830,9 @@ def RankProportionalNormal(_source, with_replacement=True, expectation=1.1, neta
     if neta is not None: expectation = neta
     size = len(group)
     wheel = [(expectation - 2.0*(expectation-1.0)*i/(size-1.0), j) for i, j in enumerate(group)]
-    total = sum(i[0] for i in wheel)
     
-    while wheel:
-        prob = frand() * total
-        
-        i = 0
-        if size > 1:
-            while i < size and prob > wheel[i][0]:
-                prob -= wheel[i][0]
-                i += 1
-            # Fall back on uniform selection if wheel fails
-            if i >= size:
-                warn('Rank proportional selection wheel failed.')
-                i = irand(size)
-        
-        # WITH REPLACEMENT
-        if with_replacement:
-            yield wheel[i][1]
-        # WITHOUT REPLACEMENT
-        else:
-            winner = wheel.pop(i)
-            total -= winner[0]
-            yield winner[1]
-            size -= 1
+    for indiv in _WHEELS[method](wheel, with_replacement, 'Rank proportional'):
+        yield indiv
 
 @esdl_func('rank_sus')
 def RankProportionalSUS(_source, mu=None, expectation=1.1, neta=None, invert=False):
@@ -26,11 +26,27 @@ from esec.context import notify
 from esec.utils.exceptions import EvaluatorError
 from itertools import chain
 
+_EMPTY_FITNESS = EmptyFitness()
+'''The shared fitness value of individuals that have not been
+evaluated.'''
+
 class Individual(object):
     '''Represents a single member of the population with some type of
     internal genome.
+    
+    Instance members are stored in ``__slots__`` rather than a
+    per-instance dictionary. Derived classes that declare their own
+    ``__slots__`` remain free of a dictionary; those that do not will
+    have one added as normal.
     '''
     
+    __slots__ = ('_fitness', 'birthday', 'genome', '_statistic', 'species', '_eval',
+                 '_changes', '_delta_count')
+    
+    genome_type = list
+    '''The type used to store genomes. Genes provided as any other type
+    are converted by calling this type with them.'''
+    
     # _birthday is a private class variable used for assigning birthdates
     # to instances.
     _birthday = 0
@@ -57,7 +73,9 @@ class Individual(object):
         
         :Parameters:
           genes : iterable
-            The sequence of genes that make up the new individual.
+            The sequence of genes that make up the new individual. If an
+            instance of `genome_type` is provided, it is used directly
+            rather than copied and must not be modified afterwards.
           
           parent : `Individual` or `Species`
             Either the `Individual` (or derived class) that was used to
@@ -71,24 +89,32 @@ class Individual(object):
           statistic : dict [optional]
             A set of statistic values associated with this individual.
             These are accumulated with ``parent.statistic`` and allow
-            statistics to accurately represent the population.
+            statistics to accurately represent the population. If
+            omitted, the parent's dictionary is shared rather than
+            copied.
         '''
         assert genes, "Genes must be provided"
         assert parent, "Parent must be provided"
-        self._fitness = EmptyFitness()
+        self._fitness = _EMPTY_FITNESS
         '''The fitness of this individual. `EmptyFitness` indicates that
         a fitness evaluation is required, after which it is replaced by
         an instance of `Fitness`.
         '''
         self.birthday = None
         '''The birthday value for this individual.'''
-        self.genome = list(genes)
+        self._changes = None
+        '''``None``, or the genome, fitness, evaluator and delta count
+        of the individual this individual was mutated from and the
+        indices of the changed genes. See `set_changes`.'''
+        self._delta_count = 0
+        '''The number of consecutive fitness values, ending with this
+        individual's, that were calculated from a parent's fitness
+        rather than evaluated in full.'''
+        genome_type = self.genome_type
+        self.genome = genes if type(genes) is genome_type else genome_type(genes)
         '''The gene values for this individual. Gene values are
         considered immutable.
         '''
-        self.statistic = statistic or { }
-        '''The statistics specifically associated with this individual.
-        '''
         
         # Species classes provide default values for species, _eval and
         # statistic so we don't have to test for them
@@ -100,11 +126,51 @@ class Individual(object):
         # We are allowed to read parent._eval
         self._eval = parent._eval      #pylint: disable=W0212
         
-        for key, value in parent.statistic.iteritems():
-            if key in self.statistic:
-                self.statistic[key] += value
-            else:
-                self.statistic[key] = value
+        # Statistics are copy-on-write: an individual with no statistics
+        # of its own shares its parent's dictionary.
+        parent_statistic = parent.statistic
+        if not statistic:
+            self._statistic = parent_statistic
+        else:
+            for key, value in parent_statistic.iteritems():
+                if key in statistic:
+                    statistic[key] += value
+                else:
+                    statistic[key] = value
+            self._statistic = statistic
+    
+    @property
+    def statistic(self):
+        '''The statistics specifically associated with this individual.
+        
+        The returned dictionary may be shared with other individuals
+        and must not be modified. Use `set_statistic` to change values.
+        '''
+        return self._statistic
+    
+    def set_statistic(self, **values):
+        '''Sets the statistics named in `values` for this individual
+        without affecting any individual sharing the same dictionary.
+        '''
+        statistic = dict(self._statistic)
+        statistic.update(values)
+        self._statistic = statistic
+    
+    def set_changes(self, parent, changed):
+        '''Records that the genome of this individual is a copy of the
+        genome of `parent` with only the genes at the indices in
+        `changed` replaced. Mutation operators call this so that
+        landscapes providing ``_eval_delta`` (see `esec.landscape`) can
+        calculate the fitness of this individual from the fitness of
+        `parent`.
+        
+        Nothing is recorded if `parent` has not been evaluated. The
+        record is discarded once this individual's fitness is set.
+        '''
+        fitness = parent._fitness   #pylint: disable=W0212
+        if isinstance(fitness, Fitness):
+            self._changes = (parent.genome, fitness, changed, parent._eval,     #pylint: disable=W0212
+                             parent._delta_count + 1)                           #pylint: disable=W0212
     
     def born(self):
         '''Sets the individual's birthday to the next available value.
@@ -138,14 +204,42 @@ class Individual(object):
             pass
         return True
     
+    def __getstate__(self):
+        '''Returns the state of this individual for pickling as a
+        dictionary containing every slot and instance member.
+        '''
+        try:
+            state = dict(object.__getattribute__(self, '__dict__'))
+        except AttributeError:
+            state = { }
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        return state
+    
+    def __setstate__(self, state):
+        '''Restores the state of this individual after unpickling.
+        
+        This is required because `__getattr__` cannot be used before
+        ``self.species`` has been restored.
+        '''
+        for name, value in state.iteritems():
+            object.__setattr__(self, name, value)
+    
     def __getattr__(self, name):
         '''Attempts to locate unknown members on the species descriptor
         associated with this individual.
         
         If `name` is not found on either `self` or ``self.species``, an
         AttributeError is raised. (This matches the standard behaviour
-        for an unknown attribute.)
+        for an unknown attribute.) Special names beginning with two
+        underscores are never looked up on the species.
         '''
+        if name == 'species' or name.startswith('__'):
+            raise AttributeError(name)
         return getattr(self.species, name)
     
     # Pylint doesn't understand properties correctly
@@ -178,16 +272,17 @@ class Individual(object):
     
     @fitness.setter
     def fitness(self, value):
+        self._changes = None
         if isinstance(value, (Fitness, EmptyFitness)):
             self._fitness = value
         elif value is None:
-            self._fitness = EmptyFitness()
+            self._fitness = _EMPTY_FITNESS
         else:
             self._fitness = Fitness(value)
     
     @fitness.deleter
     def fitness(self):
-        self._fitness = EmptyFitness()
+        self._fitness = _EMPTY_FITNESS
     
     #pylint: enable=E0102,E0202,E1101,C0111
     
@@ -62,6 +62,23 @@ interchangeable.)
 The only requirement of a subclass is that it defines an ``_eval()``
 method and calls the `Landscape` initialiser.
 
+Subclasses may also define an ``_eval_batch()`` method, which receives a
+list of individuals and returns a list of unwrapped fitness values (or
+``None`` if the group cannot be handled). `Landscape.eval_batch` uses
+this to evaluate entire groups at once, falling back on ``eval()`` for
+each individual when it is not available. The results must be identical
+(to within floating-point tolerance) to those of ``_eval()``.
+
+Subclasses may also define an ``_eval_delta()`` method, which receives
+an individual, the genome of the individual it was mutated from, that
+individual's unwrapped fitness value and the indices of the genes that
+were changed (see `esec.individual.Individual.set_changes`). It returns
+the unwrapped fitness of the new individual, calculated from the
+changed genes alone, or ``None`` if this is not possible. To limit the
+accumulation of floating-point error, ``_eval()`` is used instead once
+``cfg.delta_limit`` consecutive values have been calculated this way.
+Setting ``delta_limit`` to zero disables delta evaluation.
+
 '''
 
 import random
@@ -71,7 +88,7 @@ import esec.context
 from esec.fitness import Fitness, FitnessMaximise, FitnessMinimise
 from esec.utils import ConfigDict, merge_cls_dicts, cfg_validate, cfg_strict_test
 from esec.utils import a_or_an
-from types import ModuleType as module
+from types import MethodType, ModuleType as module
 
 #=======================================================================
 # Landscape - Abstract base class for parameterised evaluators.
@@ -92,6 +109,7 @@ class Landscape(object):
     lname = '--none--' # problem type subclasses should overwrite this
     
     maximise = True # is the default objective maximise? (ie fitness)
+    parallel = True # may eval() run in a worker process? (see esec.parallel)
     size_equals_parameters = True # should size.exact == parameters?
     syntax = { # configuration syntax key's and type. MERGED
         'class?': type, # specific class of landscape
@@ -100,6 +118,7 @@ class Landscape(object):
         'invert?': bool,
         'offset?': float,
         'parameters': [None, int],   # may be used by subclasses
+        'delta_limit': int, # consecutive evaluations using _eval_delta
         'size': {   # size should be used for all genome size references
             'min': int,
             'max': int,
@@ -111,6 +130,7 @@ class Landscape(object):
         'invert': False,
         'offset': 0.0,
         'parameters': None,
+        'delta_limit': 100,
         'size': {
             'min': 0,
             'max': 0,
@@ -168,6 +188,7 @@ class Landscape(object):
         # inversion? offset?
         self.invert = self.cfg.invert
         self.offset = self.cfg.offset
+        self.delta_limit = self.cfg.delta_limit
         
         # Autobind _eval_minimise or _eval_maximise.
         if not hasattr(self, 'eval'):
@@ -176,11 +197,67 @@ class Landscape(object):
             else:
                 setattr(self, 'eval', self._eval_maximise)
     
+    def __getstate__(self):
+        '''Returns the state of the landscape for pickling. The merged
+        ``syntax`` is recreated by `__setstate__`. Bound methods stored
+        as attributes, such as ``eval``, cannot be pickled and are
+        replaced by the object they are bound to and their name.
+        '''
+        state = dict(self.__dict__)
+        state.pop('syntax', None)
+        bound = { }
+        for key, value in state.items():
+            if isinstance(value, MethodType) and value.im_self is not None:
+                owner = value.im_self
+                bound[key] = (None if owner is self else owner, value.__name__)
+                del state[key]
+        state['_bound_methods'] = bound
+        return state
+    
+    def __setstate__(self, state):
+        '''Restores the state of the landscape after unpickling.'''
+        state = dict(state)
+        bound = state.pop('_bound_methods', { })
+        self.__dict__.update(state)
+        for key, (owner, name) in bound.iteritems():
+            setattr(self, key, getattr(self if owner is None else owner, name))
+        self.syntax = merge_cls_dicts(self, 'syntax')
+        if not hasattr(self, 'eval'):
+            if self.maximise == self.invert:
+                setattr(self, 'eval', self._eval_minimise)
+            else:
+                setattr(self, 'eval', self._eval_maximise)
+    
+    def _eval_changes(self, indiv):
+        '''Returns the unwrapped fitness of `indiv` calculated by
+        ``_eval_delta`` from the fitness of the individual it was
+        mutated from, or ``None`` if no changes were recorded, the
+        subclass does not provide ``_eval_delta`` or ``delta_limit``
+        consecutive values have already been calculated this way.
+        '''
+        eval_delta = getattr(self, '_eval_delta', None)
+        changes = getattr(indiv, '_changes', None)
+        if eval_delta is None or changes is None: return None
+        
+        genome, fitness, changed, evaluator, count = changes
+        # The parent must have been evaluated by the same evaluator and
+        # the genes must not be mapped to a different phenome.
+        if count > self.delta_limit or evaluator is not indiv._eval or indiv.phenome is not indiv.genome:   #pylint: disable=W0212
+            return None
+        if self.maximise == self.invert: fitness_type = FitnessMinimise
+        else: fitness_type = FitnessMaximise
+        if type(fitness) is not fitness_type: return None
+        
+        value = eval_delta(indiv, genome, fitness.values[0] - self.offset, changed)
+        if value is not None: indiv._delta_count = count   #pylint: disable=W0212
+        return value
+    
     def _eval_maximise(self, indiv):
         '''Evaluates the provided individual and wraps the result in a
         `FitnessMaximise` object.
         '''
-        fitness = self._eval(indiv)     #pylint: disable=E1101
+        fitness = self._eval_changes(indiv)
+        if fitness is None: fitness = self._eval(indiv)     #pylint: disable=E1101
         if isinstance(fitness, Fitness): return fitness
         else: return FitnessMaximise(fitness + self.offset)
     
@@ -188,10 +265,32 @@ class Landscape(object):
         '''Evaluates the provided individual and wraps the result in a
         `FitnessMinimise` object.
         '''
-        fitness = self._eval(indiv)     #pylint: disable=E1101
+        fitness = self._eval_changes(indiv)
+        if fitness is None: fitness = self._eval(indiv)     #pylint: disable=E1101
         if isinstance(fitness, Fitness): return fitness
         else: return FitnessMinimise(fitness + self.offset)
     
+    def eval_batch(self, individuals):
+        '''Evaluates a sequence of individuals and returns a list
+        containing the fitness of each, in the same order.
+        
+        If the subclass provides an ``_eval_batch`` method, it is used
+        to evaluate the entire group at once. Otherwise, or if
+        ``_eval_batch`` returns ``None``, ``eval`` is called for each
+        individual.
+        '''
+        individuals = list(individuals)
+        eval_batch = getattr(self, '_eval_batch', None)
+        values = eval_batch(individuals) if eval_batch and individuals else None
+        if values is None:
+            return [self.eval(indiv) for indiv in individuals]
+        
+        if self.maximise == self.invert: fitness_type = FitnessMinimise
+        else: fitness_type = FitnessMaximise
+        offset = self.offset
+        return [value if isinstance(value, Fitness) else fitness_type(value + offset)
+                for value in values]
+    
     def legal(self, indiv): #pylint: disable=W0613,R0201
         '''Determines whether the specified individual is legal.
         
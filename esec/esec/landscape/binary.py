@@ -10,9 +10,12 @@ Most of these binary landscapes are problem generators.
 
 '''
 
-from itertools import izip
+from array import array
+from itertools import chain, izip, imap, repeat, starmap
+from operator import add, eq, mul, ne, not_
 from esec.landscape import Landscape
 from esec.species.joined import JoinedIndividual
+from esec.utils import LRUCache
 
 #=======================================================================
 def inttobin(n, count=24):
@@ -75,8 +78,21 @@ class OneMax(Binary):
     
     def _eval(self, indiv):
         '''Count the bits.
+        
+        Genomes providing a ``count`` method, such as lists and
+        `esec.species.binary_packed.BitString`, are counted without
+        iterating in Python.
         '''
-        return sum(indiv)
+        phenome = indiv.phenome
+        try:
+            return phenome.count(1)
+        except AttributeError:
+            return sum(phenome)
+    
+    def _eval_delta(self, indiv, genome, value, changed):
+        '''Adjusts the parent's count by the genes in `changed`.'''
+        phenome = indiv.phenome
+        return value + sum(phenome[i] - genome[i] for i in changed)
 
 
 #=======================================================================
@@ -300,6 +316,74 @@ class Multimodal(Binary):
         return result
 
 
+#=======================================================================
+class ClauseIndex(object):
+    '''An index of the literals in a CNF expression for the `CNF_SAT`
+    landscape.
+    
+    The state of an assignment is the number of true literals in each
+    clause; a clause is satisfied when its count is non-zero. Counts
+    for a complete assignment are calculated with `counts`. When only a
+    few variables change, `rescore` uses the clauses containing each
+    variable to update the counts of the affected clauses alone.
+    '''
+    
+    def __init__(self, clauses, variables):
+        '''Initialises a new index.
+        
+        :Parameters:
+          clauses : list of lists of int
+            The literals of each clause, as 1-based variable numbers
+            that are negative for negated variables. Every clause must
+            contain the same number of literals.
+          
+          variables : int
+            The number of variables.
+        '''
+        self.length = len(clauses[0]) if clauses else 0
+        literals = [literal for clause in clauses for literal in clause]
+        self._variables = array('l', (abs(literal) - 1 for literal in literals))
+        self._positive = [literal > 0 for literal in literals]
+        
+        # The clauses containing each variable, and whether each
+        # occurrence is positive
+        self.occurrences = [array('l') for _ in xrange(variables)]
+        self._occurrence_positive = [[] for _ in xrange(variables)]
+        for j, clause in enumerate(clauses):
+            for literal in clause:
+                self.occurrences[abs(literal) - 1].append(j)
+                self._occurrence_positive[abs(literal) - 1].append(literal > 0)
+    
+    def counts(self, genes):
+        '''Returns an array containing the number of true literals in
+        each clause for the assignment `genes`.
+        '''
+        values = [bool(gene) for gene in genes]
+        truth = imap(eq, imap(values.__getitem__, self._variables), self._positive)
+        return array('l', imap(sum, izip(*([truth] * self.length))))
+    
+    def rescore(self, counts, genes, changed):
+        '''Returns a copy of `counts` updated for the variables in
+        `changed`, which must all have different values in `genes` to
+        those `counts` was calculated for.
+        
+        :Returns:
+            A tuple containing the new counts, a list of the clauses
+            that became satisfied and a list of the clauses that are no
+            longer satisfied.
+        '''
+        counts = array('l', counts)
+        previous = { }
+        for v in changed:
+            value = bool(genes[v])
+            for j, positive in izip(self.occurrences[v], self._occurrence_positive[v]):
+                if j not in previous: previous[j] = counts[j]
+                counts[j] += 1 if positive == value else -1
+        gained = [j for j, count in previous.iteritems() if not count and counts[j]]
+        lost = [j for j, count in previous.iteritems() if count and not counts[j]]
+        return counts, gained, lost
+
+
 #=======================================================================
 class CNF_SAT(Binary):
     '''N-dimensional random CNF Epistasis Generator
@@ -330,6 +414,15 @@ class CNF_SAT(Binary):
     
     Also supports the stepwise adaptation of weights (SAW) as suggested
     by Eiben and van der Hauw.
+    
+    The number of true literals in each clause is remembered for up to
+    ``state_cache_size`` recently evaluated genomes. When an individual
+    was mutated from a parent whose counts are remembered (see
+    `esec.individual.Individual.set_changes`), it is evaluated by
+    updating only the clauses that contain the changed variables.
+    `rescore` does the same for any pair of individuals. Since the
+    counts are integers, ``delta_limit`` only disables this when it is
+    zero.
     '''
     lname = 'CNF-SAT'
     size_equals_parameters = False
@@ -338,13 +431,15 @@ class CNF_SAT(Binary):
         'L': int,
         'K': int,
         'N?': int,
-        'SAW?': bool
+        'SAW?': bool,
+        'state_cache_size': int,            # 0 to disable
     }
     default = {
         'L': 430, # no of clauses in the expression
         'K': 3, # no of literals per clause
         'N': 100, # no of Boolean variables per literal per clause.
-        'SAW': False
+        'SAW': False,
+        'state_cache_size': 1000,
     }
     
     test_key = (('L', int), ('K', int), ('N', int), ('SAW', bool),)
@@ -362,6 +457,9 @@ class CNF_SAT(Binary):
         
         # create the random clauses of length K (c_len)
         self.c_list = [self._create_clause() for _ in xrange(self.n_clauses)]
+        self._index = ClauseIndex(self.c_list, self.c_vars)
+        self._states = LRUCache(self.cfg.state_cache_size)
+        self._saw_version = 0
         # initialise SAW weights if needed
         if self.use_saw:
             self.w_list = [0] * self.n_clauses
@@ -369,6 +467,11 @@ class CNF_SAT(Binary):
         else:
             self.eval = self._eval
     
+    def __getstate__(self):
+        state = super(CNF_SAT, self).__getstate__()
+        state['_states'] = LRUCache(self._states.size)
+        return state
+    
     def _create_clause(self):
         '''Create a single random clause.
         
@@ -384,19 +487,73 @@ class CNF_SAT(Binary):
                 clause[i] = -clause[i]
         return clause
     
+    def _cached_state(self, genes):
+        '''Returns the remembered state of `genes` as a tuple containing
+        `genes`, the number of true literals in each clause, the number
+        of satisfied clauses and the total SAW weight of the satisfied
+        clauses, or ``None`` if it is not remembered.
+        '''
+        entry = self._states.get(id(genes))
+        if entry is None or entry[0] is not genes: return None
+        _, counts, satisfied, total, version = entry
+        if version != self._saw_version:
+            total = sum(imap(mul, self.w_list, imap(bool, counts)))
+            self._states[id(genes)] = (genes, counts, satisfied, total, self._saw_version)
+        return genes, counts, satisfied, total
+    
+    def _rescored_state(self, genes, parent_state, changed):
+        '''Returns the state of `genes` calculated from `parent_state`
+        by updating the clauses that contain the variables in `changed`
+        that differ from the parent. `changed` may include unchanged and
+        repeated variables.
+        '''
+        parent_genes, counts, satisfied, total = parent_state
+        changed = [v for v in set(changed) if bool(genes[v]) != bool(parent_genes[v])]
+        
+        counts, gained, lost = self._index.rescore(counts, genes, changed)
+        satisfied += len(gained) - len(lost)
+        if self.use_saw:
+            w_list = self.w_list
+            total += sum(w_list[j] for j in gained) - sum(w_list[j] for j in lost)
+        return genes, counts, satisfied, total
+    
+    def _state(self, indiv):
+        '''Returns the genes of `indiv`, the number of true literals in
+        each clause, the number of satisfied clauses and the total SAW
+        weight of the satisfied clauses.
+        
+        The values are remembered for individuals, whose genes are
+        never modified, but not for other sequences. Individuals whose
+        parent's values are remembered are rescored from the parent.
+        '''
+        genes = getattr(indiv, 'phenome', None)
+        if genes is None:
+            genes = indiv
+        else:
+            state = self._cached_state(genes)
+            if state is not None: return state
+            
+            changes = getattr(indiv, '_changes', None)
+            if changes is not None and self.delta_limit > 0 and genes is indiv.genome:
+                parent_state = self._cached_state(changes[0])
+                if parent_state is not None:
+                    state = self._rescored_state(genes, parent_state, changes[2])
+                    self._states[id(genes)] = state + (self._saw_version,)
+                    return state
+        
+        counts = self._index.counts(genes)
+        satisfied = len(counts) - counts.count(0)
+        total = sum(imap(mul, self.w_list, imap(bool, counts))) if self.use_saw else 0
+        if genes is not indiv:
+            self._states[id(genes)] = (genes, counts, satisfied, total, self._saw_version)
+        return genes, counts, satisfied, total
+    
     def _eval(self, indiv):
         '''Evaluate CNF Boolean Expressions.
         
         Fitness values are between 0.0 and 1.0 if the expression is OK.
         '''
-        satisfied = 0
-        c_list = self.c_list
-        for j in xrange(self.n_clauses):
-            for k in xrange(self.c_len):
-                if (((c_list[j][k] > 0) and indiv[c_list[j][k] - 1]) or
-                    ((c_list[j][k] < 0) and (not indiv[-c_list[j][k] - 1]))):
-                    satisfied += 1
-                    break
+        satisfied = self._state(indiv)[2]
         return (float(satisfied) / self.n_clauses) # 1.0 = satisfied
     
     def _eval_saw(self, indiv):
@@ -404,31 +561,43 @@ class CNF_SAT(Binary):
         
         Fitness values are integers between 0 and +INF.
         '''
-        total = 0
-        c_list = self.c_list
-        w_list = self.w_list
-        for j in xrange(self.n_clauses):
-            for k in xrange(self.c_len):
-                if (((c_list[j][k] > 0) and indiv[c_list[j][k] - 1]) or
-                    ((c_list[j][k] < 0) and (not indiv[-c_list[j][k] - 1]))):
-                    total += w_list[j]
-                    break
-        return total
+        return self._state(indiv)[3]
+    
+    def rescore(self, indiv, parent, changed=None):
+        '''Returns the same value as ``eval(indiv)``, calculated by
+        updating the clauses of `parent` that contain the variables that
+        differ in `indiv`.
+        
+        :Parameters:
+          indiv : `Individual`
+            The individual to evaluate.
+          
+          parent : `Individual`
+            An individual that differs from `indiv` in a small number of
+            genes, usually the individual `indiv` was mutated from.
+          
+          changed : iterable of int [optional]
+            The indices of the genes that may differ between `indiv` and
+            `parent`. Unchanged and repeated genes are ignored. If
+            omitted, every gene is compared.
+        '''
+        genes = getattr(indiv, 'phenome', indiv)
+        if changed is None: changed = xrange(len(genes))
+        state = self._rescored_state(genes, self._state(parent), changed)
+        _, _, satisfied, total = state
+        if genes is not indiv:
+            self._states[id(genes)] = state + (self._saw_version,)
+        
+        if self.use_saw: return total
+        return (float(satisfied) / self.n_clauses)
     
     def update_saw(self, best):
         '''Update weights using w_i^1 = w - i + 1 + c_i(best).'''
-        c_list = self.c_list
-        w_list = self.w_list
-        for j in xrange(self.n_clauses):
-            satisfied = 0 # False
-            for k in xrange(self.c_len):
-                if (((c_list[j][k] > 0) and best[c_list[j][k] - 1]) or
-                    ((c_list[j][k] < 0) and (not best[-c_list[j][k] - 1]))):
-                    satisfied = 1 # True
-                    break
-            # Stepwise Adaptation of Weights - SAW
-            # add's 1 while not satisfied, goes to 0 if is satisfied.
-            w_list[j] = w_list[j] + 1 - satisfied
+        counts = self._state(best)[1]
+        # Stepwise Adaptation of Weights - SAW
+        # add's 1 while not satisfied, goes to 0 if is satisfied.
+        self.w_list[:] = map(add, self.w_list, imap(not_, counts))
+        self._saw_version += 1
     
     
     def info(self, level):
@@ -444,6 +613,72 @@ class CNF_SAT(Binary):
                 break
         return result
 
+#=======================================================================
+class EpistasisTable(object):
+    '''A lookup table of gene contributions for the `NK` and `NKC`
+    landscapes.
+    
+    The contribution of each gene depends on its own value and the
+    values of the genes it is linked to. Contributions are stored in a
+    single flat array with ``2**(len(links[i]) + 1)`` entries for each
+    gene ``i``, using eight bytes per entry, and the links of each gene
+    are stored as arrays of gene indices with matching weights. With
+    ``K`` links per gene, the table requires ``N * 2**(K+1) * 8`` bytes,
+    about a quarter of the memory used by nested lists of floats.
+    '''
+    
+    def __init__(self, values, links):
+        '''Initialises a new lookup table.
+        
+        :Parameters:
+          values : array of float
+            The contributions of each gene, with the contributions of
+            gene ``i`` starting at ``i * 2**(len(links[i]) + 1)``. Every
+            gene must have the same number of links.
+          
+          links : list of lists of int
+            The indices of the genes linked to each gene. Indices may
+            exceed the number of genes when contributions depend on
+            other individuals, as in `NKC`.
+        '''
+        self.values = values
+        self.size = len(links)
+        self._loci = [ ]
+        for locus, linked in enumerate(links):
+            columns = 2 ** (len(linked) + 1)
+            self._loci.append((locus, locus * columns,
+                               array('l', linked), array('l', (2 ** (i + 1) for i in xrange(len(linked))))))
+    
+    def evaluate(self, genes):
+        '''Returns the sum of the contributions of each gene in `genes`,
+        which must support indexing.
+        '''
+        values = self.values
+        getgene = genes.__getitem__
+        total = 0.0
+        for locus, offset, linked, weights in self._loci:
+            total += values[offset + genes[locus] + sum(imap(mul, imap(getgene, linked), weights))]
+        return total
+    
+    def evaluate_all(self, genomes):
+        '''Returns a list containing the sum of the contributions of
+        each genome in `genomes`, which must all have the same length.
+        
+        Each gene's contribution is looked up for every genome at once,
+        so the per-gene overhead of `evaluate` is only incurred once
+        for the entire group.
+        '''
+        columns = zip(*genomes)
+        count = len(genomes)
+        values = self.values
+        totals = [0.0] * count
+        for locus, offset, linked, weights in self._loci:
+            index = map(add, columns[locus], repeat(offset, count))
+            for j, weight in izip(linked, weights):
+                index = map(add, index, map(mul, columns[j], repeat(weight, count)))
+            totals = map(add, totals, map(values.__getitem__, index))
+        return totals
+
 #=======================================================================
 class NK(Binary):
     '''NK Landscape Problem Generator
@@ -460,6 +695,9 @@ class NK(Binary):
     
     - gene contribution is its value + contribution of k other values
     
+    F is stored in an `EpistasisTable`, which also evaluates entire
+    groups through ``_eval_batch``.
+    
     Qualities: maximisation, normalised
     '''
     lname = 'NK Binary Landscape'
@@ -483,11 +721,10 @@ class NK(Binary):
         random = self.rand.random
         shuffle = self.rand.shuffle
         
-        # Create the BIG fitness matrix N x 2^(K+1) with random(0, 1)
-        F = self._F = [None] * n
+        # Create the BIG fitness matrix N x 2^(K+1) with random(0, 1),
+        # stored by row in a flat array
         f_cols = 2**(k + 1)
-        for i in xrange(n):
-            F[i] = [random() for _ in xrange(f_cols)]
+        F = self._F = array('d', starmap(random, repeat((), n * f_cols)))
         
         # Create the epistasis matrix N x K with random index allocations
         E = self._E = [None] * n
@@ -496,24 +733,22 @@ class NK(Binary):
             links.remove(i) # no epistasis link to self :)
             shuffle(links) # possible links
             E[i] = links[:k] # copy just what we need (the first k links)
+        
+        self._table = EpistasisTable(F, E)
     
     
     def _eval(self, indiv):
         '''Evaluate Binary NK landscape.'''
-        E = self._E
-        F = self._F
-        k = self.K
         # calculate the fitness using N-to-K dependencies
-        total = 0.0
-        for gene in xrange(self.size.exact): # do this for each gene
-            fit_index = indiv[gene]
-            for i in xrange(k):
-                multiplier = 2**(i + 1)
-                epi_index = E[gene][i]
-                fit_index += multiplier * indiv[epi_index]
-            total += F[gene][fit_index]
         # that's it (using total / N as in wspears)
-        return total / self.size.exact
+        return self._table.evaluate(indiv.phenome) / self.size.exact
+    
+    def _eval_batch(self, individuals):
+        '''Evaluates every individual in one pass over the table.'''
+        n = self.size.exact
+        genomes = [indiv.phenome for indiv in individuals]
+        if any(len(genome) != n for genome in genomes): return None
+        return [total / n for total in self._table.evaluate_all(genomes)]
 
 
 #=======================================================================
@@ -526,7 +761,11 @@ class NKC(Binary):
     - Create fitness matrix F = N x (2^{K+C+1}) of random (0, 1)
     - Create epistasis matrix E = N x (K+C) with epistasis connections
     - Fitness is sum of gene contribution, where gene contribution is
-      its value + contribution of k other values
+      its value + contribution of k other values and c values from
+      the other individuals in the group
+    
+    F is stored in an `EpistasisTable`, which also evaluates entire
+    groups through ``_eval_batch``.
     
     Qualities: maximisation, normalised
     '''
@@ -555,11 +794,10 @@ class NKC(Binary):
         random = self.rand.random
         shuffle = self.rand.shuffle
         
-        # Create the BIG fitness matrix N x 2^(K+C+1) with random (0, 1)
-        F = self._F = [None] * n
+        # Create the BIG fitness matrix N x 2^(K+C+1) with random (0, 1),
+        # stored by row in a flat array
         f_cols = 2**(k + c + 1)
-        for i in xrange(n):
-            F[i] = [random() for _ in xrange(f_cols)]
+        F = self._F = array('d', starmap(random, repeat((), n * f_cols)))
         
         # Create the epistasis matrix N x (K+C) with random index allocations
         E = self._E = [None] * n
@@ -572,8 +810,21 @@ class NKC(Binary):
             links = list(xrange(n, n * s))
             shuffle(links)
             E[i].extend(links[:c]) # only what we need
+        
+        self._table = EpistasisTable(F, E)
     
     
+    def _genes(self, indiv):
+        '''Returns the genes of every member of `indiv` joined into a
+        single list.'''
+        assert isinstance(indiv, JoinedIndividual), \
+               "indiv (%s) should be JoinedIndividual." % (type(indiv) if indiv else "None")
+        assert len(indiv) == self.group
+        all_genes = []
+        for i in indiv:
+            all_genes.extend(i[:])
+        return all_genes
+    
     def _eval(self, indiv):
         '''Evaluate Binary NKC landscape.
         
@@ -584,32 +835,19 @@ class NKC(Binary):
         Fitness is assigned to the joined individual and also directly
         to the first individual.
         '''
-        assert isinstance(indiv, JoinedIndividual), \
-               "indiv (%s) should be JoinedIndividual." % (type(indiv) if indiv else "None")
-        assert len(indiv) == self.group
-        E = self._E
-        F = self._F
-        K = self.K
-        # Calculate the fitness using N-to-K-to-C dependencies
-        total = 0.0
-        all_genes = []
-        for i in indiv:
-            all_genes.extend(i[:])
-        
-        for i in xrange(len(indiv[0])): # do this for first individual only
-            gene = all_genes[i]
-            
-            multiplier = 1
-            for j in xrange(K):
-                epi_index = E[gene][j]
-                # note - epi_index may be in self -or- another individual!
-                gene_index = gene + multiplier * all_genes[epi_index]
-                
-                multiplier += multiplier
-            
-            total += F[gene][gene_index]
+        # Calculate the fitness using N-to-K-to-C dependencies. Only the
+        # genes of the first individual contribute, but their links may
+        # be in self -or- another individual!
         # that's it (using total / N as in wspears)
-        return total / self.size.exact
+        return self._table.evaluate(self._genes(indiv)) / self.size.exact
+    
+    def _eval_batch(self, individuals):
+        '''Evaluates every joined individual in one pass over the
+        table.'''
+        n = self.size.exact
+        genomes = [self._genes(indiv) for indiv in individuals]
+        if any(len(genome) != n * self.group for genome in genomes): return None
+        return [total / n for total in self._table.evaluate_all(genomes)]
 
 
 #=======================================================================
@@ -669,6 +907,70 @@ class MMDP6(Binary):
         return total
 
 
+#=======================================================================
+class CodeDistances(object):
+    '''The Hamming distances between every pair of codewords in an `ECC`
+    genome.
+    
+    The genome contains the first M/2 codewords and the remaining
+    codewords are their complements. Each codeword is packed into an
+    integer and the distance between each unordered pair of the first
+    M/2 is counted from the set bits of their exclusive-or. Since
+    complementing both codewords of a pair does not change their
+    distance and complementing one of them gives n minus the distance,
+    these fill the entire matrix.
+    '''
+    
+    def __init__(self, genes, n, M):
+        '''Calculates the distances between the codewords in `genes`.
+        
+        :Parameters:
+          genes : sequence of int
+            The bits of the first M/2 codewords.
+          
+          n : int
+            The number of bits in each codeword.
+          
+          M : int
+            The total number of codewords.
+        '''
+        self.n = n
+        half = M // 2
+        bits = ''.join(['1' if gene else '0' for gene in genes])
+        words = [int(bits[i*n:i*n+n], 2) for i in xrange(half)]
+        
+        matrix = [[0] * M for _ in xrange(M)]
+        minimum = n
+        for i, word in enumerate(words):
+            row, complement = matrix[i], matrix[half+i]
+            row[half+i] = complement[i] = n
+            for j in xrange(i + 1, half):
+                d = bin(word ^ words[j]).count('1')
+                row[j] = matrix[j][i] = complement[half+j] = matrix[half+j][half+i] = d
+                row[half+j] = matrix[half+j][i] = complement[j] = matrix[j][half+i] = n - d
+                if d < minimum: minimum = d
+                if n - d < minimum: minimum = n - d
+        self.matrix = matrix
+        '''The distance between codewords ``i`` and ``j`` is
+        ``matrix[i][j]``.'''
+        self.minimum = minimum
+        '''The smallest distance between two different codewords.'''
+    
+    def inverse_square_sum(self):
+        '''Returns the sum of ``d**-2`` for every ordered pair of
+        different codewords, added in the same order as comparing each
+        codeword to every other.
+        
+        :Raises ZeroDivisionError:
+            Two codewords are equal.
+        '''
+        inverse = [0.0] * (self.n + 1)
+        for d in xrange(self.minimum, self.n + 1):
+            inverse[d] = d ** -2
+        # The diagonal adds zero, which does not change the total
+        return sum(imap(inverse.__getitem__, chain.from_iterable(self.matrix)))
+
+
 #=======================================================================
 class ECC(Binary):
     '''Error Correcting Code Design Problem
@@ -716,6 +1018,30 @@ class ECC(Binary):
         # set the number of Binary genes that will be required
         # Note - only using simplified M/2 search space
         self.size.min = self.size.max = self.size.exact = self.n * self.M // 2
+        # The distances of the most recent individual, which are used by
+        # both legal() and _eval()
+        self._last = None
+    
+    def __getstate__(self):
+        state = super(ECC, self).__getstate__()
+        state['_last'] = None
+        return state
+    
+    def _distances(self, indiv):
+        '''Returns the `CodeDistances` for `indiv`.
+        
+        The distances of the most recent individual are remembered, since
+        its genes are never modified, but not those of other sequences.
+        '''
+        genes = getattr(indiv, 'phenome', None)
+        if genes is None:
+            return CodeDistances(indiv, self.n, self.M)
+        last = self._last
+        if last is not None and last[0] is genes:
+            return last[1]
+        distances = CodeDistances(genes, self.n, self.M)
+        self._last = (genes, distances)
+        return distances
     
     def _eval(self, indiv):
         '''Evaluate ECC.'''
@@ -723,15 +1049,7 @@ class ECC(Binary):
         if indiv.legal():
             # Sum the distance to other codewords. NOTE: two equal codewords
             # will cause ZeroDivisionError ... so indiv must be legal.
-            code = self._splitgenome(indiv)
-            total = 0
-            dist = self._HammDist
-            for i in code:
-                #subtotal = 0
-                for j in code:
-                    if i is not j:
-                        total += dist(i, j)**-2
-                #total += subtotal
+            total = self._distances(indiv).inverse_square_sum()
             # Inverse the summed difference
             return 1.0 / total
         else:
@@ -759,17 +1077,7 @@ class ECC(Binary):
         separation distance d. If d is high, it's a highly constricted
         space.
         '''
-        dist = self._HammDist
-        min_dist = self.d
-        code = self._splitgenome(indiv)
-        for i in code:
-            for j in code:
-                if i is j:
-                    continue
-                if dist(i, j) < min_dist:
-                    return False
-        # if we reach this, its a legal genome
-        return True
+        return self._distances(indiv).minimum >= self.d
 
 
 #=======================================================================
@@ -832,7 +1140,12 @@ class SUS(Binary):
         '''Evaluate subset sum.'''
         # Create an integer subset from the binary selection x (indiv)
         # and sum() to give P(x)
-        P_x = sum(wi for wi, xi in izip(self._W, indiv) if xi == 1)
+        phenome = indiv.phenome
+        if hasattr(phenome, 'ones'):
+            W = self._W
+            P_x = sum(W[i] for i in phenome.ones())
+        else:
+            P_x = sum(wi for wi, xi in izip(self._W, phenome) if xi == 1)
         # get the difference to C
         gap = self._C - P_x
         # return the MINimization value
@@ -841,6 +1154,22 @@ class SUS(Binary):
         else:
             return int(P_x) # penalty of P(x)
     
+    def _eval_delta(self, indiv, genome, value, changed):
+        '''Recovers P(x) of the parent from its fitness and adjusts it by
+        the weights of the genes in `changed`.'''
+        C = self._C
+        # P(x) cannot be recovered if C or the fitness were truncated
+        if C % 1 or value % 1: return None
+        P_x = value if value > C else C - value
+        W = self._W
+        phenome = indiv.phenome
+        P_x += sum(W[i] * ((phenome[i] == 1) - (genome[i] == 1)) for i in changed)
+        gap = C - P_x
+        if gap >= 0:
+            return int(gap)
+        else:
+            return int(P_x)
+    
     
     def info(self, level):
         '''Return the basics, and also subset sum data.
@@ -867,6 +1196,10 @@ class MAXCUT(Binary):
     vertices i and j.
     Random weights [0, 1] when allocated.
     
+    The graph is stored as arrays of edges, so evaluation time is
+    proportional to the number of edges rather than N^2. `find_best`
+    provides a reference value using a bounded branch-and-bound search.
+    
     Qualities:
     '''
     lname = 'MAXCUT'
@@ -884,49 +1217,52 @@ class MAXCUT(Binary):
     def __init__(self, cfg=None, **other_cfg):
         super(MAXCUT, self).__init__(cfg, **other_cfg)
         
-        self.size.min = self.size.max = self.size.exact = self.cfg.N or self.cfg.parameters
+        n = self.size.min = self.size.max = self.size.exact = self.cfg.N or self.cfg.parameters
         self.prob = float(self.cfg.P)
-        # create adjaceny matrix to represent connections and edge weights
+        # create the list of edges to represent connections and weights
         
         #   0 1 2    i=row, j=col
-        # 0 0 - -    "-" means it gets ij value reflected (copied) into it
-        # 1 x 0 -    "x" means a weight value is created (prob) b/w [0, 1)
-        # 2 x x 0    ...
+        # 0 0 - -    only the lower triangle of the adjacency matrix is
+        # 1 x 0 -    generated: "x" means an edge is created (prob) with
+        # 2 x x 0    a weight b/w [0, 1)
         frand = self.rand.random
-        W = [None]*self.size.exact # init list
-        for i in xrange(self.size.exact):
-            W[i] = [0]*self.size.exact
-            for j in xrange(i): #note: range[0, i) so w[i, j]=0 where i==j
+        edges = [ ]
+        for i in xrange(n):
+            for j in xrange(i): #note: range[0, i) so no edge where i==j
                 if frand() < self.prob:
-                    W[i][j] = frand() # range [0, 1) ... close enough to [0, 1]?
-                    W[j][i] = W[i][j] # reflected connection
-        self._W = W # save it for later...
-        # Note: don't need the full matrix but leaving as-is for now.
-        
-        ## Uncomment the following to do the exhaustive test
-        ## takes about ~2-5mins for 20.09 graphs.
-        ##self._find_best()
+                    edges.append((j, i, frand())) # range [0, 1) ... close enough to [0, 1]?
+        # Sort edges by their first vertex so weights are summed in the
+        # same order as rows of the full matrix were.
+        edges.sort()
+        self._edges_from = array('l', (e[0] for e in edges))
+        self._edges_to = array('l', (e[1] for e in edges))
+        self._weights = array('d', (e[2] for e in edges))
+        self._best = None
     
     def _eval(self, indiv):
         '''Evaluate MAXCUT. Sum the weights of edges that span both
         subgraphs. If indiv[i] = 0 represents V_0 and indiv[i] = 1 is
         V_1.
+        
+        The time taken is proportional to the number of edges.
         '''
-        N = self.size.exact
-        W = self._W
-        total = 0
-        for i in xrange(N-1):
-            for j in xrange(i + 1, N):
-                if indiv[i] != indiv[j]: #only include spanning edges
-                    total += W[i][j]
-        return total
+        gene = indiv.phenome.__getitem__
+        spanning = imap(ne, imap(gene, self._edges_from), imap(gene, self._edges_to))
+        # Multiplying by False adds zero, which does not change the sum
+        return sum(imap(mul, self._weights, spanning))
     
     def info(self, level):
         '''Return the basics, and also MAXCUT data.
         '''
         result = super(MAXCUT, self).info(level)
-        result.append('  N=%d, prob=%2.2f, seed N=%d' % (self.size.exact, self.prob, self.cfg.random_seed))
-        W = self._W
+        result.append('  N=%d, prob=%2.2f, seed N=%d, edges=%d' %
+                      (self.size.exact, self.prob, self.cfg.random_seed, len(self._weights)))
+        if self._best:
+            result.append('  Best cut found %f (%s)' % (self._best[0], 'optimal' if self._best[2] else 'bounded'))
+        n = self.size.exact
+        W = [[0] * n for _ in xrange(n)]
+        for i, j, w in izip(self._edges_from, self._edges_to, self._weights):
+            W[i][j] = W[j][i] = w
         for i in W:
             part = ''
             for j in i:
@@ -937,28 +1273,239 @@ class MAXCUT(Binary):
             result.append(part)
         return result
     
-    def _find_best(self): #pragma: no cover
-        '''Iteratively find the best maxcut for the current random graph
+    def _adjacency(self):
+        '''Returns a list containing a dictionary for each vertex that
+        maps adjacent vertices to edge weights.'''
+        adjacent = [{ } for _ in xrange(self.size.exact)]
+        for i, j, w in izip(self._edges_from, self._edges_to, self._weights):
+            adjacent[i][j] = w
+            adjacent[j][i] = w
+        return adjacent
+    
+    @classmethod
+    def _remove_leaves(cls, adjacent):
+        '''Removes vertices with one or no edges from `adjacent`, along
+        with any vertices that have one or no edges as a result.
+        
+        The edge of a removed vertex is cut by every maximum cut, since
+        the vertex may always be placed on the opposite side to its
+        neighbour. Returns a list of ``(vertex, neighbour)`` tuples in
+        the order they were removed, where `neighbour` is ``None`` if
+        the vertex had no edges.
+        '''
+        removed = [ ]
+        pending = [v for v, edges in enumerate(adjacent) if len(edges) <= 1]
+        while pending:
+            v = pending.pop()
+            edges = adjacent[v]
+            if edges is None or len(edges) > 1: continue
+            u = None
+            if edges:
+                u = next(iter(edges))
+                del adjacent[u][v]
+                if len(adjacent[u]) <= 1: pending.append(u)
+            adjacent[v] = None
+            removed.append((v, u))
+        return removed
+    
+    @classmethod
+    def _components(cls, adjacent):
+        '''Returns a list containing the vertices of each connected
+        component of `adjacent`, ignoring removed vertices. The
+        vertices of each component are ordered beginning with the
+        vertex with the most total edge weight and continuing with the
+        vertex with the most weight to those already ordered.
+        '''
+        degree = [sum(edges.itervalues()) if edges else 0.0 for edges in adjacent]
+        linked = [0.0] * len(adjacent)
+        done = [edges is None for edges in adjacent]
+        components = [ ]
+        for start in sorted(xrange(len(adjacent)), key=lambda v: -degree[v]):
+            if done[start]: continue
+            done[start] = True
+            order = [ start ]
+            frontier = set(adjacent[start])
+            for u, w in adjacent[start].iteritems():
+                linked[u] += w
+            while frontier:
+                v = max(frontier, key=lambda u: (linked[u], degree[u]))
+                frontier.discard(v)
+                done[v] = True
+                order.append(v)
+                for u, w in adjacent[v].iteritems():
+                    if not done[u]:
+                        linked[u] += w
+                        frontier.add(u)
+            components.append(order)
+        return components
+    
+    @classmethod
+    def _local_search(cls, adjacent, order, side):
+        '''Sets `side` for each vertex in `order` to a good cut, found
+        by greedily placing each vertex on the side that cuts the most
+        weight and then moving single vertices to the other side while
+        that improves the cut.
+        '''
+        for v in order:
+            weight = [0.0, 0.0]
+            for u, w in adjacent[v].iteritems():
+                if side[u] >= 0: weight[side[u]] += w
+            side[v] = 0 if weight[1] >= weight[0] else 1
+        
+        improved = True
+        while improved:
+            improved = False
+            for v in order:
+                gain = sum(w if side[u] == side[v] else -w for u, w in adjacent[v].iteritems())
+                if gain > 1e-12:
+                    side[v] = 1 - side[v]
+                    improved = True
+    
+    @classmethod
+    def _branch_and_bound(cls, adjacent, order, side, node_limit):
+        '''Searches for the maximum cut of the connected vertices in
+        `order`, which are assigned in that order. `side` initially
+        contains a cut of these vertices and is updated with the best
+        cut found.
+        
+        Returns a tuple containing the number of partial assignments
+        visited and ``True`` if the search completed within
+        `node_limit`.
+        '''
+        def _cut(assignment):
+            '''Returns the weight cut by `assignment`.'''
+            return sum(w for v in order for u, w in adjacent[v].iteritems()
+                       if u > v and assignment[u] != assignment[v])
+        
+        best = _cut(side)
+        best_side = dict((v, side[v]) for v in order)
+        
+        # to_side[s][v] is the weight of edges between v and assigned
+        # vertices on side s
+        assigned = dict((v, -1) for v in order)
+        to_side = (dict.fromkeys(order, 0.0), dict.fromkeys(order, 0.0))
+        state = { 'cut': 0.0, 'free': _cut(dict((v, v) for v in order)), 'bonus': 0.0 }
+        
+        def _assign(v, s, sign):
+            '''Assigns (sign=1) or unassigns (sign=-1) vertex `v` to side
+            `s`, updating the bound terms.'''
+            if sign > 0:
+                state['bonus'] -= max(to_side[0][v], to_side[1][v])
+                state['cut'] += to_side[1 - s][v]
+                assigned[v] = s
+            else:
+                assigned[v] = -1
+                state['cut'] -= to_side[1 - s][v]
+                state['bonus'] += max(to_side[0][v], to_side[1][v])
+            bonus = 0.0
+            for u, w in adjacent[v].iteritems():
+                if assigned[u] < 0:
+                    before = max(to_side[0][u], to_side[1][u])
+                    to_side[s][u] += sign * w
+                    bonus += max(to_side[0][u], to_side[1][u]) - before
+                    state['free'] -= sign * w
+            state['bonus'] += bonus
+        
+        # The first vertex is always on side zero, since swapping the
+        # sides of every vertex produces the same cut.
+        _assign(order[0], 0, 1)
+        stack = [ ]
+        nodes = 1
+        complete = True
+        tolerance = 1e-9 * max(1.0, best)
+        while True:
+            depth = len(stack) + 1
+            if depth == len(order):
+                if state['cut'] > best + tolerance:
+                    best = state['cut']
+                    best_side = dict(assigned)
+                backtrack = True
+            elif state['cut'] + state['free'] + state['bonus'] <= best + tolerance:
+                backtrack = True
+            elif nodes >= node_limit:
+                complete = False
+                break
+            else:
+                # Try the side that cuts the most weight first
+                v = order[depth]
+                s = 0 if to_side[1][v] >= to_side[0][v] else 1
+                _assign(v, s, 1)
+                stack.append((v, s, False))
+                nodes += 1
+                backtrack = False
+            
+            if backtrack:
+                # Undo assignments until one can be tried on the other
+                # side. If none can, the search is finished.
+                finished = True
+                while stack:
+                    v, s, second = stack.pop()
+                    _assign(v, s, -1)
+                    if not second:
+                        _assign(v, 1 - s, 1)
+                        stack.append((v, 1 - s, True))
+                        nodes += 1
+                        finished = False
+                        break
+                if finished: break
+        
+        for v, s in best_side.iteritems():
+            side[v] = s
+        return nodes, complete
+    
+    def find_best(self, node_limit=1000000):
+        '''Searches for the maximum cut of the current graph using a
+        depth-first branch-and-bound search.
         
-        :Note:
-            This takes TIME! (~3-5mins). Only call if you *really* want
-            to.
+        Vertices with one or no edges are removed first, since their
+        edges are always cut, and each connected component of the
+        remaining graph is searched separately. The search of each
+        component begins with the cut found by a greedy local search.
+        The upper bound of each partial assignment is the weight already
+        cut, plus the weight of every edge between unassigned vertices,
+        plus the larger of the weights each unassigned vertex has to
+        either side.
+        
+        The result is cached, so later calls with the same or a
+        smaller `node_limit` return immediately.
+        
+        :Parameters:
+          node_limit : int
+            The maximum number of partial assignments to visit. If the
+            search is stopped early, the best cut found so far is
+            returned and is not known to be optimal.
+        
+        :Returns:
+            A tuple containing the weight of the best cut found, a list
+            of genes representing the cut and ``True`` if the cut is
+            known to be optimal.
         '''
-        min_i = 0
-        max_i = 2**self.size.exact
-        bsf = 0
-        bsf_i = 0
-        print '*** Doing exhaustive test (%d) to find best. ("." per 10000)' % max_i
-        for i in xrange(min_i, max_i):
-            x = inttobinlist(i, self.size.exact)
-            result = self._eval(x)
-            if result > bsf:
-                bsf = result
-                bsf_i = i
-            if i % 10000 == 0:
-                print '.', #progress indicator
-        print
-        print 'Best of %f at %d' % (bsf, bsf_i)
+        if self._best and (self._best[2] or self._best[3] >= node_limit):
+            return self._best[:3]
+        
+        adjacent = self._adjacency()
+        removed = self._remove_leaves(adjacent)
+        side = [-1] * self.size.exact
+        complete = True
+        nodes = 0
+        for order in self._components(adjacent):
+            self._local_search(adjacent, order, side)
+            if nodes < node_limit:
+                used, done = self._branch_and_bound(adjacent, order, side, node_limit - nodes)
+                nodes += used
+                complete = complete and done
+            else:
+                complete = False
+        
+        # Removed vertices are placed opposite their neighbour
+        for v, u in reversed(removed):
+            side[v] = 0 if u is None else 1 - side[u]
+        
+        genes = [1 if s > 0 else 0 for s in side]
+        total = sum(w for i, j, w in izip(self._edges_from, self._edges_to, self._weights)
+                    if genes[i] != genes[j])
+        self._best = (total, genes, complete, node_limit)
+        return self._best[:3]
 
 
 #=======================================================================
@@ -10,7 +10,9 @@ own new functions.
 '''
 
 from math import sqrt
+from esec.context import notify
 from esec.landscape import Landscape
+from esec.utils import LRUCache
 
 class GE(Landscape):
     '''Abstract GE fitness landscape
@@ -25,6 +27,8 @@ class GE(Landscape):
         
         'size_penalty_square_factor': float,    # penalty factors to
         'size_penalty_linear_factor': float,    # hurt large programs
+        
+        'fitness_cache_size': int,              # 0 to disable
     }
     
     # subclasses should set default to overlay their changes on to this
@@ -32,6 +36,7 @@ class GE(Landscape):
         'size': { 'min': 1, 'max': 50 },
         'size_penalty_square_factor': 0.0,
         'size_penalty_linear_factor': 0.0,
+        'fitness_cache_size': 0,
     }
     
     test_key = ( )
@@ -46,6 +51,43 @@ class GE(Landscape):
         
         self.size_penalty_square_factor = self.cfg.size_penalty_square_factor
         self.size_penalty_linear_factor = self.cfg.size_penalty_linear_factor
+        
+        self.fitness_cache = LRUCache(self.cfg.fitness_cache_size)
+        '''Fitness values of recently evaluated programs, keyed by
+        phenome string and length. Only subclasses whose fitness depends
+        on nothing else should enable this using
+        ``fitness_cache_size``.'''
+    
+    def __getstate__(self):
+        state = super(GE, self).__getstate__()
+        state['fitness_cache'] = LRUCache(self.fitness_cache.size)
+        return state
+    
+    def _eval_maximise(self, indiv):
+        return self._eval_cached(indiv, super(GE, self)._eval_maximise)
+    
+    def _eval_minimise(self, indiv):
+        return self._eval_cached(indiv, super(GE, self)._eval_minimise)
+    
+    def _eval_cached(self, indiv, evaluate):
+        '''Returns the fitness of `indiv` from `fitness_cache`, or
+        calls `evaluate` and stores the result.
+        
+        Hits and misses are reported as the ``fitness_cache_hits`` and
+        ``fitness_cache_misses`` statistics.
+        '''
+        cache = self.fitness_cache
+        if not cache.size:
+            return evaluate(indiv)
+        
+        key = (indiv.phenome_string, len(indiv))
+        fitness = cache.get(key)
+        if fitness is None:
+            notify('GE', 'statistic', 'local_fitness_cache_misses+global_fitness_cache_misses')
+            fitness = cache[key] = evaluate(indiv)
+        else:
+            notify('GE', 'statistic', 'local_fitness_cache_hits+global_fitness_cache_hits')
+        return fitness
     
     
     def _size_penalty(self, indiv):
@@ -104,6 +146,7 @@ class Multiplexer(GE):
     default = {
         'parameters': 3,
         'terminals': 0, # will be set later, based on parameters
+        'fitness_cache_size': 1000,
     }
     
     def __init__(self, cfg=None, **other_cfg):
@@ -195,6 +238,7 @@ F1 = F(1.0)
         'parameters': 0,
         'terminals': 1,
         'expr': 'X**4+X**3+X**2+X',
+        'fitness_cache_size': 1000,
     }
     
     strict = { 'parameters': 0, 'terminals': 1 }
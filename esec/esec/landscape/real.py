@@ -6,14 +6,24 @@
 The `Real` base class inherits from `Landscape` for parameter validation
 and support. See `landscape` for details.
 
+If NumPy_ is installed, a number of landscapes also provide a vectorised
+``_eval_batch`` method, which evaluates an entire group of individuals
+at once through `Landscape.eval_batch`.
+
+.. _NumPy: http://numpy.scipy.org/
 '''
 
 from math import sin, cos, fabs, sqrt, pi, e, exp, log
-from itertools import izip
+from itertools import chain, izip
 from esec.fitness import SimpleDominatingFitness
 from esec.landscape import Landscape
 from esec.utils import all_equal
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 #=======================================================================
 class Real(Landscape):
     '''Abstract real-valued parameter fitness landscape
@@ -89,6 +99,20 @@ class Real(Landscape):
         return (all(i1 >= i2 for i1, i2 in izip(indiv.lower_bounds, self.lower_bounds)) and
                 all(i1 <= i2 for i1, i2 in izip(indiv.upper_bounds, self.upper_bounds)))
     
+    def _genome_matrix(self, individuals):   #pylint: disable=R0201
+        '''Returns the phenomes of `individuals` as the rows of a NumPy
+        matrix, or ``None`` if NumPy is not available or the phenomes
+        are not all the same length.
+        
+        Subclasses use this to implement ``_eval_batch``.
+        '''
+        if numpy is None: return None
+        phenomes = [indiv.phenome for indiv in individuals]
+        length = len(phenomes[0])
+        if any(len(phenome) != length for phenome in phenomes): return None
+        genes = chain.from_iterable(phenomes)
+        return numpy.fromiter(genes, float, len(phenomes) * length).reshape(-1, length)
+    
     
     def info(self, level):
         '''Return landscape info for any real landscape.'''
@@ -315,6 +339,12 @@ class Sphere(Real):
         '''
         return sum(v*v for v in indiv)
     
+    def _eval_batch(self, individuals):
+        '''Vectorised equivalent of `_eval`.'''
+        x = self._genome_matrix(individuals)
+        if x is None: return None
+        return (x*x).sum(axis=1).tolist()
+    
 
 #rename Parabola (EC) to the more common standard Sphere
 Parabola = Sphere
@@ -435,6 +465,7 @@ class NoisyQuartic(Real):
     '''
     lname = 'Noisy Quartic'
     maximise = False
+    parallel = False # eval() consumes self.rand
     
     default = { 'size': { 'min': 2, 'max': 2 }, 'bounds': { 'lower': -5.12, 'upper': 5.12 } }
     
@@ -559,6 +590,22 @@ class Rastrigin(Real):
         '''f() = 10*n + sum((x_i)^2 - 10cos(2*pi*x_i))'''
         c = 2*pi
         return 10*len(indiv) + sum( x*x - 10*cos(c*x) for x in indiv)
+    
+    def _eval_delta(self, indiv, genome, value, changed):
+        '''Adjusts the parent's value by the terms of the genes in
+        `changed`.'''
+        c = 2*pi
+        phenome = indiv.phenome
+        for i in changed:
+            x, y = phenome[i], genome[i]
+            value += (x*x - 10*cos(c*x)) - (y*y - 10*cos(c*y))
+        return value
+    
+    def _eval_batch(self, individuals):
+        '''Vectorised equivalent of `_eval`.'''
+        x = self._genome_matrix(individuals)
+        if x is None: return None
+        return (10*x.shape[1] + (x*x - 10*numpy.cos(2*pi*x)).sum(axis=1)).tolist()
 
 #=======================================================================
 class Griewangk(Real):
@@ -597,6 +644,13 @@ class Griewangk(Real):
             total += x*x
             prod *= cos(x/sqrt(i+1))
         return 1 + (total / 4000.) - prod
+    
+    def _eval_batch(self, individuals):
+        '''Vectorised equivalent of `_eval`.'''
+        x = self._genome_matrix(individuals)
+        if x is None: return None
+        root_i = numpy.sqrt(numpy.arange(1, x.shape[1] + 1))
+        return (1 + (x*x).sum(axis=1) / 4000. - numpy.cos(x / root_i).prod(axis=1)).tolist()
 
 
 
@@ -642,6 +696,15 @@ class Ackley(Real):
             s1 += x*x
             s2 += cos(c*x)
         return -20 * exp(-0.2*sqrt((1/n)*s1)) - exp((1/n)*s2) + 20 + e
+    
+    def _eval_batch(self, individuals):
+        '''Vectorised equivalent of `_eval`.'''
+        x = self._genome_matrix(individuals)
+        if x is None: return None
+        n = float(x.shape[1])
+        s1 = (x*x).sum(axis=1)
+        s2 = numpy.cos(2*pi*x).sum(axis=1)
+        return (-20 * numpy.exp(-0.2*numpy.sqrt((1/n)*s1)) - numpy.exp((1/n)*s2) + 20 + e).tolist()
 
 
 
@@ -678,6 +741,21 @@ class Schwefel(Real):
     def _eval(self, indiv):
         '''f(x) = 418.9829*n + sum(x_i * sin(sqrt(abs(x_i))))'''
         return 418.9829*len(indiv) + sum(x * sin(sqrt(fabs(x))) for x in indiv)
+    
+    def _eval_delta(self, indiv, genome, value, changed):
+        '''Adjusts the parent's value by the terms of the genes in
+        `changed`.'''
+        phenome = indiv.phenome
+        for i in changed:
+            x, y = phenome[i], genome[i]
+            value += x * sin(sqrt(fabs(x))) - y * sin(sqrt(fabs(y)))
+        return value
+    
+    def _eval_batch(self, individuals):
+        '''Vectorised equivalent of `_eval`.'''
+        x = self._genome_matrix(individuals)
+        if x is None: return None
+        return (418.9829*x.shape[1] + (x * numpy.sin(numpy.sqrt(numpy.fabs(x)))).sum(axis=1)).tolist()
 
 
 #=======================================================================
@@ -719,6 +797,13 @@ class Michalewicz(Real):
         for i, x in enumerate(indiv):
             total += sin(x)*sin(((i+1)*x*x)/pi)**m2
         return -total
+    
+    def _eval_batch(self, individuals):
+        '''Vectorised equivalent of `_eval`.'''
+        x = self._genome_matrix(individuals)
+        if x is None: return None
+        i = numpy.arange(1, x.shape[1] + 1)
+        return (-(numpy.sin(x) * numpy.sin((i*x*x)/pi)**self.m2).sum(axis=1)).tolist()
 
 
 
@@ -1049,6 +1134,18 @@ class FMS(Real):
         # easy done...
         return total
     
+    def _eval_batch(self, individuals):
+        '''Vectorised equivalent of `_eval`. Each row of the
+        intermediate matrices holds the sampled output of one
+        individual.
+        '''
+        x = self._genome_matrix(individuals)
+        if x is None: return None
+        theta_t = numpy.array(self._theta_t)
+        v = [x[:, j:j+1] for j in xrange(6)]
+        y = v[0] * numpy.sin(v[1]*theta_t + v[2]*numpy.sin(v[3]*theta_t + v[4]*numpy.sin(v[5]*theta_t)))
+        return ((y - numpy.array(self._y0))**2).sum(axis=1).tolist()
+    
     
     def _fms(self, v, theta_t):
         '''y(t) = a1 * sin(w1*t*theta + a2 *
@@ -4,6 +4,7 @@ The `Sequence` base class inherits from `Landscape` for parameter
 validation and support. See `landscape` for details.
 '''
 
+from array import array
 from sys import maxsize
 from math import sqrt
 from itertools import chain, islice, izip
@@ -104,8 +105,148 @@ class SimplePacking(Sequence):
 
 #=======================================================================
 
+class CostMatrix(object):
+    '''A dense matrix of link costs between numbered nodes, stored in
+    a flat array of floats.
+    
+    Costs are obtained by indexing with a tuple of node indices, so a
+    `CostMatrix` may be used anywhere a dictionary of costs is expected.
+    The cost of a link from a node to itself is ``None`` and missing
+    links have an infinite cost.
+    '''
+    def __init__(self, size, costs=None):
+        '''Initialises a new cost matrix.
+        
+        :Parameters:
+          size : int
+            The number of nodes.
+          
+          costs : iterable(float) [optional]
+            The ``size*size`` costs in row-major order. If omitted, every
+            link has an infinite cost.
+        '''
+        self.size = size
+        '''The number of nodes.'''
+        if costs is None:
+            self.costs = array('d', [float('inf')]) * (size * size)
+        else:
+            self.costs = array('d', costs)
+        '''The link costs in row-major order.'''
+        assert len(self.costs) == size * size, "Expected %d costs" % (size * size)
+    
+    def __len__(self):
+        return self.size * self.size
+    
+    def __getitem__(self, (i, j)):
+        if i == j: return None
+        return self.costs[i * self.size + j]
+    
+    def __setitem__(self, (i, j), value):
+        self.costs[i * self.size + j] = float('inf') if value is None else value
+    
+    def __contains__(self, (i, j)):
+        return 0 <= i < self.size and 0 <= j < self.size
+    
+    def __iter__(self):
+        size = self.size
+        return ((i, j) for i in xrange(size) for j in xrange(size))
+    
+    iterkeys = __iter__
+    
+    def iteritems(self):
+        '''Returns an iterator over the ``((i, j), cost)`` pairs of
+        the matrix in row-major order.
+        '''
+        return (((i, j), self[i, j]) for i, j in self)
+    
+    def row(self, i):
+        '''Returns the costs of the links from node `i` as a list
+        indexed by destination node. The entry for node `i` is ``None``.
+        '''
+        size = self.size
+        result = self.costs[i * size:(i + 1) * size].tolist()
+        result[i] = None
+        return result
+    
+    def tour_length(self, tour):
+        '''Returns the total cost of visiting the nodes in `tour` in
+        order and returning to the first node.
+        '''
+        if not tour: return 0.0
+        costs = self.costs
+        size = self.size
+        return sum(costs[i * size + j] for i, j in izip(tour, chain(islice(tour, 1, None), tour[:1])))
+
+
+class EuclideanCostMap(CostMatrix):
+    '''The Euclidean distances between a set of two-dimensional
+    coordinates.
+    
+    Distances are calculated when required and are not stored, which
+    allows very large instances to be used without creating a full cost
+    matrix. Use `to_matrix` to calculate every distance once.
+    '''
+    def __init__(self, coordinates):    #pylint: disable=W0231
+        '''Initialises a new cost map.
+        
+        :Parameters:
+          coordinates : iterable((float, float))
+            The X and Y coordinates of each node.
+        '''
+        coordinates = list(coordinates)
+        self.size = len(coordinates)
+        '''The number of nodes.'''
+        self.x = array('d', (x for x, _ in coordinates))
+        '''The X coordinate of each node.'''
+        self.y = array('d', (y for _, y in coordinates))
+        '''The Y coordinate of each node.'''
+    
+    def __getitem__(self, (i, j)):
+        if i == j: return None
+        x = self.x[j] - self.x[i]
+        y = self.y[j] - self.y[i]
+        return sqrt(x*x + y*y)
+    
+    def __setitem__(self, key, value):
+        raise TypeError("Distances in a EuclideanCostMap cannot be changed.")
+    
+    def row(self, i):
+        '''Returns the distances from node `i` as a list indexed by
+        destination node. The entry for node `i` is ``None``.
+        '''
+        x1 = self.x[i]
+        y1 = self.y[i]
+        result = [sqrt(x*x + y*y) for x, y in ((x2 - x1, y2 - y1) for x2, y2 in izip(self.x, self.y))]
+        result[i] = None
+        return result
+    
+    def tour_length(self, tour):
+        '''Returns the total distance of visiting the nodes in `tour`
+        in order and returning to the first node.
+        '''
+        if not tour: return 0.0
+        xs = self.x
+        ys = self.y
+        total = 0
+        for i, j in izip(tour, chain(islice(tour, 1, None), tour[:1])):
+            x = xs[j] - xs[i]
+            y = ys[j] - ys[i]
+            total += sqrt(x*x + y*y)
+        return total
+    
+    def to_matrix(self):
+        '''Returns a `CostMatrix` containing every distance.'''
+        inf = float('inf')
+        return CostMatrix(self.size, (inf if cost is None else cost
+                                      for i in xrange(self.size) for cost in self.row(i)))
+
+#=======================================================================
+
 class TSP(Sequence):
     '''TSP fitness landscape.
+    
+    The cost map is stored as a `CostMatrix`, or as a `EuclideanCostMap`
+    for node lists with more than ``dense_limit`` nodes.
     '''
     lname = 'TSP'
     maximise = False
@@ -121,6 +262,8 @@ class TSP(Sequence):
         #   - a dictionary mapping tuples of integers to the cost of including a link from the first to
         #     the second (eg. { (0, 0): None, (0, 1): 1, (0, 2): 2, (0, 3): 3, (1, 0): 1, ... })
         'cost_map': '*',
+        # node lists with more nodes than this calculate distances when needed
+        'dense_limit': int,
     }
     
     default = {
@@ -131,6 +274,7 @@ class TSP(Sequence):
             [ 3, 1, 3, None, 4 ],
             [ 7, 5, 9, 4, None ],
         ],
+        'dense_limit': 1000,
     }
     
     berlin52_map = [
@@ -159,61 +303,52 @@ class TSP(Sequence):
         # call parent cfg magic, validate/strict test syntax/defaults/cfg
         super(TSP, self).__init__(cfg, **other_cfg)
         
-        self.cost_map = self.cfg.cost_map
+        cost_map = self.cfg.cost_map
         
-        if isinstance(self.cost_map, str):
-            with open(self.cost_map) as source:
-                self.cost_map = [[float(i) for i in line.split(',')] for line in source]
+        if isinstance(cost_map, str):
+            with open(cost_map) as source:
+                cost_map = [[float(i) for i in line.split(',')] for line in source]
         
-        # Not elif to allow node conversion if necessary
-        if isinstance(self.cost_map, (list, tuple)) and isinstance(self.cost_map[0], (list, tuple)):
-            # Convert list-of-lists to dictionary lookup
-            cost_map = { }
-            if len(self.cost_map) == len(self.cost_map[0]):
-                # Dimensions are equal, so assume cost matrix
-                
-                if len(self.cost_map[1]) == len(self.cost_map[0]):
-                    # Dimensions remain equal, so assume full matrix
-                    for i in xrange(len(self.cost_map)):
-                        for j in xrange(len(self.cost_map[i])):
-                            cost_map[(i, j)] = self.cost_map[i][j]
-                        cost_map[(i, i)] = None
-                
-                elif len(self.cost_map[1]) == len(self.cost_map[0]) - 1:
-                    # Dimensions reduce, so assume half matrix
-                    for i in xrange(len(self.cost_map)):
-                        cost_map[(i, i)] = None
-                        for j in xrange(len(self.cost_map[i])):
-                            cost_map[(i, j + i + 1)] = self.cost_map[i][j]
-                            cost_map[(j + i + 1, i)] = self.cost_map[i][j]
-                
-                cost_map[(len(self.cost_map), len(self.cost_map))] = None
-                
-            elif len(self.cost_map[0]) == 2:
-                # Nested dimension is 2, so assume list of coordinates
-                for i, (x1, y1) in enumerate(self.cost_map):
-                    for j, (x2, y2) in enumerate(self.cost_map):
-                        if i == j:
-                            cost_map[(i, j)] = None
-                        else:
-                            x = x2 - x1
-                            y = y2 - y1
-                            cost_map[(i, j)] = sqrt(x*x + y*y)
-            elif len(self.cost_map[0]) == 3:
-                # Nested dimension is 3, so assume list of coordinates with leading index
-                for i, (_, x1, y1) in enumerate(self.cost_map):
-                    for j, (_, x2, y2) in enumerate(self.cost_map):
-                        if i == j:
-                            cost_map[(i, j)] = None
-                        else:
-                            x = x2 - x1
-                            y = y2 - y1
-                            cost_map[(i, j)] = sqrt(x*x + y*y)
-            self.cost_map = cost_map
+        if isinstance(cost_map, CostMatrix):
+            pass
+        
+        elif isinstance(cost_map, dict):
+            matrix = CostMatrix(max(max(key) for key in cost_map.iterkeys()) + 1)
+            for key, value in cost_map.iteritems():
+                matrix[key] = value
+            cost_map = matrix
+        
+        elif len(cost_map) == len(cost_map[0]):
+            # Dimensions are equal, so assume cost matrix
+            
+            if len(cost_map[1]) == len(cost_map[0]):
+                # Dimensions remain equal, so assume full matrix
+                size = len(cost_map)
+                matrix = CostMatrix(size, (float('inf') if value is None else value
+                                           for row in cost_map for value in row[:size]))
+            
+            elif len(cost_map[1]) == len(cost_map[0]) - 1:
+                # Dimensions reduce, so assume half matrix
+                matrix = CostMatrix(len(cost_map) + 1)
+                for i, row in enumerate(cost_map):
+                    for j, value in enumerate(row):
+                        matrix[i, j + i + 1] = matrix[j + i + 1, i] = value
+            cost_map = matrix
+            
+        elif len(cost_map[0]) == 2:
+            # Nested dimension is 2, so assume list of coordinates
+            cost_map = EuclideanCostMap(cost_map)
+        elif len(cost_map[0]) == 3:
+            # Nested dimension is 3, so assume list of coordinates with leading index
+            cost_map = EuclideanCostMap((x, y) for _, x, y in cost_map)
+        
+        if isinstance(cost_map, EuclideanCostMap) and cost_map.size <= self.cfg.dense_limit:
+            cost_map = cost_map.to_matrix()
         
-        d = max(self.cost_map.iterkeys())
-        d = (d[0] + 1, d[1] + 1)
-        self.size.min = self.size.max = self.size.exact = min(d)
+        self.cost_map = cost_map
+        '''The `CostMatrix` (or `EuclideanCostMap`) used to evaluate
+        tours.'''
+        self.size.min = self.size.max = self.size.exact = cost_map.size
     
     def phenome_string(self, indiv):
         '''Produces a string representation of `indiv`.'''
@@ -221,51 +356,33 @@ class TSP(Sequence):
     
     def _eval(self, indiv):
         '''Determines the length of a given tour.'''
-        cost_map = self.cost_map
-        cost = 0.0
-        
         assert isinstance(indiv, SequenceIndividual), \
             "Expected 'SequenceIndividual', not '%s'" % type(indiv).__name__
         
         if not indiv.legal():
             return float('inf')
         
-        assert all(p in cost_map for p in esec.utils.overlapped_pairs(indiv.phenome)), \
+        phenome = indiv.phenome
+        assert all(0 <= i < self.cost_map.size for i in phenome), \
             "Cost map is incomplete: missing %s" % \
-            next(p not in cost_map for p in esec.utils.overlapped_pairs(indiv.phenome))
+            next(i for i in phenome if not 0 <= i < self.cost_map.size)
         
-        try:
-            return sum(cost_map[p] for p in esec.utils.overlapped_pairs(indiv.phenome))
-        except KeyError:
-            return float('inf')
+        return self.cost_map.tour_length(phenome)
     
     def info(self, level):
         '''Return the basics and, if `level` > 3, the cost map.
         '''
         result = super(TSP, self).info(level)
-        if not self.cost_map:
+        size = self.cost_map.size
+        if not size:
             result.append("Cost map: None")
-        elif (level > 3 and len(self.cost_map) < 1000) or level > 4:
+        elif (level > 3 and size * size < 1000) or level > 4:
             result.append("Cost map:")
-            line = ''
-            last = None
-            map_items = sorted(self.cost_map.iteritems(), key=lambda i: i[0])
-            for cost in map_items:
-                if last == None: last = cost[0][0]
-                if last != cost[0][0]:
-                    result.append(line)
-                    line = ''
-                    last = cost[0][0]
-                
-                if isinstance(cost[1], (int, float)):
-                    line += '%8.2f ' % cost[1]
-                else:
-                    line += '%8s ' % (cost[1],)
-            result.append(line)
+            for i in xrange(size):
+                result.append(''.join(('%8.2f ' % cost if isinstance(cost, (int, float)) else '%8s ' % (cost,))
+                                      for cost in self.cost_map.row(i)))
         else:
-            d = max(self.cost_map.iterkeys())
-            d = (d[0] + 1, d[1] + 1)
-            result.append('Cost map: {%dx%d}' % d)
+            result.append('Cost map: {%dx%d}' % (size, size))
             if level > 3:
                 result[-1] += ' (Set verbosity to 5 to display.)'
         return result
@@ -140,9 +140,11 @@ class Multiplexer(TGP):
             ' or '.join(self.instruction_set).capitalize() + " instructions expected."
         assert indiv.terminals >= self.terminals, "At least %d terminals required" % self.terminals
         fitness = 0
-        for case in self.test_cases:
-            result = indiv.evaluate(indiv, terminals=case[0])
-            fitness += 1 if (result == case[1]) else 0
+        # indiv.evaluate compiles the program once and reuses it
+        evaluate = indiv.evaluate
+        for terminals, expected in self.test_cases:
+            if evaluate(indiv, terminals=terminals) == expected:
+                fitness += 1
         
         cost = self._size_penalty(indiv)
         
@@ -258,6 +258,29 @@ class MonitorBase(object):
         '''
         return True
     
+    def get_state(self):                    #pylint: disable=R0201
+        '''Called when saving a checkpoint to obtain the state of the
+        monitor. The returned object must be picklable.
+        
+        Monitors that are not derived from `MonitorBase` do not need to
+        implement this method.
+        
+        :Returns:
+            An object that can be passed to `set_state` to restore the
+            current state of the monitor.
+        '''
+        return None
+    
+    def set_state(self, state):
+        '''Called when resuming from a checkpoint, after `on_run_start`
+        and `on_pre_reset`, to restore a state returned by `get_state`.
+        
+        :Parameters:
+          state : object
+            The value returned from `get_state`.
+        '''
+        pass
+    
 
 from esec.monitors.consolemonitor import ConsoleMonitor
 from esec.monitors.csvmonitor import CSVMonitor
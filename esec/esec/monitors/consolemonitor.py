@@ -3,11 +3,9 @@ object based on prespecified report strings.
 
 See `esec.monitors` for a general overview of monitors.
 '''
-from math import isinf
-
-from esec.fitness import EmptyFitness
 from esec.individual import EmptyIndividual
 from esec.monitors import MonitorBase
+from esec.monitors.groupstatistics import GroupStatistics
 from esec.utils import attrdict, ConfigDict, is_ironpython
 from esec.utils.exceptions import ESDLCompilerError, ExceptionGroup
 
@@ -88,6 +86,21 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
         'local_dispersion': [ ' dispersion ', '%11g ', 'stats.local_dispersion'],
         # for GE landscapes only
         'local_no_compile': [ ' !compile ', '%9d ', 'stats.local_did_not_compile', 0 ],
+        'local_phenome_hits':      [ ' ph.hits ', '%8d ', 'stats.local_phenome_cache_hits', 0 ],
+        'local_phenome_misses':    [ ' ph.miss ', '%8d ', 'stats.local_phenome_cache_misses', 0 ],
+        'global_phenome_hits':     [ ' ph.hits ', '%8d ', 'stats.global_phenome_cache_hits', 0 ],
+        'global_phenome_misses':   [ ' ph.miss ', '%8d ', 'stats.global_phenome_cache_misses', 0 ],
+        'local_fitness_hits':      [ ' fit.hits ', '%9d ', 'stats.local_fitness_cache_hits', 0 ],
+        'local_fitness_misses':    [ ' fit.miss ', '%9d ', 'stats.local_fitness_cache_misses', 0 ],
+        'global_fitness_hits':     [ ' fit.hits ', '%9d ', 'stats.global_fitness_cache_hits', 0 ],
+        'global_fitness_misses':   [ ' fit.miss ', '%9d ', 'stats.global_fitness_cache_misses', 0 ],
+        # for profiled systems only
+        'local_block_time':     [ ' blk.time ', '%9.3f ', 'stats.local_block_time', 0 ],
+        'local_stage_time':     [ ' stg.time ', '%9.3f ', 'stats.local_stage_time', 0 ],
+        'local_eval_time':      [ ' evl.time ', '%9.3f ', 'stats.local_eval_time', 0 ],
+        'global_block_time':    [ ' blk.time ', '%9.3f ', 'stats.global_block_time', 0 ],
+        'global_stage_time':    [ ' stg.time ', '%9.3f ', 'stats.global_stage_time', 0 ],
+        'global_eval_time':     [ ' evl.time ', '%9.3f ', 'stats.global_eval_time', 0 ],
         
         'local_best_genome':    [ ' genome ', ' %s', 'stats.local_max.genome_string' ],
         'local_best_phenome':   [ ' phenome ', ' %s', 'stats.local_max.phenome_string' ],
@@ -190,6 +203,7 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
             'evaluations?': [int, None],
         },
         'formats?' : dict,
+        'diversity_sample?': [int, None],
     }
     '''The expected format of the configuration dictionary passed to
     `__init__`.
@@ -262,6 +276,11 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
       
       formats : (dictionary)
         A dictionary of extra formats to include with those in `format`.
+      
+      diversity_sample : (int > 1 [optional])
+        The number of individuals sampled from each group to estimate
+        ``local_diversity`` and ``local_dispersion``. If omitted, every
+        individual is used. See `esec.monitors.diversity`.
     '''
     
     default = {
@@ -275,7 +294,8 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
         'summary': 'status+best+best_phenome',
         'exception_summary': 'status+iter+births+evals',
         'formats': { },
-        'limits': { }
+        'limits': { },
+        'diversity_sample': None,
     }
     
     def __init__(self, cfg):
@@ -376,6 +396,32 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
         calculated for each group; otherwise, ``False``.
         '''
         
+        # Only calculate the remaining group statistics if they may be
+        # displayed. When verbose is 2 or higher, all statistics are
+        # displayed at the end of the run.
+        used = set()
+        for report in (self.cfg.report, self.cfg.summary, self.cfg.exception_summary):
+            names = self._used_statistics(report)
+            used = used.union(names) if names is not None and used is not None else None
+        if self.verbose >= 2: used = None
+        uses = lambda *names: used is None or any(name in used for name in names)
+        fitness_stats = ('local_max', 'local_min', 'local_ave_fitness', 'global_max', 'global_min',
+                         'global_ave_fitness', 'local_unique', 'local_diversity', 'local_dispersion',
+                         'local_evals', 'global_evals')
+        self.statistics = GroupStatistics(
+            minimum=uses('local_min', 'global_min'),
+            average=uses('local_ave_fitness', 'global_ave_fitness'),
+            counters=used is None or any(name.startswith(('local_', 'global_')) and name not in fitness_stats
+                                         for name in used),
+            unique=self.measure_unique,
+            diversity=self.measure_diversity,
+            dispersion=self.measure_dispersion,
+            sample_size=self.cfg.diversity_sample,
+        )
+        '''The `GroupStatistics` instance used to calculate statistics
+        for each group.
+        '''
+        
         # ------------------------------------------------------------
         # Other members
         self._start_time_ms = 0L
@@ -492,6 +538,26 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
         
         return (hdrs, fmts, calls)
     
+    def _used_statistics(self, report):
+        '''Returns the set of statistic names read by the columns in
+        `report`, or ``None`` if any column uses a custom function.
+        '''
+        names = set()
+        for cmd in (s.strip() for s in report.split('+')):
+            value = self.cfg.formats.get(cmd) or self.format.get(cmd)
+            if isinstance(value, str):
+                inner = self._used_statistics(value)
+                if inner is None: return None
+                names.update(inner)
+            elif value:
+                target = value[2]
+                if target is None: continue
+                if hasattr(target, '__call__'): return None
+                bit, _, stat = target.partition('.')
+                if bit == 'stats' and stat:
+                    names.add(stat.partition('.')[0])
+        return names
+    
     def on_yield(self, sender, name, group):
         '''Collates individual statistics for each group. Statistics for
         the primary population are promoted to the main statistics
@@ -500,60 +566,7 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
         self._stats['groups'].update([name])
         self._stats[name] = pop_stat = self._stats.get(name, { })
         
-        best = EmptyIndividual()
-        worst = group[0] if len(group) else EmptyIndividual()
-        fit_sum = EmptyFitness()
-        for i in group:
-            # Accumulate fitness before statistics because i.fitness
-            # may increment the 'evals' statistic.
-            if not isinf(i.fitness.simple):
-                fit_sum += i.fitness
-            if i.fitness > best.fitness: best = i
-            if i.fitness < worst.fitness: worst = i
-            
-            items = i.statistic.items()
-            for key, value in items:
-                for prefix in ('global_', 'local_'):
-                    fullkey = prefix + key
-                    if fullkey in pop_stat: pop_stat[fullkey] += value
-                    else: pop_stat[fullkey] = value
-        
-        # Update local stats
-        pop_stat['local_max'] = best
-        pop_stat['local_ave_fitness'] = fit_sum / float(len(group))
-        pop_stat['local_min'] = worst
-        
-        # Update global stats
-        pop_max = pop_stat.get('global_max', EmptyIndividual())
-        if best.fitness > pop_max.fitness:
-            pop_max = best
-            pop_stat['stable_count'] = 0
-        else:
-            pop_stat['stable_count'] = pop_stat.get('stable_count', 0) + 1
-        pop_min = pop_stat.get('global_min', worst)
-        if worst.fitness < pop_min.fitness:
-            pop_min = worst
-        pop_sum = fit_sum + pop_stat.get('_global_sum_fitness', EmptyFitness())
-        pop_cnt = float(len(group)) + pop_stat.get('_global_cnt_fitness', 0)
-        pop_stat['global_max'] = pop_max
-        pop_stat['_global_sum_fitness'] = pop_sum
-        pop_stat['_global_cnt_fitness'] = pop_cnt
-        pop_stat['global_ave_fitness'] = pop_sum / pop_cnt
-        pop_stat['global_min'] = pop_min
-        
-        pop_stat['local_diversity'] = 0.0
-        pop_stat['local_dispersion'] = 0.0
-        pop_stat['local_unique'] = 0.0
-        ## TODO: Implement diversity and dispersion measures
-        if self.measure_diversity:
-            pass
-        if self.measure_dispersion:
-            pass
-        if self.measure_unique:
-            pop_stat['local_unique'] = len(set([g.phenome_string for g in group]))
-        
-        # Update size
-        pop_stat['size'] = len(group)
+        self.statistics.update(pop_stat, name, group)
         
         if name == self.primary:
             # If this is the primary, transfer all stats out to the root
@@ -590,16 +603,15 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
                     print >> self.config_out
                 self.config_out.flush()
         
-        elif sender == 'System':
-            if name == 'Block':
-                # `value` contains a block name
-                key = value
-                self._last_block_name = key
-                blocks = self._stats['blocks']
-                if key in blocks:
-                    blocks[key] += 1
-                else:
-                    blocks[key] = 1
+        elif sender == 'System' and name == 'Block':
+            # `value` contains a block name
+            key = value
+            self._last_block_name = key
+            blocks = self._stats['blocks']
+            if key in blocks:
+                blocks[key] += 1
+            else:
+                blocks[key] = 1
         
         elif sender == 'Monitor':
             if name == 'Statistics':
@@ -665,6 +677,7 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
         }
         self.stop_now = False
         self.end_code = None
+        self.statistics.reset()
         
         # Get the time values so that the first iteration shows the
         # correct timing values.
@@ -805,6 +818,25 @@ class ConsoleMonitor(MonitorBase):  #pylint: disable=R0902
         
         return bool(self.end_code)
     
+    def get_state(self):
+        '''Returns the statistics and termination state of the monitor.
+        '''
+        return {
+            'stats': self._stats,
+            'last_block_name': self._last_block_name,
+            'stop_now': self.stop_now,
+            'end_code': self.end_code,
+        }
+    
+    def set_state(self, state):
+        '''Restores the statistics and termination state of the monitor.
+        '''
+        self._stats = state['stats']
+        self.statistics.reset()
+        self._last_block_name = state['last_block_name']
+        self.stop_now = state['stop_now']
+        self.end_code = state['end_code']
+
     
     # Report functions
     
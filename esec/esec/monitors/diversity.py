@@ -0,0 +1,152 @@
+'''Measures the diversity and dispersion of groups of individuals.
+
+Each measure is calculated from per-locus or per-edge frequencies in a
+single pass over the genomes, rather than by comparing every pair of
+individuals, so the cost is proportional to the total number of genes.
+
+The measures depend on the species of the individuals:
+
+  Binary (`BinarySpecies` and derived species)
+    Diversity is the mean Hamming distance between pairs of
+    individuals, calculated from the frequency of each allele at each
+    locus. Dispersion is the mean entropy (in bits) of the alleles at
+    each locus, between zero and one.
+  
+  Real and integer (`RealSpecies` and `IntegerSpecies`)
+    Diversity is the root-mean-square Euclidean distance between pairs
+    of individuals, calculated from each individual's distance to the
+    centroid of the group. Dispersion is the mean Euclidean distance
+    to the centroid.
+  
+  Sequence (`SequenceSpecies`)
+    Diversity is the mean number of adjacencies (edges between
+    neighbouring genes, ignoring direction) that are not shared by a
+    pair of individuals. Dispersion is the entropy of the edge
+    frequencies, scaled so that it is zero when every individual has
+    the same edges and one when no edge is shared.
+
+Both measures are zero for groups with fewer than two individuals and
+for other species.
+'''
+from itertools import izip, islice
+from math import log, sqrt
+from random import Random
+
+def _columns(genomes):
+    '''Returns a list containing a tuple of the genes at each locus of
+    `genomes`. Genes are omitted for genomes that are too short to
+    include a locus.
+    '''
+    lengths = set(len(g) for g in genomes)
+    if len(lengths) == 1:
+        return zip(*genomes)
+    return [tuple(g[i] for g in genomes if len(g) > i) for i in xrange(max(lengths))]
+
+def binary_measures(genomes):
+    '''Returns the diversity and dispersion of a list of binary genomes.
+    See `esec.monitors.diversity` for the definitions.
+    '''
+    if len(genomes) < 2: return 0.0, 0.0
+    
+    from esec.species.binary_packed import BitString
+    one = 1
+    if any(isinstance(g, BitString) for g in genomes):
+        # Packed genomes are counted as strings, with gene zero first
+        genomes = [bin(g.value)[:1:-1].ljust(g.length, '0')[:g.length] if isinstance(g, BitString) else
+                   ''.join('1' if gene else '0' for gene in g) for g in genomes]
+        one = '1'
+    columns = _columns(genomes)
+    if not columns: return 0.0, 0.0
+    
+    diversity = 0.0
+    entropy = 0.0
+    for column in columns:
+        size = len(column)
+        ones = column.count(one)
+        if 0 < ones < size:
+            diversity += 2.0 * ones * (size - ones) / (size * (size - 1))
+            p = ones / float(size)
+            entropy -= p * log(p, 2) + (1.0 - p) * log(1.0 - p, 2)
+    return diversity, entropy / len(columns)
+
+def real_measures(genomes):
+    '''Returns the diversity and dispersion of a list of real- or
+    integer-valued genomes. See `esec.monitors.diversity` for the
+    definitions.
+    '''
+    size = len(genomes)
+    if size < 2: return 0.0, 0.0
+    
+    centroid = [sum(column) / float(len(column)) for column in _columns(genomes)]
+    squared = [sum([(x - c) ** 2 for x, c in izip(g, centroid)]) for g in genomes]
+    # The mean squared distance between pairs of individuals is
+    # 2n/(n-1) times the mean squared distance to the centroid.
+    diversity = sqrt(2.0 * sum(squared) / (size - 1))
+    dispersion = sum(sqrt(d) for d in squared) / size
+    return diversity, dispersion
+
+def sequence_measures(genomes):
+    '''Returns the diversity and dispersion of a list of sequence
+    genomes. See `esec.monitors.diversity` for the definitions.
+    '''
+    size = len(genomes)
+    if size < 2: return 0.0, 0.0
+    
+    counts = { }
+    get = counts.get
+    for g in genomes:
+        for a, b in izip(g, islice(g, 1, None)):
+            edge = (a, b) if a < b else (b, a)
+            counts[edge] = get(edge, 0) + 1
+    total = sum(counts.itervalues())
+    if not total: return 0.0, 0.0
+    
+    # Two different individuals share sum(c*(c-1))/(n*(n-1)) edges on
+    # average, where c is the number of individuals with each edge.
+    shared = sum(c * (c - 1) for c in counts.itervalues())
+    diversity = float(total) / size - float(shared) / (size * (size - 1))
+    # The entropy ranges from log(total/n) when all individuals have
+    # the same edges to log(total) when no edges are shared.
+    entropy = log(total) - sum(c * log(c) for c in counts.itervalues()) / total
+    dispersion = (entropy - log(float(total) / size)) / log(size)
+    return diversity, min(max(dispersion, 0.0), 1.0)
+
+def measure(group, sample_size=None, rand=None):
+    '''Returns the diversity and dispersion of `group` as a tuple.
+    
+    :Parameters:
+      group : list of `Individual`
+        The individuals to measure. The species of the first individual
+        determines which measures are used.
+      
+      sample_size : int [optional]
+        If specified and smaller than the number of individuals in
+        `group`, the measures are estimated from a random sample of
+        this many individuals.
+      
+      rand : ``random.Random`` [optional]
+        The random number generator used for sampling. This should be
+        separate from the generator used by the experiment so that
+        measuring a group does not affect the results. If omitted, a
+        new generator is used.
+    '''
+    if sample_size and len(group) > sample_size:
+        group = (rand or Random()).sample(group, sample_size)
+    if len(group) < 2: return 0.0, 0.0
+    
+    # Species are imported here because esec.monitors is imported
+    # before esec.species.
+    from esec.species.binary import BinarySpecies
+    from esec.species.integer import IntegerSpecies
+    from esec.species.real import RealSpecies
+    from esec.species.sequence import SequenceSpecies
+    
+    species = getattr(group[0], 'species', None)
+    genomes = [i.genome for i in group]
+    if isinstance(species, BinarySpecies):
+        return binary_measures(genomes)
+    elif isinstance(species, SequenceSpecies):
+        return sequence_measures(genomes)
+    elif isinstance(species, (RealSpecies, IntegerSpecies)):
+        return real_measures(genomes)
+    return 0.0, 0.0
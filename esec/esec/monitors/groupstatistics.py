@@ -0,0 +1,182 @@
+'''Collects the fitness and other statistics of groups yielded to a
+monitor.
+
+`GroupStatistics` visits each individual of a group once and only
+calculates the values that have been requested. Values that depend only
+on an individual, such as its fitness key or phenome string, are
+remembered for the next group with the same name, so individuals that
+survive between generations are not examined again.
+'''
+from math import isinf
+from random import Random
+
+from esec.fitness import EmptyFitness
+from esec.individual import EmptyIndividual
+from esec.monitors import diversity
+
+class GroupStatistics(object):
+    '''Calculates the statistics for each group yielded to a monitor.
+    
+    The statistics are stored in a dictionary for each group using the
+    same names as `esec.monitors.ConsoleMonitor` has always used:
+    ``local_max``, ``local_min``, ``local_ave_fitness``,
+    ``global_max``, ``global_min``, ``global_ave_fitness``,
+    ``stable_count``, ``local_unique`` and ``size``, as well as
+    ``local_`` and ``global_`` totals of each individual's
+    ``statistic`` dictionary. ``local_diversity`` and
+    ``local_dispersion`` are calculated by `esec.monitors.diversity`.
+    ``local_max``, ``global_max``, ``stable_count`` and ``size`` are
+    always calculated.
+    '''
+    
+    def __init__(self, minimum=True, average=True, counters=True, unique=True,
+                 diversity=False, dispersion=False, sample_size=None):
+        '''Initialises a new statistics engine.
+        
+        :Parameters:
+          minimum : bool
+            ``True`` to calculate ``local_min`` and ``global_min``.
+          
+          average : bool
+            ``True`` to calculate ``local_ave_fitness`` and
+            ``global_ave_fitness``.
+          
+          counters : bool
+            ``True`` to accumulate the ``statistic`` dictionary of each
+            individual.
+          
+          unique : bool
+            ``True`` to count the number of unique phenomes in
+            ``local_unique``.
+          
+          diversity : bool
+            ``True`` to calculate ``local_diversity``.
+          
+          dispersion : bool
+            ``True`` to calculate ``local_dispersion``.
+          
+          sample_size : int [optional]
+            If specified, diversity and dispersion are estimated from
+            a random sample of this many individuals from each group.
+            Samples are taken using a separate random number generator
+            so they do not affect the experiment.
+        '''
+        self.minimum = minimum
+        self.average = average
+        self.counters = counters
+        self.unique = unique
+        self.diversity = diversity
+        self.dispersion = dispersion
+        self.sample_size = sample_size
+        self._rand = Random(0)
+        self._seen = { }
+    
+    def reset(self):
+        '''Forgets the individuals remembered from previous groups.'''
+        self._seen = { }
+    
+    def _entry(self, indiv):
+        '''Returns the values remembered for `indiv` as a tuple
+        containing `indiv`, its fitness, the fitness key, ``True`` if
+        the fitness is finite, and the phenome string (or ``None`` if
+        `unique` is ``False``).
+        '''
+        fitness = indiv.fitness
+        return (indiv, fitness, fitness.key, not isinf(fitness.simple),
+                indiv.phenome_string if self.unique else None)
+    
+    def update(self, pop_stat, name, group):    #pylint: disable=R0912,R0914
+        '''Updates `pop_stat` with the statistics of `group`, which was
+        yielded with the name `name`.
+        '''
+        previous = self._seen.get(name, { })
+        seen = { }
+        entries = [ ]
+        for indiv in group:
+            entry = previous.get(id(indiv))
+            if entry is None or entry[0] is not indiv or entry[1] is not indiv._fitness:   #pylint: disable=W0212
+                entry = self._entry(indiv)
+            seen[id(indiv)] = entry
+            entries.append(entry)
+        self._seen[name] = seen
+        size = len(entries)
+        
+        # Find the first best and first worst individuals
+        best = worst = None
+        if entries:
+            best = worst = entries[0]
+            best_key = worst_key = best[2]
+            for entry in entries:
+                key = entry[2]
+                if key > best_key: best, best_key = entry, key
+                if key < worst_key: worst, worst_key = entry, key
+        best = best[0] if best else EmptyIndividual()
+        pop_stat['local_max'] = best
+        
+        pop_max = pop_stat.get('global_max', EmptyIndividual())
+        if best.fitness.key > pop_max.fitness.key:
+            pop_max = best
+            pop_stat['stable_count'] = 0
+        else:
+            pop_stat['stable_count'] = pop_stat.get('stable_count', 0) + 1
+        pop_stat['global_max'] = pop_max
+        
+        if self.minimum:
+            worst = worst[0] if worst else EmptyIndividual()
+            pop_stat['local_min'] = worst
+            pop_min = pop_stat.get('global_min', worst)
+            if worst.fitness.key < pop_min.fitness.key:
+                pop_min = worst
+            pop_stat['global_min'] = pop_min
+        
+        if self.average:
+            finite = [entry[1] for entry in entries if entry[3]]
+            fit_sum = EmptyFitness()
+            if finite:
+                fitness_type = type(finite[0])
+                if finite[0].key is not finite[0] and all(type(f) is fitness_type for f in finite):
+                    # Single-valued fitnesses are summed as numbers
+                    fit_sum = fitness_type((sum(f.values[0] for f in finite),), True)
+                else:
+                    for fitness in finite:
+                        fit_sum += fitness
+            pop_stat['local_ave_fitness'] = fit_sum / float(size)
+            
+            pop_sum = fit_sum + pop_stat.get('_global_sum_fitness', EmptyFitness())
+            pop_cnt = float(size) + pop_stat.get('_global_cnt_fitness', 0)
+            pop_stat['_global_sum_fitness'] = pop_sum
+            pop_stat['_global_cnt_fitness'] = pop_cnt
+            pop_stat['global_ave_fitness'] = pop_sum / pop_cnt
+        
+        if self.counters:
+            # Individuals frequently share statistic dictionaries, so
+            # each distinct dictionary is only accumulated once.
+            shared = { }
+            for entry in entries:
+                statistic = entry[0].statistic
+                if statistic:
+                    item = shared.get(id(statistic))
+                    if item is None: shared[id(statistic)] = [statistic, 1]
+                    else: item[1] += 1
+            totals = { }
+            for statistic, count in shared.itervalues():
+                for key, value in statistic.iteritems():
+                    if count != 1: value *= count
+                    if key in totals: totals[key] += value
+                    else: totals[key] = value
+            for key, value in totals.iteritems():
+                for fullkey in ('global_' + key, 'local_' + key):
+                    if fullkey in pop_stat: pop_stat[fullkey] += value
+                    else: pop_stat[fullkey] = value
+        
+        pop_stat['local_diversity'] = 0.0
+        pop_stat['local_dispersion'] = 0.0
+        if self.diversity or self.dispersion:
+            measures = diversity.measure([entry[0] for entry in entries], self.sample_size, self._rand)
+            pop_stat['local_diversity'], pop_stat['local_dispersion'] = measures
+        
+        pop_stat['local_unique'] = 0.0
+        if self.unique:
+            pop_stat['local_unique'] = len(set(entry[4] for entry in entries))
+        
+        pop_stat['size'] = size
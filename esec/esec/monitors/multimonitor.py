@@ -113,3 +113,13 @@ class MultiMonitor(MonitorBase):  #pylint: disable=R0902
             partial_result = monitor.should_terminate(sender)
             result = result or partial_result
         return result
+    
+    def get_state(self):
+        '''Returns a list containing the state of each monitor.'''
+        return [getattr(monitor, 'get_state', lambda: None)() for monitor in self._monitors]
+    
+    def set_state(self, state):
+        '''Restores the state of each monitor.'''
+        for monitor, monitor_state in zip(self._monitors, state):
+            if hasattr(monitor, 'set_state'):
+                monitor.set_state(monitor_state)
@@ -0,0 +1,148 @@
+'''Provides the `ParallelEvaluator` class, which evaluates groups of
+individuals using a pool of local worker processes.
+
+A `ParallelEvaluator` is created by `esec.system.System` when the
+``processes`` configuration value is provided. It replaces the
+``_evaluate`` function used by the code emitted for ``EVAL``
+statements, so that every unevaluated individual in the evaluated
+groups is sent to the worker pool immediately, rather than being
+evaluated lazily when its ``fitness`` is first read.
+
+Only evaluators that set a ``parallel`` attribute to ``True`` are
+evaluated in worker processes. `esec.landscape.Landscape` sets this by
+default; landscapes that consume random numbers or depend on shared
+state during evaluation must set it to ``False``. All other evaluators
+are handled exactly as they would be without a `ParallelEvaluator`.
+
+Because the worker processes never touch the system-wide random number
+generator and results are written back in the original order, runs
+using a `ParallelEvaluator` produce identical results to serial runs
+with the same seed.
+'''
+
+import sys
+import traceback
+from itertools import islice
+from esec.context import notify
+from esec.utils.exceptions import EvaluatorError
+
+def _evaluate_chunk(args):
+    '''Evaluates a list of individuals in a worker process.
+    
+    :Parameters:
+      args : tuple
+        A tuple containing the evaluator and a list of individuals.
+    
+    :Returns:
+        A tuple containing ``True`` and the list of fitness values, or
+        ``False`` and a tuple of exception details if an evaluation
+        failed.
+    '''
+    evaluator, individuals = args
+    try:
+        return True, [evaluator.eval(indiv) for indiv in individuals]
+    except KeyboardInterrupt:
+        raise
+    except:
+        ex = sys.exc_info()
+        return False, (ex[0], ex[1], ''.join(traceback.format_exception(*ex)))
+
+class ParallelEvaluator(object):
+    '''Evaluates groups of individuals using a pool of worker
+    processes.
+    '''
+    
+    def __init__(self, processes=None, chunksize=None):
+        '''Initialises a new `ParallelEvaluator`. The worker pool is
+        not started until the first evaluation is required.
+        
+        :Parameters:
+          processes : int [optional]
+            The number of worker processes to use. If ``None`` or zero,
+            one process is used for each available CPU.
+          
+          chunksize : int [optional]
+            The number of individuals sent to a worker process at a
+            time. If ``None``, each group is split into approximately
+            four chunks per process.
+        '''
+        self.processes = processes or None
+        self.chunksize = chunksize
+        self._pool = None
+    
+    @property
+    def pool(self):
+        '''Returns the worker pool, starting it if necessary.'''
+        if self._pool is None:
+            from multiprocessing import Pool
+            self._pool = Pool(self.processes)
+            self.processes = self._pool._processes  #pylint: disable=W0212
+        return self._pool
+    
+    def close(self):
+        '''Terminates the worker pool. The pool is restarted if another
+        evaluation is required.
+        '''
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+    
+    def evaluate(self, evaluator, _source):
+        '''Assigns `evaluator` to every individual in `_source` and
+        evaluates them.
+        
+        Individuals are evaluated in worker processes if
+        ``evaluator.parallel`` is ``True``. Otherwise, their existing
+        fitness is cleared and will be calculated when next required.
+        
+        :Parameters:
+          evaluator : evaluator
+            The evaluator to use, or ``None`` to use the default
+            evaluator of each individual's species.
+          
+          _source : iterable(`Individual`)
+            The individuals to evaluate.
+        '''
+        # Pending individuals are kept in order of first appearance so
+        # that the results do not depend on the scheduling of workers.
+        pending = []
+        seen = set()
+        for indiv in _source:
+            indiv._eval = evaluator             #pylint: disable=W0212
+            del indiv.fitness
+            if id(indiv) not in seen:
+                seen.add(id(indiv))
+                pending.append(indiv)
+        
+        if not pending: return
+        
+        # Individuals with no evaluator use their species default, so
+        # they are grouped by evaluator.
+        by_evaluator = { }
+        for indiv in pending:
+            target = indiv._eval or indiv._eval_default     #pylint: disable=W0212
+            if getattr(target, 'parallel', False):
+                by_evaluator.setdefault(id(target), (target, []))[1].append(indiv)
+        
+        for target, group in by_evaluator.itervalues():
+            self._evaluate_group(target, group)
+    
+    def _evaluate_group(self, evaluator, group):
+        '''Evaluates `group` using `evaluator` in the worker pool and
+        stores the results.
+        '''
+        pool = self.pool
+        chunksize = self.chunksize or max(1, -(-len(group) // (self.processes * 4)))
+        chunks = [(evaluator, group[i:i + chunksize]) for i in xrange(0, len(group), chunksize)]
+        
+        indiv_iter = iter(group)
+        count = 0
+        for success, results in pool.imap(_evaluate_chunk, chunks):
+            if not success:
+                raise EvaluatorError(*results)
+            for indiv, fitness in zip(islice(indiv_iter, len(results)), results):
+                indiv.fitness = fitness
+            count += len(results)
+        
+        notify('individual', 'statistic', { 'local_evals': count, 'global_evals': count })
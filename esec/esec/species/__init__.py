@@ -88,6 +88,23 @@ class Species(object):
         :see: Individual.statistic
         '''
     
+    def __getstate__(self):
+        '''Returns the state of the species for pickling.
+        
+        The ``public_context`` is not included, since it contains bound
+        methods, and an unpickled species should not be included in a
+        system.
+        '''
+        state = dict(self.__dict__)
+        state.pop('syntax', None)
+        state['public_context'] = { }
+        return state
+    
+    def __setstate__(self, state):
+        '''Restores the state of the species after unpickling.'''
+        self.__dict__.update(state)
+        self.syntax = utils.merge_cls_dicts(self, 'syntax')
+    
     def legal(self, indiv): #pylint: disable=W0613,R0201
         '''Determines whether the specified individual is legal.
         
@@ -340,9 +357,10 @@ class Species(object):
             raise StopIteration
         
         do_all_pairs = (per_pair_rate >= 1.0)
-        do_all_genes = (per_gene_rate >= 1.0)
+        genes = int(genes or 0)
         
         frand = rand.random
+        sample_sites = utils.sample_sites
         
         for i1, i2 in utils.pairs(_source):
             if do_all_pairs or frand() < per_pair_rate:
@@ -351,22 +369,14 @@ class Species(object):
                 
                 new_genes1 = list(i1_genome)
                 new_genes2 = list(i2_genome)
-                source = xrange(i1_len if i1_len < i2_len else i2_len)
-
-                if genes:
-                    do_all_genes = True
-                    source = list(source)
-                    rand.shuffle(source)
-                    source = islice(source, genes)
-
-                for i in source:
-                    if do_all_genes or frand() < per_gene_rate:
-                        if discrete:
-                            new_genes1[i] = i1_genome[i] if frand() < 0.5 else i2_genome[i]
-                            new_genes2[i] = i1_genome[i] if frand() < 0.5 else i2_genome[i]
-                        else:
-                            new_genes1[i] = i2_genome[i]
-                            new_genes2[i] = i1_genome[i]
+                
+                for i in sample_sites(i1_len if i1_len < i2_len else i2_len, per_gene_rate, genes):
+                    if discrete:
+                        new_genes1[i] = i1_genome[i] if frand() < 0.5 else i2_genome[i]
+                        new_genes2[i] = i1_genome[i] if frand() < 0.5 else i2_genome[i]
+                    else:
+                        new_genes1[i] = i2_genome[i]
+                        new_genes2[i] = i1_genome[i]
                 
                 i1 = type(i1)(new_genes1, i1, statistic={ 'recombined': 1 })
                 i2 = type(i2)(new_genes2, i2, statistic={ 'recombined': 1 })
@@ -750,13 +760,19 @@ class Species(object):
                 new_genes1 = list(i1_genome)
                 new_genes2 = list(i2_genome)
                 exchanging = (frand() < switch_rate)
+                length = i1_len if i1_len < i2_len else i2_len
                 
-                for i in xrange(i1_len if i1_len < i2_len else i2_len):
+                # Each site is the last gene before a switch
+                start = 0
+                for site in utils.sample_sites(length, switch_rate):
                     if exchanging:
-                        new_genes1[i] = i2_genome[i]
-                        new_genes2[i] = i1_genome[i]
-                    if frand() < switch_rate:
-                        exchanging = not exchanging
+                        new_genes1[start:site+1] = i2_genome[start:site+1]
+                        new_genes2[start:site+1] = i1_genome[start:site+1]
+                    exchanging = not exchanging
+                    start = site + 1
+                if exchanging:
+                    new_genes1[start:length] = i2_genome[start:length]
+                    new_genes2[start:length] = i1_genome[start:length]
                 
                 i1 = type(i1)(new_genes1, i1, statistic={ 'recombined': 1 })
                 i2 = type(i2)(new_genes2, i2, statistic={ 'recombined': 1 })
@@ -4,6 +4,7 @@ from itertools import islice, chain
 from esec.species import Species
 from esec.individual import Individual
 from esec.context import rand
+from esec.utils import sample_sites
 # Disabled: method could be a function
 #pylint: disable=R0201
 
@@ -12,6 +13,8 @@ class BinaryIndividual(Individual):
     '''An `Individual` for binary-valued genomes.
     '''
     
+    __slots__ = ()
+    
     @property
     def phenome_string(self):
         '''Returns a string representation of the phenome of this individual.
@@ -181,9 +184,7 @@ class BinarySpecies(Species):
         assert genes is not True, "genes has no value"
         
         frand = rand.random
-        shuffle = rand.shuffle
         
-        do_all_gene = (per_gene_rate >= 1.0)
         do_all_indiv = (per_indiv_rate >= 1.0)
         
         genes = int(genes or 0)
@@ -191,19 +192,14 @@ class BinarySpecies(Species):
         for indiv in _source:
             if do_all_indiv or frand() < per_indiv_rate:
                 new_genes = list(indiv.genome)
-                source = xrange(len(new_genes))
-                
-                if genes:
-                    do_all_gene = True
-                    source = list(source)
-                    shuffle(source)
-                    source = islice(source, genes)
                 
-                for i in source:
-                    if do_all_gene or frand() < per_gene_rate:
-                        new_genes[i] = 0 if frand() < 0.5 else 1
+                sites = sample_sites(len(new_genes), per_gene_rate, genes)
+                for i in sites:
+                    new_genes[i] = 0 if frand() < 0.5 else 1
                 
-                yield type(indiv)(new_genes, indiv, statistic={ 'mutated': 1 })
+                child = type(indiv)(new_genes, indiv, statistic={ 'mutated': 1 })
+                child.set_changes(indiv, sites)
+                yield child
             else:
                 yield indiv
     
@@ -236,9 +232,7 @@ class BinarySpecies(Species):
         assert genes is not True, "genes has no value"
         
         frand = rand.random
-        shuffle = rand.shuffle
         
-        do_all_gene = (per_gene_rate >= 1.0)
         do_all_indiv = (per_indiv_rate >= 1.0)
         
         genes = int(genes or 0)
@@ -247,19 +241,13 @@ class BinarySpecies(Species):
             if do_all_indiv or frand() < per_indiv_rate:
                 new_genes = list(indiv.genome)
                 
-                source = enumerate(new_genes)
+                sites = sample_sites(len(new_genes), per_gene_rate, genes)
+                for i in sites:
+                    new_genes[i] = 1 - new_genes[i]
                 
-                if genes:
-                    do_all_gene = True
-                    source = list(source)
-                    shuffle(source)
-                    source = islice(source, genes)
-                
-                for i, gene in source:
-                    if do_all_gene or frand() < per_gene_rate:
-                        new_genes[i] = 1 - gene
-                
-                yield type(indiv)(new_genes, indiv, statistic={ 'mutated': 1 })
+                child = type(indiv)(new_genes, indiv, statistic={ 'mutated': 1 })
+                child.set_changes(indiv, sites)
+                yield child
             else:
                 yield indiv
     
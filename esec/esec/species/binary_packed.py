@@ -0,0 +1,558 @@
+'''Provides the `PackedBinarySpecies` class for binary-valued genomes
+stored as the bits of a single integer.
+
+Genomes are instances of `BitString`, which behaves as an immutable
+sequence of ``0`` and ``1`` values and may be used anywhere a
+`BinaryIndividual` genome is expected. The operators provided by
+`PackedBinarySpecies` work on whole words at a time: mutation builds a
+mask of the bits to change and applies it with a single exclusive-or,
+and crossover exchanges the bits selected by a mask between parents.
+'''
+from itertools import imap
+from esec.species.binary import BinaryIndividual, BinarySpecies
+from esec.context import rand
+from esec.utils import sample_sites
+import esec.utils as utils
+
+# Disabled: method could be a function, too many public methods
+#pylint: disable=R0201,R0904
+
+class BitString(object):
+    '''An immutable sequence of bits stored as an integer. Bit ``i`` of
+    `value` is the gene at index ``i``.
+    '''
+    
+    __slots__ = ('value', 'length')
+    
+    def __init__(self, genes=(), length=None):
+        '''Initialises a new bit string.
+        
+        :Parameters:
+          genes : iterable or int
+            Either a sequence of gene values, where any true value is
+            stored as ``1``, or an integer containing the bits.
+          
+          length : int [optional]
+            The number of bits. This must be provided if `genes` is an
+            integer and is ignored otherwise.
+        '''
+        if isinstance(genes, (int, long)):
+            assert length is not None, "length must be provided with an integer value"
+            self.value = genes
+            self.length = length
+        else:
+            genes = list(genes)
+            self.length = len(genes)
+            self.value = int(''.join('1' if g else '0' for g in reversed(genes)) or '0', 2)
+    
+    def __len__(self):
+        return self.length
+    
+    def __iter__(self):
+        if not self.length: return iter(())
+        return imap(int, reversed(bin(self.value)[2:].zfill(self.length)))
+    
+    def __getitem__(self, key):
+        length = self.length
+        if isinstance(key, slice):
+            start, stop, step = key.indices(length)
+            if step != 1:
+                return list(self)[key]
+            if stop <= start:
+                return BitString(0, 0)
+            return BitString((self.value >> start) & ((1 << (stop - start)) - 1), stop - start)
+        if key < 0: key += length
+        if not 0 <= key < length:
+            raise IndexError('BitString index out of range')
+        return (self.value >> key) & 1
+    
+    def __add__(self, other):
+        if type(other) is not BitString:
+            other = BitString(other)
+        return BitString(self.value | (other.value << self.length), self.length + other.length)
+    
+    def __radd__(self, other):
+        return BitString(other) + self
+    
+    def __eq__(self, other):
+        if type(other) is BitString:
+            return self.value == other.value and self.length == other.length
+        try:
+            return len(other) == self.length and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return False
+    
+    def __ne__(self, other):
+        return not self.__eq__(other)
+    
+    def __hash__(self):
+        return hash((self.value, self.length))
+    
+    def __reduce__(self):
+        return (BitString, (self.value, self.length))
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def count(self, gene):
+        '''Returns the number of genes equal to `gene`.'''
+        ones = bin(self.value).count('1')
+        if gene == 1: return ones
+        elif gene == 0: return self.length - ones
+        return 0
+    
+    def ones(self):
+        '''Returns an iterator over the indices of the genes that are
+        ``1``, in increasing order.
+        '''
+        value = self.value
+        while value:
+            low = value & -value
+            # len(bin(low)) - 3 is low.bit_length() - 1, which needs 2.7
+            yield len(bin(low)) - 3
+            value ^= low
+
+def _mask(length, per_gene_rate, genes=0):
+    '''Returns a mask of `length` bits where each bit is set with
+    probability `per_gene_rate`, or where exactly `genes` bits are set.
+    
+    The bits to set are chosen with `esec.utils.sample_sites`.
+    '''
+    if not genes:
+        if per_gene_rate >= 1.0:
+            return (1 << length) - 1
+        if per_gene_rate == 0.5:
+            return rand.getrandbits(length)
+    
+    mask = 0
+    for i in sample_sites(length, per_gene_rate, genes):
+        mask |= 1 << i
+    return mask
+
+class PackedBinaryIndividual(BinaryIndividual):
+    '''A `BinaryIndividual` with a `BitString` genome.
+    '''
+    
+    __slots__ = ()
+    
+    genome_type = BitString
+    
+    @property
+    def genome_string(self):
+        '''Returns a string representation of the genes of this
+        individual.
+        '''
+        return str(list(self.genome))
+
+class PackedBinarySpecies(BinarySpecies):
+    '''Provides individuals with fixed- or variable-length genomes of
+    binary values stored as `BitString` instances. Each gene has the
+    value ``0`` or ``1``.
+    
+    Operators not overridden by this species are inherited from
+    `BinarySpecies` and `Species` and produce the same results for
+    packed genomes, though without the performance benefit.
+    '''
+    name = 'PackedBinary'
+    
+    def __init__(self, cfg, eval_default):
+        super(PackedBinarySpecies, self).__init__(cfg, eval_default)
+        # Make some names public within the execution context
+        self.public_context = {
+            'random_packed_binary': self.init_random,
+            'packed_binary_zero': self.init_zero,
+            'packed_binary_one': self.init_one,
+            'packed_binary_toggle': self.init_toggle
+        }
+    
+    def legal(self, indiv):
+        '''Determines whether `indiv` is legal.'''
+        assert isinstance(indiv, PackedBinaryIndividual), "Expected PackedBinaryIndividual"
+        genome = indiv.genome
+        return 0 <= genome.value < (1 << genome.length)
+    
+    def init_random(self, length=None, shortest=10, longest=10, template=None): #pylint: disable=W0613
+        '''Returns instances of `PackedBinaryIndividual` initialised
+        with random bitstrings.
+        
+        :Parameters:
+          length : int > 0
+            The number of genes to include in each individual. If left
+            unspecified, a random number between `shortest` and
+            `longest` (inclusive) is used to determine the length of
+            each individual.
+          
+          shortest : int > 0
+            The smallest number of genes in any individual.
+          
+          longest : int > `shortest`
+            The largest number of genes in any individual.
+          
+          template : `PackedBinaryIndividual` [optional]
+            Unused for this species.
+        '''
+        len_ = self._len(length, shortest, longest)
+        getrandbits = rand.getrandbits
+        while True:
+            length = len_()
+            yield PackedBinaryIndividual(BitString(getrandbits(length), length), self)
+    
+    def init_zero(self, length=None, shortest=10, longest=10):
+        '''Returns instances of `PackedBinaryIndividual` initialised
+        with zeros.
+        
+        :Parameters:
+          length : int > 0
+            The number of genes to include in each individual. If left
+            unspecified, a random number between `shortest` and
+            `longest` (inclusive) is used to determine the length of
+            each individual.
+          
+          shortest : int > 0
+            The smallest number of genes in any individual.
+          
+          longest : int > `shortest`
+            The largest number of genes in any individual.
+        '''
+        len_ = self._len(length, shortest, longest)
+        while True:
+            yield PackedBinaryIndividual(BitString(0, len_()), self)
+    
+    def init_one(self, length=None, shortest=10, longest=10):
+        '''Returns instances of `PackedBinaryIndividual` initialised
+        with ones.
+        
+        :Parameters:
+          length : int > 0
+            The number of genes to include in each individual. If left
+            unspecified, a random number between `shortest` and
+            `longest` (inclusive) is used to determine the length of
+            each individual.
+          
+          shortest : int > 0
+            The smallest number of genes in any individual.
+          
+          longest : int > `shortest`
+            The largest number of genes in any individual.
+        '''
+        len_ = self._len(length, shortest, longest)
+        while True:
+            length = len_()
+            yield PackedBinaryIndividual(BitString((1 << length) - 1, length), self)
+    
+    def init_toggle(self, length=None, shortest=10, longest=10):
+        '''Returns instances of `PackedBinaryIndividual`. Every second
+        individual (from the first one returned) is initialised with
+        ones; the remainder with zeros.
+        
+        :Parameters:
+          length : int > 0
+            The number of genes to include in each individual. If left
+            unspecified, a random number between `shortest` and
+            `longest` (inclusive) is used to determine the length of
+            each individual.
+          
+          shortest : int > 0
+            The smallest number of genes in any individual.
+          
+          longest : int > `shortest`
+            The largest number of genes in any individual.
+        '''
+        len_ = self._len(length, shortest, longest)
+        while True:
+            length = len_()
+            yield PackedBinaryIndividual(BitString((1 << length) - 1, length), self)
+            yield PackedBinaryIndividual(BitString(0, len_()), self)
+    
+    def mutate_random(self, _source, per_indiv_rate=1.0, per_gene_rate=0.1, genes=None):
+        '''Mutates a group of individuals by replacing genes with random values.
+        
+        .. include:: epydoc_include.txt
+        
+        :Parameters:
+          _source : iterable(`Individual`)
+            A sequence of individuals. Individuals are taken one at a time
+            from this sequence and either returned unaltered or cloned and
+            mutated.
+          
+          per_indiv_rate : |prob|
+            The probability of any individual being mutated. If an individual
+            is not mutated, it is returned unmodified.
+          
+          per_gene_rate : |prob|
+            The probability of any gene being mutated. If an individual is not
+            selected for mutation (under `per_indiv_rate`) then this value is
+            unused.
+          
+          genes : int
+            The exact number of genes to mutate. If `None`, `per_gene_rate` is
+            used instead.
+        '''
+        assert per_indiv_rate is not True, "per_indiv_rate has no value"
+        assert per_gene_rate is not True, "per_gene_rate has no value"
+        assert genes is not True, "genes has no value"
+        
+        frand = rand.random
+        getrandbits = rand.getrandbits
+        
+        do_all_indiv = (per_indiv_rate >= 1.0)
+        
+        genes = int(genes or 0)
+        
+        for indiv in _source:
+            if do_all_indiv or frand() < per_indiv_rate:
+                genome = indiv.genome
+                length = genome.length
+                mask = _mask(length, per_gene_rate, genes)
+                value = (genome.value & ~mask) | (getrandbits(length) & mask)
+                yield type(indiv)(BitString(value, length), indiv, statistic={ 'mutated': 1 })
+            else:
+                yield indiv
+    
+    def mutate_bitflip(self, _source, per_indiv_rate=1.0, per_gene_rate=0.1, genes=None):
+        '''Mutates a group of individuals by inverting genes.
+        
+        .. include:: epydoc_include.txt
+        
+        :Parameters:
+          _source : iterable(`Individual`)
+            A sequence of individuals. Individuals are taken one at a time
+            from this sequence and either returned unaltered or cloned and
+            mutated.
+          
+          per_indiv_rate : |prob|
+            The probability of any individual being mutated. If an individual
+            is not mutated, it is returned unmodified.
+          
+          per_gene_rate : |prob|
+            The probability of any gene being inverted. If an individual is not
+            selected for mutation (under `per_indiv_rate`) then this value is
+            unused.
+          
+          genes : int
+            The exact number of genes to mutate. If `None`, `per_gene_rate` is
+            used instead.
+        '''
+        assert per_indiv_rate is not True, "per_indiv_rate has no value"
+        assert per_gene_rate is not True, "per_gene_rate has no value"
+        assert genes is not True, "genes has no value"
+        
+        frand = rand.random
+        
+        do_all_indiv = (per_indiv_rate >= 1.0)
+        
+        genes = int(genes or 0)
+        
+        for indiv in _source:
+            if do_all_indiv or frand() < per_indiv_rate:
+                genome = indiv.genome
+                length = genome.length
+                value = genome.value ^ _mask(length, per_gene_rate, genes)
+                yield type(indiv)(BitString(value, length), indiv, statistic={ 'mutated': 1 })
+            else:
+                yield indiv
+    
+    def mutate_inversion(self, _source, per_indiv_rate=0.1):
+        '''Mutates a group of individuals by inverting entire individuals.
+        
+        .. include:: epydoc_include.txt
+        
+        :Parameters:
+          _source : iterable(`Individual`)
+            A sequence of individuals. Individuals are taken one at a time
+            from this sequence and either returned unaltered or cloned and
+            mutated.
+          
+          per_indiv_rate : |prob|
+            The probability of any individual being mutated. If an individual
+            is not mutated, it is returned unmodified.
+        '''
+        assert per_indiv_rate is not True, "per_indiv_rate has no value"
+        
+        frand = rand.random
+        
+        do_all_indiv = (per_indiv_rate >= 1.0)
+        
+        for indiv in _source:
+            if do_all_indiv or frand() < per_indiv_rate:
+                genome = indiv.genome
+                length = genome.length
+                value = genome.value ^ ((1 << length) - 1)
+                yield type(indiv)(BitString(value, length), indiv, statistic={ 'mutated': 1 })
+            else:
+                yield indiv
+    
+    def mutate_gap_inversion(self, _source, per_indiv_rate=0.1, length=None, shortest=1, longest=10):
+        '''Mutates a group of individuals by inverting segments within
+        individuals.
+        
+        The genes inverted are always contiguous.
+        
+        .. include:: epydoc_include.txt
+        
+        :Parameters:
+          _source : iterable(`Individual`)
+            A sequence of individuals. Individuals are taken one at a time
+            from this sequence and either returned unaltered or cloned and
+            mutated.
+          
+          per_indiv_rate : |prob|
+            The probability of any individual being mutated. If an individual
+            is not mutated, it is returned unmodified.
+          
+          length : int > 0 [optional]
+            The number of genes to invert at each mutation. If left
+            unspecified, a random number between `shortest` and `longest`
+            (inclusive) is used to determine the length.
+          
+          shortest : int > 0
+            The smallest number of genes that may be inverted at any
+            mutation.
+          
+          longest : int > `shortest`
+            The largest number of genes that may be inverted at any
+            mutation.
+        '''
+        assert per_indiv_rate is not True, "per_indiv_rate has no value"
+        
+        len_ = self._len(length, shortest, longest)
+        
+        frand = rand.random
+        irand = rand.randrange
+        
+        do_all_indiv = (per_indiv_rate >= 1.0)
+        
+        for indiv in _source:
+            if do_all_indiv or frand() < per_indiv_rate:
+                length = len_()
+                genome = indiv.genome
+                len_indiv = genome.length
+                max_cut1 = len_indiv - length
+                if max_cut1 > 0:
+                    cut1 = irand(max_cut1)
+                    cut2 = cut1 + length
+                else:
+                    cut1, cut2 = 0, len_indiv
+                value = genome.value ^ ((1 << cut2) - (1 << cut1))
+                yield type(indiv)(BitString(value, len_indiv), indiv, statistic={ 'mutated': 1 })
+            else:
+                yield indiv
+    
+    def crossover_uniform(self, _source,
+                          per_pair_rate=None, per_indiv_rate=1.0, per_gene_rate=0.5,
+                          genes=None, discrete=False,
+                          one_child=True, two_children=False):
+        '''Performs uniform crossover by selecting genes at random from
+        one of two individuals.
+        
+        The genes to exchange are selected as a mask over the shorter
+        of the two genomes. See `Species.crossover_uniform` for a
+        description of the parameters.
+        '''
+        assert per_pair_rate is not True, "per_pair_rate has no value"
+        assert per_indiv_rate is not True, "per_indiv_rate has no value"
+        assert per_gene_rate is not True, "per_gene_rate has no value"
+        assert genes is not True, "genes has no value"
+        
+        if per_pair_rate is None: per_pair_rate = per_indiv_rate
+        if per_pair_rate <= 0.0 or (per_gene_rate <= 0.0 and not genes):
+            if one_child and not two_children:
+                skip = True
+                for indiv in _source:
+                    if not skip: yield indiv
+                    skip = not skip
+            else:
+                for indiv in _source:
+                    yield indiv
+            raise StopIteration
+        
+        do_all_pairs = (per_pair_rate >= 1.0)
+        genes = int(genes or 0)
+        
+        frand = rand.random
+        getrandbits = rand.getrandbits
+        
+        for i1, i2 in utils.pairs(_source):
+            if do_all_pairs or frand() < per_pair_rate:
+                i1_genome, i2_genome = i1.genome, i2.genome
+                i1_len, i2_len = i1_genome.length, i2_genome.length
+                length = i1_len if i1_len < i2_len else i2_len
+                value1, value2 = i1_genome.value, i2_genome.value
+                
+                mask = _mask(length, per_gene_rate, genes)
+                if discrete:
+                    pick1 = getrandbits(length)
+                    pick2 = getrandbits(length)
+                    new1 = (value1 & ~mask) | (mask & ((value1 & pick1) | (value2 & ~pick1)))
+                    new2 = (value2 & ~mask) | (mask & ((value1 & pick2) | (value2 & ~pick2)))
+                else:
+                    diff = (value1 ^ value2) & mask
+                    new1 = value1 ^ diff
+                    new2 = value2 ^ diff
+                
+                i1 = type(i1)(BitString(new1, i1_len), i1, statistic={ 'recombined': 1 })
+                i2 = type(i2)(BitString(new2, i2_len), i2, statistic={ 'recombined': 1 })
+            
+            if one_child and not two_children:
+                yield i1 if frand() < 0.5 else i2
+            else:
+                yield i1
+                yield i2
+    
+    def crossover(self, _source,
+                  points=1,
+                  per_pair_rate=None, per_indiv_rate=1.0,
+                  one_child=True, two_children=False):
+        '''Performs crossover by selecting a `points` points common to
+        both individuals and exchanging the sequences of genes to the
+        right (including the selection).
+        
+        The segments to exchange are combined into a single mask. See
+        `Species.crossover` for a description of the parameters.
+        '''
+        assert points is not True, "points has no value"
+        assert per_pair_rate is not True, "per_pair_rate has no value"
+        assert per_indiv_rate is not True, "per_indiv_rate has no value"
+        
+        if per_pair_rate is None: per_pair_rate = per_indiv_rate
+        if per_pair_rate <= 0.0 or points < 1:
+            if one_child and not two_children:
+                skip = True
+                for indiv in _source:
+                    if not skip: yield indiv
+                    skip = not skip
+            else:
+                for indiv in _source:
+                    yield indiv
+            raise StopIteration
+        
+        do_all_pairs = (per_pair_rate >= 1.0)
+        points = int(points)
+        
+        frand = rand.random
+        sample = rand.sample
+        
+        for i1, i2 in utils.pairs(_source):
+            if do_all_pairs or frand() < per_pair_rate:
+                i1_genome, i2_genome = i1.genome, i2.genome
+                i1_len, i2_len = i1_genome.length, i2_genome.length
+                
+                if i1_len > points and i2_len > points:
+                    max_len = i1_len if i1_len < i2_len else i2_len
+                    cuts = sorted(sample(xrange(1, max_len), points))
+                    cuts.append(max_len)
+                    
+                    mask = 0
+                    for cut_i, cut_j in utils.pairs(iter(cuts)):
+                        mask |= (1 << cut_j) - (1 << cut_i)
+                    
+                    value1, value2 = i1_genome.value, i2_genome.value
+                    diff = (value1 ^ value2) & mask
+                    
+                    i1 = type(i1)(BitString(value1 ^ diff, i1_len), i1, statistic={ 'recombined': 1 })
+                    i2 = type(i2)(BitString(value2 ^ diff, i2_len), i2, statistic={ 'recombined': 1 })
+            if one_child and not two_children:
+                yield i1 if frand() < 0.5 else i2
+            else:
+                yield i1
+                yield i2
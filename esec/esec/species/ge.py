@@ -2,7 +2,9 @@
 Grammatical Evolution (GE) genomes.
 '''
 import itertools
+from esec.context import notify
 from esec.species.integer import IntegerSpecies, IntegerIndividual
+from esec.utils import LRUCache
 
 # Disabled: too many public methods
 #pylint: disable=R0904
@@ -13,7 +15,7 @@ class GEIndividual(IntegerIndividual):
     def __init__(self, genes, parent,
                  lower_bounds=None, upper_bounds=None,
                  grammar=None, defines=None,
-                 wrap_count=10,
+                 wrap_count=10, phenome_cache=None,
                  statistic=None):
         '''Initialises a new `GEIndividual`. Instances are generally
         created using the initialisation methods provided by
@@ -30,8 +32,9 @@ class GEIndividual(IntegerIndividual):
             new individual, or an instance of `GESpecies`.
             
             If a `GEIndividual` is provided, it's values for
-            `lower_bounds`, `upper_bounds`, `grammar`, `defines` and
-            `wrap_count` are used instead of the parameters provided.
+            `lower_bounds`, `upper_bounds`, `grammar`, `defines`,
+            `wrap_count` and `phenome_cache` are used instead of the
+            parameters provided.
           
           lower_bounds : list(int)
             The inclusive lower limit on genome values. Each element
@@ -59,6 +62,11 @@ class GEIndividual(IntegerIndividual):
             The number of times the genome may be reused when mapping
             to a phenome.
           
+          phenome_cache : `LRUCache` [optional]
+            A cache mapping generated programs to compiled code. It is
+            shared between individuals to avoid compiling identical
+            programs more than once.
+          
           statistic : dict [optional]
             A set of statistic values associated with this individual.
             These are accumulated with ``parent.statistic`` and allow
@@ -80,11 +88,15 @@ class GEIndividual(IntegerIndividual):
         '''The definitions used for this individual.'''
         self.wrap_count = int(wrap_count)
         '''The number of times to reuse the genome when mapping.'''
+        self.phenome_cache = phenome_cache
+        '''The cache of compiled programs shared with related
+        individuals.'''
         
         if isinstance(parent, GEIndividual):
             self.grammar = parent.grammar
             self.defines = parent.defines
             self.wrap_count = parent.wrap_count
+            self.phenome_cache = parent.phenome_cache
         
         if isinstance(self.defines, str):
             defines = self.defines
@@ -95,6 +107,15 @@ class GEIndividual(IntegerIndividual):
         elif not isinstance(self.defines, dict):
             self.defines = { }
     
+    def __getstate__(self):
+        '''Returns the state of the individual for pickling. The
+        compiled program and shared cache are not included.
+        '''
+        state = super(GEIndividual, self).__getstate__()
+        state['_compiled'] = None
+        state['phenome_cache'] = None
+        return state
+    
     @property
     def Eval(self): #pylint: disable=C0103
         '''A reference to a Python function represented in the program as
@@ -107,28 +128,42 @@ class GEIndividual(IntegerIndividual):
             program, self._effective_size = self.grammar.eval(self.genome, self.wrap_count)
             self._phenome = program or ''
             
-            self.statistic['did_not_compile'] = 0
-            self.statistic['dnc_unterminated'] = 0
-            self.statistic['dnc_exception'] = 0
-            
             if not program:
-                self.statistic['did_not_compile'] = 1
-                self.statistic['dnc_unterminated'] = 1
+                self.set_statistic(did_not_compile=1, dnc_unterminated=1, dnc_exception=0)
                 self._compiled = None
                 return None
             
             try:
-                exec program in defs    #pylint: disable=W0122
+                exec self._compile(program) in defs    #pylint: disable=W0122
                 self._compiled = defs["Eval"]
+                self.set_statistic(did_not_compile=0, dnc_unterminated=0, dnc_exception=0)
             except KeyboardInterrupt:
                 raise
             except:
-                self.statistic['did_not_compile'] = 1
-                self.statistic['dnc_exception'] = 1
+                self.set_statistic(did_not_compile=1, dnc_unterminated=0, dnc_exception=1)
                 self._compiled = None
         
         return self._compiled
     
+    def _compile(self, program):
+        '''Returns the compiled code object for `program`, using
+        `phenome_cache` if available.
+        
+        Hits and misses are reported as the ``phenome_cache_hits`` and
+        ``phenome_cache_misses`` statistics.
+        '''
+        cache = self.phenome_cache
+        if cache is None:
+            return compile(program, '<GE>', 'exec')
+        
+        code = cache.get(program)
+        if code is None:
+            notify('GE', 'statistic', 'local_phenome_cache_misses+global_phenome_cache_misses')
+            code = cache[program] = compile(program, '<GE>', 'exec')
+        else:
+            notify('GE', 'statistic', 'local_phenome_cache_hits+global_phenome_cache_hits')
+        return code
+    
     @property
     def effective_size(self):
         '''Returns the number of codon (gene) values actually used when
@@ -181,7 +216,7 @@ class GESpecies(IntegerSpecies):
                 grammar, defines=None, length=None,
                 shortest=1, longest=100,
                 lowest=0, highest=255,
-                wrap_count=0):
+                wrap_count=0, cache_size=1000):
         '''Returns instances of `GEIndividual` initialised with random values.
         
         The values of `lowest` and `highest` are stored with the individual and
@@ -219,6 +254,11 @@ class GESpecies(IntegerSpecies):
           wrap_count : int |ge| 0 [defaults to 10]
             The number of times the genome may be reused when mapping
             to a phenome.
+          
+          cache_size : int |ge| 0 [defaults to 1000]
+            The number of compiled programs to keep for reuse by
+            individuals with identical phenomes. If zero, programs are
+            always compiled.
         '''
         assert grammar is not True, "grammar has no value"
         assert defines is not True, "defines has no value"
@@ -228,10 +268,12 @@ class GESpecies(IntegerSpecies):
         assert lowest is not True, "lowest has no value"
         assert highest is not True, "highest has no value"
         assert wrap_count is not True, "wrap_count has no value"
+        assert cache_size is not True, "cache_size has no value"
         
         lowest = int(lowest)
         highest = int(highest)
         wrap_count = int(wrap_count)
+        phenome_cache = LRUCache(cache_size) if cache_size else None
         
         for indiv in self.init_random(length, shortest, longest, lowest, highest):
             yield GEIndividual(indiv.genome,
@@ -240,7 +282,8 @@ class GESpecies(IntegerSpecies):
                                upper_bounds=indiv.upper_bounds,
                                grammar=grammar,
                                defines=defines,
-                               wrap_count=wrap_count)
+                               wrap_count=wrap_count,
+                               phenome_cache=phenome_cache)
 
 class Grammar(object):
     '''GE grammar class.
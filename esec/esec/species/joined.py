@@ -21,6 +21,8 @@ class JoinedIndividual(Individual):
     order provided to the initialiser).
     '''
     
+    __slots__ = ()
+    
     def __init__(self, members, parent=None):
         '''Initialises a new individual made up of a set of joined
         individuals. Each individual is positioned within the genome of
@@ -1,23 +1,85 @@
 '''Provides the `RealSpecies` and `RealIndividual` classes for
 real-valued genomes.
+
+If NumPy_ is installed, the ``mutate_random``, ``mutate_delta`` and
+``mutate_gaussian`` operators accept ``bulk=True`` to mutate blocks of
+individuals using vectorised operations. Bulk mutation draws its random
+numbers from a NumPy generator seeded from the system-wide generator, so
+runs remain reproducible from the same seed but do not match runs that
+use the per-gene operators.
+
+.. _NumPy: http://numpy.scipy.org/
 '''
-from itertools import izip
-from itertools import islice
+from itertools import chain, izip
 import math
 from esec.species import Species
 from esec.individual import Individual
 from esec.context import rand
+from esec.utils import sample_sites
 import esec.utils as utils
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # Disabled: method could be a function
 #pylint: disable=R0201
 
+BULK_FIRST_BLOCK_SIZE = 8
+'''The number of individuals mutated together in the first block by the
+bulk mutation operators.'''
+
+BULK_BLOCK_SIZE = 256
+'''The largest number of individuals mutated together by the bulk
+mutation operators.'''
+
+def _bulk_blocks(_source, first_size, block_size):
+    '''Yields lists of consecutive individuals from `_source` with
+    genomes of equal length. The first list contains up to `first_size`
+    individuals and the limit doubles for each list after it, up to
+    `block_size`, so that a consumer taking only a few individuals does
+    not cause a full block to be read from `_source`.
+    '''
+    block = []
+    limit = first_size
+    for indiv in _source:
+        if block and (len(block) >= limit or len(indiv.genome) != len(block[0].genome)):
+            yield block
+            block = []
+            limit = min(limit * 2, block_size)
+        block.append(indiv)
+    if block:
+        yield block
+
+def _bounds_matrix(block, name, length):
+    '''Returns the bounds stored in attribute `name` of each individual
+    in `block` as a matrix with `length` columns. A single row is
+    returned if every individual shares the same bounds. Missing values
+    are ``nan``.
+    '''
+    first = getattr(block[0], name)
+    if all(getattr(indiv, name) is first for indiv in block):
+        rows = [first]
+    else:
+        rows = [getattr(indiv, name) for indiv in block]
+    
+    result = numpy.empty((len(rows), length))
+    result.fill(numpy.nan)
+    for dest, src in izip(result, rows):
+        count = min(len(src), length)
+        dest[:count] = src[:count]
+    return result
+
 # Override Individual to provide one that keeps its valid bounds with it
 class RealIndividual(Individual):
     '''An `Individual` for real-valued genomes. The valid range of each
     gene is stored with the individual so it may be used during mutation
     operations without being respecified.
     '''
+    
+    __slots__ = ('lower_bounds', 'upper_bounds', 'strategy')
+    
     def __init__(self, genes, parent, lower_bounds=None, upper_bounds=None, strategy=None, statistic=None):
         '''Initialises a new `RealIndividual`. Instances are generally
         created using the initialisation methods provided by `RealSpecies`.
@@ -324,7 +386,6 @@ class RealSpecies(Species):
             raise StopIteration
         
         do_all_pairs = (per_pair_rate >= 1.0)
-        do_all_genes = (per_gene_rate >= 1.0)
         
         frand = rand.random
         
@@ -334,18 +395,80 @@ class RealSpecies(Species):
                 
                 new_genes = list(i1_genome)
                 
-                if do_all_genes:
-                    for i, g2 in enumerate(i2_genome):
-                        new_genes[i] = (new_genes[i] + g2) / 2
-                else:
-                    for i, g2 in enumerate(i2_genome):
-                        if frand() < per_gene_rate:
-                            new_genes[i] = (new_genes[i] + g2) / 2
+                for i in sample_sites(len(i2_genome), per_gene_rate):
+                    new_genes[i] = (new_genes[i] + i2_genome[i]) / 2
                 
                 i1 = type(i1)(new_genes, i1, statistic={ 'recombined': 1 })
             yield i1
     
-    def mutate_random(self, _source, per_indiv_rate=1.0, per_gene_rate=0.1, genes=None):
+    def _mutate_bulk(self, _source, per_indiv_rate, per_gene_rate, genes, finite_only, mutate):
+        '''Mutates blocks of individuals from `_source` using NumPy.
+        
+        Individuals are read from `_source` in blocks that start with
+        `BULK_FIRST_BLOCK_SIZE` individuals and double in size up to
+        `BULK_BLOCK_SIZE`. Every individual in a block is read before
+        any are returned, so about twice as many individuals as are
+        taken may be read. Every random number for a block is
+        drawn at once, regardless of which individuals and genes are
+        mutated, from a generator seeded once from the system-wide
+        generator.
+        
+        :Parameters:
+          finite_only : bool
+            ``True`` to only mutate genes with finite bounds; otherwise,
+            genes without bounds are not mutated.
+          
+          mutate : function(state, genome, mask, low, high)
+            Returns a matrix of mutated genomes and a sequence of the
+            ``step_sum`` statistic for each row (or ``None``). Only
+            elements where `mask` is ``True`` should be changed.
+        '''
+        state = numpy.random.RandomState(rand.getrandbits(32))
+        do_all_indiv = (per_indiv_rate >= 1.0)
+        do_all_gene = (per_gene_rate >= 1.0)
+        
+        for block in _bulk_blocks(_source, BULK_FIRST_BLOCK_SIZE, BULK_BLOCK_SIZE):
+            assert all(isinstance(indiv, RealIndividual) for indiv in block), \
+                "Want `RealIndividual`, not `%s`" % type(next(i for i in block if not isinstance(i, RealIndividual)))
+            
+            count, length = len(block), len(block[0].genome)
+            if do_all_indiv:
+                chosen = numpy.ones(count, dtype=bool)
+            else:
+                chosen = state.random_sample(count) < per_indiv_rate
+            
+            genes_iter = chain.from_iterable(indiv.genome for indiv in block)
+            genome = numpy.fromiter(genes_iter, float, count * length).reshape(count, length)
+            low = _bounds_matrix(block, 'lower_bounds', length)
+            high = _bounds_matrix(block, 'upper_bounds', length)
+            if finite_only:
+                eligible = numpy.isfinite(low) & numpy.isfinite(high)
+            else:
+                eligible = ~(numpy.isnan(low) | numpy.isnan(high))
+            eligible = eligible & chosen[:, None]
+            
+            if genes:
+                keys = state.random_sample((count, length))
+                keys[~eligible] = 2.0
+                mask = (keys.argsort(axis=1).argsort(axis=1) < genes) & eligible
+            elif do_all_gene:
+                mask = eligible
+            else:
+                mask = (state.random_sample((count, length)) < per_gene_rate) & eligible
+            
+            with numpy.errstate(invalid='ignore'):
+                new_genome, step_sum = mutate(state, genome, mask, low, high)
+            
+            for i, indiv in enumerate(block):
+                if not chosen[i]:
+                    yield indiv
+                elif step_sum is None:
+                    yield type(indiv)(genes=new_genome[i].tolist(), parent=indiv, statistic={ 'mutated': 1 })
+                else:
+                    yield type(indiv)(genes=new_genome[i].tolist(), parent=indiv,
+                                      statistic={ 'mutated': 1, 'step_sum': float(step_sum[i]) })
+    
+    def mutate_random(self, _source, per_indiv_rate=1.0, per_gene_rate=0.1, genes=None, bulk=False):
         '''Mutates a group of individuals by replacing genes with random values.
         
         .. include:: epydoc_include.txt
@@ -368,43 +491,53 @@ class RealSpecies(Species):
           genes : int
             The exact number of genes to mutate. If `None`, `per_gene_rate` is
             used instead.
+          
+          bulk : bool
+            ``True`` to mutate blocks of individuals using NumPy, if it is
+            available. Results differ from those when `bulk` is ``False``.
         '''
         assert per_indiv_rate is not True, "per_indiv_rate has no value"
         assert per_gene_rate is not True, "per_gene_rate has no value"
         assert genes is not True, "genes has no value"
         
         frand = rand.random
-        shuffle = rand.shuffle
         
-        do_all_gene = (per_gene_rate >= 1.0)
         do_all_indiv = (per_indiv_rate >= 1.0)
         
         genes = int(genes or 0)
         
+        if bulk and numpy is not None:
+            def _mutate(state, genome, mask, low, high):
+                '''Replaces masked genes with uniform random values.'''
+                values = state.random_sample(genome.shape) * (high - low) + low
+                return numpy.where(mask, values, genome), None
+            
+            for indiv in self._mutate_bulk(_source, per_indiv_rate, per_gene_rate, genes, True, _mutate):
+                yield indiv
+            return
+        
         for indiv in _source:
             assert isinstance(indiv, RealIndividual), "Want RealIndividual, not '%s'" % type(indiv)
             
             if do_all_indiv or frand() < per_indiv_rate:
                 new_genes = list(indiv.genome)
-                source = izip(xrange(len(new_genes)), indiv.lower_bounds, indiv.upper_bounds)
-                source = (i for i in source if not math.isinf(i[1]) and not math.isinf(i[2]))
+                lower_bounds, upper_bounds = indiv.lower_bounds, indiv.upper_bounds
                 
-                if genes:
-                    do_all_gene = True
-                    source = list(source)
-                    shuffle(source)
-                    source = islice(source, genes)
+                # Genes with infinite bounds are never mutated
+                finite = [i for i in xrange(min(len(new_genes), len(lower_bounds), len(upper_bounds)))
+                          if not math.isinf(lower_bounds[i]) and not math.isinf(upper_bounds[i])]
                 
-                for i, low, high in source:
-                    if do_all_gene or frand() < per_gene_rate:
-                        new_genes[i] = frand() * (high - low) + low
+                for j in sample_sites(len(finite), per_gene_rate, genes):
+                    i = finite[j]
+                    low, high = lower_bounds[i], upper_bounds[i]
+                    new_genes[i] = frand() * (high - low) + low
                 yield type(indiv)(genes=new_genes, parent=indiv, statistic={ 'mutated': 1 })
             else:
                 yield indiv
     
     def mutate_delta(self, _source, step_size=0.1, per_indiv_rate=1.0,
                      per_gene_rate=0.1, genes=None,
-                     positive_rate=0.5):
+                     positive_rate=0.5, bulk=False):
         '''Mutates a group of individuals by adding or subtracting `step_size`
         to or from individiual genes.
         
@@ -435,6 +568,10 @@ class RealSpecies(Species):
           positive_rate : |prob|
             The probability of `step_size` being added to the gene value.
             Otherwise, `step_size` is subtracted.
+          
+          bulk : bool
+            ``True`` to mutate blocks of individuals using NumPy, if it is
+            available. Results differ from those when `bulk` is ``False``.
         '''
         assert step_size is not True, "step_size has no value"
         assert per_indiv_rate is not True, "per_indiv_rate has no value"
@@ -443,40 +580,48 @@ class RealSpecies(Species):
         assert positive_rate is not True, "positive_rate has no value"
         
         frand = rand.random
-        shuffle = rand.shuffle
         
-        do_all_gene = (per_gene_rate >= 1.0)
         do_all_indiv = (per_indiv_rate >= 1.0)
         
         genes = int(genes or 0)
         
+        if bulk and numpy is not None:
+            def _mutate(state, genome, mask, low, high):
+                '''Adds or subtracts `step_size` from masked genes.'''
+                step = numpy.where(state.random_sample(genome.shape) < positive_rate, step_size, -step_size)
+                new_genome = numpy.minimum(numpy.maximum(genome + step, low), high)
+                return numpy.where(mask, new_genome, genome), mask.sum(axis=1) * step_size
+            
+            for indiv in self._mutate_bulk(_source, per_indiv_rate, per_gene_rate, genes, False, _mutate):
+                yield indiv
+            return
+        
         for indiv in _source:
             assert isinstance(indiv, RealIndividual), "Want `RealIndividual`, not `%s`" % type(indiv)
             
             if do_all_indiv or frand() < per_indiv_rate:
                 step_size_sum = 0
                 new_genes = list(indiv.genome)
-                source = izip(xrange(len(new_genes)), new_genes, indiv.lower_bounds, indiv.upper_bounds)
-                
-                if genes:
-                    do_all_gene = True
-                    source = list(source)
-                    shuffle(source)
-                    source = islice(source, genes)
+                lower_bounds, upper_bounds = indiv.lower_bounds, indiv.upper_bounds
+                length = min(len(new_genes), len(lower_bounds), len(upper_bounds))
                 
-                for i, gene, low, high in source:
-                    if do_all_gene or frand() < per_gene_rate:
-                        step_size_sum += step_size
-                        new_gene = gene + (step_size if frand() < positive_rate else -step_size)
-                        new_genes[i] = (low  if new_gene < low  else
-                                        high if new_gene > high else
-                                        new_gene)
+                sites = sample_sites(length, per_gene_rate, genes)
+                for i in sites:
+                    gene, low, high = new_genes[i], lower_bounds[i], upper_bounds[i]
+                    step_size_sum += step_size
+                    new_gene = gene + (step_size if frand() < positive_rate else -step_size)
+                    new_genes[i] = (low  if new_gene < low  else
+                                    high if new_gene > high else
+                                    new_gene)
                 
-                yield type(indiv)(genes=new_genes, parent=indiv, statistic={ 'mutated': 1, 'step_sum': step_size_sum })
+                child = type(indiv)(genes=new_genes, parent=indiv, statistic={ 'mutated': 1, 'step_sum': step_size_sum })
+                child.set_changes(indiv, sites)
+                yield child
             else:
                 yield indiv
     
-    def mutate_gaussian(self, _source, step_size=0.1, sigma=None, per_indiv_rate=1.0, per_gene_rate=0.1, genes=None):
+    def mutate_gaussian(self, _source, step_size=0.1, sigma=None, per_indiv_rate=1.0, per_gene_rate=0.1, genes=None,
+                        bulk=False):
         '''Mutates a group of individuals by adding or subtracting a random
         value with Gaussian distribution based on `step_size` or `sigma`.
         
@@ -510,6 +655,10 @@ class RealSpecies(Species):
           genes : int
             The exact number of genes to mutate. If `None`, `per_gene_rate` is
             used instead.
+          
+          bulk : bool
+            ``True`` to mutate blocks of individuals using NumPy, if it is
+            available. Results differ from those when `bulk` is ``False``.
         '''
         assert step_size is not True, "step_size has no value"
         assert sigma is not True, "sigma has no value"
@@ -519,37 +668,44 @@ class RealSpecies(Species):
         
         sigma = sigma or (step_size * 1.253)
         frand = rand.random
-        shuffle = rand.shuffle
         gauss = rand.gauss
         
-        do_all_gene = (per_gene_rate >= 1.0)
         do_all_indiv = (per_indiv_rate >= 1.0)
         
         genes = int(genes or 0)
         
+        if bulk and numpy is not None:
+            def _mutate(state, genome, mask, low, high):
+                '''Adds a normally distributed value to masked genes.'''
+                step = state.normal(0.0, sigma, genome.shape) * mask
+                new_genome = numpy.minimum(numpy.maximum(genome + step, low), high)
+                return numpy.where(mask, new_genome, genome), step.sum(axis=1)
+            
+            for indiv in self._mutate_bulk(_source, per_indiv_rate, per_gene_rate, genes, False, _mutate):
+                yield indiv
+            return
+        
         for indiv in _source:
             assert isinstance(indiv, RealIndividual), "Want `RealIndividual`, not `%s`" % type(indiv)
             
             if do_all_indiv or frand() < per_indiv_rate:
                 step_size_sum = 0
                 new_genes = list(indiv.genome)
-                source = izip(xrange(len(new_genes)), new_genes, indiv.lower_bounds, indiv.upper_bounds)
-                
-                if genes:
-                    do_all_gene = True
-                    source = list(source)
-                    shuffle(source)
-                    source = islice(source, genes)
+                lower_bounds, upper_bounds = indiv.lower_bounds, indiv.upper_bounds
+                length = min(len(new_genes), len(lower_bounds), len(upper_bounds))
                 
-                for i, gene, low, high in source:
-                    if do_all_gene or frand() < per_gene_rate:
-                        step = gauss(0, sigma)
-                        step_size_sum += step
-                        new_gene = gene + step
-                        new_genes[i] = (low  if new_gene <= low  else
-                                        high if new_gene >= high else
-                                        new_gene)
+                sites = sample_sites(length, per_gene_rate, genes)
+                for i in sites:
+                    gene, low, high = new_genes[i], lower_bounds[i], upper_bounds[i]
+                    step = gauss(0, sigma)
+                    step_size_sum += step
+                    new_gene = gene + step
+                    new_genes[i] = (low  if new_gene <= low  else
+                                    high if new_gene >= high else
+                                    new_gene)
                 
-                yield type(indiv)(genes=new_genes, parent=indiv, statistic={ 'mutated': 1, 'step_sum': step_size_sum })
+                child = type(indiv)(genes=new_genes, parent=indiv, statistic={ 'mutated': 1, 'step_sum': step_size_sum })
+                child.set_changes(indiv, sites)
+                yield child
             else:
                 yield indiv
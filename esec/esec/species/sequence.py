@@ -6,6 +6,7 @@ from itertools import izip, islice, chain
 from esec.species import Species
 from esec.individual import Individual
 from esec.context import rand
+from esec.utils import sample_sites
 import esec.species
 
 # Disabled: method could be a function, too many public methods
@@ -15,6 +16,9 @@ import esec.species
 class SequenceIndividual(Individual):
     '''An `Individual` for sequence genomes.
     '''
+    
+    __slots__ = ()
+    
     def __init__(self, genes, parent, statistic=None):
         '''Initialises a new `SequenceIndividual`. Instances are
         generally created using the initialisation methods provided by
@@ -99,6 +103,7 @@ class SequenceSpecies(Species):
         genes = list(xrange(self._get_length(length, item_count)))
         
         while True:
+            genes = list(genes)
             shuffle(genes)
             yield SequenceIndividual(genes, parent=self)
     
@@ -111,7 +116,7 @@ class SequenceSpecies(Species):
         genes = list(xrange(self._get_length(length, item_count)))
         
         while True:
-            yield SequenceIndividual(genes, parent=self)
+            yield SequenceIndividual(list(genes), parent=self)
     
     def init_reverse(self, length=None, item_count=10):
         '''Returns instances of `SequenceIndividual` initialised in
@@ -122,7 +127,7 @@ class SequenceSpecies(Species):
         genes = list(reversed(xrange(self._get_length(length, item_count))))
         
         while True:
-            yield SequenceIndividual(genes, parent=self)
+            yield SequenceIndividual(list(genes), parent=self)
     
     def repair(self, _source, randomly=True, sequentially=False):
         '''Repairs a group of individuals by replacing duplicate values.
@@ -208,9 +213,7 @@ class SequenceSpecies(Species):
         
         frand = rand.random
         irand = rand.randrange
-        shuffle = rand.shuffle
         
-        do_all_gene = (per_gene_rate >= 1.0)
         do_all_indiv = (per_indiv_rate >= 1.0)
         
         genes = int(genes or 0)
@@ -221,14 +224,13 @@ class SequenceSpecies(Species):
                 len_genes = len(new_genes)
                 
                 if genes:
-                    for _ in xrange(genes):
-                        i1, i2 = irand(len_genes), irand(len_genes)
-                        new_genes[i1], new_genes[i2] = new_genes[i2], new_genes[i1]
+                    swaps = genes
                 else:
-                    for _ in xrange(len_genes):
-                        if do_all_gene or frand() < per_gene_rate:
-                            i1, i2 = irand(len_genes), irand(len_genes)
-                            new_genes[i1], new_genes[i2] = new_genes[i2], new_genes[i1]
+                    swaps = len(sample_sites(len_genes, per_gene_rate))
+                
+                for _ in xrange(swaps):
+                    i1, i2 = irand(len_genes), irand(len_genes)
+                    new_genes[i1], new_genes[i2] = new_genes[i2], new_genes[i1]
                 
                 yield type(indiv)(new_genes, indiv, statistic={ 'mutated': 1 })
             else:
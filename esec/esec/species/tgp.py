@@ -6,6 +6,7 @@ genetic programming (Koza-style) genomes.
 #pylint: disable=C0302,W0221,R0904,R0913
 
 from copy import copy
+from functools import partial
 from itertools import chain, islice, izip
 import math
 from esec.species import Species
@@ -79,6 +80,7 @@ class TgpIndividual(Individual):
             statistics to accurately represent the population.
         '''
         self._phenome_string = None
+        self._compiled = None
         self.instructions = instructions
         self.instruction_set = instruction_set
         self.terminals = int(terminals or 0)
@@ -95,6 +97,14 @@ class TgpIndividual(Individual):
         
         super(TgpIndividual, self).__init__(genes, parent=parent, statistic=statistic)
     
+    def __getstate__(self):
+        '''Returns the state of the individual for pickling. Compiled
+        programs are not included and are recreated when needed.
+        '''
+        state = super(TgpIndividual, self).__getstate__()
+        state['_compiled'] = None
+        return state
+    
     @property
     def root_program(self):
         '''Returns the root program of this individual.'''
@@ -375,81 +385,146 @@ class TgpSpecies(Species):
         assert isinstance(terminals, (list, tuple)), "terminals must be list/tuple type"
         assert len(terminals) >= indiv.terminals, "terminals does not have enough values"
         
-        op_stack = []
-        
-        # These are used to skip trees not evaluated due to a
-        # DecisionInstruction.
-        skip_1 = []  # nodes to skip before
-        take_1 = []  # nodes to take during
-        skip_2 = []  # nodes to skip after
+        if i_start == 0 and i_end == -1:
+            compiled = indiv._compiled      #pylint: disable=W0212
+            if compiled is None:
+                compiled = indiv._compiled = self.compile(indiv) or False     #pylint: disable=W0212
+            if compiled:
+                assert 0 <= adf_index < len(compiled), \
+                       "ADF index %d is not valid (must be [0, %d))" % (adf_index, len(compiled))
+                return compiled[adf_index](state, terminals)
         
         assert 0 <= adf_index < len(indiv.genome), \
                "ADF index %d is not valid (must be [0, %d))" % (adf_index, len(indiv.genome))
         current_program = indiv.genome[adf_index]
+        if i_end <= i_start: i_end = len(current_program)
         
-        for op_i, op in islice(enumerate(current_program), i_start, i_end if i_end > i_start else None):
-            # Skip instructions if we need to
-            if skip_1 and skip_1[-1]:
-                skip_1[-1] -= 1
-                continue
-            elif take_1 and take_1[-1]:
-                take_1[-1] -= 1
-            elif skip_2 and skip_2[-1]:
-                skip_2[-1] -= 1
-                continue
-            if take_1 and take_1[-1] == 0 and skip_2 and skip_2[-1] == 0:
-                skip_1.pop()
-                take_1.pop()
-                skip_2.pop()
-            
-            
-            if isinstance(op, DecisionInstruction):
-                # Determine how many instructions to skip
-                selection = op(state) - 1
-                spans = [(op_i + 1, self._find_end(current_program, op_i + 1))]
-                for _ in xrange(1, op.param_count):
-                    start = spans[-1][1]
-                    spans.append((start, self._find_end(current_program, start)))
-                skip_1.append(spans[selection][0] - spans[0][0])
-                take_1.append(spans[selection][1] - spans[selection][0])
-                skip_2.append(spans[-1][1] - spans[selection][1])
-                
-            elif isinstance(op, Instruction):
-                # Add a new item for this instruction
-                if op.lazy:
-                    item = []
-                    i = op_i + 1
-                    for _ in xrange(op.param_count):
-                        j = self._find_end(current_program, i)
-                        def make_lazy_eval(indiv, state, terminals, adf_index, i, j):
-                            '''Creates an evaluation lambda.'''
-                            return lambda: self.evaluate(indiv, state, terminals, adf_index, i, j)
-                        item.append(make_lazy_eval(indiv, state, terminals, adf_index, i, j))
-                        i = j
-                    if op_stack:
-                        op_stack[-1].append(op(state, *item))
-                    else:
-                        return op(state, *item)
-                else:
-                    op_stack.append([op])   # not extend
-            elif isinstance(op, (Terminal, Constant)):
-                # Add this terminal or constant to the topmost instruction
-                val = op(state, terminals)
-                if op_stack: op_stack[-1].append(val)
-                else: return val
-            elif isinstance(op, CallAdf):
-                # Add the result of this ADF to the topmost instruction
-                val = self.evaluate(indiv, state, terminals, op.index)
-                if op_stack: op_stack[-1].append(val)
-                else: return val
-            
-            # If the topmost instruction has enough parameters, evaluate it.
-            while op_stack and (len(op_stack[-1]) == op_stack[-1][0].param_count + 1):
-                item = op_stack.pop()
-                if op_stack:
-                    op_stack[-1].append(item[0](state, *item[1:]))
-                else:
-                    return item[0](state, *item[1:])
+        # Incomplete programs have no result
+        needed = 1
+        for op in islice(current_program, i_start, i_end):
+            needed += op.param_count - 1
+            if needed == 0: break
+        else:
+            return None
+        
+        return self._interpret(indiv, current_program, i_start, state, terminals)[0]
+    
+    def _interpret(self, indiv, program, start, state, terminals):
+        '''Evaluates the branch of `program` starting at `start`, which
+        must be complete, and returns its result and the index after the
+        end of the branch. Branches are evaluated in the same way as by
+        the functions returned from `compile`.
+        '''
+        op = program[start]
+        end = start + 1
+        
+        if isinstance(op, (Terminal, Constant)):
+            return op(state, terminals), end
+        elif isinstance(op, CallAdf):
+            return self.evaluate(indiv, state, terminals, op.index), end
+        
+        starts = []
+        for _ in xrange(op.param_count):
+            starts.append(end)
+            end = self._find_end(program, end)
+        
+        if isinstance(op, DecisionInstruction):
+            # Only the selected branch is evaluated
+            return self._interpret(indiv, program, starts[op(state) - 1], state, terminals)[0], end
+        elif op.lazy:
+            # Branches are passed as functions and evaluated on request
+            def _make_lazy_eval(i):
+                '''Creates an evaluation lambda.'''
+                return lambda: self._interpret(indiv, program, i, state, terminals)[0]
+            return op(state, *[_make_lazy_eval(i) for i in starts]), end
+        
+        params = [self._interpret(indiv, program, i, state, terminals)[0] for i in starts]
+        return op(state, *params), end
+    
+    def compile(self, indiv):
+        '''Converts the programs of `indiv` into nested functions.
+        
+        `evaluate` calls this method once for each individual and stores
+        the result with the individual, so that programs are not
+        reinterpreted for every set of terminals.
+        
+        :Parameters:
+          indiv : `TgpIndividual`
+            The individual to compile. Every ADF is compiled.
+        
+        :Returns:
+            A list containing a function for each program in
+            ``indiv.genome``. Each function takes a state object and a
+            list of terminal values and returns the same result as
+            `evaluate`. ``None`` is returned if any program is
+            incomplete, in which case `evaluate` interprets the
+            individual directly.
+        '''
+        adfs = []
+        try:
+            for program in indiv.genome:
+                func, _ = self._compile_node(program, 0, adfs)
+                adfs.append(func)
+        except IndexError:
+            return None
+        return adfs
+    
+    @classmethod
+    def _compile_node(cls, program, start, adfs):     #pylint: disable=R0911,R0912
+        '''Returns a function that evaluates the branch of `program`
+        starting at `start` and the index after the end of the branch.
+        
+        `adfs` is the list of compiled ADFs, which is completed before
+        any of the returned functions are called.
+        
+        Raises `IndexError` if the branch is incomplete.
+        '''
+        op = program[start]
+        end = start + 1
+        children = []
+        for _ in xrange(op.param_count):
+            child, end = cls._compile_node(program, end, adfs)
+            children.append(child)
+        
+        if isinstance(op, Terminal):
+            index = op.index
+            return (lambda state, terminals: terminals[index]), end
+        elif isinstance(op, Constant):
+            value = op.value
+            return (lambda state, terminals: value), end
+        elif isinstance(op, CallAdf):
+            index = op.index
+            return (lambda state, terminals: adfs[index](state, terminals)), end
+        elif isinstance(op, DecisionInstruction):
+            # Only the selected branch is evaluated
+            return (lambda state, terminals: children[op(state) - 1](state, terminals)), end
+        elif op.lazy:
+            # Branches are passed as functions and evaluated on request
+            return (lambda state, terminals: op(state, *[partial(child, state, terminals)
+                                                          for child in children])), end
+        
+        if type(op).__call__.im_func is not Instruction.__call__.im_func:
+            # Instructions that override __call__ receive the state
+            return (lambda state, terminals: op(state, *[child(state, terminals)
+                                                         for child in children])), end
+        
+        # Plain instructions (the most common case) call func directly
+        func = op.func
+        if len(children) == 0:
+            return (lambda state, terminals: func()), end
+        elif len(children) == 1:
+            arg1 = children[0]
+            return (lambda state, terminals: func(arg1(state, terminals))), end
+        elif len(children) == 2:
+            arg1, arg2 = children
+            return (lambda state, terminals: func(arg1(state, terminals),
+                                                  arg2(state, terminals))), end
+        elif len(children) == 3:
+            arg1, arg2, arg3 = children
+            return (lambda state, terminals: func(arg1(state, terminals),
+                                                  arg2(state, terminals),
+                                                  arg3(state, terminals))), end
+        return (lambda state, terminals: func(*[child(state, terminals) for child in children])), end
     
     def depth(self, program):   #pylint: disable=R0201
         '''Returns the depth of a given program.
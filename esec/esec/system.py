@@ -8,13 +8,14 @@ from esec.utils import ConfigDict, cfg_validate, merge_cls_dicts
 from esec.utils.exceptions import EvaluatorError, ESDLCompilerError
 
 from esdlc import compileESDL
-from esdlc.emitters.esec import emit
+from esdlc.emitters.esec import emit, Profiler
 
 from esec import GLOBAL_ESDL_FUNCTIONS
 from esec.monitors import MonitorBase
 from esec.individual import Individual, OnIndividual
 import esec.generators  #pylint: disable=W0611
 from esec.species import SPECIES
+from esec.parallel import ParallelEvaluator
 
 import esec.context
 
@@ -39,7 +40,11 @@ class System(object):
             'definition': str,
         },
         # The block selector (must support iter(selector))
-        'selector?': '*'
+        'selector?': '*',
+        # The number of evaluation processes (None for serial)
+        'processes?': [int, None],
+        # True to record execution times
+        'profile?': bool,
     }
     
     default = {
@@ -75,6 +80,10 @@ class System(object):
         self._in_step = False
         self._next_block = []
         self._block_cache = {}
+        self._parallel = None
+        self._profile_totals = None
+        self._selector_position = 0
+        self._lscape = lscape
 
         # Compile code
         self.definition = self.cfg.system.definition
@@ -85,8 +94,10 @@ class System(object):
         }
         
         # Add species settings to context
+        self._species = species = []
         for cls in SPECIES:
             inst = context[cls.name] = cls(self.cfg, lscape)
+            species.append(inst)
             try:
                 for key, value in inst.public_context.iteritems():
                     context[key.lower()] = value
@@ -106,10 +117,28 @@ class System(object):
         model, self.validation_result = compileESDL(self.definition, context)
         if not self.validation_result:
             raise ESDLCompilerError(self.validation_result, "Errors occurred while compiling system.")
-        self._code_string, internal_context = emit(model, out=None, optimise_level=0, profile='_profiler' in context)
+        
+        # Groups and variables created by the system are saved in
+        # checkpoints, while external values are not.
+        self._variable_names = sorted(name for name in model.variables if name not in context)
+        
+        # A profiler may be provided directly as '_profiler'
+        self.profiler = context.get('_profiler')
+        '''The `Profiler` recording execution times, or ``None`` if
+        profiling is not enabled.'''
+        if self.profiler is None and self.cfg['profile']:
+            self.profiler = context['_profiler'] = Profiler()
+        if self.profiler is not None:
+            for inst in species:
+                inst._eval = inst._eval_default = self.profiler.evaluator(inst._eval_default) #pylint: disable=W0212
+        
+        self._code_string, internal_context = emit(model, out=None, optimise_level=0, profile=self.profiler is not None)
         
         internal_context['_yield'] = lambda name, group: self.monitor.on_yield(self, name, group)
         internal_context['_alias'] = GroupAlias
+        if self.cfg['processes'] is not None:
+            self._parallel = ParallelEvaluator(self.cfg['processes'])
+            internal_context['_evaluate'] = self._parallel.evaluate
         
         for key, value in internal_context.iteritems():
             if key in context:
@@ -124,12 +153,18 @@ class System(object):
         self.monitor = monitor or MonitorBase()
         self.selector = self.cfg['selector'] or [name for name in model.block_names if name != model.INIT_BLOCK_NAME]
         self.selector_current = iter(self.selector)
+        self._selector_position = 0
         
         for func in model.externals.iterkeys():
             if func not in context:
                 context[func] = OnIndividual(func)
         
         self._code = compile(self._code_string, 'ESDL Definition', 'exec')
+        # The same code without the final call to the initialisation
+        # block is used when restoring a saved state.
+        init_call = '_block_' + model.INIT_BLOCK_NAME + '()'
+        assert self._code_string.endswith(init_call), "Emitted code does not end with " + init_call
+        self._define_code = compile(self._code_string[:-len(init_call)], 'ESDL Definition', 'exec')
     
     def _do_notify(self, sender, name, value):
         '''Queues a message for the current monitor.
@@ -172,6 +207,97 @@ class System(object):
             result.extend(ConfigDict(self._context).list())
         return result
     
+    def profile_report(self):
+        '''Returns a list of strings describing the time spent in each
+        block, statement, generator pipeline stage and evaluator since
+        the system was created. If profiling is not enabled, an empty
+        list is returned.
+        '''
+        if self.profiler is None:
+            return []
+        return self.profiler.report()
+    
+    def _notify_profile(self):
+        '''Sends the time spent in blocks, pipeline stages and
+        evaluations since the previous call to the monitor as
+        statistics.
+        '''
+        self.profiler.unwind()
+        totals = self.profiler.totals()
+        previous = self._profile_totals or { }
+        self._profile_totals = totals
+        
+        # Blocks report inclusive time, while stages and evaluations
+        # report self time so that selection and breeding operators are
+        # not charged for lazy evaluations.
+        stats = { }
+        for kind, key, index in (('BLOCK', 'block_time', 1), ('STAGE', 'stage_time', 3), ('EVAL', 'eval_time', 3)):
+            value = totals[kind][index] - previous.get(kind, [0, 0.0, 0.0, 0.0, 0.0])[index]
+            stats['local_' + key] = stats['global_' + key] = value
+        self.monitor.notify('System', 'statistic', stats)
+    
+    def get_state(self):
+        '''Returns a dictionary containing the state of the system
+        between steps. This includes the groups and variables created by
+        the system, the next birthday value, the state of the random
+        number generator and the position of the block selector.
+        
+        The returned state refers to the species and evaluators of the
+        system, which should be pickled by reference. See
+        `persistent_objects`.
+        '''
+        context = self._context
+        return {
+            'variables': dict((name, context[name]) for name in self._variable_names if name in context),
+            'birthday': Individual._birthday,   #pylint: disable=W0212
+            'rand': context['rand'].getstate(),
+            'selector_position': self._selector_position,
+        }
+    
+    def set_state(self, state):
+        '''Restores a state returned by `get_state`. The system must
+        have been created with the same definition and configuration as
+        the system that the state was obtained from.
+        
+        This replaces a call to `begin`.
+        '''
+        # Define the blocks without running the initialisation block
+        exec self._define_code in self._context   #pylint: disable=W0122
+        
+        context = self._context
+        for name, value in state['variables'].iteritems():
+            if isinstance(value, GroupAlias):
+                # Aliases are only stored in the context by __init__
+                value = GroupAlias(name, value._source_name)    #pylint: disable=W0212
+            context[name] = value
+        Individual._birthday = state['birthday']    #pylint: disable=W0212
+        context['rand'].setstate(state['rand'])
+        
+        self._block_cache = { }
+        self.selector_current = iter(self.selector)
+        self._selector_position = 0
+        for _ in xrange(state['selector_position']):
+            next(self.selector_current)
+            self._selector_position += 1
+        
+        if self.profiler is not None:
+            self._profile_totals = self.profiler.totals()
+    
+    def persistent_objects(self):
+        '''Returns a dictionary mapping names to the species and default
+        evaluators of this system. When saving a checkpoint, these
+        objects are pickled by name so that restored individuals refer
+        to the objects of the restoring system.
+        '''
+        result = { }
+        if self._lscape is not None:
+            result['landscape'] = self._lscape
+        for inst in self._species:
+            result['species:' + inst.name] = inst
+            if inst._eval_default is not None:                      #pylint: disable=W0212
+                result['eval:' + inst.name] = inst._eval_default    #pylint: disable=W0212
+        return result
+    
     def seed_offset(self, offset):
         '''Re-seed the random instance (shared everywhere) with an
         offset amount. Can be called before each ``run()`` for
@@ -208,6 +334,10 @@ class System(object):
             # Run the initialisation block
             exec self._code in self._context
             
+            if self.profiler is not None:
+                self.profiler.unwind()
+                self._profile_totals = self.profiler.totals()
+            
             self.monitor.on_post_reset(self)
         except KeyboardInterrupt:
             raise
@@ -269,7 +399,9 @@ class System(object):
                             block_name = next(self.selector_current)
                         except StopIteration:
                             self.selector_current = iter(self.selector)
+                            self._selector_position = 0
                             block_name = next(self.selector_current)
+                        self._selector_position += 1
                         block_name = str(block_name).lower()
                     
                     try:
@@ -295,10 +427,14 @@ class System(object):
                     ex_trace = ''.join(traceback.format_exception(*ex))
                     self.monitor.on_exception(self, ex_type, ex_value, ex_trace)
                 
+                if self.profiler is not None:
+                    self._notify_profile()
                 self.monitor.on_post_breed(self)
         finally:
             self._in_step = False
     
     def close(self):
         '''Executes clean-up code.'''
+        if self._parallel:
+            self._parallel.close()
         self.monitor.on_run_end(self)
\ No newline at end of file
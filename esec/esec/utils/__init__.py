@@ -4,9 +4,12 @@ Support functions for the |esec| framework.
 '''
 import sys, copy, os.path
 import itertools
+from math import log
 from warnings import warn
+from esec.context import rand
 from esec.utils.attributedict import attrdict
 from esec.utils.configdict import ConfigDict
+from esec.utils.lrucache import LRUCache
 from esec.utils.exceptions import ExceptionGroup, UnexpectedKeyWarning
 
 def a_or_an(string):
@@ -187,6 +190,46 @@ def overlapped_pairs(source):
     first = next(p2, None)
     return itertools.izip(p1, itertools.chain(p2, itertools.repeat(first)))
 
+SKIP_SITES_BELOW = 0.1
+'''The highest rate at which `sample_sites` skips between sites rather
+than testing every site. Above this rate, testing every site is
+faster.'''
+
+def sample_sites(length, rate, count=None):
+    '''Returns the indices of the sites to modify in a sequence of
+    `length` items.
+    
+    If `count` is provided, exactly `count` distinct sites (or every
+    site, if `count` is at least `length`) are selected uniformly at
+    random and returned in no particular order. Otherwise, each site is
+    selected independently with probability `rate` and the indices are
+    returned in increasing order.
+    
+    For rates below `SKIP_SITES_BELOW`, the number of sites between each
+    selection is drawn from a geometric distribution. The number of
+    random values used is proportional to the number of sites selected
+    rather than to `length`, while the distribution of the result is
+    the same as testing each site in turn.
+    '''
+    if count:
+        count = int(count)
+        if count >= length: return range(length)
+        return rand.sample(xrange(length), count)
+    if rate >= 1.0: return range(length)
+    if rate <= 0.0 or length <= 0: return []
+    
+    frand = rand.random
+    if rate >= SKIP_SITES_BELOW:
+        return [i for i in xrange(length) if frand() < rate]
+    
+    log_q = log(1.0 - rate)
+    sites = []
+    i = int(log(1.0 - frand()) / log_q)
+    while i < length:
+        sites.append(i)
+        i += 1 + int(log(1.0 - frand()) / log_q)
+    return sites
+
 _is_ironpython = None
 
 def is_ironpython():
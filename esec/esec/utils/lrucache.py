@@ -0,0 +1,103 @@
+'''Bounded cache that discards the least recently used items first.
+'''
+
+class LRUCache(object):
+    '''Maps keys to values, holding at most `size` items. When the cache
+    is full, adding an item discards the item that was least recently
+    retrieved or added.
+    
+    The `hits` and `misses` members count the calls to `get` that did
+    and did not find a value.
+    
+    Items are stored in a dictionary of ``[previous, next, key, value]``
+    links that form a circular list in order of use, so the cache does
+    not depend on ``collections.OrderedDict`` (added in Python 2.7).
+    '''
+    def __init__(self, size=1000):
+        '''Initialises a new cache.
+        
+        :Parameters:
+          size : int
+            The maximum number of items to hold. If zero, no items are
+            ever stored.
+        '''
+        self.size = int(size or 0)
+        '''The maximum number of items to hold.'''
+        self.hits = 0
+        '''The number of successful calls to `get`.'''
+        self.misses = 0
+        '''The number of unsuccessful calls to `get`.'''
+        self._items = { }
+        # The root link precedes the least recently used item and
+        # follows the most recently used item.
+        self._root = root = [None, None, None, None]
+        root[0] = root[1] = root
+    
+    def __getstate__(self):
+        # The links are replaced by a list of items from least to most
+        # recently used, since pickling the linked list would recurse
+        # once for every item.
+        items = [ ]
+        link = self._root[1]
+        while link is not self._root:
+            items.append((link[2], link[3]))
+            link = link[1]
+        return { 'size': self.size, 'hits': self.hits, 'misses': self.misses, 'items': items }
+    
+    def __setstate__(self, state):
+        self.__init__(state['size'])
+        self.hits = state['hits']
+        self.misses = state['misses']
+        for key, value in state['items']:
+            self[key] = value
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __contains__(self, key):
+        return key in self._items
+    
+    def _append(self, link):
+        '''Inserts `link` as the most recently used item.'''
+        root = self._root
+        last = root[0]
+        link[0], link[1] = last, root
+        last[1] = root[0] = link
+    
+    def get(self, key, default=None):
+        '''Returns the value stored for `key` and marks it as recently
+        used, or returns `default` if `key` is not in the cache.
+        '''
+        link = self._items.get(key)
+        if link is None:
+            self.misses += 1
+            return default
+        previous, following = link[0], link[1]
+        previous[1], following[0] = following, previous
+        self._append(link)
+        self.hits += 1
+        return link[3]
+    
+    def __setitem__(self, key, value):
+        if self.size <= 0: return
+        items = self._items
+        link = items.get(key)
+        if link is not None:
+            previous, following = link[0], link[1]
+            previous[1], following[0] = following, previous
+            link[3] = value
+        else:
+            link = items[key] = [None, None, key, value]
+        self._append(link)
+        if len(items) > self.size:
+            oldest = self._root[1]
+            oldest[1][0], self._root[1] = self._root, oldest[1]
+            del items[oldest[2]]
+    
+    def clear(self):
+        '''Removes all items from the cache. The `hits` and `misses`
+        counters are not reset.
+        '''
+        self._items.clear()
+        root = self._root
+        root[0] = root[1] = root
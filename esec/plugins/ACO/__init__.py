@@ -52,7 +52,7 @@ configs = {
         },
         'system': {
             'definition': TSP_DEF,
-            'create_pheromone_map': pheromone.PheromoneMap
+            'create_pheromone_map': pheromone.PheromoneMatrix
         },
         'monitor': {
             'primary': 'ants',
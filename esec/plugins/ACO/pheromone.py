@@ -12,9 +12,16 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-'''General pheromone map class.
+'''General pheromone map classes.
+
+`PheromoneMap` stores pheromone for any hashable phenome components in
+a dictionary. `PheromoneMatrix` stores pheromone for links between
+numbered nodes in a dense matrix, which is faster to update and allows
+`plugins.ACO.tsp.TourBuilder` to read pheromone without dictionary
+lookups.
 '''
 
+from array import array
 from itertools import chain, islice, izip
 from esec.species.sequence import SequenceIndividual
 import esec.utils
@@ -197,14 +204,7 @@ class PheromoneMap(object):
         
         if maximization is not None: maximisation = maximization
         
-        pheromone = self._pheromone
-        
-        for key in pheromone.iterkeys():
-            pheromone[key] *= persistence
-
-        # decay the initial value
-        self.initial *= persistence
-        initial = self.initial
+        self._evaporate(persistence)
         
         if use_rank:
             # sort in worst-to-best fitness order
@@ -213,8 +213,7 @@ class PheromoneMap(object):
             delta = step
             
             for indiv in group:
-                for p in esec.utils.overlapped_pairs(indiv.phenome):
-                    pheromone[p] = pheromone.get(p, initial) + delta
+                self._deposit(indiv.phenome, delta)
                 delta += step
         else:
             for indiv in source:
@@ -223,8 +222,30 @@ class PheromoneMap(object):
                 else:
                     delta = strength / float(indiv.fitness.values[0])
                 
-                for p in esec.utils.overlapped_pairs(indiv.phenome):
-                    pheromone[p] = pheromone.get(p, initial) + delta
+                self._deposit(indiv.phenome, delta)
+    
+    def _evaporate(self, persistence):
+        '''Multiplies every pheromone value, including the initial
+        value, by `persistence`.
+        '''
+        pheromone = self._pheromone
+        
+        for key in pheromone.iterkeys():
+            pheromone[key] *= persistence
+        
+        # decay the initial value
+        self.initial *= persistence
+    
+    def _deposit(self, phenome, delta):
+        '''Adds `delta` to the pheromone of each overlapped pair in
+        `phenome`, including the pair formed by the last and first
+        values.
+        '''
+        pheromone = self._pheromone
+        initial = self.initial
+        
+        for p in esec.utils.overlapped_pairs(phenome):
+            pheromone[p] = pheromone.get(p, initial) + delta
     
     def display(self):
         '''Displays the entire contents of this pheromone map.
@@ -239,6 +260,127 @@ class PheromoneMap(object):
             prev = i[0][0]
             print "%10s = %10.2f " % i,
         print
+
+#==============================================================================
+
+class PheromoneMatrix(PheromoneMap):
+    '''Represents a pheromone map for links between nodes numbered from
+    zero, such as the cities in a tour. Keys are ``(i, j)`` tuples, as
+    produced by the overlapped pairs of a `SequenceIndividual`'s
+    phenome.
     
+    Pheromone values are stored in a dense matrix as a flat array of
+    floats with a shared scale factor. Evaporation only changes the
+    scale factor and depositing pheromone changes one element for each
+    link, so neither depends on the size of the matrix. The matrix is
+    enlarged automatically to include any node that pheromone is
+    deposited on.
+    '''
+    
+    RESCALE_BELOW = 1e-20
+    '''When the scale factor falls below this value, it is applied to
+    the stored values and reset to one. This prevents stored values (and
+    the values returned by `powered`) from overflowing.
+    '''
+    
+    def __init__(self, initial=0.1, size=None):
+        '''Initialises a new pheromone matrix.
+        
+        :Parameter:
+          initial : float
+            The initial pheromone. It is generally recommended that this
+            be greater than zero.
+          
+          size : int [optional]
+            The number of nodes. If omitted, the matrix is sized when
+            pheromone is first deposited or by calling `resize`.
+        '''
+        super(PheromoneMatrix, self).__init__(initial)
+        self.size = 0
+        '''The number of nodes in the matrix.'''
+        self._values = array('d')
+        self._scale = 1.0
+        self._powered = { }
+        if size: self.resize(size)
+    
+    def resize(self, size):
+        '''Enlarges the matrix to include at least `size` nodes. New
+        links have the current initial pheromone value.
+        '''
+        old_size = self.size
+        if size <= old_size: return
+        
+        old_values = self._values
+        values = array('d', [self.initial / self._scale]) * (size * size)
+        for i in xrange(old_size):
+            values[i * size:i * size + old_size] = old_values[i * old_size:(i + 1) * old_size]
+        self._values = values
+        self.size = size
+        self._powered = { }
+    
+    def __getitem__(self, key):
+        i, j = key
+        size = self.size
+        if 0 <= i < size and 0 <= j < size:
+            return self._values[i * size + j] * self._scale
+        return self.initial
+    
+    def powered(self, power):
+        '''Returns an array containing the pheromone value of every link
+        raised to `power`, in row-major order.
+        
+        Every element is divided by the same (unspecified) factor, so
+        the values are only suitable for comparison with each other. The
+        returned array is updated in place as pheromone changes until
+        `resize` is called.
+        '''
+        cache = self._powered.get(power)
+        if cache is None:
+            cache = self._powered[power] = array('d', (value ** power for value in self._values))
+        return cache
+    
+    def _evaporate(self, persistence):
+        '''Multiplies every pheromone value, including the initial
+        value, by `persistence`.
+        '''
+        self.initial *= persistence
+        self._scale *= persistence
+        if self._scale < self.RESCALE_BELOW:
+            scale = self._scale
+            values = self._values
+            values[:] = array('d', (value * scale for value in values))
+            for power, cache in self._powered.iteritems():
+                cache[:] = array('d', (value ** power for value in values))
+            self._scale = 1.0
+    
+    def _deposit(self, phenome, delta):
+        '''Adds `delta` to the pheromone of each link between adjacent
+        nodes in `phenome`, including the link from the last node to the
+        first.
+        '''
+        phenome = list(phenome)
+        if not phenome: return
+        self.resize(max(phenome) + 1)
+        
+        size = self.size
+        values = self._values
+        powered = self._powered.items()
+        delta /= self._scale
+        for i, j in izip(phenome, chain(islice(phenome, 1, None), phenome[:1])):
+            k = i * size + j
+            value = values[k] = values[k] + delta
+            for power, cache in powered:
+                cache[k] = value ** power
+    
+    def display(self):
+        '''Displays the entire contents of this pheromone matrix.
+        
+        This is intended for debugging purposes only.
+        '''
+        for i in xrange(self.size):
+            for j in xrange(self.size):
+                print "%10s = %10.2f " % ((i, j), self[i, j]),
+            print
+
 #==============================================================================
 
@@ -15,6 +15,8 @@
 '''TSP problem classes. 
 '''
 
+from array import array
+from heapq import nlargest
 from itertools import chain, islice, izip
 from math import sqrt
 import esec.landscape as landscape
@@ -33,8 +35,10 @@ class TourSpecies(SequenceSpecies):
         super(TourSpecies, self).__init__(cfg, eval_default)
         # Make some names public within the execution context
         self.public_context['build_tours'] = self.init_tour
+        self._builder = None
     
-    def init_tour(self, cost_map, cost_power=2.0, pheromone_map=None, pheromone_power=2.0, greediness=0.0):
+    def init_tour(self, cost_map, cost_power=2.0, pheromone_map=None, pheromone_power=2.0, greediness=0.0,
+                  candidates=None):
         '''Returns instances of `SequenceIndividual` based on cost and
         pheromone maps.
         
@@ -70,48 +74,31 @@ class TourSpecies(SequenceSpecies):
             The probability of selecting the most attractive link rather
             than selecting an available link at random in proportion to
             attractiveness.
+          
+          candidates : int [optional]
+            The number of nearest nodes to consider at each step. If
+            omitted, every unvisited node is considered. Using 10 to 20
+            candidates greatly reduces the time taken to build tours for
+            large problems.
         '''
-        irand = rand.randrange
-        frand = rand.random
+        builder = self._builder
+        if (builder is None or builder.cost_map is not cost_map or builder.cost_power != cost_power or
+            builder.pheromone_map is not pheromone_map or builder.pheromone_power != pheromone_power or
+            builder.candidates != (int(candidates) if candidates else None)):
+            # The builder keeps the attractiveness of each link, so it
+            # is reused while the maps and parameters are unchanged.
+            builder = self._builder = TourBuilder(cost_map, cost_power, pheromone_map, pheromone_power,
+                                                  candidates)
         
-        length = max(cost_map)[0] + 1
+        length = builder.size
         next_start_city = 0
         
         while True:
             # For each individual...
-            
-            # Starting location
-            current_city = next_start_city
+            genes = builder.tour(next_start_city, greediness)
             next_start_city = (next_start_city + 1) % length
             
-            # Remaining options
-            options = set(xrange(length))
-            options.discard(current_city)
-            genes = [ current_city ]
-            
-            while options:
-                prob_list = self._init_fitness_wheel(genes[-1], options,
-                                                     cost_map, cost_power,
-                                                     pheromone_map, pheromone_power)
-                # Greedy selection
-                next_city = prob_list[0][0]
-                
-                if greediness <= 0.0 or greediness < frand():
-                    # Non-greedy selection
-                    selection = frand() * sum(i[1] for i in prob_list)
-                    
-                    for city_index, prob in prob_list:
-                        if selection < prob:
-                            next_city = city_index
-                            break
-                        else:
-                            selection -= prob
-                
-                genes.append(next_city)
-                options.discard(next_city)
-            
-            # No options remaining, the link back to the original node
-            # is handled elsewhere
+            # The link back to the original node is handled elsewhere
             yield SequenceIndividual(genes, parent=self)
     
     @classmethod
@@ -151,3 +138,137 @@ class TourSpecies(SequenceSpecies):
         return prob_list
 
 #==============================================================================
+
+class TourBuilder(object):
+    '''Constructs tours from cost and pheromone maps.
+    
+    The attractiveness of the links from each node, based on cost, is
+    calculated the first time the node is visited and kept for later
+    tours. When the pheromone map is a `PheromoneMatrix`, pheromone is
+    read directly from its `PheromoneMatrix.powered` array. Otherwise,
+    the pheromone map is indexed for each potential link.
+    
+    If `candidates` is specified, each step only considers the nearest
+    unvisited nodes (those with the most attractive costs). All
+    unvisited nodes are considered when every candidate has been
+    visited.
+    '''
+    
+    def __init__(self, cost_map, cost_power=2.0, pheromone_map=None, pheromone_power=2.0, candidates=None):
+        '''Initialises a new tour builder. The parameters are described
+        in `TourSpecies.init_tour`.
+        '''
+        self.cost_map = cost_map
+        self.cost_power = cost_power
+        self.pheromone_map = pheromone_map
+        self.pheromone_power = pheromone_power
+        self.candidates = int(candidates) if candidates else None
+        self.size = getattr(cost_map, 'size', None) or max(cost_map)[0] + 1
+        self._heuristic = [None] * self.size
+        self._candidates = [None] * self.size
+    
+    def heuristic(self, node):
+        '''Returns an array containing the attractiveness of the link from
+        `node` to every node, based on cost alone. The entry for `node`
+        is zero.
+        '''
+        row = self._heuristic[node]
+        if row is None:
+            cost_map = self.cost_map
+            power = self.cost_power
+            if hasattr(cost_map, 'row'):
+                costs = cost_map.row(node)
+            else:
+                costs = (cost_map[(node, j)] if j != node else None for j in xrange(self.size))
+            row = self._heuristic[node] = array('d', (c ** -power if c else 1.0 for c in costs))
+            row[node] = 0.0
+        return row
+    
+    def candidate_list(self, node):
+        '''Returns the `candidates` most attractive nodes to move to from
+        `node`, based on cost alone, in order of decreasing
+        attractiveness.
+        '''
+        nodes = self._candidates[node]
+        if nodes is None:
+            row = self.heuristic(node)
+            nodes = nlargest(self.candidates + 1, xrange(self.size), key=row.__getitem__)
+            nodes = self._candidates[node] = [j for j in nodes if j != node][:self.candidates]
+        return nodes
+    
+    def tour(self, start, greediness=0.0):
+        '''Returns a list containing a new tour beginning at `start`.
+        
+        :Parameters:
+          start : int
+            The first node of the tour.
+          
+          greediness : |prob| [defaults to 0.0]
+            The probability of selecting the most attractive link rather
+            than selecting a link at random in proportion to
+            attractiveness.
+        '''
+        frand = rand.random
+        size = self.size
+        pheromone_map = self.pheromone_map
+        pheromone_power = self.pheromone_power
+        powered = None
+        if hasattr(pheromone_map, 'powered'):
+            pheromone_map.resize(size)
+            powered = pheromone_map.powered(pheromone_power)
+        
+        # Unvisited nodes are kept in the first `remaining` elements of
+        # `unvisited` so they can be removed in constant time.
+        unvisited = range(size)
+        position = range(size)
+        visited = [False] * size
+        remaining = size
+        
+        current = start
+        genes = [ start ]
+        while True:
+            visited[current] = True
+            remaining -= 1
+            last = unvisited[remaining]
+            unvisited[position[current]] = last
+            position[last] = position[current]
+            if not remaining: break
+            
+            options = None
+            if self.candidates:
+                options = [j for j in self.candidate_list(current) if not visited[j]]
+            if not options:
+                options = unvisited[:remaining]
+            
+            heuristic = self.heuristic(current)
+            if powered is not None:
+                base = current * size
+                weights = [heuristic[j] * powered[base + j] for j in options]
+            elif pheromone_map:
+                weights = []
+                for j in options:
+                    p = pheromone_map[(current, j)]
+                    weights.append(heuristic[j] * (p ** pheromone_power if p else 1))
+            else:
+                weights = [heuristic[j] for j in options]
+            
+            if greediness > 0.0 and frand() <= greediness:
+                # Greedy selection
+                current = options[weights.index(max(weights))]
+            else:
+                total = sum(weights)
+                if total > 0.0:
+                    selection = frand() * total
+                    current = options[-1]
+                    for j, weight in izip(options, weights):
+                        if selection < weight:
+                            current = j
+                            break
+                        selection -= weight
+                else:
+                    current = options[int(frand() * len(options))]
+            genes.append(current)
+        
+        return genes
+
+#==============================================================================
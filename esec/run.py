@@ -348,6 +348,7 @@ batch_settings_syntax = {
     'csv': bool,
     'low_priority': bool,
     'quiet': bool,
+    'processes': [int, None],
 }
 '''The syntax used for batch configurations.'''
 
@@ -361,9 +362,258 @@ batch_settings_default = {
     'csv': False,
     'low_priority': False,
     'quiet': False,
+    'processes': None,
 }
 '''The default values used for batch configurations.'''
 
+def _load_batch(batch_name):
+    '''Loads a batch file from the ``cfgs`` directory.
+    
+    :Returns:
+        A tuple containing the list of batch items, the default
+        configuration for each item and the settings string provided by
+        the batch file.
+    '''
+    # A batch file is a normal .py file with a method named "batch" that 
+    # returns a sequence of tuples of settings.
+    mod = _load_module('cfgs', batch_name)
+    if not mod:
+        raise ImportError('Cannot find ' + batch_name + ' as batch file.')
+    # Update configs with anything specified in the batch file
+    configs.update(mod.get('configs', None) or { })
+    # Get any settings overrides from the batch file
+    batch = list(mod.get('batch')())
+    batch_settings = mod.get('settings', '')
+    # Get config defaults (allows batch files to import plugins directly)
+    batch_default = ConfigDict(default)
+    batch_default.overlay(mod.get('defaults', { }))
+    return batch, batch_default, batch_settings
+
+def _unpack_batch_item(batch_item):
+    '''Returns the tags, configuration names, configuration
+    dictionary, settings string and format string of a batch item.
+    '''
+    # Use get method (dictionary) if available;
+    # otherwise, assume compatibility mode (tuple).
+    if hasattr(batch_item, 'get'):
+        tags = batch_item.get('tags', set([]))
+        names = batch_item.get('names', None)
+        config = batch_item.get('config', None)
+        settings = batch_item.get('settings', None)
+        fmt = batch_item.get('format', None) or batch_item.get('fmt', None)
+    else:
+        tags, names, config, settings, fmt = batch_item
+    return tags, names, config, settings, fmt
+
+def _run_batch_item(i, batch_item, batch_default, batch_cfg, pathbase, verbose, console=True):
+    '''Runs a single configuration of a batch and saves the results.
+    
+    :Parameters:
+      i : int
+        The index of the configuration within the batch.
+      
+      batch_item : tuple or dict
+        The configuration from the batch file.
+      
+      batch_default : `ConfigDict`
+        The default configuration.
+      
+      batch_cfg : `ConfigDict`
+        The validated batch settings.
+      
+      pathbase : str
+        The absolute path to save results in.
+      
+      verbose : int
+        The verbosity level from the command line, or a negative value
+        to use the value in the configuration.
+      
+      console : bool
+        ``False`` to prevent any output being written to the console.
+    
+    :Returns:
+        The first two lines written to the summary output, or ``None``
+        if `batch_cfg` specifies a dry run.
+    '''
+    #pylint: disable=R0912,R0914
+    tags, names, config, settings, _ = _unpack_batch_item(batch_item)
+    
+    # Use cfgid instead of converting i repeatedly
+    cfgid = '%04d' % i
+    # Output file extension is '.txt' unless the csv setting is True.
+    extension = '.txt'
+    if batch_cfg.csv:
+        extension = '.csv'
+    
+    if console:
+        # Print an obvious header
+        print '\n** ' + "*"*117
+        print ' **'
+        print ("  ** Experiment %04d." % i), (("Tags %s" % tags) if tags else "")
+        print ' **'
+        print "** "+ "*"*117 + '\n'
+    
+    # Overlay any configuration names specified for this run.
+    if names:
+        try:
+            cfg = _load_config(names, batch_default)
+        except AttributeError:
+            print >> sys.stderr, 'Loading config file(s) failed: '+ names
+            raise
+    else:
+        cfg = ConfigDict(batch_default)
+    
+    # Overlay any config dictionary (copy to avoid shared reference issues)
+    cfg.overlay(ConfigDict(config) if isinstance(config, ConfigDict) else config)
+    # Override cfg.verbose
+    if verbose >= 0:
+        cfg.verbose = int(verbose)
+    # Use settings strings to override configurations
+    for key, value in settings_split(settings).iteritems():
+        cfg.set_by_name(key, value)
+    
+    # Write summary to a buffer first, then only include the second line
+    # in the super summary file (ignore headings)
+    summary_buffer = StringIO()
+    
+    # Helper function to open a unique file
+    def _open(filepattern, mode='w'):
+        '''Returns an open file. `filepattern` must contain a ``%d``
+        value so a unique index may be included.
+        '''
+        i = 0
+        filename = filepattern % i
+        # Not reliable, but no other choice in Python
+        # (specifically, open() has no way to fail when a file exists)
+        while os.path.exists(filename):
+            i += 1
+            filename = filepattern % i
+        return open(filename, mode)
+    
+    # Close files/objects in this list after this run
+    open_files = []
+    
+    # If the monitor has been specified as a dictionary, specify output files.
+    # If the monitor has been specified directly, don't try and change it.
+    if isinstance(cfg.monitor, (ConfigDict, dict)):
+        report_out = _open(os.path.join(pathbase, cfgid + '.%04d' + extension))
+        summary_out = _open(os.path.join(pathbase, cfgid + '.%04d._summary' + extension))
+        config_out = _open(os.path.join(pathbase, cfgid + '.%04d._config.txt'))
+        open_files.extend((report_out, summary_out, config_out))
+        
+        if not batch_cfg.csv:
+            if not console:
+                cfg.overlay({'monitor': {
+                    'report_out': report_out,
+                    'summary_out': MultiTarget(summary_out, summary_buffer),
+                    'config_out': config_out,
+                    'error_out': summary_out,
+                    'verbose': max(4, cfg.verbose),
+                }})
+            elif batch_cfg.quiet:
+                # MultiTarget sends the same output to both the console and the files.
+                cfg.overlay({'monitor': {
+                    'report_out': report_out,
+                    'summary_out': MultiTarget(summary_out, sys.stdout, summary_buffer),
+                    'config_out': config_out,
+                    'error_out': MultiTarget(summary_out, sys.stderr),
+                    'verbose': max(4, cfg.verbose),
+                }})
+            else:
+                # MultiTarget sends the same output to both the console and the files.
+                cfg.overlay({'monitor': {
+                    'report_out': MultiTarget(report_out, sys.stdout),
+                    'summary_out': MultiTarget(summary_out, sys.stdout, summary_buffer),
+                    'config_out': MultiTarget(config_out, sys.stdout),
+                    'error_out': MultiTarget(summary_out, sys.stderr),
+                    'verbose': max(4, cfg.verbose),
+                }})
+        else:
+            # MultiMonitor sends the same callbacks to different monitors.
+            monitor_cfg = ConfigDict(cfg.monitor)
+            if batch_cfg.quiet or not console:
+                monitor_cfg['report_out'] = None
+                monitor_cfg['config_out'] = None
+            if not console:
+                monitor_cfg['summary_out'] = None
+                monitor_cfg['error_out'] = None
+            console_monitor = ConsoleMonitor(monitor_cfg)
+            monitor_cfg.overlay({
+                'report_out': report_out,
+                'summary_out': MultiTarget(summary_out, summary_buffer),
+                'config_out': config_out,
+                'error_out': summary_out,
+                'verbose': max(4, cfg.verbose),
+            })
+            csv_monitor = CSVMonitor(monitor_cfg)
+            
+            cfg.monitor = {
+                'class': MultiMonitor,
+                'monitors': [ console_monitor, csv_monitor ]
+            }
+    
+    # Create an Experiment instance
+    try:
+        ea_exp = Experiment(cfg)
+    except:
+        ea_exp = None
+    
+    # Run the application (and time it)
+    if batch_cfg.dry_run:
+        message = '--> DRY RUN DONE <--'
+    elif ea_exp:
+        start_time = time.clock()
+        ea_exp.run()
+        message = '->> DONE <<- in %s' % (time.clock() - start_time)
+    else:
+        message = '--> ERRORS OCCURRED <--'
+    if console:
+        print message
+    
+    for obj in open_files: obj.close()
+    
+    if batch_cfg.dry_run:
+        return None
+    
+    summary_lines = summary_buffer.getvalue().splitlines()[:2]
+    if len(summary_lines) != 2:
+        summary_lines = ['-', '-']
+    return summary_lines
+
+_batch_worker_state = { }
+'''The batch state loaded by each worker process.'''
+
+def _batch_worker_init(batch_name, batch_cfg, pathbase, verbose):
+    '''Initialises a worker process for a parallel batch run. The batch
+    file is loaded again in each worker, so that configurations do not
+    need to be passed between processes.
+    '''
+    if batch_cfg.low_priority:
+        _set_low_priority()
+    batch, batch_default, _ = _load_batch(batch_name)
+    _batch_worker_state.update(
+        batch=batch,
+        batch_default=batch_default,
+        batch_cfg=batch_cfg,
+        pathbase=pathbase,
+        verbose=verbose,
+    )
+
+def _batch_worker(i):
+    '''Runs configuration `i` of the batch loaded by
+    `_batch_worker_init`.
+    
+    :Returns:
+        A tuple containing `i`, the summary lines returned by
+        `_run_batch_item` and the time taken in seconds.
+    '''
+    state = _batch_worker_state
+    start_time = time.time()
+    summary_lines = _run_batch_item(i, state['batch'][i], state['batch_default'],
+                                    state['batch_cfg'], state['pathbase'], state['verbose'],
+                                    console=False)
+    return i, summary_lines, time.time() - start_time
+
 def esec_batch(options):
     '''Runs a batch file of configurations and saves the results.
     
@@ -420,24 +670,17 @@ def esec_batch(options):
     batch.quiet=True
         Hide console output
     
+    batch.processes=...
+        Run configurations in this many worker processes. Zero uses one
+        process for each CPU. Console output from each run is hidden,
+        and the summary files are written in configuration order.
+    
     '''
     # Disable pylint complaints about branches and local variables
     #pylint: disable=R0912,R0914
     
     options.batch, _, tag_names = options.batch.partition('+')
-    # A batch file is a normal .py file with a method named "batch" that 
-    # returns a sequence of tuples of settings.
-    mod = _load_module('cfgs', options.batch)
-    if not mod:
-        raise ImportError('Cannot find ' + options.batch + ' as batch file.')
-    # Update configs with anything specified in the batch file
-    configs.update(mod.get('configs', None) or { })
-    # Get any settings overrides from the batch file
-    batch = mod.get('batch')()
-    batch_settings = mod.get('settings', '')
-    # Get config defaults (allows batch files to import plugins directly)
-    batch_default = ConfigDict(default)
-    batch_default.overlay(mod.get('defaults', { }))
+    batch, batch_default, batch_settings = _load_batch(options.batch)
     
     print '>>>>', batch_settings
     
@@ -511,18 +754,25 @@ def esec_batch(options):
     # Create a super summary (summary of the summary lines)
     summary_file = open(os.path.join(pathbase, '_summary' + extension), 'w')
     
-    # Run each configuration of the batch
+    def _write_summary(i, summary_lines):
+        '''Writes the summary of configuration `i` to the super
+        summary file.
+        '''
+        if summary_file and summary_lines:
+            if batch_cfg.csv:
+                if i == 0:
+                    summary_file.write('#,' + summary_lines[0] + '\n')
+                summary_file.write('%d,%s\n' % (i, summary_lines[1]))
+            else:
+                if i == 0:
+                    summary_file.write('  #  ' + summary_lines[0] + '\n')
+                summary_file.write('%04d %s\n' % (i, summary_lines[1]))
+            summary_file.flush()
+    
+    # Select the configurations to run
+    run_ids = []
     for i, batch_item in enumerate(batch):
-        # Use get method (dictionary) if available;
-        # otherwise, assume compatibility mode (tuple).
-        if hasattr(batch_item, 'get'):
-            tags = batch_item.get('tags', set([]))
-            names = batch_item.get('names', None)
-            config = batch_item.get('config', None)
-            settings = batch_item.get('settings', None)
-            fmt = batch_item.get('format', None) or batch_item.get('fmt', None)
-        else:
-            tags, names, config, settings, fmt = batch_item
+        tags, _, _, _, fmt = _unpack_batch_item(batch_item)
         
         # Use cfgid instead of converting i repeatedly
         cfgid = '%04d' % i
@@ -549,134 +799,34 @@ def esec_batch(options):
         if (batch_cfg.include_tags and not batch_cfg.include_tags.intersection(tags) or
             batch_cfg.exclude_tags and batch_cfg.exclude_tags.intersection(tags)):
             continue
-        # Print an obvious header
-        print '\n** ' + "*"*117
-        print ' **'
-        print ("  ** Experiment %04d." % i), (("Tags %s" % tags) if tags else "")
-        print ' **'
-        print "** "+ "*"*117 + '\n'
-        
-        # Overlay any configuration names specified for this run.
-        if names:
-            try:
-                cfg = _load_config(names, batch_default)
-            except AttributeError:
-                print >> sys.stderr, 'Loading config file(s) failed: '+ names
-                raise
-        else:
-            cfg = ConfigDict(batch_default)
-        
-        # Overlay any config dictionary (copy to avoid shared reference issues)
-        cfg.overlay(ConfigDict(config) if isinstance(config, ConfigDict) else config)
-        # Override cfg.verbose
-        if options.verbose >= 0:
-            cfg.verbose = int(options.verbose)
-        # Use settings strings to override configurations
-        for key, value in settings_split(settings).iteritems():
-            cfg.set_by_name(key, value)
-        
-        # Write summary to a buffer first, then only include the second line
-        # in the super summary file (ignore headings)
-        summary_buffer = StringIO()
-
-        # Helper function to open a unique file
-        def _open(filepattern, mode='w'):
-            '''Returns an open file. `filepattern` must contain a ``%d``
-            value so a unique index may be included.
-            '''
-            i = 0
-            filename = filepattern % i
-            # Not reliable, but no other choice in Python
-            # (specifically, open() has no way to fail when a file exists)
-            while os.path.exists(filename):
-                i += 1
-                filename = filepattern % i
-            return open(filename, mode)
-        
-        # Close files/objects in this list after this run
-        open_files = []
-        
-        # If the monitor has been specified as a dictionary, specify output files.
-        # If the monitor has been specified directly, don't try and change it.
-        if isinstance(cfg.monitor, (ConfigDict, dict)):
-            report_out = _open(os.path.join(pathbase, cfgid + '.%04d' + extension))
-            summary_out = _open(os.path.join(pathbase, cfgid + '.%04d._summary' + extension))
-            config_out = _open(os.path.join(pathbase, cfgid + '.%04d._config.txt'))
-            open_files.extend((report_out, summary_out, config_out))
-            
-            if not batch_cfg.csv:
-                if batch_cfg.quiet:
-                    # MultiTarget sends the same output to both the console and the files.
-                    cfg.overlay({'monitor': {
-                        'report_out': report_out,
-                        'summary_out': MultiTarget(summary_out, sys.stdout, summary_buffer),
-                        'config_out': config_out,
-                        'error_out': MultiTarget(summary_out, sys.stderr),
-                        'verbose': max(4, cfg.verbose),
-                    }})
-                else:
-                    # MultiTarget sends the same output to both the console and the files.
-                    cfg.overlay({'monitor': {
-                        'report_out': MultiTarget(report_out, sys.stdout),
-                        'summary_out': MultiTarget(summary_out, sys.stdout, summary_buffer),
-                        'config_out': MultiTarget(config_out, sys.stdout),
-                        'error_out': MultiTarget(summary_out, sys.stderr),
-                        'verbose': max(4, cfg.verbose),
-                    }})
-            else:
-                # MultiMonitor sends the same callbacks to different monitors.
-                monitor_cfg = ConfigDict(cfg.monitor)
-                if batch_cfg.quiet:
-                    monitor_cfg['report_out'] = None
-                    monitor_cfg['config_out'] = None
-                console_monitor = ConsoleMonitor(monitor_cfg)
-                monitor_cfg.overlay({
-                    'report_out': report_out,
-                    'summary_out': MultiTarget(summary_out, summary_buffer),
-                    'config_out': config_out,
-                    'error_out': summary_out,
-                    'verbose': max(4, cfg.verbose),
-                })
-                csv_monitor = CSVMonitor(monitor_cfg)
-                
-                cfg.monitor = {
-                    'class': MultiMonitor,
-                    'monitors': [ console_monitor, csv_monitor ]
-                }
-        
-        # Create an Experiment instance
+        run_ids.append(i)
+    
+    # Run each configuration of the batch
+    if batch_cfg.processes is None:
+        for i in run_ids:
+            _write_summary(i, _run_batch_item(i, batch[i], batch_default, batch_cfg, pathbase, options.verbose))
+    elif run_ids:
+        from multiprocessing import Pool
+        pool = Pool(batch_cfg.processes or None, _batch_worker_init,
+                    (options.batch, batch_cfg, pathbase, options.verbose))
         try:
-            ea_exp = Experiment(cfg)
+            # imap returns results in order, so the super summary is
+            # the same as for a serial run.
+            for i, summary_lines, elapsed in pool.imap(_batch_worker, run_ids):
+                if batch_cfg.dry_run:
+                    print "  ** Experiment %04d: DRY RUN DONE" % i
+                else:
+                    print "  ** Experiment %04d: DONE in %s" % (i, elapsed)
+                _write_summary(i, summary_lines)
+            pool.close()
         except:
-            ea_exp = None
-        
-        # Run the application (and time it)
-        if batch_cfg.dry_run:
-            print '--> DRY RUN DONE <--'
-        elif ea_exp:
-            start_time = time.clock()
-            ea_exp.run()
-            print '->> DONE <<- in ', (time.clock() - start_time)
-        else:
-            print '--> ERRORS OCCURRED <--'
-        
-        # Write the summary to the super summary file.
-        if summary_file and not batch_cfg.dry_run:
-            summary_lines = summary_buffer.getvalue().splitlines()[:2]
-            if len(summary_lines) != 2:
-                summary_lines = ['-', '-']
-            if batch_cfg.csv:
-                if i == 0:
-                    summary_file.write('#,' + summary_lines[0] + '\n')
-                summary_file.write('%d,%s\n' % (i, summary_lines[1]))
-            else:
-                if i == 0:
-                    summary_file.write('  #  ' + summary_lines[0] + '\n')
-                summary_file.write('%04d %s\n' % (i, summary_lines[1]))
-            summary_file.flush()
-        
-        for obj in open_files: obj.close()
-        
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+    
+    summary_file.close()
+    
     # Save the tag data
     if batch_cfg.include_tags or batch_cfg.exclude_tags:
         tags_file.write("#\n# Summary of cfgid's per tag\n#\n")
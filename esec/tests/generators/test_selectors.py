@@ -276,3 +276,144 @@ def check_selectors_BestOfTuple(population, best_population):
     print "len(offspring) = %d, len(population) = %d" % (len(offspring), len(best_population))
     assert len(offspring) == len(best_population), "Did not select all individials"
     assert all([i in best_population for i in offspring]), "Some individuals not in original population"
+
+def _sample_wheel(selector, population, method, with_replacement, count, **kwargs):
+    _gen = selector(_source=iter(population), with_replacement=with_replacement, method=method, **kwargs)
+    return [next(_gen) for _ in xrange(count)]
+
+def test_selectors_proportional_methods():
+    for population in (make_pop_max(), make_pop_min()):
+        for selector, kwargs in ((selectors.FitnessProportionalNormal, { }),
+                                 (selectors.RankProportionalNormal, { 'expectation': 2.0 }),
+                                 (selectors.RankProportionalNormal, { 'expectation': 1.5, 'invert': True })):
+            yield check_selectors_proportional_methods_match, selector, population, True, kwargs
+            yield check_selectors_proportional_methods_match, selector, population, False, kwargs
+
+def check_selectors_proportional_methods_match(selector, population, with_replacement, kwargs):
+    count = 500 if with_replacement else len(population)
+    state = rand.getstate()
+    linear = _sample_wheel(selector, population, 'linear', with_replacement, count, **kwargs)
+    rand.setstate(state)
+    bisect = _sample_wheel(selector, population, 'bisect', with_replacement, count, **kwargs)
+    print "len(linear) = %d, len(bisect) = %d" % (len(linear), len(bisect))
+    assert len(linear) == len(bisect) == count, "Did not select expected number of individuals"
+    assert all(i1 is i2 for i1, i2 in izip(linear, bisect)), "Methods selected different individuals"
+
+def test_selectors_proportional_distribution():
+    population = make_pop_max()[:10]
+    total = float(sum(range(10)))
+    yield (check_selectors_proportional_distribution, selectors.FitnessProportionalNormal,
+           population, [i / total for i in xrange(9, -1, -1)], { })
+    yield (check_selectors_proportional_distribution, selectors.RankProportionalNormal,
+           population, [(1.5 - i / 9.0) / 10.0 for i in xrange(10)], { 'expectation': 1.5 })
+
+def check_selectors_proportional_distribution(selector, population, expected, kwargs):
+    samples = 20000
+    ranked = sorted(population, key=lambda i: i.fitness.simple, reverse=True)
+    for method in ('linear', 'bisect'):
+        offspring = _sample_wheel(selector, population, method, True, samples, **kwargs)
+        observed = [sum(1 for j in offspring if j is i) for i in ranked]
+        print "method = %s, observed = %s" % (method, observed)
+        # Individuals with zero probability must never be selected
+        assert all(o == 0 for o, e in izip(observed, expected) if e == 0.0), "Selected an individual with zero probability"
+        # Pearson's chi-squared statistic with at most 9 degrees of freedom
+        # should be below 27.88 (p = 0.001)
+        chi2 = sum((o - e * samples) ** 2 / (e * samples) for o, e in izip(observed, expected) if e > 0.0)
+        print "chi2 = %f" % chi2
+        assert chi2 < 27.88, "Distribution does not match expected proportions"
+
+class PairFitness(FitnessMaximise):
+    types = [float, float]
+    defaults = [0.0, 0.0]
+
+def _make_tied_pop(fitness):
+    population = make_pop_max()
+    for indiv, value in izip(population, (rand.randrange(10) for _ in population)):
+        indiv.fitness = fitness(value)
+        indiv.birthday = rand.randrange(10)
+    return population
+
+def test_selectors_ordered():
+    for fitness in (FitnessMaximise, FitnessMinimise, lambda v: PairFitness((v, -v))):
+        population = _make_tied_pop(fitness)
+        for selector, key, reverse in [
+            (selectors.Best, lambda i: i.fitness, True),
+            (selectors.Worst, lambda i: i.fitness, False),
+            (selectors.Youngest, lambda i: i.birthday, True),
+            (selectors.Oldest, lambda i: i.birthday, False)]:
+            yield check_selectors_ordered, selector, population, key, reverse
+
+def check_selectors_ordered(selector, population, key, reverse):
+    expected = sorted(population, key=key, reverse=reverse)
+    for count in (1, 2, 10, 13, len(population)):
+        _gen = selector(_source=iter(population))
+        offspring = [next(_gen) for _ in xrange(count)]
+        print [key(i) for i in offspring]
+        assert all(i is j for i, j in izip(offspring, expected)), \
+            "Did not select the same individuals as a stable sort"
+    
+    offspring = list(selector(_source=iter(population)))
+    assert len(offspring) == len(population), "Did not select all individuals"
+    assert all(i is j for i, j in izip(offspring, expected)), "Did not select the same individuals as a stable sort"
+
+def _reference_tournament(population, k, greediness, with_replacement):
+    '''Selects from `population` by removing competitors from a list, as
+    `selectors.Tournament` originally did.'''
+    group = list(population)
+    if with_replacement:
+        while True:
+            pool = [group[rand.randrange(len(group))] for _ in xrange(k)]
+            winner = max(pool, key=lambda i: i.fitness.key)
+            if greediness >= 1.0 or rand.random() < greediness:
+                yield winner
+            else:
+                pool.remove(winner)
+                yield rand.choice(pool)
+    while group:
+        winner_index = 0
+        if len(group) >= k:
+            pool_index = [rand.randrange(len(group)) for _ in xrange(k)]
+            winner_index = max(pool_index, key=lambda i: group[i].fitness.key)
+            if not (greediness >= 1.0 or rand.random() < greediness):
+                pool_index.remove(winner_index)
+                winner_index = rand.choice(pool_index)
+        yield group.pop(winner_index)
+
+def test_selectors_Tournament_reference():
+    for population in (make_pop_max(), make_pop_min(), _make_tied_pop(FitnessMaximise)):
+        for k, greediness in ((2, 1.0), (3, 1.0), (3, 0.7)):
+            yield check_selectors_Tournament_with_replacement, population, k, greediness
+            yield check_selectors_Tournament_without_replacement, population[:20], k, greediness
+
+def check_selectors_Tournament_with_replacement(population, k, greediness):
+    state = rand.getstate()
+    _gen = _reference_tournament(population, k, greediness, True)
+    expected = [next(_gen) for _ in xrange(200)]
+    rand.setstate(state)
+    _gen = selectors.Tournament(_source=iter(population), k=k, greediness=greediness, with_replacement=True)
+    offspring = [next(_gen) for _ in xrange(200)]
+    assert all(i is j for i, j in izip(offspring, expected)), "Did not select the same individuals as the reference"
+
+def check_selectors_Tournament_without_replacement(population, k, greediness):
+    runs = 2000
+    ranked = sorted(population, key=lambda i: i.fitness, reverse=True)
+    rank = dict((id(i), r) for r, i in enumerate(ranked))
+    
+    def mean_ranks(make_gen):
+        totals = [0] * len(population)
+        for _ in xrange(runs):
+            offspring = list(make_gen())
+            assert len(offspring) == len(population), "Did not select all individuals"
+            assert set(map(id, offspring)) == set(rank), "Did not select each individual once"
+            for position, indiv in enumerate(offspring):
+                totals[position] += rank[id(indiv)]
+        return [t / float(runs) for t in totals]
+    
+    expected = mean_ranks(lambda: _reference_tournament(population, k, greediness, False))
+    observed = mean_ranks(lambda: selectors.Tournament(_source=iter(population), k=k, greediness=greediness,
+                                                       without_replacement=True))
+    print "expected = %s" % ', '.join('%.2f' % r for r in expected)
+    print "observed = %s" % ', '.join('%.2f' % r for r in observed)
+    # The standard error of each mean rank is below 0.15
+    assert all(abs(o - e) < 0.75 for o, e in izip(observed, expected)), \
+        "Mean rank at each position does not match the reference"
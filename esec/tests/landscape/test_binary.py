@@ -1,3 +1,5 @@
+import pickle
+from itertools import islice
 from random import randrange
 from esec.fitness import Fitness, EmptyFitness
 from esec.species.joined import JoinedIndividual, JoinedSpecies
@@ -70,3 +72,193 @@ def test_ECC():
     assert len(codes) == 4
     assert bvp.legal([0,0,0,1,1,1]) == False # compliment dist() == 0,
     assert bvp.legal([0,0,0,0,0,1]) == True
+
+def _reference_ECC(bvp, genes):
+    '''Checks and evaluates `genes` by comparing every ordered pair of
+    codewords.'''
+    code = bvp._splitgenome(genes)
+    dist = bvp._HammDist
+    if any(dist(i, j) < bvp.d for i in code for j in code if i is not j):
+        return False, 0.0001
+    total = 0
+    for i in code:
+        for j in code:
+            if i is not j:
+                total += dist(i, j)**-2
+    return True, 1.0 / total
+
+def test_ECC_distances():
+    for cfg in ('2 2 1', '6 4 2', '12 12 3', '12 24 1'):
+        bvp = binary.ECC.by_cfg_str(cfg)
+        ecc_species = BinarySpecies({ }, bvp)
+        for _ in xrange(50):
+            genes = [randrange(2) for _ in xrange(bvp.size.exact)]
+            legal, expect = _reference_ECC(bvp, genes)
+            assert bvp.legal(genes) == legal, "Incorrect legality for %s" % cfg
+            fitness = bvp.eval(BinaryIndividual(genes, ecc_species))
+            assert fitness.values[0] == expect, "Evaluated %s but expected %s for %s" % (fitness, expect, cfg)
+
+def _reference_contributions(bvp, genes):
+    '''Sums the contributions of the first N genes by looking up each
+    one in the table as a list of rows.'''
+    n = bvp.size.exact
+    columns = len(bvp._F) // n
+    total = 0.0
+    for gene in xrange(n):
+        index = genes[gene]
+        for i, link in enumerate(bvp._E[gene]):
+            index += 2**(i + 1) * genes[link]
+        total += bvp._F[gene * columns + index]
+    return total / n
+
+def test_NK_eval_batch():
+    for n, k in ((5, 2), (20, 0), (30, 6)):
+        bvp = binary.NK(parameters=n, K=k, random_seed=1234)
+        assert len(bvp._F) == n * 2**(k + 1), "Expected table of N x 2^(K+1) values"
+        group = [BinaryIndividual([randrange(2) for _ in xrange(n)], species) for _ in xrange(20)]
+        batch = bvp.eval_batch(group)
+        for indiv, fitness in zip(group, batch):
+            expect = _reference_contributions(bvp, indiv.genome)
+            assert fitness.values[0] == expect, "Batch result %s does not match %s" % (fitness, expect)
+            assert bvp.eval(indiv).values[0] == expect, "Result %s does not match %s" % (bvp.eval(indiv), expect)
+
+def test_NKC_eval_batch():
+    bvp = binary.NKC.by_cfg_str('8 2 3 3 1234')
+    n = bvp.size.exact
+    assert all(len(links) == bvp.K + bvp.C for links in bvp._E), "Expected K + C links per gene"
+    group = [JoinedIndividual([[randrange(2) for _ in xrange(n)] for _ in xrange(bvp.group)],
+                              JoinedSpecies.instance) for _ in xrange(20)]
+    batch = bvp.eval_batch(group)
+    for indiv, fitness in zip(group, batch):
+        genes = sum((list(member) for member in indiv), [])
+        expect = _reference_contributions(bvp, genes)
+        assert fitness.values[0] == expect, "Batch result %s does not match %s" % (fitness, expect)
+        assert bvp.eval(indiv).values[0] == expect, "Result %s does not match %s" % (bvp.eval(indiv), expect)
+
+def test_MAXCUT_eval():
+    for n, p in ((2, 0.9), (12, 0.9), (30, 0.1)):
+        bvp = binary.MAXCUT(parameters=n, P=p, random_seed=1234)
+        W = [[0] * n for _ in xrange(n)]
+        for i, j, w in zip(bvp._edges_from, bvp._edges_to, bvp._weights):
+            assert i < j, "Expected edges from lower to higher vertex"
+            W[i][j] = W[j][i] = w
+        for _ in xrange(20):
+            genes = [randrange(2) for _ in xrange(n)]
+            expect = sum(W[i][j] for i in xrange(n) for j in xrange(i + 1, n) if genes[i] != genes[j])
+            fitness = bvp.eval(BinaryIndividual(genes, species))
+            assert abs(fitness.values[0] - expect) <= 1e-9, "Result %s does not match %s" % (fitness, expect)
+
+def test_MAXCUT_find_best():
+    for n, p, seed in ((1, 0.5, 1), (2, 0.9, 1), (10, 0.9, 1), (12, 0.5, 2), (14, 0.2, 3)):
+        bvp = binary.MAXCUT(parameters=n, P=p, random_seed=seed)
+        expect = max(bvp.eval(BinaryIndividual(binary.inttobinlist(i, n), species)).values[0]
+                     for i in xrange(2**n))
+        best, genes, optimal = bvp.find_best()
+        assert optimal, "Expected search to complete"
+        assert abs(best - expect) <= 1e-9, "Found %s but best is %s" % (best, expect)
+        assert bvp.eval(BinaryIndividual(genes, species)).values[0] == best, "Expected genes to match best"
+        assert bvp.find_best() == (best, genes, optimal), "Expected cached result"
+    
+    # Sparse graphs are mostly trees, which are always cut completely
+    bvp = binary.MAXCUT(parameters=200, P=0.005, random_seed=1)
+    best, genes, optimal = bvp.find_best()
+    assert optimal, "Expected search to complete"
+    assert best <= sum(bvp._weights) + 1e-9, "Best cut exceeds total weight"
+    
+    bvp = binary.MAXCUT(parameters=60, P=0.9, random_seed=1)
+    best, genes, optimal = bvp.find_best(node_limit=100)
+    assert not optimal, "Expected search to stop at node limit"
+    assert bvp.eval(BinaryIndividual(genes, species)).values[0] == best, "Expected genes to match best"
+
+def _scan_CNF_SAT(bvp, genes):
+    '''Evaluates `genes` by scanning every clause.'''
+    satisfied = [any((literal > 0) == bool(genes[abs(literal) - 1]) for literal in clause)
+                 for clause in bvp.c_list]
+    if bvp.use_saw:
+        return sum(w for w, s in zip(bvp.w_list, satisfied) if s)
+    return float(sum(satisfied)) / bvp.n_clauses
+
+def test_CNF_SAT_rescore():
+    for cfg in binary.CNF_SAT.test_cfg:
+        bvp = binary.CNF_SAT.by_cfg_str(cfg)
+        n = bvp.size.exact
+        group = [BinaryIndividual([randrange(2) for _ in xrange(n)], species) for _ in xrange(10)]
+        for generation in xrange(10):
+            for indiv in group:
+                assert bvp.eval(indiv) == _scan_CNF_SAT(bvp, indiv.genome), "Incorrect result for %s" % cfg
+            
+            offspring = [ ]
+            for parent in group:
+                genes = list(parent.genome)
+                changed = [randrange(n) for _ in xrange(generation % 3 + 1)]
+                for i in changed:
+                    genes[i] = 1 - genes[i]
+                child = BinaryIndividual(genes, species)
+                # Unchanged genes may be included in `changed`
+                fitness = bvp.rescore(child, parent, changed + [0] if generation % 2 else None)
+                expect = _scan_CNF_SAT(bvp, genes)
+                assert fitness == expect, "Rescored %s but expected %s for %s" % (fitness, expect, cfg)
+                offspring.append(child)
+            group = offspring
+            
+            if bvp.use_saw:
+                best = group[randrange(len(group))]
+                weights = [w + (0 if any((l > 0) == bool(best[abs(l) - 1]) for l in clause) else 1)
+                           for w, clause in zip(bvp.w_list, bvp.c_list)]
+                bvp.update_saw(best)
+                assert bvp.w_list == weights, "Incorrect SAW weights"
+
+def test_CNF_SAT_eval_mutated():
+    for cfg in binary.CNF_SAT.test_cfg:
+        bvp = binary.CNF_SAT.by_cfg_str(cfg)
+        mutator = BinarySpecies({ }, bvp)
+        group = list(islice(mutator.init_random(length=bvp.size.exact), 10))
+        for generation in xrange(10):
+            for indiv in group:
+                assert indiv.fitness.values[0] == _scan_CNF_SAT(bvp, indiv.genome), "Incorrect result for %s" % cfg
+            if bvp.use_saw:
+                bvp.update_saw(group[generation])
+            hits = bvp._states.hits
+            group = list(mutator.mutate_bitflip(group, per_gene_rate=0.02))
+            for indiv in group:
+                _ = indiv.fitness
+            # Each offspring finds its parent's counts
+            assert bvp._states.hits - hits == len(group), "Offspring were not rescored for %s" % cfg
+
+def test_CNF_SAT_pickle():
+    for cfg in binary.CNF_SAT.test_cfg:
+        bvp = binary.CNF_SAT.by_cfg_str(cfg)
+        species = BinarySpecies({ }, bvp)
+        group = list(islice(species.init_random(length=bvp.size.exact), 10))
+        if bvp.use_saw:
+            bvp.update_saw(group[0])
+        copy = pickle.loads(pickle.dumps(bvp, pickle.HIGHEST_PROTOCOL))
+        assert copy.eval.__name__ == bvp.eval.__name__, "Evaluator changed for %s" % cfg
+        assert copy.eval.im_self is copy, "Evaluator not bound to the copy for %s" % cfg
+        expected = [bvp.eval(BinaryIndividual(indiv.genome, species)) for indiv in group]
+        actual = [copy.eval(BinaryIndividual(indiv.genome, species)) for indiv in group]
+        assert actual == expected, "Incorrect result after pickling %s" % cfg
+
+def test_eval_delta():
+    yield check_eval_delta, binary.OneMax(parameters=50), 'mutate_bitflip'
+    yield check_eval_delta, binary.OneMax(parameters=50, delta_limit=0), 'mutate_random'
+    yield check_eval_delta, binary.SUS(random_seed=12345), 'mutate_bitflip'
+    yield check_eval_delta, binary.SUS(random_seed=12345, even=True, delta_limit=3), 'mutate_random'
+    yield check_eval_delta, binary.SUS(random_seed=12345, offset=0.5), 'mutate_bitflip'
+
+def check_eval_delta(bvp, mutate):
+    mutator = BinarySpecies({ }, bvp)
+    group = list(islice(mutator.init_random(length=bvp.size.exact), 10))
+    for indiv in group:
+        _ = indiv.fitness
+    used = False
+    for _ in xrange(10):
+        group = list(getattr(mutator, mutate)(group, per_gene_rate=0.05))
+        for child in group:
+            expect = bvp.eval(BinaryIndividual(child.genome, species))
+            assert child.fitness == expect, "Delta result %s does not match %s" % (child.fitness, expect)
+            assert child._delta_count <= bvp.delta_limit, "Delta limit was exceeded"
+            used = used or child._delta_count > 0
+    
+    expect_used = bvp.delta_limit > 0 and not (bvp.offset % 1)
+    assert used == expect_used, "Delta evaluation was %sused" % ('' if used else 'not ')
@@ -1,7 +1,9 @@
 from random import uniform
+from itertools import islice
 from itertools import izip
 from esec.fitness import Fitness, EmptyFitness
 import esec.landscape.real as real
+from esec.species.binary_real import BinaryRealSpecies
 from esec.species.real import RealIndividual, RealSpecies
 species = RealSpecies({ }, lambda _: 0)
 
@@ -33,4 +35,61 @@ def check_rvp(cls):
             assert isinstance(fitness, (int, long, float, Fitness, EmptyFitness)), "Result was not fitness value"
     # test print_info works
     print '\n'.join(rvp.info(5))
+
+def test_eval_batch():
+    classes = [getattr(real, n) for n in dir(real)]
+    classes = [c for c in classes if type(c) is type]
+    classes = [c for c in classes if issubclass(c, real.Real) and c is not real.Real]
+    classes = [c for c in classes if c.parallel]
+    for cls in classes:
+        yield check_eval_batch, cls
+
+def check_eval_batch(cls):
+    for cfg in cls.test_cfg:
+        rvp = cls.by_cfg_str(cfg)
+        group = [RealIndividual([uniform(lower, upper)
+                                 for lower, upper in izip(rvp.lower_bounds, rvp.upper_bounds)],
+                                lower_bounds=rvp.lower_bounds, upper_bounds=rvp.upper_bounds,
+                                parent=species)
+                 for _ in xrange(20)]
         
+        batch = rvp.eval_batch(group)
+        assert len(batch) == len(group), "Incorrect number of results"
+        for indiv, fitness in izip(group, batch):
+            expected = rvp.eval(indiv)
+            assert type(fitness) is type(expected), "Result was not the same fitness type"
+            assert all(abs(f1 - f2) <= 1e-9 * max(1.0, abs(f2))
+                       for f1, f2 in izip(fitness.values, expected.values)), \
+                "Batch result %s does not match %s" % (fitness, expected)
+
+def test_eval_batch_phenome():
+    rvp = real.Sphere(parameters=3)
+    mapped = BinaryRealSpecies({ }, rvp)
+    group = list(islice(mapped.init_random_real(length=3, lowest=-5.0, highest=5.0), 20))
+    
+    batch = rvp.eval_batch(group)
+    for indiv, fitness in izip(group, batch):
+        assert fitness.values == rvp.eval(indiv).values, \
+            "Batch result %s does not match %s" % (fitness, rvp.eval(indiv))
+
+def test_eval_delta():
+    for cls in (real.Rastrigin, real.Schwefel):
+        yield check_eval_delta, cls(parameters=20), 'mutate_gaussian'
+        yield check_eval_delta, cls(parameters=20, delta_limit=4, offset=0.25), 'mutate_delta'
+
+def check_eval_delta(rvp, mutate):
+    mutator = RealSpecies({ }, rvp)
+    group = list(islice(mutator.init_random(length=rvp.size.exact, lowest=rvp.lower_bounds,
+                                            highest=rvp.upper_bounds), 10))
+    for indiv in group:
+        _ = indiv.fitness
+    used = False
+    for _ in xrange(10):
+        group = list(getattr(mutator, mutate)(group, per_gene_rate=0.2))
+        for child in group:
+            expect = rvp.eval(RealIndividual(child.genome, species, child.lower_bounds, child.upper_bounds))
+            assert abs(child.fitness.values[0] - expect.values[0]) <= 1e-9 * max(1.0, abs(expect.values[0])), \
+                "Delta result %s does not match %s" % (child.fitness, expect)
+            assert child._delta_count <= rvp.delta_limit, "Delta limit was exceeded"
+            used = used or child._delta_count > 0
+    assert used, "Delta evaluation was not used"
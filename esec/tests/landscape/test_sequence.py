@@ -0,0 +1,48 @@
+from random import Random
+from esec.landscape.sequence import TSP, CostMatrix, EuclideanCostMap
+from esec.species.sequence import SequenceIndividual, SequenceSpecies
+species = SequenceSpecies({ }, lambda _: 0)
+
+FULL = [
+    [ None, 1, 2, 3, 7 ],
+    [ 1, None, 2, 1, 5 ],
+    [ 2, 2, None, 3, 9 ],
+    [ 3, 1, 3, None, 4 ],
+    [ 7, 5, 9, 4, None ],
+]
+HALF = [ [ 1, 2, 3, 7 ], [ 2, 1, 5 ], [ 3, 9 ], [ 4 ] ]
+DICT = dict(((i, j), FULL[i][j]) for i in xrange(5) for j in xrange(5))
+
+def test_tsp_cost_map_formats():
+    for cost_map in (FULL, HALF, DICT):
+        yield check_tsp_cost_map, cost_map
+
+def check_tsp_cost_map(cost_map):
+    tsp = TSP(cost_map=cost_map)
+    assert isinstance(tsp.cost_map, CostMatrix), "Expected CostMatrix, not %s" % type(tsp.cost_map).__name__
+    assert tsp.size.exact == 5, "Expected 5 nodes, not %d" % tsp.size.exact
+    for i in xrange(5):
+        assert tsp.cost_map.row(i) == FULL[i], "Row %d was %s" % (i, tsp.cost_map.row(i))
+        for j in xrange(5):
+            assert tsp.cost_map[i, j] == FULL[i][j], "Cost (%d, %d) was %s" % (i, j, tsp.cost_map[i, j])
+    
+    fitness = tsp.eval(SequenceIndividual([0, 1, 2, 3, 4], species))
+    assert fitness.values[0] == 17, "Tour length was %s" % fitness
+    fitness = tsp.eval(SequenceIndividual([4, 2, 0, 1, 3], species))
+    assert fitness.values[0] == 17, "Tour length was %s" % fitness
+
+def test_tsp_euclidean():
+    dense = TSP(cost_map=TSP.berlin52_map)
+    lazy = TSP(cost_map=TSP.berlin52_map, dense_limit=10)
+    assert type(dense.cost_map) is CostMatrix, "Expected CostMatrix"
+    assert type(lazy.cost_map) is EuclideanCostMap, "Expected EuclideanCostMap"
+    
+    rand = Random(1)
+    for _ in xrange(20):
+        tour = range(52)
+        rand.shuffle(tour)
+        indiv = SequenceIndividual(tour, species)
+        assert dense.eval(indiv) == lazy.eval(indiv), "Tour lengths differ"
+    
+    for i in (0, 13, 51):
+        assert dense.cost_map.row(i) == lazy.cost_map.row(i), "Row %d differs" % i
@@ -0,0 +1,198 @@
+import tests
+import pickle
+from itertools import islice, chain
+import esec.species.binary_packed as binary_packed
+from esec.species.binary_packed import BitString
+from esec.landscape.binary import OneMax, SUS
+
+Species = binary_packed.PackedBinarySpecies({ }, None)
+
+def _make_pop(gen, **kwargs):
+    pop = list(islice(gen(**kwargs), 100))
+    assert len(pop) == 100, "length was not 100"
+    print
+    print ', '.join('%s=%s' % i for i in kwargs.iteritems())
+    print '\n'.join(i.phenome_string for i in pop)
+    assert all(isinstance(i, binary_packed.PackedBinaryIndividual) for i in pop), "not all individuals were correct type"
+    assert all(isinstance(i.genome, BitString) for i in pop), "not all genomes were BitString"
+    return pop
+
+def test_bitstring():
+    genes = [1, 0, 0, 1, 1, 0, 1, 0, 0, 0, 1]
+    bits = BitString(genes)
+    assert len(bits) == len(genes), "length was %d" % len(bits)
+    assert list(bits) == genes, "%s != %s" % (list(bits), genes)
+    assert bits == genes, "BitString did not compare equal to list"
+    assert bits != genes[:-1], "BitString compared equal to shorter list"
+    assert all(bits[i] == genes[i] for i in xrange(-len(genes), len(genes))), "indexing did not match list"
+    assert list(bits[2:7]) == genes[2:7], "slice did not match list"
+    assert bits[::3] == genes[::3], "stepped slice did not match list"
+    assert bits.count(1) == genes.count(1), "count(1) was %d" % bits.count(1)
+    assert bits.count(0) == genes.count(0), "count(0) was %d" % bits.count(0)
+    assert list(bits.ones()) == [i for i, g in enumerate(genes) if g], "ones() was %s" % list(bits.ones())
+    assert list(bits + [1, 1]) == genes + [1, 1], "concatenation did not match list"
+    assert list([1, 1] + bits) == [1, 1] + genes, "reflected concatenation did not match list"
+    assert BitString(bits.value, bits.length) == bits, "BitString did not round trip through value"
+    assert pickle.loads(pickle.dumps(bits, 2)) == bits, "BitString did not round trip through pickle"
+    assert list(BitString([0, 0, 0])) == [0, 0, 0], "leading zeros were lost"
+    assert list(BitString([])) == [], "empty BitString was not empty"
+
+def test_init():
+    for gen, expected_genes in [
+        (Species.init_random, set([0, 1])),
+        (Species.init_zero, set([0])),
+        (Species.init_one, set([1])),
+        (Species.init_toggle, set([0, 1]))]:
+        
+        yield check_init_length_int, gen, expected_genes
+        yield check_init_length_range_int, gen, expected_genes
+        yield check_init_length_dict_range_int, gen, expected_genes
+
+def check_init_length_int(gen, expected_genes):
+    pop = _make_pop(gen, length=10)
+    
+    all_genes = set(chain(*(iter(i.genome) for i in pop)))
+    assert all_genes == expected_genes, "%s != %s" % (all_genes, expected_genes)
+    
+    assert all(len(i.genome) == 10 for i in pop), "not all individuals had 10 genes"
+    assert all(Species.legal(i) for i in pop), "not all individuals were legal"
+
+def check_init_length_range_int(gen, expected_genes):
+    pop = _make_pop(gen, shortest=5, longest=15)
+    
+    all_genes = set(chain(*(iter(i.genome) for i in pop)))
+    assert all_genes == expected_genes, "%s != %s" % (all_genes, expected_genes)
+    
+    assert all(5 <= len(i.genome) <= 15 for i in pop), "not all individuals had [5,15] genes"
+
+def check_init_length_dict_range_int(gen, expected_genes):
+    pop = _make_pop(gen, length={'min': 5, 'max': 15})
+    
+    all_genes = set(chain(*(iter(i.genome) for i in pop)))
+    assert all_genes == expected_genes, "%s != %s" % (all_genes, expected_genes)
+    
+    assert all(5 <= len(i.genome) <= 15 for i in pop), "not all individuals had [5,15] genes"
+
+def test_mutate():
+    for gen, params, expected_genes in [
+        (Species.mutate_random, {'per_indiv_rate': 0.0, 'per_gene_rate': 0.0}, set([0])),
+        (Species.mutate_random, {'per_indiv_rate': 1.0, 'per_gene_rate': 0.0}, set([0])),
+        (Species.mutate_random, {'per_indiv_rate': 0.0, 'per_gene_rate': 1.0}, set([0])),
+        (Species.mutate_random, {'per_indiv_rate': 1.0, 'per_gene_rate': 1.0}, set([0, 1])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 0.0, 'per_gene_rate': 0.0}, set([0])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 1.0, 'per_gene_rate': 0.0}, set([0])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 0.0, 'per_gene_rate': 1.0}, set([0])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 1.0, 'per_gene_rate': 1.0}, set([1])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 0.5, 'per_gene_rate': 1.0}, set([0, 1])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 1.0, 'per_gene_rate': 0.5}, set([0, 1])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 1.0, 'per_gene_rate': 0.1}, set([0, 1])),
+        (Species.mutate_bitflip, {'per_indiv_rate': 1.0, 'genes': 10}, set([1])),
+        (Species.mutate_inversion, {'per_indiv_rate': 0.0}, set([0])),
+        (Species.mutate_inversion, {'per_indiv_rate': 0.5}, set([0, 1])),
+        (Species.mutate_inversion, {'per_indiv_rate': 1.0}, set([1])),
+        (Species.mutate_gap_inversion, {'per_indiv_rate': 0.0}, set([0])),
+        (Species.mutate_gap_inversion, {'per_indiv_rate': 1.0, 'length': 10}, set([1])),
+        (Species.mutate_gap_inversion, {'per_indiv_rate': 1.0, 'length': 20}, set([1])),
+        (Species.mutate_gap_inversion, {'per_indiv_rate': 0.5, 'length': 10}, set([0, 1])),
+        (Species.mutate_gap_inversion, {'per_indiv_rate': 1.0, 'shortest': 2, 'longest': 5}, set([0, 1])),
+        ]:
+        
+        yield check_mutate, gen, params, expected_genes
+
+def check_mutate(gen, params, expected_genes):
+    pop = _make_pop(Species.init_zero, length=10)
+    
+    params['_source'] = iter(pop)
+    
+    pop2 = _make_pop(gen, **params)
+    all_genes = set(chain(*(iter(i.genome) for i in pop2)))
+    assert all_genes == expected_genes, "%s != %s" % (all_genes, expected_genes)
+
+def test_mutate_bitflip_rate():
+    for rate in (0.001, 0.01, 0.1, 0.3):
+        yield check_mutate_bitflip_rate, rate
+
+def check_mutate_bitflip_rate(rate):
+    length = 1000
+    pop = list(islice(Species.init_zero(length=length), 200))
+    flips = [i.genome.count(1) for i in Species.mutate_bitflip(pop, per_gene_rate=rate)]
+    mean = sum(flips) / float(len(flips))
+    expected = rate * length
+    # Allow five standard errors of the binomial mean
+    tolerance = 5 * (length * rate * (1 - rate) / len(flips)) ** 0.5
+    print rate, mean, expected, tolerance
+    assert abs(mean - expected) <= tolerance, "mean flips %f not within %f of %f" % (mean, tolerance, expected)
+
+def test_mutate_genes():
+    pop = list(islice(Species.init_random(length=50), 100))
+    for genes in (1, 5, 50):
+        for parent, child in zip(pop, Species.mutate_bitflip(pop, genes=genes)):
+            flipped = BitString(parent.genome.value ^ child.genome.value, 50).count(1)
+            assert flipped == genes, "%d genes flipped instead of %d" % (flipped, genes)
+
+def test_crossover():
+    for gen, params in [
+        (Species.crossover_uniform, { }),
+        (Species.crossover_uniform, {'per_gene_rate': 0.1}),
+        (Species.crossover_uniform, {'genes': 3}),
+        (Species.crossover_one, { }),
+        (Species.crossover_two, { }),
+        (Species.crossover, {'points': 5}),
+        ]:
+        yield check_crossover_exchanges, gen, params, 20, 20
+        yield check_crossover_exchanges, gen, params, 12, 20
+
+def check_crossover_exchanges(gen, params, length1, length2):
+    pop1 = list(islice(Species.init_random(length=length1), 50))
+    pop2 = list(islice(Species.init_random(length=length2), 50))
+    pop = list(chain(*zip(pop1, pop2)))
+    children = list(gen(iter(pop), per_pair_rate=1.0, two_children=True, **params))
+    assert len(children) == len(pop), "expected %d children, not %d" % (len(pop), len(children))
+    
+    for p1, p2, c1, c2 in zip(pop[::2], pop[1::2], children[::2], children[1::2]):
+        assert len(c1) == len(p1) and len(c2) == len(p2), "children changed length"
+        assert c1.genome[length1:] == p1.genome[length1:], "genes beyond common length were exchanged"
+        assert c2.genome[length1:] == p2.genome[length1:], "genes beyond common length were exchanged"
+        for i in xrange(min(length1, length2)):
+            assert sorted((c1[i], c2[i])) == sorted((p1[i], p2[i])), "gene %d was not exchanged" % i
+        if params.get('genes'):
+            swapped = sum(1 for i in xrange(length1) if c1[i] != p1[i])
+            assert swapped <= params['genes'], "%d genes were swapped" % swapped
+        if gen == Species.crossover_one:
+            changed = [i for i in xrange(length1) if p1[i] != p2[i] and c1[i] != p1[i]]
+            if changed:
+                tail = range(changed[0], length1)
+                assert all(c1[i] == p2[i] for i in tail), "single point crossover did not swap the tail"
+
+def test_crossover_discrete():
+    pop = list(islice(Species.init_random(length=30), 100))
+    children = list(Species.crossover_discrete(iter(pop), two_children=True))
+    for p1, p2, c1, c2 in zip(pop[::2], pop[1::2], children[::2], children[1::2]):
+        for i in xrange(30):
+            assert c1[i] in (p1[i], p2[i]), "gene %d did not come from a parent" % i
+            assert c2[i] in (p1[i], p2[i]), "gene %d did not come from a parent" % i
+
+def test_generic_operators():
+    pop = list(islice(Species.init_random(length=20), 20))
+    inserted = list(Species.mutate_insert(iter(pop), shortest=1, longest=5))
+    assert all(isinstance(i.genome, BitString) for i in inserted), "insert did not produce BitString genomes"
+    assert all(len(i) > 20 for i in inserted), "insert did not lengthen individuals"
+    deleted = list(Species.mutate_delete(iter(pop), shortest=1, longest=5))
+    assert all(isinstance(i.genome, BitString) for i in deleted), "delete did not produce BitString genomes"
+    assert all(len(i) < 20 for i in deleted), "delete did not shorten individuals"
+
+def test_landscapes():
+    onemax = OneMax(parameters=40)
+    sus = SUS(parameters=40, random_seed=1)
+    species = binary_packed.PackedBinarySpecies({ }, onemax)
+    for indiv in islice(species.init_random(length=40), 50):
+        genes = list(indiv.genome)
+        assert onemax._eval(indiv) == sum(genes), "OneMax %s != %s" % (onemax._eval(indiv), sum(genes))
+        expected = sus._eval(binary_packed.BinaryIndividual(genes, species))
+        assert sus._eval(indiv) == expected, "SUS %s != %s" % (sus._eval(indiv), expected)
+
+def test_pickle():
+    indiv = next(Species.init_random(length=30))
+    clone = pickle.loads(pickle.dumps(indiv, 2))
+    assert type(clone) is type(indiv), "type was %s" % type(clone)
+    assert clone.genome == indiv.genome, "genome did not round trip"
@@ -0,0 +1,41 @@
+import tests
+from esec.landscape.ge import Multiplexer
+from esec.species.ge import GESpecies, GEIndividual
+
+Species = GESpecies({ }, None)
+
+def _make_pop(genomes, cache_size=10):
+    source = Species.init_ge(grammar=Multiplexer.rules, length=1, cache_size=cache_size)
+    template = next(source)
+    return [GEIndividual(genome, template) for genome in genomes]
+
+def test_phenome_cache():
+    pop = _make_pop([[0, 1], [4, 1], [0, 1, 2]])
+    cache = pop[0].phenome_cache
+    assert cache is not None, "Expected a phenome cache"
+    assert all(indiv.phenome_cache is cache for indiv in pop), "Expected a shared phenome cache"
+    
+    assert pop[0].phenome_string == pop[1].phenome_string == pop[2].phenome_string, \
+        "Expected identical phenomes"
+    for indiv in pop:
+        assert indiv.Eval is not None, "Expected a compiled program"
+    assert (cache.hits, cache.misses) == (2, 1), "Expected 2 hits and 1 miss, not %s" % ((cache.hits, cache.misses),)
+    
+    # Compiled functions must be distinct so that defines are not shared
+    assert pop[0].Eval is not pop[1].Eval, "Expected distinct functions"
+    assert pop[0].Eval([True] * 11, None) == pop[1].Eval([True] * 11, None)
+
+def test_phenome_cache_disabled():
+    pop = _make_pop([[0, 1], [4, 1]], cache_size=0)
+    assert pop[0].phenome_cache is None, "Expected no phenome cache"
+    assert pop[0].Eval is not None and pop[1].Eval is not None, "Expected compiled programs"
+
+def test_fitness_cache():
+    lscape = Multiplexer()
+    pop = _make_pop([[0, 1, 2, 3], [4, 1, 2, 3], [0, 1, 2, 3, 4]])
+    
+    fitness = [lscape.eval(indiv) for indiv in pop]
+    assert fitness[0] == fitness[1], "Expected identical fitness"
+    cache = lscape.fitness_cache
+    # The third individual has a different length, so is evaluated
+    assert (cache.hits, cache.misses) == (1, 2), "Expected 1 hit and 2 misses, not %s" % ((cache.hits, cache.misses),)
@@ -95,3 +95,40 @@ def check_mutate(pop_gen, gen, params, expected_length):
         assert all(l <= len(i) <= h for i in pop2), "!(%s <= len(i) <= %s)" % (l, h)
     else:
         assert all(len(i) in expected_length for i in pop2), "len(i) not in %s" % (expected_length,)
+
+def test_individual_slots():
+    for spec in (b_spec, i_spec, r_spec):
+        indiv = next(spec.init_random(length=10))
+        assert not hasattr(indiv, '__dict__'), "%s has an instance dictionary" % type(indiv)
+        # Unknown members are found on the species
+        assert indiv.init_random == spec.init_random, "Species fallback failed"
+        try:
+            indiv.does_not_exist
+            assert False, "AttributeError was not raised"
+        except AttributeError:
+            pass
+
+def test_individual_statistic_sharing():
+    parent = next(r_spec.init_random(length=10))
+    child1 = r_ind(parent.genome, parent, statistic={ 'mutated': 1 })
+    child2 = r_ind(child1.genome, child1)
+    assert child2.statistic is child1.statistic, "Statistics were copied"
+    assert child2.statistic == { 'mutated': 1 }, "Statistics were %r" % child2.statistic
+    
+    child2.set_statistic(mutated=5, extra=1)
+    assert child1.statistic == { 'mutated': 1 }, "Parent statistics were %r" % child1.statistic
+    assert child2.statistic == { 'mutated': 5, 'extra': 1 }, "Statistics were %r" % child2.statistic
+    
+    child3 = r_ind(child2.genome, child2, statistic={ 'mutated': 1 })
+    assert child3.statistic == { 'mutated': 6, 'extra': 1 }, "Statistics were %r" % child3.statistic
+
+def test_individual_pickle():
+    import cPickle
+    indiv = next(r_spec.init_random(length=10)).born()
+    indiv.fitness = 1.5
+    for protocol in (0, 2):
+        copy = cPickle.loads(cPickle.dumps(indiv, protocol))
+        assert copy.genome == indiv.genome, "Genomes were different"
+        assert copy.birthday == indiv.birthday, "Birthdays were different"
+        assert copy.fitness == indiv.fitness, "Fitnesses were different"
+        assert copy.lower_bounds == indiv.lower_bounds, "Bounds were different"
@@ -65,6 +65,25 @@ def test_mutate():
         
         yield check_mutate, gen, params, expected_genes
 
+def test_mutate_beyond_bounds():
+    # Genomes lengthened by mutate_insert may be longer than their bounds
+    indiv = integer.IntegerIndividual([5] * 6, Species, lower_bounds=[0] * 4, upper_bounds=[10] * 4)
+    for gen, params in [
+        (Species.mutate_random, {'per_gene_rate': 1.0}),
+        (Species.mutate_random, {'genes': 6}),
+        (Species.mutate_delta, {'per_gene_rate': 1.0}),
+        (Species.mutate_delta, {'genes': 6}),
+        (Species.mutate_gaussian, {'per_gene_rate': 1.0}),
+        (Species.mutate_gaussian, {'genes': 6}),
+        ]:
+        yield check_mutate_beyond_bounds, indiv, gen, params
+
+def check_mutate_beyond_bounds(indiv, gen, params):
+    result = list(gen(_source=iter([indiv] * 10), **params))
+    assert len(result) == 10, "Some individuals were not returned"
+    assert all(len(i.genome) == 6 for i in result), "Genomes changed length"
+    assert all(i.genome[4:] == [5, 5] for i in result), "Genes without bounds were mutated"
+
 def check_init_length_int(gen, expected_genes):
     pop = _make_pop(gen, length=10, lowest=0, highest=10)
     
@@ -63,6 +63,75 @@ def test_mutate():
         ]:
         
         yield check_mutate, gen, params, expected_genes
+        yield check_mutate, gen, dict(params, bulk=True), expected_genes
+
+def test_mutate_bulk():
+    if real.numpy is None: return
+    
+    pop = _make_pop(Species.init_random, length=20, lowest=-1.0, highest=1.0)
+    for gen, params in [
+        (Species.mutate_random, { 'per_gene_rate': 0.5 }),
+        (Species.mutate_delta, { 'per_gene_rate': 0.5, 'step_size': 0.5 }),
+        (Species.mutate_gaussian, { 'per_gene_rate': 0.5, 'step_size': 0.5 }),
+        (Species.mutate_gaussian, { 'per_indiv_rate': 0.5, 'per_gene_rate': 1.0 }),
+        (Species.mutate_gaussian, { 'genes': 3 }),
+        ]:
+        yield check_mutate_bulk, pop, gen, params
+
+def check_mutate_bulk(pop, gen, params):
+    tests._context.rand.seed(1)
+    pop2 = list(gen(_source=iter(pop), bulk=True, **params))
+    tests._context.rand.seed(1)
+    pop3 = list(gen(_source=iter(pop), bulk=True, **params))
+    
+    assert len(pop2) == len(pop), "Some individuals were not returned"
+    assert [i.genome for i in pop2] == [i.genome for i in pop3], "Results were not reproducible"
+    assert all(-1.0 <= g <= 1.0 for i in pop2 for g in i.genome), "Genes were not clamped"
+    
+    for before, after in zip(pop, pop2):
+        if after is before: continue
+        assert after.statistic['mutated'] == 1, "Mutation was not counted"
+        changed = sum(1 for g1, g2 in zip(before.genome, after.genome) if g1 != g2)
+        if params.get('genes'):
+            assert changed <= params['genes'], "%d genes were changed" % changed
+        assert all(isinstance(g, float) for g in after.genome), "Genes were not floats"
+
+def test_mutate_bulk_reads():
+    if real.numpy is None: return
+    
+    pop = _make_pop(Species.init_random, length=20, lowest=-1.0, highest=1.0)
+    read = [0]
+    def _source():
+        while True:
+            for indiv in pop:
+                read[0] += 1
+                yield indiv
+    
+    for take in (1, 8, 9, 20, 100):
+        read[0] = 0
+        result = list(islice(Species.mutate_gaussian(_source(), per_gene_rate=0.5, bulk=True), take))
+        print take, read[0]
+        assert len(result) == take, "Expected %d individuals" % take
+        assert read[0] <= 2 * take + real.BULK_FIRST_BLOCK_SIZE, "Read %d individuals to take %d" % (read[0], take)
+
+def test_mutate_beyond_bounds():
+    # Genomes lengthened by mutate_insert may be longer than their bounds
+    indiv = real.RealIndividual([0.5] * 6, Species, lower_bounds=[0.0] * 4, upper_bounds=[1.0] * 4)
+    for gen, params in [
+        (Species.mutate_random, {'per_gene_rate': 1.0}),
+        (Species.mutate_random, {'genes': 6}),
+        (Species.mutate_delta, {'per_gene_rate': 1.0}),
+        (Species.mutate_delta, {'genes': 6}),
+        (Species.mutate_gaussian, {'per_gene_rate': 1.0}),
+        (Species.mutate_gaussian, {'genes': 6}),
+        ]:
+        yield check_mutate_beyond_bounds, indiv, gen, params
+
+def check_mutate_beyond_bounds(indiv, gen, params):
+    result = list(gen(_source=iter([indiv] * 10), **params))
+    assert len(result) == 10, "Some individuals were not returned"
+    assert all(len(i.genome) == 6 for i in result), "Genomes changed length"
+    assert all(i.genome[4:] == [0.5, 0.5] for i in result), "Genes without bounds were mutated"
 
 def test_crossover_average():
     pop = _make_pop(Species.init_toggle, length=10, lowest=0.0, highest=1.0)
@@ -36,6 +36,11 @@ def test_init():
         yield check_init_item_count_float, gen, expected_genes
         yield check_init_length_dict_float, gen, expected_genes
 
+def test_init_distinct_genomes():
+    for gen in (Species.init_random, Species.init_forward, Species.init_reverse):
+        pop = list(islice(gen(length=10), 10))
+        assert len(set(id(i.genome) for i in pop)) == len(pop), "Individuals share a genome list"
+
 def test_mutate():
     genes = list(xrange(10))
     for gen, params, expected_genes in [
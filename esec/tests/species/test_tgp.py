@@ -1,5 +1,6 @@
 import tests
 from itertools import izip
+from random import Random
 import esec.species.tgp as tgp
 
 from esec.context import rand, notify
@@ -117,3 +118,73 @@ def test_execute_lazy():
     Species.evaluate(indiv, state)
     
     assert state.hits == 1, "Expected only one hit, not %s" % state.hits
+
+def test_execute_lazy_nested():
+    code = [[eval_both, eval_one_only, hit_state, hit_state, hit_state]]
+    indiv = tgp.TgpIndividual(code, Species, [eval_both, eval_one_only, hit_state], None, 0)
+    state = TestState()
+    Species.evaluate(indiv, state)
+    
+    assert state.hits == 2, "Expected two hits, not %s" % state.hits
+
+def test_execute_decision_nested():
+    choose = tgp.DecisionInstructionWithState(lambda state: state.pop(0), param_count=2, name="choose")
+    add = tgp.Instruction(lambda a, b: a + b, param_count=2, name="add")
+    code = [[add, choose, choose, tgp.Terminal(0), tgp.Terminal(1), tgp.Terminal(2), tgp.Terminal(0)]]
+    indiv = tgp.TgpIndividual(code, Species, [add, choose], None, 3)
+    
+    for selections, expected in (([1, 1], 2), ([1, 2], 11), ([2], 101)):
+        result = Species.evaluate(indiv, selections, [1, 10, 100])
+        assert result == expected, "Expected %d, not %s" % (expected, result)
+
+def test_execute_compiled():
+    def _check(indiv, terminals):
+        # i_end forces the program to be interpreted rather than compiled
+        expected = Species.evaluate(indiv, None, terminals, 0, 0, len(indiv.genome[0]))
+        result = Species.evaluate(indiv, None, terminals)
+        assert result == expected, "Expected %s, not %s" % (expected, result)
+    
+    for init in (Species.init_boolean_tgp, Species.init_integer_tgp):
+        source = init(terminals=3, deepest=6, adfs=1)
+        for _ in xrange(20):
+            indiv = next(source)
+            for terminals in ([0, 0, 1], [1, 0, 1], [1, 1, 0]):
+                yield _check, indiv, terminals
+            assert indiv._compiled, "Expected compiled programs to be stored"
+
+class TraceState(object):
+    def __init__(self, seed):
+        self.rand = Random(seed)
+        self.trace = [ ]
+    def choose(self):
+        selection = self.rand.randrange(2) + 1
+        self.trace.append(selection)
+        return selection
+    def record(self, value):
+        self.trace.append(value)
+        return value
+
+trace_instructions = [
+    tgp.Instruction(lambda a, b: a + b, param_count=2, name="add"),
+    tgp.InstructionWithState(lambda state, a, b: state.record(a - b), param_count=2, name="sub"),
+    tgp.DecisionInstructionWithState(lambda state: state.choose(), param_count=2, name="choose"),
+    tgp.Instruction(lambda a, b, c: b() if a() % 2 else c(), param_count=3, name="if_odd", lazy=True),
+    tgp.InstructionWithState(lambda state, a, b: state.record(a() + a()), param_count=2, name="twice", lazy=True),
+]
+
+def test_execute_compiled_decision_lazy():
+    def _check(indiv, terminals, seed):
+        # i_end forces the program to be interpreted rather than compiled
+        expected_state = TraceState(seed)
+        expected = Species.evaluate(indiv, expected_state, terminals, 0, 0, len(indiv.genome[0]))
+        state = TraceState(seed)
+        result = Species.evaluate(indiv, state, terminals)
+        assert result == expected, "Expected %s, not %s" % (expected, result)
+        assert state.trace == expected_state.trace, "Expected %s, not %s" % (expected_state.trace, state.trace)
+    
+    source = Species.init_tgp(trace_instructions, terminals=3, deepest=6, adfs=1,
+                              lowest_int_constant=0, highest_int_constant=5)
+    for _ in xrange(30):
+        indiv = next(source)
+        for seed, terminals in enumerate(([0, 1, 2], [3, 4, 5], [1, 1, 0])):
+            yield _check, indiv, terminals, seed
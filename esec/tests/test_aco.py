@@ -0,0 +1,108 @@
+from tests import *
+from itertools import islice
+from esec.landscape.sequence import TSP
+from esec.species.sequence import SequenceSpecies
+from plugins.ACO.pheromone import PheromoneMap, PheromoneMatrix
+from plugins.ACO.tsp import TourSpecies, TourBuilder
+
+def _berlin52():
+    '''Returns the Berlin52 landscape and a group of evaluated random
+    tours.'''
+    landscape = TSP(cost_map=TSP.berlin52_map)
+    species = SequenceSpecies({ }, None)
+    group = list(islice(species.init_random(length=52), 10))
+    for indiv in group:
+        indiv.fitness = landscape.eval(indiv)
+    return landscape, group
+
+def test_PheromoneMatrix_matches_PheromoneMap():
+    _, group = _berlin52()
+    
+    for persistence in (0.9, 0.01):
+        pmap, matrix = PheromoneMap(0.1), PheromoneMatrix(0.1, size=52)
+        # Requesting powered values before updating checks that they
+        # are kept up to date.
+        powered = matrix.powered(2.0)
+        for _ in xrange(20):
+            pmap.update_fitness(source=group, persistence=persistence, strength=100, minimisation=True)
+            matrix.update_fitness(source=group, persistence=persistence, strength=100, minimisation=True)
+            pmap.update_rank(source=group, persistence=persistence)
+            matrix.update_rank(source=group, persistence=persistence)
+        
+        print "persistence = %s, scale = %s" % (persistence, matrix._scale)
+        assert matrix.size == 52, "Expected matrix to be resized to 52 nodes"
+        assert abs(matrix.initial - pmap.initial) <= 1e-9 * pmap.initial, "Expected equal initial values"
+        ratios = [ ]
+        for i in xrange(52):
+            for j in xrange(52):
+                expect = pmap[i, j]
+                assert abs(matrix[i, j] - expect) <= 1e-9 * expect, \
+                    "Expected %s for %s but got %s" % (expect, (i, j), matrix[i, j])
+                ratios.append(powered[i * 52 + j] / expect ** 2.0)
+        assert max(ratios) - min(ratios) <= 1e-9 * max(ratios), \
+            "Expected powered values to be proportional to pheromone"
+        assert matrix[60, 0] == matrix.initial, "Expected initial value outside matrix"
+
+def _check_tour(tour, size):
+    assert sorted(tour) == range(size), "Expected permutation of %d nodes: %s" % (size, tour)
+
+def test_TourBuilder_tours():
+    landscape, group = _berlin52()
+    pmap, matrix = PheromoneMap(0.1), PheromoneMatrix(0.1)
+    for each in (pmap, matrix):
+        each.update_fitness(source=group, persistence=0.9, strength=100, minimisation=True)
+    
+    for pheromone_map in (None, pmap, matrix):
+        for candidates in (None, 1, 5):
+            for greediness in (0.0, 0.5, 1.0):
+                builder = TourBuilder(landscape.cost_map, 2.0, pheromone_map, 2.0, candidates)
+                for start in (0, 17, 51):
+                    tour = builder.tour(start, greediness)
+                    _check_tour(tour, 52)
+                    yield check_start, tour, start
+
+def check_start(tour, start):
+    assert tour[0] == start, "Expected tour to begin at %d: %s" % (start, tour)
+
+def test_TourBuilder_nearest_neighbour():
+    landscape, _ = _berlin52()
+    cost_map = landscape.cost_map
+    
+    for candidates in (None, 3):
+        builder = TourBuilder(cost_map, 2.0, None, 2.0, candidates)
+        tour = builder.tour(0, greediness=1.0)
+        
+        remaining = set(xrange(1, 52))
+        expect = [ 0 ]
+        while remaining:
+            nearest = min(remaining, key=lambda j: cost_map[expect[-1], j])
+            expect.append(nearest)
+            remaining.discard(nearest)
+        print candidates, tour
+        assert tour == expect, "Expected nearest neighbour tour %s" % expect
+
+def test_TourBuilder_candidate_list():
+    landscape, _ = _berlin52()
+    cost_map = landscape.cost_map
+    builder = TourBuilder(cost_map, 2.0, None, 2.0, 5)
+    
+    for node in (0, 25, 51):
+        nodes = builder.candidate_list(node)
+        expect = sorted((j for j in xrange(52) if j != node), key=lambda j: cost_map[node, j])[:5]
+        assert nodes == expect, "Expected %s but got %s" % (expect, nodes)
+
+def test_TourSpecies_init_tour():
+    landscape, _ = _berlin52()
+    species = TourSpecies({ }, None)
+    matrix = PheromoneMatrix(0.1)
+    
+    tours = list(islice(species.init_tour(landscape.cost_map, pheromone_map=matrix, candidates=10), 60))
+    for indiv in tours:
+        _check_tour(indiv.genome, 52)
+    assert [indiv.genome[0] for indiv in tours] == range(52) + range(8), "Expected start node to rotate"
+    builder = species._builder
+    
+    list(islice(species.init_tour(landscape.cost_map, pheromone_map=matrix, candidates=10), 1))
+    assert species._builder is builder, "Expected builder to be reused"
+    list(islice(species.init_tour(landscape.cost_map, pheromone_map=matrix), 1))
+    assert species._builder is not builder, "Expected new builder for different parameters"
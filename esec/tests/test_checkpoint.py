@@ -0,0 +1,78 @@
+import os
+import tempfile
+from esec import Experiment
+from esec.individual import Individual
+from esec.landscape.real import NoisyQuartic
+from esec.monitors import ConsoleMonitor
+import esec.context
+
+SYSTEM_DEFINITION = r'''
+FROM random_real(length=10, lowest=-1.28, highest=1.28) SELECT 20 population
+EVAL population
+YIELD population
+
+BEGIN generation
+    FROM population SELECT 20 offspring USING tournament(k=3), crossover_uniform, mutate_gaussian(step_size=0.1)
+    EVAL offspring
+    FROM population, offspring SELECT 20 population USING best
+    YIELD population
+END generation
+
+BEGIN restart
+    FROM population SELECT 10 population USING best
+    FROM random_real(length=10, lowest=-1.28, highest=1.28) SELECT 10 fresh
+    FROM population, fresh SELECT population
+    EVAL population
+    YIELD population
+END restart
+'''
+
+def make_experiment(checkpoint=None):
+    return Experiment({
+        'random_seed': 12345,
+        'monitor': ConsoleMonitor({ 'limits': { 'iterations': 12 } }),
+        'landscape': NoisyQuartic(parameters=10, random_seed=12345),
+        'system': { 'definition': SYSTEM_DEFINITION },
+        'selector': ['generation', 'generation', 'restart'],
+        'checkpoint': checkpoint,
+        'checkpoint_interval': 5,
+    })
+
+def get_result(exp):
+    best = exp.monitor._stats['global_max']
+    population = esec.context.context['population']
+    return ((best.genome, best.fitness.values, best.birthday),
+            [(indiv.genome, indiv.fitness.values, indiv.birthday) for indiv in population],
+            exp.monitor._stats['global_evals'],
+            Individual._birthday)
+
+def test_checkpoint_resume():
+    exp = make_experiment()
+    exp.run()
+    expected = get_result(exp)
+    
+    handle, filename = tempfile.mkstemp()
+    os.close(handle)
+    try:
+        # Run until a checkpoint has been saved, then keep going to
+        # simulate lost work.
+        exp = make_experiment(filename)
+        exp.begin()
+        for _ in xrange(7): exp.step()
+        assert exp.steps == 7, "Unexpected number of steps"
+        
+        exp = make_experiment(filename)
+        exp.resume()
+        actual = get_result(exp)
+        
+        print expected[0]
+        print actual[0]
+        assert exp.steps == 12, "Did not resume from the checkpoint"
+        assert actual[0] == expected[0], "Best individual differs from uninterrupted run"
+        assert actual == expected, "Final population differs from uninterrupted run"
+        
+        population = esec.context.context['population']
+        species = exp.system.persistent_objects()['species:' + population[0].species.name]
+        assert all(indiv.species is species for indiv in population), "Species was not restored by reference"
+    finally:
+        os.remove(filename)
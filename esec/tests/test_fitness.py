@@ -0,0 +1,46 @@
+import tests
+from itertools import product
+from esec.fitness import Fitness, FitnessMaximise, FitnessMinimise, EmptyFitness, SimpleDominatingFitness
+
+VALUES = [-float('inf'), -2.5, -1, 0, 0.0, 1, 2.5, float('inf')]
+
+class TwoPartFitness(FitnessMaximise):
+    types = [float, float]
+    defaults = [0.0, 0.0]
+
+def test_fitness_key_types():
+    for fitness_type in (Fitness, FitnessMaximise):
+        key = fitness_type(2.5).key
+        assert type(key) is float and key == 2.5, "Key was %r" % key
+    key = FitnessMinimise(2.5).key
+    assert type(key) is float and key == -2.5, "Key was %r" % key
+    
+    for fitness in (TwoPartFitness([1, 2]), SimpleDominatingFitness(1)([1.0])):
+        assert fitness.key is fitness, "Key was %r" % fitness.key
+    
+    empty = EmptyFitness()
+    assert empty.key is empty, "Key was %r" % empty.key
+
+def test_fitness_key_order():
+    for fitness_type in (FitnessMaximise, FitnessMinimise):
+        yield check_fitness_key_order, fitness_type
+
+def check_fitness_key_order(fitness_type):
+    fitnesses = [fitness_type(v) for v in VALUES] + [EmptyFitness()]
+    for f1, f2 in product(fitnesses, fitnesses):
+        if isinstance(f1, EmptyFitness) and isinstance(f2, EmptyFitness):
+            continue
+        assert (f1 > f2) == (f1.key > f2.key), "%s > %s differed" % (f1, f2)
+        assert (f1 < f2) == (f1.key < f2.key), "%s < %s differed" % (f1, f2)
+    
+    expected = sorted(fitnesses, reverse=True)
+    actual = sorted(fitnesses, key=lambda f: f.key, reverse=True)
+    assert [getattr(f, 'values', None) for f in expected] == [getattr(f, 'values', None) for f in actual], \
+        "Sort order differed"
+
+def test_fitness_key_augmented():
+    fitness = FitnessMinimise(1.0)
+    fitness += FitnessMinimise(2.0)
+    assert fitness.key == -3.0, "Key was %r" % fitness.key
+    fitness -= FitnessMinimise(5.0)
+    assert fitness.key == 2.0, "Key was %r" % fitness.key
@@ -0,0 +1,245 @@
+from tests import *
+from itertools import izip
+from math import isinf, log, sqrt
+from random import Random
+from esec.context import rand
+from esec.fitness import EmptyFitness
+from esec.individual import EmptyIndividual
+from esec.monitors import ConsoleMonitor
+from esec.monitors.consolemonitor import NullStream
+from esec.monitors import diversity
+from esec.monitors.groupstatistics import GroupStatistics
+from esec.individual import Individual
+from esec.species import Species
+from esec.species.binary import BinarySpecies
+from esec.species.binary_packed import PackedBinarySpecies
+from esec.species.real import RealSpecies
+from esec.species.sequence import SequenceSpecies
+
+def _reference_update(pop_stat, group):
+    '''Calculates statistics for `group` as `ConsoleMonitor.on_yield`
+    originally did.'''
+    best = EmptyIndividual()
+    worst = group[0] if len(group) else EmptyIndividual()
+    fit_sum = EmptyFitness()
+    for i in group:
+        if not isinf(i.fitness.simple):
+            fit_sum += i.fitness
+        if i.fitness.key > best.fitness.key: best = i
+        if i.fitness.key < worst.fitness.key: worst = i
+        for key, value in i.statistic.items():
+            for prefix in ('global_', 'local_'):
+                pop_stat[prefix + key] = pop_stat.get(prefix + key, 0) + value
+    
+    pop_stat['local_max'] = best
+    pop_stat['local_ave_fitness'] = fit_sum / float(len(group))
+    pop_stat['local_min'] = worst
+    pop_max = pop_stat.get('global_max', EmptyIndividual())
+    if best.fitness.key > pop_max.fitness.key:
+        pop_max = best
+        pop_stat['stable_count'] = 0
+    else:
+        pop_stat['stable_count'] = pop_stat.get('stable_count', 0) + 1
+    pop_min = pop_stat.get('global_min', worst)
+    if worst.fitness.key < pop_min.fitness.key:
+        pop_min = worst
+    pop_sum = fit_sum + pop_stat.get('_global_sum_fitness', EmptyFitness())
+    pop_cnt = float(len(group)) + pop_stat.get('_global_cnt_fitness', 0)
+    pop_stat['global_max'] = pop_max
+    pop_stat['_global_sum_fitness'] = pop_sum
+    pop_stat['_global_cnt_fitness'] = pop_cnt
+    pop_stat['global_ave_fitness'] = pop_sum / pop_cnt
+    pop_stat['global_min'] = pop_min
+    pop_stat['local_diversity'] = 0.0
+    pop_stat['local_dispersion'] = 0.0
+    pop_stat['local_unique'] = len(set(g.phenome_string for g in group))
+    pop_stat['size'] = len(group)
+
+def _generations(make_pop, count):
+    '''Yields `count` groups where each group keeps half of the previous
+    group and adds new individuals, some with statistics.'''
+    population = make_pop()
+    for indiv in population[::3]:
+        indiv.set_statistic(mutated=1)
+    for indiv in population[::7]:
+        indiv.set_statistic(recombined=2, mutated=1)
+    for _ in xrange(count):
+        yield population
+        fresh = make_pop()
+        for indiv in fresh[::4]:
+            indiv.set_statistic(mutated=rand.randrange(3))
+        population = [rand.choice(population) for _ in xrange(50)] + fresh[:50]
+
+def _compare(expected, actual):
+    assert sorted(expected) == sorted(actual), "Keys differ: %s != %s" % (sorted(expected), sorted(actual))
+    for key, value in expected.iteritems():
+        if isinstance(value, EmptyIndividual): value = value.fitness
+        other = actual[key]
+        if isinstance(other, EmptyIndividual): other = other.fitness
+        if hasattr(value, 'fitness'):
+            assert value is other, "%s: %s is not %s" % (key, value, other)
+        elif hasattr(value, 'values'):
+            assert type(value) is type(other) and value.values == other.values, "%s: %s != %s" % (key, value, other)
+        else:
+            assert value == other, "%s: %s != %s" % (key, value, other)
+
+def test_group_statistics():
+    for make_pop in (make_pop_max, make_pop_min):
+        yield check_group_statistics_reference, make_pop
+
+def check_group_statistics_reference(make_pop):
+    statistics = GroupStatistics()
+    expected, actual = { }, { }
+    for group in _generations(make_pop, 10):
+        _reference_update(expected, group)
+        statistics.update(actual, 'population', group)
+        _compare(expected, actual)
+        for stats in (expected, actual):
+            for key in [k for k in stats if k.startswith('local_')]:
+                del stats[key]
+
+def test_group_statistics_empty():
+    actual = { }
+    GroupStatistics().update(actual, 'population', [])
+    assert actual['size'] == 0, "Size was %d" % actual['size']
+    assert isinstance(actual['local_max'], EmptyIndividual), "Empty group had a maximum"
+    assert isinstance(actual['local_ave_fitness'], EmptyFitness), "Empty group had an average"
+
+def test_group_statistics_infinite():
+    population = make_pop_max()
+    population[0].fitness = FitnessMaximise(float('-inf'))
+    expected, actual = { }, { }
+    _reference_update(expected, population)
+    GroupStatistics().update(actual, 'population', population)
+    _compare(expected, actual)
+
+def test_group_statistics_reevaluated():
+    population = make_pop_max()
+    statistics = GroupStatistics()
+    actual = { }
+    statistics.update(actual, 'population', population)
+    population[0].fitness = FitnessMaximise(1000)
+    statistics.update(actual, 'population', population)
+    assert actual['local_max'] is population[0], "New fitness of a remembered individual was ignored"
+
+def test_group_statistics_optional():
+    statistics = GroupStatistics(minimum=False, average=False, counters=False, unique=False)
+    population = make_pop_max()
+    population[0].set_statistic(mutated=1)
+    actual = { }
+    statistics.update(actual, 'population', population)
+    for key in ('local_min', 'global_min', 'local_ave_fitness', 'global_ave_fitness', 'local_mutated'):
+        assert key not in actual, "%s was calculated" % key
+    assert actual['local_unique'] == 0, "local_unique was calculated"
+    assert actual['local_max'] is max(population, key=lambda i: i.fitness.key), "local_max was incorrect"
+
+def _make_monitor(**cfg):
+    cfg.setdefault('out', NullStream())
+    return ConsoleMonitor(cfg)
+
+def test_console_monitor_statistics():
+    for cfg, expected in [
+        ({ }, (True, True, False, False)),
+        ({ 'report': 'brief', 'summary': 'status' }, (False, False, False, False)),
+        ({ 'report': 'brief+local_int', 'summary': 'status' }, (True, True, False, False)),
+        ({ 'report': 'brief+local_mutated', 'summary': 'status' }, (False, False, True, False)),
+        ({ 'report': 'brief', 'summary': 'status', 'limits': { 'unique': 1 } }, (False, False, False, True)),
+        ({ 'report': 'brief', 'summary': 'status', 'verbose': 2 }, (True, True, True, False)),
+        ({ 'report': 'brief+custom', 'summary': 'status',
+           'formats': { 'custom': [ 'c', '%s', lambda owner: ('-',) ] } }, (True, True, True, False)),
+        ]:
+        yield check_console_monitor_statistics, cfg, expected
+
+def check_console_monitor_statistics(cfg, expected):
+    statistics = _make_monitor(**cfg).statistics
+    actual = (statistics.minimum, statistics.average, statistics.counters, statistics.unique)
+    print cfg
+    assert actual == expected, "%s != %s" % (actual, expected)
+
+def _pairs(group):
+    return [(a, b) for i, a in enumerate(group) for b in group[i + 1:]]
+
+def _naive_binary(genomes):
+    pairs = _pairs([list(g) for g in genomes])
+    diversity = sum(sum(1 for x, y in izip(a, b) if x != y) for a, b in pairs) / float(len(pairs))
+    entropy = 0.0
+    for column in izip(*genomes):
+        p = sum(column) / float(len(column))
+        if 0 < p < 1: entropy -= p * log(p, 2) + (1 - p) * log(1 - p, 2)
+    return diversity, entropy / len(genomes[0])
+
+def _naive_real(genomes):
+    pairs = _pairs(genomes)
+    diversity = sqrt(sum(sum((x - y) ** 2 for x, y in izip(a, b)) for a, b in pairs) / float(len(pairs)))
+    centroid = [sum(column) / float(len(column)) for column in izip(*genomes)]
+    dispersion = sum(sqrt(sum((x - c) ** 2 for x, c in izip(g, centroid))) for g in genomes) / len(genomes)
+    return diversity, dispersion
+
+def _edges(genome):
+    return set(tuple(sorted(pair)) for pair in izip(genome, genome[1:]))
+
+def _naive_sequence(genomes):
+    pairs = _pairs(genomes)
+    diversity = sum(len(_edges(a) - _edges(b)) for a, b in pairs) / float(len(pairs))
+    return diversity, None
+
+def test_diversity():
+    binary_species = BinarySpecies({ }, None)
+    packed_species = PackedBinarySpecies({ }, None)
+    real_species = RealSpecies({ }, None)
+    sequence_species = SequenceSpecies({ }, None)
+    for name, group, naive in [
+        ('binary', list(islice(binary_species.init_random(length=20), 30)), _naive_binary),
+        ('packed', list(islice(packed_species.init_random(length=20), 30)), _naive_binary),
+        ('binary_same', list(islice(binary_species.init_one(length=20), 30)), _naive_binary),
+        ('real', list(islice(real_species.init_random(length=5, lowest=-2.0, highest=2.0), 30)), _naive_real),
+        ('integer', make_pop_max()[:30], _naive_real),
+        ('sequence', list(islice(sequence_species.init_random(length=12), 30)), _naive_sequence),
+        ]:
+        yield check_diversity, name, group, naive
+
+def check_diversity(name, group, naive):
+    expected = naive([i.genome for i in group])
+    actual = diversity.measure(group)
+    print name, expected, actual
+    assert abs(actual[0] - expected[0]) < 1e-9, "Diversity %f != %f" % (actual[0], expected[0])
+    if expected[1] is not None:
+        assert abs(actual[1] - expected[1]) < 1e-9, "Dispersion %f != %f" % (actual[1], expected[1])
+
+def test_diversity_sequence_dispersion():
+    species = SequenceSpecies({ }, None)
+    same = list(islice(species.init_forward(length=10), 20))
+    assert diversity.measure(same) == (0.0, 0.0), "Identical sequences were diverse"
+    distinct = list(islice(species.init_forward(length=3), 10))
+    for start, indiv in enumerate(distinct):
+        indiv.genome = [start * 3, start * 3 + 1, start * 3 + 2]
+    div, disp = diversity.measure(distinct)
+    print div, disp
+    assert abs(div - 2.0) < 1e-9, "Sequences sharing no edges had diversity %f" % div
+    assert abs(disp - 1.0) < 1e-9, "Sequences sharing no edges had dispersion %f" % disp
+
+def test_diversity_sample():
+    species = RealSpecies({ }, None)
+    group = list(islice(species.init_random(length=10, lowest=-1.0, highest=1.0), 2000))
+    exact = diversity.measure(group)
+    state = rand.getstate()
+    estimate = diversity.measure(group, sample_size=200, rand=Random(1))
+    assert rand.getstate() == state, "Sampling used the experiment's random number generator"
+    print exact, estimate
+    assert abs(estimate[0] - exact[0]) < 0.1 * exact[0], "Sampled diversity was not close to exact"
+    assert abs(estimate[1] - exact[1]) < 0.1 * exact[1], "Sampled dispersion was not close to exact"
+
+def test_diversity_other_species():
+    species = Species({ }, None)
+    group = [Individual(i.genome, species) for i in make_pop_max()[:5]]
+    assert diversity.measure(group) == (0.0, 0.0), "Unsupported species was measured"
+    assert diversity.measure(make_pop_max()[:1]) == (0.0, 0.0), "Single individual was measured"
+
+def test_console_monitor_diversity():
+    monitor = _make_monitor(report='brief+local_diversity+local_dispersion', diversity_sample=50)
+    assert monitor.statistics.diversity and monitor.statistics.dispersion, "Diversity was not enabled"
+    assert monitor.statistics.sample_size == 50, "Sample size was %s" % monitor.statistics.sample_size
+    actual = { }
+    monitor.statistics.update(actual, 'population', make_pop_max())
+    assert actual['local_diversity'] > 0.0, "Diversity was not calculated"
+    assert actual['local_dispersion'] > 0.0, "Dispersion was not calculated"
@@ -0,0 +1,81 @@
+from esec import Experiment
+from esec.monitors import MonitorBase
+from esec.landscape.real import Rastrigin
+from esec.parallel import ParallelEvaluator
+import esec.context
+
+SYSTEM_DEFINITION = r'''
+FROM random_real(length=10, lowest=-5.0, highest=5.0) SELECT 20 population
+EVAL population
+YIELD population
+
+BEGIN generation
+    FROM population SELECT 20 offspring USING tournament(k=3), crossover_uniform, mutate_gaussian(step_size=0.5)
+    EVAL offspring USING config.landscape
+    FROM population, offspring SELECT 20 population USING best
+    YIELD population
+END generation
+'''
+
+class CountingMonitor(MonitorBase):
+    def __init__(self, iterations):
+        super(CountingMonitor, self).__init__()
+        self.iterations = iterations
+        self.stats = { }
+    
+    def on_pre_reset(self, sender):
+        self.stats = { 'iterations': 0 }
+    
+    def on_pre_breed(self, sender):
+        self.stats['iterations'] += 1
+    
+    def on_notify(self, sender, name, value):
+        if name == 'statistic':
+            if isinstance(value, str): value = dict((k, 1) for k in value.split('+'))
+            for key, count in value.iteritems():
+                self.stats[key] = self.stats.get(key, 0) + count
+    
+    def on_exception(self, sender, exception_type, value, trace):
+        print trace
+        assert False, "Exception occurred during run"
+    
+    def should_terminate(self, sender):
+        return self.stats['iterations'] >= self.iterations
+
+def run_experiment(processes):
+    monitor = CountingMonitor(5)
+    exp = Experiment({
+        'random_seed': 12345,
+        'monitor': monitor,
+        'landscape': Rastrigin(parameters=10, random_seed=12345),
+        'system': { 'definition': SYSTEM_DEFINITION },
+        'processes': processes,
+    })
+    exp.run()
+    population = esec.context.context['population']
+    return [(indiv.genome, indiv.fitness.values) for indiv in population], monitor.stats
+
+def test_parallel_matches_serial():
+    serial, serial_stats = run_experiment(None)
+    parallel, parallel_stats = run_experiment(2)
+    print serial_stats
+    print parallel_stats
+    assert serial == parallel, "Parallel evaluation produced different results"
+    assert serial_stats['global_evals'] == parallel_stats['global_evals'] == 20 * 6
+    assert serial_stats['local_evals'] == parallel_stats['local_evals'] == 20 * 6
+
+def test_parallel_evaluator_skips_unsafe():
+    class Unsafe(object):
+        parallel = False
+        def eval(self, indiv):
+            return 1.0
+    
+    assert Rastrigin(parameters=2).parallel, "Landscapes should be parallel by default"
+    
+    from tests import test_species_max
+    evaluator = ParallelEvaluator(1)
+    group = [next(test_species_max.init_count(length=2)) for _ in xrange(4)]
+    evaluator.evaluate(Unsafe(), iter(group))
+    assert evaluator._pool is None, "Pool was started for unsafe evaluator"
+    assert all(indiv._eval.__class__ is Unsafe for indiv in group)
+    assert all(indiv.fitness.simple == 1.0 for indiv in group)
@@ -0,0 +1,93 @@
+from __future__ import absolute_import
+from StringIO import StringIO
+from esec import Experiment
+from esec.monitors.consolemonitor import ConsoleMonitor
+from esdlc.emitters.esec import Profiler
+from tests.test_parallel import CountingMonitor, SYSTEM_DEFINITION
+from esec.landscape.real import Rastrigin
+import esec.context
+
+def run_experiment(profile):
+    monitor = CountingMonitor(5)
+    exp = Experiment({
+        'random_seed': 12345,
+        'monitor': monitor,
+        'landscape': Rastrigin(parameters=10, random_seed=12345),
+        'system': { 'definition': SYSTEM_DEFINITION },
+        'profile': profile,
+    })
+    exp.run()
+    population = esec.context.context['population']
+    return [(indiv.genome, indiv.fitness.values) for indiv in population], monitor.stats, exp.system
+
+def test_profiler_nesting():
+    profiler = Profiler()
+    profiler.start('outer')
+    profiler.start('inner', 'EVAL')
+    sum(xrange(100000))
+    profiler.end('inner', 'EVAL')
+    profiler.end('outer')
+    
+    calls, wall, cpu, self_wall, self_cpu = profiler.data['EVAL', 'inner']
+    print profiler.data
+    assert calls == 1, "Expected one call"
+    assert wall > 0.0, "No time was recorded"
+    assert self_wall == wall and self_cpu == cpu, "Self time should equal total time without nesting"
+    
+    outer = profiler.data['STMT', 'outer']
+    assert outer[1] >= wall, "Outer time should include inner time"
+    assert abs(outer[3] - (outer[1] - wall)) < 1e-9, "Self time should exclude inner time"
+    
+    # Sections left open are discarded by end()
+    profiler.start('outer')
+    profiler.start('open')
+    profiler.end('outer')
+    assert profiler.data['STMT', 'outer'][0] == 2
+    assert ('STMT', 'open') not in profiler.data, "Unfinished section was recorded"
+    assert not profiler._stack, "Unfinished section was not discarded"
+
+def test_profiler_wrap():
+    profiler = Profiler()
+    result = list(profiler.wrap('stage', iter([1, 2, 3])))
+    print profiler.data
+    assert result == [1, 2, 3], "Items were not returned"
+    assert profiler.data['STAGE', 'stage'][0] == 4, "Expected one call per item and one for termination"
+
+def test_profiled_system():
+    plain, plain_stats, plain_system = run_experiment(False)
+    profiled, profiled_stats, system = run_experiment(True)
+    print profiled_stats
+    print '\n'.join(system.profile_report())
+    assert plain == profiled, "Profiling changed the results"
+    assert plain_system.profiler is None and plain_system.profile_report() == []
+    assert 'local_block_time' not in plain_stats, "Unprofiled system reported times"
+    
+    profiler = system.profiler
+    kinds = set(kind for kind, _ in profiler.data)
+    assert kinds == set(Profiler.KINDS), "Not all kinds of section were timed: %s" % kinds
+    assert profiler.data['BLOCK', 'generation'][0] == 5, "Expected one record per generation"
+    assert profiler.data['STAGE', 'tournament(k=3.0)'][0] > 0, "Pipeline stage was not timed"
+    assert sum(r[0] for (kind, _), r in profiler.data.iteritems() if kind == 'EVAL') == profiled_stats['global_evals']
+    
+    for key in ('block_time', 'stage_time', 'eval_time'):
+        assert profiled_stats['global_' + key] > 0.0, "No time reported for " + key
+    assert profiled_stats['global_block_time'] <= profiler.totals()['BLOCK'][1]
+
+def test_console_monitor_times():
+    out = StringIO()
+    monitor = ConsoleMonitor({ 'out': out, 'error_out': out,
+                               'report': 'brief+local_block_time+local_stage_time+local_eval_time',
+                               'limits': { 'iterations': 5 } })
+    exp = Experiment({
+        'random_seed': 12345,
+        'monitor': monitor,
+        'landscape': Rastrigin(parameters=10, random_seed=12345),
+        'system': { 'definition': SYSTEM_DEFINITION },
+        'profile': True,
+    })
+    exp.run()
+    print out.getvalue()
+    stats = monitor._stats
+    for key in ('block_time', 'stage_time', 'eval_time'):
+        assert stats.get('global_' + key, 0.0) > 0.0, "No time reported for " + key
+        assert 'local_' + key in stats, "No time reported for the last generation for " + key
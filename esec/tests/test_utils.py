@@ -1,6 +1,10 @@
+import tests
+import pickle
 import StringIO
+from random import Random
 from nose.tools import raises
-from esec.utils import safe_div, ConfigDict
+import esec.utils
+from esec.utils import safe_div, ConfigDict, LRUCache, sample_sites
 
 def test_safe_div():
     assert safe_div(4,2) == 2
@@ -97,4 +101,96 @@ def test_ConfigDict_subclass():
 
 
 
-    
\ No newline at end of file
+    
+
+def test_LRUCache():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    cache['c'] = 3      # discards 'b', the least recently used
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+def test_LRUCache_order():
+    cache = LRUCache(5)
+    expect = [ ]
+    rand = Random(1)
+    for _ in xrange(500):
+        key = rand.randrange(10)
+        if rand.random() < 0.5:
+            cache[key] = key
+            if key in expect: expect.remove(key)
+            expect.append(key)
+            del expect[:-5]
+        else:
+            assert (cache.get(key) == key) == (key in expect), "Incorrect result for %d" % key
+            if key in expect:
+                expect.remove(key)
+                expect.append(key)
+        assert sorted(expect) == sorted(k for k in xrange(10) if k in cache), "Incorrect keys"
+    
+    cache = pickle.loads(pickle.dumps(cache))
+    assert [cache.get(key) for key in expect] == expect, "Items were lost when pickled"
+    cache.clear()
+    assert len(cache) == 0 and cache.get(expect[0]) is None
+
+def test_LRUCache_disabled():
+    cache = LRUCache(0)
+    cache['a'] = 1
+    assert len(cache) == 0
+    assert cache.get('a', 'missing') == 'missing'
+
+def test_sample_sites_limits():
+    assert sample_sites(10, 0.0) == []
+    assert sample_sites(10, 1.0) == range(10)
+    assert sample_sites(0, 0.01) == []
+    assert sorted(sample_sites(10, 0.0, 20)) == range(10)
+    for count in (1, 3, 9):
+        sites = sample_sites(10, 0.0, count)
+        assert len(sites) == count, "%d sites returned instead of %d" % (len(sites), count)
+        assert len(set(sites)) == count, "sites were not distinct: %s" % sites
+        assert all(0 <= i < 10 for i in sites), "site out of range: %s" % sites
+
+def test_sample_sites_distribution():
+    # Each rate is tested using both geometric skipping and testing
+    # every site, which must produce the same distribution.
+    for rate in (0.001, 0.01, 0.05, 0.2):
+        for skip_below in (0.0, 1.0):
+            yield check_sample_sites_distribution, rate, skip_below
+
+def check_sample_sites_distribution(rate, skip_below):
+    original = esec.utils.SKIP_SITES_BELOW
+    esec.utils.SKIP_SITES_BELOW = skip_below
+    try:
+        length, trials = 50, 4000
+        counts = [0] * length
+        totals = []
+        for _ in xrange(trials):
+            sites = sample_sites(length, rate)
+            assert sites == sorted(set(sites)), "sites were not distinct and ordered: %s" % sites
+            assert all(0 <= i < length for i in sites), "site out of range: %s" % sites
+            for i in sites: counts[i] += 1
+            totals.append(len(sites))
+    finally:
+        esec.utils.SKIP_SITES_BELOW = original
+    
+    # The number of sites is binomial; allow five standard errors.
+    mean = sum(totals) / float(trials)
+    expected = length * rate
+    tolerance = 5 * (length * rate * (1 - rate) / trials) ** 0.5
+    assert abs(mean - expected) <= tolerance, "mean %f not within %f of %f" % (mean, tolerance, expected)
+    
+    variance = sum((t - mean) ** 2 for t in totals) / (trials - 1)
+    expected_variance = length * rate * (1 - rate)
+    assert abs(variance - expected_variance) <= 0.2 * expected_variance + 0.01, \
+        "variance %f not close to %f" % (variance, expected_variance)
+    
+    # Every site is equally likely to be selected.
+    site_tolerance = 5 * (rate * (1 - rate) / trials) ** 0.5 + 1.0 / trials
+    for i, count in enumerate(counts):
+        assert abs(count / float(trials) - rate) <= site_tolerance, \
+            "site %d selected with frequency %f, not %f" % (i, count / float(trials), rate)